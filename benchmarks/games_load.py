@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Classroom load test for the games API against a local MySQL.
+
+Three steps:
+
+    provision  start the docker-compose ``mysql`` service, wait for it and
+               apply schema.sql
+    seed       insert students, their word lists and approved lessons with
+               flashcards / grammar / sentence-builder / cloze exercises
+               (deterministic ids, so re-seeding is a no-op)
+    run        drive classroom traffic at one or more concurrency levels
+
+Each virtual student loops: start a session in a random game, post one result
+per item with a short think time (``--think-ms 0`` gives pure result bursts),
+complete the session, then fetch their stats. For every level the run reports
+p50/p99 latency and error rate per operation, plus MySQL pool saturation
+sampled from ``/v1/metrics?format=prometheus`` (connections in use vs
+pool size, pool acquire wait, slow queries).
+
+By default the API runs in-process through ASGI (one event loop, one pool,
+same as one pod without the network). ``--url`` targets a running pod instead.
+MySQL connection settings come from the usual MYSQL_* variables.
+
+Usage:
+    python -m benchmarks.games_load provision
+    python -m benchmarks.games_load seed [--students 500] [--lessons 20]
+    python -m benchmarks.games_load run --concurrency 10,50,100 [--duration 30] [--url http://localhost:8000]
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA = os.path.join(ROOT, "schema.sql")
+NAMESPACE = uuid.UUID("6f0c5d3e-1f43-4b0a-9a57-4c7f1e0b7a11")
+
+WORDS = [
+    ("apple", "תפוח"), ("book", "ספר"), ("chair", "כיסא"), ("dog", "כלב"), ("evening", "ערב"),
+    ("friend", "חבר"), ("garden", "גינה"), ("house", "בית"), ("island", "אי"), ("jacket", "מעיל"),
+    ("kitchen", "מטבח"), ("lesson", "שיעור"), ("market", "שוק"), ("night", "לילה"), ("office", "משרד"),
+    ("phone", "טלפון"), ("question", "שאלה"), ("river", "נהר"), ("school", "בית ספר"), ("teacher", "מורה"),
+]
+
+# Share of sessions per game; lesson games use the seeded approved lessons
+GAME_MIX = {
+    "flashcards_lesson": 0.25,
+    "flashcards_custom": 0.15,
+    "spelling": 0.15,
+    "grammar": 0.2,
+    "sentence": 0.15,
+    "cloze": 0.1,
+}
+
+
+def seed_id(*parts: Any) -> str:
+    return str(uuid.uuid5(NAMESPACE, ":".join(str(p) for p in parts)))
+
+
+def student_id(i: int) -> str:
+    return f"load-student-{i:05d}"
+
+
+# -------------------------
+# Provision + seed
+# -------------------------
+def schema_statements(text: str) -> List[str]:
+    """Split schema.sql into statements. ``-- `` comments are stripped first
+    because some contain semicolons."""
+    text = re.sub(r"--(\s.*)?$", "", text, flags=re.MULTILINE)
+    return [stmt.strip() for stmt in text.split(";") if stmt.strip()]
+
+
+async def _connect(database: Optional[str] = None):
+    import aiomysql
+
+    from src.config import settings
+
+    return await aiomysql.connect(
+        host=settings.MYSQL_HOST,
+        port=settings.MYSQL_PORT,
+        user=settings.MYSQL_USER or "tulkka_user",
+        password=settings.MYSQL_PASSWORD or "tulkka_password",
+        db=database or settings.MYSQL_DATABASE,
+        autocommit=True,
+        charset="utf8mb4",
+    )
+
+
+async def wait_for_mysql(timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = await _connect()
+            conn.close()
+            return
+        except Exception as exc:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"MySQL not reachable after {timeout:.0f}s: {exc}") from exc
+            await asyncio.sleep(2)
+
+
+async def provision(start_container: bool = True) -> None:
+    if start_container:
+        compose = ["docker", "compose"] if shutil.which("docker") else ["docker-compose"]
+        print(f"Starting mysql via {' '.join(compose)} ...")
+        subprocess.run([*compose, "up", "-d", "mysql"], cwd=ROOT, check=True)
+    await wait_for_mysql()
+    with open(SCHEMA, encoding="utf-8") as fh:
+        statements = schema_statements(fh.read())
+    conn = await _connect()
+    try:
+        async with conn.cursor() as cur:
+            for stmt in statements:
+                await cur.execute(stmt)
+    finally:
+        conn.close()
+    print(f"Applied {len(statements)} statements from schema.sql")
+
+
+def _lesson_exercises(lesson: int) -> List[Tuple]:
+    rows = []
+    for i, (word, translation) in enumerate(WORDS[:10]):
+        data = {"word": word, "translation": translation, "example_sentence": f"I see the {word}."}
+        rows.append((seed_id("ex", lesson, "fc", i), "flashcards", data))
+    for i in range(8):
+        word = WORDS[i][0]
+        data = {
+            "prompt": f"She ___ to the {word} every day.",
+            "options": ["go", "goes", "going", "gone"],
+            "correctIndex": 1,
+            "explanation": "Third person singular takes -s.",
+        }
+        rows.append((seed_id("ex", lesson, "gc", i), "grammar_challenge", data))
+    for i in range(5):
+        word = WORDS[i][0]
+        tokens = ["I", "like", "the", word]
+        data = {"english": " ".join(tokens), "translation": "", "tokens": tokens, "distractors": ["likes"], "accepted": [tokens]}
+        rows.append((seed_id("ex", lesson, "sb", i), "sentence_builder", data))
+    for i in range(5):
+        word = WORDS[i][0]
+        data = {
+            "textParts": ["We ", " to the ", " yesterday."],
+            "options": [["went", "go", "gone", "going"], [word, "table", "cloud", "number"]],
+            "correct": ["went", word],
+        }
+        rows.append((seed_id("ex", lesson, "ac", i), "advanced_cloze", data))
+    return rows
+
+
+async def seed(students: int, lessons: int) -> None:
+    conn = await _connect()
+    try:
+        async with conn.cursor() as cur:
+            await cur.executemany(
+                "INSERT IGNORE INTO lessons (id, class_id, teacher_id, lesson_number, title, status, approved_at) "
+                "VALUES (%s, %s, %s, %s, %s, 'approved', NOW())",
+                [(seed_id("lesson", n), seed_id("class", n % 5), "load-teacher", n + 1, f"Load lesson {n + 1}")
+                 for n in range(lessons)],
+            )
+            for n in range(lessons):
+                await cur.executemany(
+                    "INSERT IGNORE INTO lesson_exercises (id, lesson_id, exercise_type, topic_id, topic_name, exercise_data, difficulty) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, 'medium')",
+                    [(ex_id, seed_id("lesson", n), kind, "load-topic", "Load topic", json.dumps(data, ensure_ascii=False))
+                     for ex_id, kind, data in _lesson_exercises(n)],
+                )
+            for start in range(0, students, 100):
+                batch = range(start, min(start + 100, students))
+                await cur.executemany(
+                    "INSERT IGNORE INTO word_lists (id, user_id, name, word_count) VALUES (%s, %s, %s, %s)",
+                    [(seed_id("list", i), student_id(i), "Load words", len(WORDS)) for i in batch],
+                )
+                await cur.executemany(
+                    "INSERT IGNORE INTO words (id, list_id, word, translation) VALUES (%s, %s, %s, %s)",
+                    [(seed_id("word", i, w), seed_id("list", i), w, t) for i in batch for w, t in WORDS],
+                )
+    finally:
+        conn.close()
+    print(f"Seeded {students} students (1 word list x {len(WORDS)} words each) and {lessons} approved lessons")
+
+
+# -------------------------
+# Traffic
+# -------------------------
+@dataclass
+class Sample:
+    op: str
+    seconds: float
+    ok: bool
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    duration: float
+    samples: List[Sample] = field(default_factory=list)
+    sessions: int = 0
+    pool_in_use: List[Tuple[float, float]] = field(default_factory=list)  # (in_use, max_size)
+    metrics_before: Dict[str, float] = field(default_factory=dict)
+    metrics_after: Dict[str, float] = field(default_factory=dict)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+_SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$")
+
+
+def parse_prometheus(text: str) -> Dict[str, float]:
+    """``{'name{labels}': value}`` for every sample line of a text exposition."""
+    out: Dict[str, float] = {}
+    for line in text.splitlines():
+        m = _SAMPLE_RE.match(line.strip())
+        if m:
+            try:
+                out[m.group(1) + (m.group(2) or "")] = float(m.group(3))
+            except ValueError:
+                pass
+    return out
+
+
+def histogram_quantile(before: Dict[str, float], after: Dict[str, float], name: str, q: float) -> Optional[float]:
+    """Upper bucket bound holding quantile ``q`` of the observations made between two scrapes."""
+    buckets = []
+    for key, value in after.items():
+        m = re.match(rf'^{name}_bucket\{{(.*)le="([^"]+)"\}}$', key)
+        if m:
+            bound = math.inf if m.group(2) == "+Inf" else float(m.group(2))
+            buckets.append((bound, value - before.get(key, 0.0)))
+    if not buckets:
+        return None
+    totals: Dict[float, float] = defaultdict(float)
+    for bound, count in buckets:  # sum across label sets (e.g. primary + replica)
+        totals[bound] += count
+    ordered = sorted(totals.items())
+    total = ordered[-1][1]
+    if total <= 0:
+        return None
+    for bound, cumulative in ordered:
+        if cumulative >= q * total:
+            return bound
+    return math.inf
+
+
+def _sum_metric(snapshot: Dict[str, float], name: str) -> float:
+    return sum(v for k, v in snapshot.items() if k == name or k.startswith(name + "{"))
+
+
+class Student:
+    """One virtual student playing sessions back to back."""
+
+    def __init__(self, client, index: int, lessons: int, think_ms: int, record: Callable[[str, float, bool], None]):
+        self.client = client
+        self.user = student_id(index)
+        self.word_list = seed_id("list", index)
+        self.lessons = lessons
+        self.think_ms = think_ms
+        self.record = record
+        self.rng = random.Random(index)
+        self.headers = {"X-User-Id": self.user}
+
+    async def _call(self, op: str, method: str, url: str, body: Optional[dict] = None) -> Optional[dict]:
+        started = time.perf_counter()
+        ok = False
+        data = None
+        try:
+            resp = await self.client.request(method, url, json=body, headers=self.headers)
+            ok = resp.status_code < 400
+            if ok and resp.content:
+                data = resp.json()
+        except Exception:
+            ok = False
+        self.record(op, time.perf_counter() - started, ok)
+        return data
+
+    async def _think(self) -> None:
+        if self.think_ms:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think_ms / 1000)
+
+    def _lesson(self) -> str:
+        return seed_id("lesson", self.rng.randrange(self.lessons))
+
+    async def play(self) -> None:
+        game = self.rng.choices(list(GAME_MIX), weights=list(GAME_MIX.values()))[0]
+        correct = lambda: self.rng.random() < 0.7  # noqa: E731
+        base, start, items_key, result = {
+            "flashcards_lesson": ("/v1/flashcards", {"mode": "lesson", "lessonId": self._lesson()}, "words",
+                                  lambda it: {"wordId": it["id"], "isCorrect": correct()}),
+            "flashcards_custom": ("/v1/flashcards", {"mode": "custom", "wordListId": self.word_list, "limit": 10}, "words",
+                                  lambda it: {"wordId": it["id"], "isCorrect": correct()}),
+            "spelling": ("/v1/spelling", {"wordListId": self.word_list}, "words",
+                         lambda it: {"wordId": it["id"], "userAnswer": it.get("word", ""), "isCorrect": correct()}),
+            "grammar": ("/v1/grammar-challenge", {"mode": "lesson", "lessonId": self._lesson()}, "questions",
+                        lambda it: {"questionId": it["id"], "selectedAnswer": 1, "isCorrect": correct()}),
+            "sentence": ("/v1/sentence-builder", {"mode": "lesson", "lessonId": self._lesson()}, "items",
+                         lambda it: {"itemId": it["id"], "userTokens": it.get("tokens", []), "isCorrect": correct()}),
+            "cloze": ("/v1/advanced-cloze", {"mode": "lesson", "lessonId": self._lesson()}, "items",
+                      lambda it: {"itemId": it["id"], "selectedAnswers": ["went", "table"], "isCorrect": correct()}),
+        }[game]
+
+        session = await self._call("session_start", "POST", f"{base}/sessions", start)
+        if not session:
+            return
+        sid = session["id"]
+        for item in session.get(items_key) or []:
+            await self._think()
+            body = {"clientResultId": str(uuid.uuid4()), "attempts": 1,
+                    "timeSpentMs": self.rng.randint(800, 6000), **result(item)}
+            await self._call("result", "POST", f"{base}/sessions/{sid}/results", body)
+        await self._call("complete", "POST", f"{base}/sessions/{sid}/complete", {})
+        await self._call("stats", "GET", f"{base}/stats/me")
+
+
+async def _scrape(client) -> Dict[str, float]:
+    try:
+        resp = await client.get("/v1/metrics", params={"format": "prometheus"})
+        return parse_prometheus(resp.text) if resp.status_code == 200 else {}
+    except Exception:
+        return {}
+
+
+async def run_level(
+    client,
+    concurrency: int,
+    duration: float,
+    students: int,
+    lessons: int,
+    think_ms: int,
+    sample_interval: float = 0.5,
+) -> LevelResult:
+    result = LevelResult(concurrency=concurrency, duration=duration)
+    record = lambda op, s, ok: result.samples.append(Sample(op, s, ok))  # noqa: E731
+    result.metrics_before = await _scrape(client)
+    deadline = time.monotonic() + duration
+
+    async def student_loop(slot: int) -> None:
+        student = Student(client, slot % students, lessons, think_ms, record)
+        while time.monotonic() < deadline:
+            await student.play()
+            result.sessions += 1
+
+    async def sampler() -> None:
+        while time.monotonic() < deadline:
+            snap = await _scrape(client)
+            in_use = snap.get('mysql_pool_in_use{pool="primary"}')
+            size = snap.get('mysql_pool_max_size{pool="primary"}')
+            if in_use is not None and size:
+                result.pool_in_use.append((in_use, size))
+            await asyncio.sleep(sample_interval)
+
+    started = time.monotonic()
+    await asyncio.gather(sampler(), *(student_loop(i) for i in range(concurrency)))
+    result.duration = time.monotonic() - started
+    result.metrics_after = await _scrape(client)
+    return result
+
+
+def summarize(result: LevelResult) -> Dict[str, Any]:
+    ops: Dict[str, List[Sample]] = defaultdict(list)
+    for s in result.samples:
+        ops[s.op].append(s)
+    ops["all"] = list(result.samples)
+
+    summary: Dict[str, Any] = {"concurrency": result.concurrency, "sessions": result.sessions, "ops": {}}
+    for op, samples in ops.items():
+        latencies = [s.seconds for s in samples]
+        errors = sum(1 for s in samples if not s.ok)
+        summary["ops"][op] = {
+            "count": len(samples),
+            "rps": len(samples) / result.duration if result.duration else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1e3,
+            "p99_ms": percentile(latencies, 99) * 1e3,
+            "error_rate": errors / len(samples) if samples else 0.0,
+        }
+
+    pool: Dict[str, Any] = {"samples": len(result.pool_in_use)}
+    if result.pool_in_use:
+        in_use = [u for u, _ in result.pool_in_use]
+        pool.update(
+            max_size=result.pool_in_use[-1][1],
+            mean_in_use=sum(in_use) / len(in_use),
+            max_in_use=max(in_use),
+            saturated_share=sum(1 for u, m in result.pool_in_use if u >= m) / len(result.pool_in_use),
+        )
+    before, after = result.metrics_before, result.metrics_after
+    wait_p99 = histogram_quantile(before, after, "mysql_pool_acquire_wait_seconds", 0.99)
+    pool["acquire_wait_p99_ms"] = None if wait_p99 is None else wait_p99 * 1e3
+    pool["slow_queries"] = _sum_metric(after, "mysql_slow_queries_total") - _sum_metric(before, "mysql_slow_queries_total")
+    summary["pool"] = pool
+    return summary
+
+
+def render(summary: Dict[str, Any]) -> str:
+    lines = [f"concurrency {summary['concurrency']}: {summary['sessions']} sessions"]
+    for op in ("session_start", "result", "complete", "stats", "all"):
+        o = summary["ops"].get(op)
+        if not o:
+            continue
+        lines.append(
+            f"  {op:<14} {o['count']:7d} req {o['rps']:8.1f} rps   p50 {o['p50_ms']:8.1f} ms   "
+            f"p99 {o['p99_ms']:8.1f} ms   errors {o['error_rate']:6.2%}"
+        )
+    pool = summary["pool"]
+    if pool.get("samples"):
+        wait = pool["acquire_wait_p99_ms"]
+        lines.append(
+            f"  pool           in use mean {pool['mean_in_use']:.1f} / max {pool['max_in_use']:.0f} of {pool['max_size']:.0f}, "
+            f"saturated {pool['saturated_share']:.0%} of samples, acquire wait p99 "
+            + ("n/a" if wait is None else ("> top bucket" if math.isinf(wait) else f"<= {wait:.0f} ms"))
+            + f", slow queries {pool['slow_queries']:.0f}"
+        )
+    else:
+        lines.append("  pool           no samples (is /v1/metrics reachable?)")
+    return "\n".join(lines)
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    import httpx
+
+    levels = [int(c) for c in str(args.concurrency).split(",") if c.strip()]
+    limits = httpx.Limits(max_connections=max(levels) + 10, max_keepalive_connections=max(levels) + 10)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url.rstrip("/"), timeout=args.timeout, limits=limits)
+    else:
+        from src.api.app import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+
+    summaries = []
+    async with client:
+        for level in levels:
+            result = await run_level(client, level, args.duration, args.students, args.lessons, args.think_ms)
+            summary = summarize(result)
+            summaries.append(summary)
+            print(render(summary))
+    if not args.url:
+        from src.db.mysql_pool import AsyncMySQLPool
+
+        await AsyncMySQLPool.close_pool()
+    return summaries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("provision", help="Start MySQL via docker-compose and apply schema.sql")
+    p.add_argument("--no-docker", action="store_true", help="Only apply the schema to an already running MySQL")
+
+    p = sub.add_parser("seed", help="Insert load-test students, word lists and approved lessons")
+    p.add_argument("--students", type=int, default=500)
+    p.add_argument("--lessons", type=int, default=20)
+
+    p = sub.add_parser("run", help="Drive classroom traffic and report latency, errors and pool saturation")
+    p.add_argument("--concurrency", default="10,50,100", help="Concurrent students per level, comma separated")
+    p.add_argument("--duration", type=float, default=30.0, help="Seconds per level")
+    p.add_argument("--students", type=int, default=500, help="Seeded students to draw from")
+    p.add_argument("--lessons", type=int, default=20, help="Seeded lessons to draw from")
+    p.add_argument("--think-ms", type=int, default=300, help="Mean pause between answers (0 = bursts)")
+    p.add_argument("--timeout", type=float, default=30.0)
+    p.add_argument("--url", help="Base URL of a running API; default runs the app in-process")
+    p.add_argument("--json", metavar="FILE", help="Write the per-level summaries as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.command == "provision":
+        asyncio.run(provision(start_container=not args.no_docker))
+    elif args.command == "seed":
+        asyncio.run(seed(args.students, args.lessons))
+    else:
+        summaries = asyncio.run(run(args))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as fh:
+                json.dump(summaries, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
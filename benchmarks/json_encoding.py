@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Encoding cost of a games session-start response.
+
+Compares FastAPI's default path (``jsonable_encoder`` + stdlib ``JSONResponse``)
+with ``FastJSONResponse`` from src/json_utils.py on a flashcards-style payload.
+
+Usage:
+    python -m benchmarks.json_encoding [--items 50] [--iterations 5000]
+"""
+
+from __future__ import annotations
+import argparse
+import time
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src import json_utils
+from src.json_utils import FastJSONResponse
+
+
+def session_payload(items: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "wordListId": str(uuid.uuid4()),
+        "words": [
+            {
+                "id": str(uuid.uuid4()),
+                "word": f"word-{i}",
+                "translation": f"תרגום {i}",
+                "notes": "Used in everyday conversation.",
+                "exampleSentence": f"This is example sentence number {i}.",
+                "isFavorite": i % 3 == 0,
+                "difficulty": "medium",
+                "stats": {"timesPracticed": i, "timesCorrect": i // 2, "accuracy": 50},
+            }
+            for i in range(items)
+        ],
+        "progress": {"current": 0, "total": items, "correct": 0, "incorrect": 0},
+        "startedAt": "2026-01-02T03:04:05Z",
+        "completedAt": None,
+    }
+
+
+def bench(fn, iterations: int) -> float:
+    for _ in range(100):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    payload = session_payload(args.items)
+    stored = json_utils.dumpb(payload)
+    cases = {
+        "jsonable_encoder + JSONResponse": lambda: JSONResponse(jsonable_encoder(payload)),
+        "JSONResponse": lambda: JSONResponse(payload),
+        f"FastJSONResponse ({json_utils.BACKEND})": lambda: FastJSONResponse(payload),
+        "FastJSONResponse (stored bytes)": lambda: FastJSONResponse(stored),
+    }
+    print(f"Session start with {args.items} items ({len(stored)} bytes), {args.iterations} iterations")
+    baseline = None
+    for name, fn in cases.items():
+        us = bench(fn, args.iterations)
+        baseline = baseline or us
+        print(f"  {name:<36} {us:8.1f} us   {baseline / us:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
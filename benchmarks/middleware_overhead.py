@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Per-request middleware overhead on a games-shaped endpoint.
+
+Compares the fused pure-ASGI ``APIRequestMiddleware`` against the previous
+stack of three BaseHTTPMiddleware layers (auth, idempotency, request log) and
+against no middleware at all. Requests are driven straight through the ASGI
+interface (no sockets), so the numbers isolate middleware cost.
+
+Usage:
+    python -m benchmarks.middleware_overhead [--requests 20000] [--path /v1/flashcards/sessions/x]
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.errors import APIError
+from src.api.middlewares import APIRequestMiddleware
+from src.config import settings
+from src.security import verify_jwt, JWTValidationError
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (baseline), copied verbatim from the
+# src/api/middlewares.py that preceded APIRequestMiddleware
+# ---------------------------------------------------------------------------
+class JWTAuthMiddleware(BaseHTTPMiddleware):
+    """JWT auth with public route support and dev-mode bypass."""
+
+    PUBLIC_PATHS = {
+        "/",
+        "/v1/health",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+        "/v1/process",
+        "/v1/trigger-lesson-processing",
+        "/v1/exercises",
+    }
+
+    # All games endpoints are intentionally public (no JWT required in this service)
+    # Updated to match TULKKA Games APIs spec route prefixes
+    GAMES_PUBLIC_PREFIXES = (
+        "/v1/flashcards",
+        "/v1/word-lists",
+        "/v1/spelling",
+        "/v1/grammar-challenge",
+        "/v1/advanced-cloze",
+        "/v1/sentence-builder",
+    )
+
+    def _is_public(self, path: str) -> bool:
+        if path.startswith("/v1/"):
+            return True
+        if path in self.PUBLIC_PATHS:
+            return True
+        for prefix in self.GAMES_PUBLIC_PREFIXES:
+            if path.startswith(prefix):
+                return True
+        return path.startswith("/docs") or path.startswith("/redoc")
+
+    async def dispatch(self, request: Request, call_next):
+        # Allow everything in development mode to unblock local testing
+        if settings.ENVIRONMENT != "production":
+            return await call_next(request)
+
+        if self._is_public(request.url.path):
+            return await call_next(request)
+
+        auth = request.headers.get("Authorization", "")
+        if not auth.startswith("Bearer "):
+            raise APIError("UNAUTHORIZED", "missing bearer token", 401)
+
+        token = auth.split(" ", 1)[1].strip()
+        try:
+            payload = verify_jwt(token)
+            request.state.user = payload
+        except JWTValidationError as exc:
+            raise APIError("UNAUTHORIZED", str(exc), 401)
+
+        return await call_next(request)
+
+
+class RequestLogMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start = time.time()
+        response: Response = await call_next(request)
+        dur = int((time.time() - start) * 1000)
+        logger.info("%s %s %d %dms", request.method, request.url.path, response.status_code, dur)
+        return response
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        key = request.headers.get("Idempotency-Key")
+        if not key:
+            return await call_next(request)
+        request.state.idempotency_key = key
+        return await call_next(request)
+
+
+# ---------------------------------------------------------------------------
+# Apps
+# ---------------------------------------------------------------------------
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/v1/flashcards/sessions/{session_id}")
+    async def get_session(session_id: str, request: Request):
+        return {"success": True, "data": {"id": session_id, "progress": {"current": 3, "total": 20}}}
+
+    if stack == "legacy":
+        # Same registration order as the baseline app.py
+        app.add_middleware(RequestLogMiddleware)
+        app.add_middleware(IdempotencyMiddleware)
+        app.add_middleware(JWTAuthMiddleware)
+    elif stack == "fused":
+        app.add_middleware(APIRequestMiddleware)
+    return app
+
+
+async def _call(app, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"authorization", b"Bearer bench"),
+            (b"idempotency-key", b"bench-key"),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(stack: str, path: str, requests: int, rounds: int) -> float:
+    """Median microseconds per request over ``rounds`` runs."""
+    app = build_app(stack)
+    for _ in range(200):  # warm up (route compilation, first-call caches)
+        assert await _call(app, path) == 200
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await _call(app, path)
+        samples.append((time.perf_counter() - start) / requests * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--path", default="/v1/flashcards/sessions/3f2a")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = {}
+    for stack in ("none", "legacy", "fused"):
+        results[stack] = asyncio.run(measure(stack, args.path, args.requests, args.rounds))
+
+    base = results["none"]
+    print(f"GET {args.path}  ({args.requests} requests x {args.rounds} rounds, median)")
+    for stack, us in results.items():
+        print(f"  {stack:<7} {us:8.1f} us/request   middleware overhead {us - base:7.1f} us")
+    saved = results["legacy"] - results["fused"]
+    print(f"  saved per request: {saved:.1f} us ({saved / results['legacy'] * 100:.0f}% of legacy total)")
+
+
+if __name__ == "__main__":
+    main()
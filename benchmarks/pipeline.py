@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Offline throughput and memory benchmark for the lesson pipeline.
+
+Runs ``LessonProcessor.process_lesson``, each extractor, each generator and
+``enhance_pipeline_output`` over a transcript corpus (docs/google_transcript.txt
+plus synthetic transcripts scaled up to 500k chars), with Gemini, Groq, the
+translator and AssemblyAI answering from recorded fixtures
+(benchmarks/replay.py). No network access is needed or allowed.
+
+For each case it reports the median time, throughput in transcript chars/s
+and peak traced memory. ``--json`` saves the results; ``--compare`` checks them
+against a saved baseline and exits 1 when any case is slower than
+``--threshold`` allows, so it can gate a deploy.
+
+Usage:
+    python -m benchmarks.pipeline [--sizes 50000,200000,500000] [--repeat 5]
+    python -m benchmarks.pipeline --json bench.json
+    python -m benchmarks.pipeline --compare bench.json --threshold 0.25
+    python -m benchmarks.pipeline --record   # refresh translator/Groq fixtures (live keys)
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.replay import ROOT, record_providers, replay_providers
+
+DEFAULT_SIZES = (50_000, 200_000, 500_000)
+
+# Substituted into synthetic transcripts so vocabulary keeps growing with size
+WORD_BANK = (
+    "airport breakfast calendar dentist elephant festival garden holiday island journey "
+    "kitchen library market neighbour orange passport question restaurant station ticket "
+    "umbrella vacation weather yesterday birthday computer doctor evening football guitar "
+    "hospital internet jacket lemon mountain notebook office picture river sandwich teacher"
+).split()
+
+SYNTHETIC_LINES = (
+    "Teacher: What did you do on the {w}?",
+    "Student: I go to the {w} yesterday with my brother.",
+    "Teacher: You went to the {w}. We say went, not go.",
+    "Student: I have a {w} and I like it very much.",
+    "Teacher: Can you make a sentence with the word {w}?",
+    "Student: She don't like the {w} because it is too big.",
+    "Teacher: Good. She doesn't like the {w}. Repeat after me.",
+    "Student: Yesterday I eated in the {w}.",
+    "Teacher: I ate in the {w}. Eat, ate, eaten.",
+    "Student: Yes, I understand.",
+)
+
+
+# -------------------------
+# Corpus
+# -------------------------
+def google_transcript() -> str:
+    with open(f"{ROOT}/docs/google_transcript.txt", encoding="utf-8") as fh:
+        return fh.read()
+
+
+def synthetic_transcript(chars: int, seed: int = 7) -> str:
+    """A Gemini-style ``[h:m:s] Speaker: text`` transcript of about ``chars`` characters."""
+    rng = random.Random(seed)
+    real = [re.sub(r"^\[[^\]]*\]\s*", "", line) for line in google_transcript().splitlines() if line.strip()]
+    lines: List[str] = []
+    size, second = 0, 0
+    while size < chars:
+        if rng.random() < 0.5:
+            text = rng.choice(real)
+        else:
+            text = rng.choice(SYNTHETIC_LINES).format(w=rng.choice(WORD_BANK))
+        second += rng.randint(2, 9)
+        line = f"[{second // 3600}:{second // 60 % 60}:{second % 60}] {text}"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)[:chars]
+
+
+def build_corpus(sizes: Tuple[int, ...]) -> Dict[str, str]:
+    corpus = {"google_transcript": google_transcript()}
+    for size in sizes:
+        corpus[f"synthetic_{size // 1000}k"] = synthetic_transcript(size)
+    return corpus
+
+
+# -------------------------
+# Cases
+# -------------------------
+def pipeline_cases(transcript: str) -> Dict[str, Callable[[], Any]]:
+    """Benchmark callables for one transcript; inputs to later stages are built once up front."""
+    from src.ai import generators
+    from src.ai.enhancers import enhance_pipeline_output
+    from src.ai.lesson_processor import LessonProcessor
+
+    processor = LessonProcessor()
+    vocabulary = processor.vocab_extractor.extract(transcript)
+    mistakes = processor.mistake_extractor.extract(transcript)
+    sentences = processor.sentence_extractor.extract(transcript)
+    processed = processor.preprocess_data(vocabulary, mistakes, sentences, transcript)
+    vocab, mist, sent = processed["vocabulary"], processed["mistakes"], processed["sentences"]
+    exercises = processor.process_lesson(transcript)
+
+    return {
+        "process_lesson": lambda: processor.process_lesson(transcript),
+        "extract.vocabulary": lambda: processor.vocab_extractor.extract(transcript),
+        "extract.mistakes": lambda: processor.mistake_extractor.extract(transcript),
+        "extract.sentences": lambda: processor.sentence_extractor.extract(transcript),
+        "generate.flashcards": lambda: generators.generate_flashcards(vocab, transcript, limit=8),
+        "generate.spelling": lambda: generators.generate_spelling_items(vocab, transcript, limit=8),
+        "generate.fill_blank": lambda: generators.generate_fill_blank(mist, transcript, limit=8),
+        "generate.sentence_builder": lambda: generators.generate_sentence_builder(sent, limit=3),
+        "generate.grammar_challenge": lambda: generators.generate_grammar_challenge(mist, limit=3),
+        "generate.advanced_cloze": lambda: generators.generate_advanced_cloze(sent, limit=2),
+        "enhance": lambda: enhance_pipeline_output(exercises),
+    }
+
+
+def provider_cases() -> Dict[str, Callable[[], Any]]:
+    """The transcription wrappers over their recorded responses (input-size independent)."""
+    from src.ai.utils.assemblyai_helper import AssemblyAIHelper
+    from src.ai.utils.gemini_transcription_helper import GeminiTranscriptionHelper
+
+    gemini = GeminiTranscriptionHelper()
+    assembly = AssemblyAIHelper()
+    audio = b"RIFF" + bytes(64 * 1024)
+    return {
+        "gemini.transcribe_audio_bytes": lambda: gemini.transcribe_audio_bytes(audio),
+        "gemini.summary_from_transcript": lambda: gemini.generate_summary_from_transcript(google_transcript()),
+        "assemblyai.transcribe_audio_bytes": lambda: assembly.transcribe_audio_bytes(audio, "he"),
+    }
+
+
+# -------------------------
+# Measurement
+# -------------------------
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    random.seed(1337)
+    fn()  # warm-up: regex caches, lazy imports
+    times = []
+    for _ in range(repeat):
+        random.seed(1337)
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    random.seed(1337)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"median_s": statistics.median(times), "min_s": min(times), "peak_mib": peak / 2**20}
+
+
+def run_suite(
+    sizes: Tuple[int, ...] = DEFAULT_SIZES,
+    repeat: int = 5,
+    only: Optional[str] = None,
+    out: Any = sys.stdout,
+) -> Dict[str, Any]:
+    corpus = build_corpus(sizes)
+    results: Dict[str, Dict[str, Any]] = {}
+    with replay_providers() as stats:
+        groups = [(name, len(text), pipeline_cases(text)) for name, text in corpus.items()]
+        groups.append(("replay", 0, provider_cases()))
+        for corpus_name, chars, cases in groups:
+            print(f"\n{corpus_name} ({chars:,} chars)" if chars else f"\n{corpus_name} (providers)", file=out)
+            for case, fn in cases.items():
+                if only and not re.search(only, case):
+                    continue
+                r = measure(fn, repeat)
+                r["chars_per_s"] = chars / r["median_s"] if chars and r["median_s"] else None
+                results[f"{corpus_name}/{case}"] = r
+                rate = f"{r['chars_per_s'] / 1e3:10,.0f} kchar/s" if r["chars_per_s"] else " " * 17
+                print(f"  {case:<34} {r['median_s'] * 1e3:10.2f} ms {rate} {r['peak_mib']:8.2f} MiB", file=out)
+    if stats.misses:
+        print(f"\nfixture misses (placeholder answers used): {stats.misses}", file=out)
+    return {"sizes": list(sizes), "repeat": repeat, "results": results, "replay_calls": stats.calls}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Cases whose median got slower than ``baseline * (1 + threshold)``."""
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        now = current["results"].get(key)
+        if not now or not base.get("median_s"):
+            continue
+        ratio = now["median_s"] / base["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {base['median_s'] * 1e3:.2f} ms -> {now['median_s'] * 1e3:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def record() -> None:
+    from src.ai.lesson_processor import LessonProcessor
+
+    with record_providers() as fixtures:
+        LessonProcessor().process_lesson(google_transcript())
+    print(f"Recorded {len(fixtures['translator'])} translations and {len(fixtures['groq'])} Groq responses")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Synthetic transcript sizes in chars, comma separated")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Regex on case names to run")
+    parser.add_argument("--json", metavar="FILE", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--record", action="store_true", help="Re-record translator/Groq fixtures from live services")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    if args.record:
+        record()
+        return 0
+
+    sizes = tuple(int(s) for s in args.sizes.split(",") if s.strip())
+    current = run_suite(sizes, args.repeat, args.only)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(current, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(current, json.load(fh), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
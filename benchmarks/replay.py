@@ -0,0 +1,259 @@
+"""
+Recorded provider responses for offline benchmarks.
+
+``replay_providers()`` swaps the Gemini, Groq, translator and AssemblyAI
+clients used by the lesson pipeline for stand-ins that answer from
+benchmarks/fixtures/providers.json, and refuses outbound socket connections
+while it is active, so a benchmark run can never reach a live service.
+
+Calls still go through the real wrappers (``_tr``, ``GroqClient.chat``'s
+callers, ``GeminiTranscriptionHelper._generate``,
+``AssemblyAIHelper._request_with_retry``), so their parsing and bookkeeping
+are part of what is measured.
+
+``record_providers()`` does the opposite for the translator and Groq: it wraps
+the live clients and writes every answer back into the fixture file.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import socket
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "providers.json")
+
+# Modules that bind ``_translator`` by name from shared_utils
+TRANSLATOR_MODULES = (
+    "src.ai.generators.shared_utils",
+    "src.ai.generators",
+    "src.ai.generators.spelling_generator",
+    "src.ai.generators.flashcards_generator",
+    "src.ai.generators.sentence_builder_generator",
+)
+
+
+class NetworkBlocked(RuntimeError):
+    pass
+
+
+def load_fixtures(path: str = FIXTURES) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _read(path: str) -> str:
+    with open(os.path.join(ROOT, path), encoding="utf-8") as fh:
+        return fh.read()
+
+
+def prompt_key(system_prompt: str, user_prompt: str) -> str:
+    return hashlib.sha1(f"{system_prompt}\n{user_prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+class ReplayStats:
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def hit(self, provider: str, missed: bool = False) -> None:
+        self.calls[provider] = self.calls.get(provider, 0) + 1
+        if missed:
+            self.misses[provider] = self.misses.get(provider, 0) + 1
+
+
+# -------------------------
+# Replay stand-ins
+# -------------------------
+class ReplayTranslator:
+    """deep_translator.GoogleTranslator stand-in."""
+
+    def __init__(self, table: Dict[str, str], stats: ReplayStats):
+        self.table = table
+        self.stats = stats
+
+    def translate(self, text: str) -> str:
+        result = self.table.get(text)
+        self.stats.hit("translator", missed=result is None)
+        # Unrecorded text still gets a non-empty answer so the generators take
+        # the same path they would with a live translator.
+        return result if result is not None else f"[he] {text}"
+
+
+class ReplayGroqClient:
+    """GroqClient stand-in; answers by prompt hash, else the default response."""
+
+    def __init__(self, responses: Dict[str, str], stats: ReplayStats, model: Optional[str] = None):
+        self.responses = responses
+        self.stats = stats
+        self.model = model or "replay"
+        self.enabled = True
+        self.client = None
+
+    def chat(self, system_prompt, user_prompt, temperature=0.2, max_tokens=1200) -> Optional[str]:
+        from src.metrics import provider_call
+
+        key = prompt_key(system_prompt, user_prompt)
+        with provider_call("groq", "chat"):
+            response = self.responses.get(key)
+            self.stats.hit("groq", missed=response is None)
+            return response if response is not None else self.responses.get("default")
+
+
+class _ReplayGeminiModels:
+    def __init__(self, transcript: str, summary: Dict[str, Any], stats: ReplayStats):
+        self.transcript = transcript
+        self.summary = summary
+        self.stats = stats
+
+    def generate_content(self, model: str, contents, config=None):
+        self.stats.hit("gemini")
+        schema = (config or {}).get("response_schema") if isinstance(config, dict) else None
+        parsed = schema(**self.summary) if schema is not None else None
+        return SimpleNamespace(text=self.transcript, parsed=parsed)
+
+
+class ReplayGeminiClient:
+    """google.genai.Client stand-in (``files.upload`` / ``models.generate_content``)."""
+
+    def __init__(self, transcript: str, summary: Dict[str, Any], stats: ReplayStats):
+        self.files = SimpleNamespace(upload=lambda file: SimpleNamespace(name=f"files/{os.path.basename(file)}"))
+        self.models = _ReplayGeminiModels(transcript, summary, stats)
+
+
+class ReplayResponse:
+    def __init__(self, payload: Dict[str, Any], status_code: int = 200):
+        self._body = json.dumps(payload)
+        self.status_code = status_code
+        self.headers: Dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> Dict[str, Any]:
+        # Decode on every call like requests does
+        return json.loads(self._body)
+
+
+class ReplayAssemblyAI:
+    """``requests`` stand-in for AssemblyAIHelper: upload, create, one
+    'processing' poll, then the recorded completed transcript."""
+
+    def __init__(self, fixtures: Dict[str, Any], stats: ReplayStats):
+        self.fixtures = fixtures
+        self.stats = stats
+        self.result = json.loads(_read(fixtures["result_file"]))
+        self._polls: Dict[str, int] = {}
+
+    def post(self, url: str, **kwargs) -> ReplayResponse:
+        data = kwargs.get("data")
+        if data is not None and not isinstance(data, (bytes, str)):
+            for _ in data:  # drain the chunk generator like a real upload
+                pass
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> ReplayResponse:
+        self.stats.hit("assemblyai")
+        if url.endswith("/upload"):
+            return ReplayResponse(self.fixtures["upload"])
+        if method == "POST" and url.endswith("/transcript"):
+            self._polls.clear()
+            return ReplayResponse(self.fixtures["create"])
+        polls = self._polls[url] = self._polls.get(url, 0) + 1
+        return ReplayResponse(self.fixtures["processing"] if polls == 1 else self.result)
+
+
+def _block_connect(sock, address):
+    raise NetworkBlocked(f"network access during replay: {address!r}")
+
+
+@contextmanager
+def replay_providers(fixtures: Optional[Dict[str, Any]] = None) -> Iterator[ReplayStats]:
+    """Patch every provider on the pipeline path to replay recorded responses."""
+    import importlib
+
+    fixtures = fixtures or load_fixtures()
+    stats = ReplayStats()
+    translator = ReplayTranslator(fixtures.get("translator", {}), stats)
+    gemini = fixtures["gemini"]
+    gemini_transcript = _read(gemini["transcript_file"])
+
+    from src.ai.utils import assemblyai_helper, gemini_transcription_helper, groq_helper
+
+    with ExitStack() as stack:
+        for name in TRANSLATOR_MODULES:
+            module = importlib.import_module(name)
+            stack.enter_context(mock.patch.object(module, "_translator", lambda target="he": translator))
+        stack.enter_context(
+            mock.patch.object(
+                groq_helper, "GroqClient", lambda model=None: ReplayGroqClient(fixtures.get("groq", {}), stats, model)
+            )
+        )
+        genai = SimpleNamespace(Client=lambda api_key: ReplayGeminiClient(gemini_transcript, gemini["summary"], stats))
+        stack.enter_context(mock.patch.object(gemini_transcription_helper, "_genai", lambda: genai))
+        stack.enter_context(mock.patch.object(assemblyai_helper, "requests", ReplayAssemblyAI(fixtures["assemblyai"], stats)))
+        stack.enter_context(mock.patch.object(assemblyai_helper, "cancellable_sleep", lambda seconds: None))
+        stack.enter_context(mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "replay", "ASSEMBLYAI_API_KEY": "replay"}))
+        stack.enter_context(mock.patch.object(socket.socket, "connect", _block_connect))
+        stack.enter_context(mock.patch.object(socket.socket, "connect_ex", _block_connect))
+        yield stats
+
+
+# -------------------------
+# Recording
+# -------------------------
+class _RecordingTranslator:
+    def __init__(self, inner, table: Dict[str, str]):
+        self.inner = inner
+        self.table = table
+
+    def translate(self, text: str) -> str:
+        result = self.inner.translate(text)
+        if result:
+            self.table[text] = result
+        return result
+
+
+@contextmanager
+def record_providers(path: str = FIXTURES) -> Iterator[Dict[str, Any]]:
+    """
+    Run the block against the live translator and Groq and save their answers
+    into the fixture file. Gemini and AssemblyAI fixtures point at recorded
+    outputs under docs/ and are not re-recorded here.
+    """
+    import importlib
+
+    from src.ai.generators.shared_utils import _translator
+    from src.ai.utils import groq_helper
+
+    fixtures = load_fixtures(path)
+    table = fixtures.setdefault("translator", {})
+    responses = fixtures.setdefault("groq", {})
+    live_groq = groq_helper.GroqClient
+
+    class RecordingGroqClient(live_groq):
+        def chat(self, system_prompt, user_prompt, temperature=0.2, max_tokens=1200):
+            response = super().chat(system_prompt, user_prompt, temperature, max_tokens)
+            if response:
+                responses[prompt_key(system_prompt, user_prompt)] = response
+            return response
+
+    def recording_translator(target: str = "he"):
+        inner = _translator(target)
+        return _RecordingTranslator(inner, table) if inner is not None else None
+
+    with ExitStack() as stack:
+        for name in TRANSLATOR_MODULES:
+            module = importlib.import_module(name)
+            stack.enter_context(mock.patch.object(module, "_translator", recording_translator))
+        stack.enter_context(mock.patch.object(groq_helper, "GroqClient", RecordingGroqClient))
+        yield fixtures
+
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(fixtures, fh, ensure_ascii=False, indent=2)
+        fh.write("\n")
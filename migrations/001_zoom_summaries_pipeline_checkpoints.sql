@@ -0,0 +1,11 @@
+-- Supabase (Postgres) migration for the Zoom worker.
+--
+-- Stage checkpoints of each lesson job (src/workers/checkpoints.py):
+-- stage name -> {"at": iso timestamp, ...stage metadata}. Retries resume from
+-- the first stage missing here. The worker still runs without the column
+-- (checkpoint writes are logged and skipped), but then only resumes from the
+-- host-local manifest.
+--
+-- Apply with the Supabase SQL editor or: psql "$DATABASE_URL" -f <this file>
+
+ALTER TABLE zoom_summaries ADD COLUMN IF NOT EXISTS pipeline_checkpoints jsonb;
@@ -8,17 +8,29 @@ Features:
 - Heartbeat logs
 - Crash-loop protection
 - Clean logging with your existing logging_config
+- Supervisor mode (WORKER_PROCESSES > 1): K job processes fed by one
+  dispatcher, crashed children restarted, graceful drain on SIGTERM
+- Prometheus metrics listener (WORKER_METRICS_PORT)
+- On-demand sampling profile on SIGUSR2 (PROFILER_ENABLED), forwarded to
+  job processes in supervisor mode
 """
 
 import os
+import queue
 import signal
 import sys
 import time
 import logging
 import traceback
-from typing import List
+import multiprocessing
+from typing import Any, Dict, List, Optional
 
+from src import profiler
+from src.config import settings
+from src.metrics import registry, start_metrics_server
+from src.workers import zoom_processor
 from src.workers.zoom_processor import run_forever
+from src.workers.wakeup import create_listener
 from src.logging_config import configure_logging
 
 logger = logging.getLogger(__name__)
@@ -28,6 +40,15 @@ MAX_CRASHES = 5        # Max crashes allowed in the window
 CRASH_WINDOW_SEC = 300  # 5 minutes
 crash_times = []
 
+# Supervisor mode
+WORKER_PROCESSES = max(1, getattr(settings, "WORKER_PROCESSES", 1))
+# How long in-flight jobs get to finish after SIGTERM before children are killed
+DRAIN_TIMEOUT_SEC = getattr(
+    settings,
+    "WORKER_DRAIN_TIMEOUT_SECONDS",
+    zoom_processor.JOB_TIMEOUT_SECONDS + zoom_processor.CANCEL_GRACE_SECONDS,
+)
+
 
 def handle_shutdown(signum, frame):
     """Handle graceful shutdown on SIGTERM/SIGINT."""
@@ -36,9 +57,14 @@ def handle_shutdown(signum, frame):
     sys.exit(0)
 
 
+def backoff_delay(attempt: int) -> int:
+    """Exponential restart backoff, capped at 30s."""
+    return min(30, 2 ** attempt)
+
+
 def restart_with_backoff(attempt: int):
     """Sleep with exponential backoff."""
-    delay = min(30, 2 ** attempt)  # capped at 30s
+    delay = backoff_delay(attempt)
     logger.warning(f"🔁 Restarting worker in {delay}s (crash attempt #{attempt})...")
     time.sleep(delay)
 
@@ -85,6 +111,212 @@ def main_loop():
             continue  # restart the worker
 
 
+class Supervisor:
+    """
+    Runs K job processes (zoom_processor.serve_jobs) and feeds them.
+
+    The supervisor owns the queue: it fetches candidates, lets the fair
+    scheduler pick one row per idle child and sends it over that child's own
+    queue, so it always knows which job a crashed child was holding. Crashed
+    children are restarted with backoff under the crash-loop limit; on
+    SIGTERM/SIGINT dispatching stops and children finish their current job.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self.ctx = multiprocessing.get_context("spawn")
+        self.events = self.ctx.Queue()
+        self.children: Dict[int, Any] = {}
+        self.inboxes: Dict[int, Any] = {}
+        self.assigned: Dict[int, Optional[Dict[str, Any]]] = {}
+        self.restart_at: Dict[int, float] = {}
+        self.restart_attempt = 0
+        self.draining = False
+        self.forced = False
+
+    # ------------------------------------------------------------------
+    # Children
+    # ------------------------------------------------------------------
+    def spawn(self, index: int):
+        inbox = self.ctx.Queue()
+        proc = self.ctx.Process(
+            target=zoom_processor.serve_jobs,
+            args=(index, inbox, self.events),
+            name=f"zoom-worker-{index}",
+        )
+        proc.start()
+        self.children[index] = proc
+        self.inboxes[index] = inbox
+        self.assigned[index] = None
+        self.restart_at.pop(index, None)
+        logger.info("🚀 Job process %s started (pid %s)", index, proc.pid)
+
+    def reap(self):
+        """Detect dead children; release their job and schedule a restart."""
+        for index, proc in list(self.children.items()):
+            if proc.is_alive():
+                continue
+            proc.join()
+            del self.children[index]
+            row = self.assigned.pop(index, None)
+            if row is not None:
+                zoom_processor.scheduler.finished(row)
+            if self.draining:
+                continue
+            logger.error("💥 Job process %s exited unexpectedly (code %s)", index, proc.exitcode)
+            if row is not None:
+                logger.warning(
+                    "Row %s was in flight; it will be reclaimed as a stale 'processing' row",
+                    row.get("id"),
+                )
+            record_crash_and_check_limit()
+            self.restart_attempt += 1
+            delay = backoff_delay(self.restart_attempt)
+            logger.warning(f"🔁 Restarting job process {index} in {delay}s (crash attempt #{self.restart_attempt})...")
+            self.restart_at[index] = time.monotonic() + delay
+
+    def restart_due(self):
+        now = time.monotonic()
+        for index, when in list(self.restart_at.items()):
+            if when <= now:
+                self.spawn(index)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def handle_events(self, timeout: float) -> int:
+        """Collect job completions (blocking up to ``timeout`` for the first)."""
+        handled = 0
+        block = timeout > 0
+        while True:
+            try:
+                kind, index, row_id = self.events.get(block=block, timeout=timeout if block else None)
+            except queue.Empty:
+                return handled
+            block = False
+            if kind == "metrics":
+                # Stage/provider metrics drained by a child after its job
+                registry.merge(row_id)
+                continue
+            row = self.assigned.get(index)
+            if kind == "done" and row is not None and row.get("id") == row_id:
+                self.assigned[index] = None
+                zoom_processor.scheduler.finished(row)
+            handled += 1
+
+    def dispatch(self) -> int:
+        idle = [i for i, proc in self.children.items() if self.assigned.get(i) is None]
+        if not idle:
+            return 0
+        busy_ids = {r.get("id") for r in self.assigned.values() if r}
+        candidates = [
+            r for r in zoom_processor.fetch_pending(
+                zoom_processor.BATCH_SIZE * zoom_processor.SCHEDULER_WINDOW
+            )
+            if r.get("id") not in busy_ids
+        ]
+        batch = zoom_processor.scheduler.plan(candidates, len(idle))
+        for index, row in zip(idle, batch):
+            zoom_processor.scheduler.started(row)
+            self.assigned[index] = row
+            self.inboxes[index].put(row)
+        return len(batch)
+
+    def idle_wait(self, listener, seconds: float):
+        """Wait for a wakeup, a job completion or the poll interval."""
+        deadline = time.monotonic() + seconds
+        while not self.draining and time.monotonic() < deadline:
+            if listener is not None and listener.wait(0.5):
+                return
+            if self.handle_events(0.5):
+                return
+            self.reap()
+            self.restart_due()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def request_drain(self, signum, frame):
+        if self.draining:
+            logger.warning("🛑 Second %s — stopping without waiting for jobs", signal.Signals(signum).name)
+            self.forced = True
+            self.stop_children()
+            sys.exit(1)
+        logger.info("🛑 Received %s — draining %d job processes...", signal.Signals(signum).name, len(self.children))
+        self.draining = True
+
+    def forward_signal(self, signum):
+        """Pass a signal (the profiler's SIGUSR2) on to every live job process."""
+        for proc in self.children.values():
+            if proc.is_alive():
+                try:
+                    os.kill(proc.pid, signum)
+                except OSError:
+                    pass
+
+    def run(self):
+        for index in range(self.processes):
+            self.spawn(index)
+        listener = create_listener()
+        try:
+            while not self.draining:
+                try:
+                    self.handle_events(0)
+                    self.reap()
+                    self.restart_due()
+                    zoom_processor.prune_local_state()
+                    if not self.dispatch():
+                        self.idle_wait(listener, zoom_processor.POLL_INTERVAL)
+                except SystemExit:
+                    raise
+                except Exception:
+                    logger.exception("Unexpected error in supervisor loop; sleeping before retry.")
+                    time.sleep(min(zoom_processor.POLL_INTERVAL, 60))
+        finally:
+            if listener:
+                listener.close()
+            if not self.forced:
+                self.drain()
+
+    def drain(self):
+        self.draining = True
+        for index in list(self.children):
+            self.inboxes[index].put(None)
+        deadline = time.monotonic() + DRAIN_TIMEOUT_SEC
+        while self.children and time.monotonic() < deadline:
+            self.handle_events(0.5)
+            self.reap()
+        for index in self.children:
+            logger.warning("Job process %s still busy after drain timeout; terminating", index)
+        self.stop_children(grace=10)
+        logger.info("👋 All job processes stopped.")
+
+    def stop_children(self, grace: float = 2.0):
+        """Terminate (then kill) every job process; their jobs are reclaimed as stale rows."""
+        for proc in self.children.values():
+            if proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + grace
+        for proc in self.children.values():
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.kill()
+                proc.join(1)
+        for inbox in self.inboxes.values():
+            # Do not let exit wait on rows a dead child will never read
+            inbox.cancel_join_thread()
+        self.children.clear()
+
+
+def run_supervisor(processes: int):
+    supervisor = Supervisor(processes)
+    signal.signal(signal.SIGTERM, supervisor.request_drain)
+    signal.signal(signal.SIGINT, supervisor.request_drain)
+    profiler.install_signal_handler("supervisor", forward=supervisor.forward_signal)
+    logger.info("🚀 Supervisor mode: %d job processes", processes)
+    supervisor.run()
+
+
 if __name__ == "__main__":
     # 1. Configure logging
     configure_logging()
@@ -98,8 +330,17 @@ if __name__ == "__main__":
     logger.info("   PID: %s", str(os.getpid()))
     logger.info("=====================================")
 
+    metrics_port = getattr(settings, "WORKER_METRICS_PORT", 0)
+    if metrics_port:
+        start_metrics_server(metrics_port, getattr(settings, "WORKER_METRICS_HOST", "0.0.0.0"))
+
     try:
-        main_loop()
+        if WORKER_PROCESSES > 1:
+            run_supervisor(WORKER_PROCESSES)
+        else:
+            if profiler.install_signal_handler("worker", forward=zoom_processor.forward_to_jobs):
+                logger.info("Sampling profiler armed: kill -USR2 %s", os.getpid())
+            main_loop()
     except SystemExit:
         logger.info("👋 Worker shut down cleanly.")
     except Exception as e:
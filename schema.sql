@@ -16,7 +16,10 @@ CREATE TABLE IF NOT EXISTS word_lists (
     updated_at      DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_user_id (user_id),
     INDEX idx_user_favorite (user_id, is_favorite),
-    INDEX idx_user_name (user_id, name)
+    INDEX idx_user_name (user_id, name),
+    -- Keyset pagination: (sort column, id) DESC; InnoDB appends the PK (id)
+    INDEX idx_user_created (user_id, created_at),
+    INDEX idx_user_updated (user_id, updated_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================================  
@@ -37,6 +40,7 @@ CREATE TABLE IF NOT EXISTS words (
     updated_at      DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_list_id (list_id),
     INDEX idx_list_favorite (list_id, is_favorite),
+    INDEX idx_list_created (list_id, created_at),
     INDEX idx_word (word),
     CONSTRAINT fk_words_word_lists FOREIGN KEY (list_id) REFERENCES word_lists(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -114,7 +118,8 @@ CREATE TABLE IF NOT EXISTS user_mistakes (
     last_answered_at    DATETIME DEFAULT CURRENT_TIMESTAMP,
     created_at          DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at          DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    UNIQUE KEY unique_user_game_item (user_id, game_type, item_id)
+    UNIQUE KEY unique_user_game_item (user_id, game_type, item_id),
+    INDEX idx_user_game_answered (user_id, game_type, last_answered_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================================  
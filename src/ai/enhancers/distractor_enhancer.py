@@ -18,6 +18,8 @@ import re
 import time
 from typing import Dict, List, Any, Optional
 
+from ...tracing import current_span, span
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
@@ -119,6 +121,7 @@ def enhance_distractors_with_groq(
             "current_options": blank2.get("options", [])
         })
     
+    current_span().set(items=len(items_to_enhance))
     if not items_to_enhance:
         logger.info("No items to enhance")
         return exercises
@@ -271,4 +274,5 @@ def enhance_pipeline_output(exercises: Dict[str, Any]) -> Dict[str, Any]:
     Call this after generating all exercises to upgrade distractor quality.
     Automatically handles Groq client creation and fallback.
     """
-    return enhance_distractors_with_groq(exercises)
+    with span("enhance.distractors"):
+        return enhance_distractors_with_groq(exercises)
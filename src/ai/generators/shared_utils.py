@@ -16,22 +16,19 @@ import re
 import logging
 from typing import List, Optional
 
+from ...metrics import provider_call
+
 logger = logging.getLogger(__name__)
 random.seed(1337)
 
-# Optional translator with proper error handling
-try:
-    from deep_translator import GoogleTranslator
-
-    _TRANSLATOR_AVAILABLE = True
-except ImportError:
-    GoogleTranslator = None  # type: ignore
-    _TRANSLATOR_AVAILABLE = False
-
 
 def _translator(target: str = "he"):
     """Create a translator instance for the target language."""
-    if not _TRANSLATOR_AVAILABLE:
+    # Imported here: deep_translator pulls in bs4/soupsieve (~30 ms), which
+    # every importer of the generators would otherwise pay at startup.
+    try:
+        from deep_translator import GoogleTranslator
+    except ImportError:
         return None
     lang = "iw" if target.lower() == "he" else target
     try:
@@ -46,7 +43,8 @@ def _tr(text: str, translator) -> str:
     if not text or not translator:
         return ""
     try:
-        result = translator.translate(text)
+        with provider_call("translator", "translate"):
+            result = translator.translate(text)
         return result if result else ""
     except Exception as e:
         logger.debug("Translation failed for '%s': %s", text[:20], e)
@@ -7,6 +7,8 @@ import logging
 import uuid
 import re
 
+from ..metrics import stage_timer
+from ..tracing import span
 from .extractors import VocabularyExtractor, MistakeExtractor, SentenceExtractor
 from .generators import (
     generate_flashcards,
@@ -140,23 +142,45 @@ class LessonProcessor:
         if not transcript or not transcript.strip():
             return self._empty(lesson_number)
         try:
-            vocabulary = self.vocab_extractor.extract(transcript)
-            mistakes = self.mistake_extractor.extract(transcript)
-            sentences = self.sentence_extractor.extract(transcript)
+            with stage_timer("extract") as stage:
+                stage.set(transcript_chars=len(transcript), lesson_number=lesson_number)
+                with span("extract.vocabulary") as sp:
+                    vocabulary = self.vocab_extractor.extract(transcript)
+                    sp.set(items=len(vocabulary))
+                with span("extract.mistakes") as sp:
+                    mistakes = self.mistake_extractor.extract(transcript)
+                    sp.set(items=len(mistakes))
+                with span("extract.sentences") as sp:
+                    sentences = self.sentence_extractor.extract(transcript)
+                    sp.set(items=len(sentences))
 
             logger.info(f"Extracted: {len(vocabulary)} vocab, {len(mistakes)} mistakes, {len(sentences)} sentences")
 
-            processed = self.preprocess_data(vocabulary, mistakes, sentences, transcript, lesson_number)
+            with span("preprocess"):
+                processed = self.preprocess_data(vocabulary, mistakes, sentences, transcript, lesson_number)
             vocab_struct = processed["vocabulary"]
             mistakes_struct = processed["mistakes"]
             sentences_struct = processed["sentences"]
 
-            flashcards = generate_flashcards(vocab_struct, transcript, limit=8)
-            spelling = generate_spelling_items(vocab_struct, transcript, limit=8)
-            fill_blank = generate_fill_blank(mistakes_struct, transcript, limit=8)
-            sentence_builder = generate_sentence_builder(sentences_struct, limit=3)
-            grammar_challenge = generate_grammar_challenge(mistakes_struct, limit=3)
-            advanced_cloze = generate_advanced_cloze(sentences_struct, limit=2)
+            with stage_timer("generate"):
+                with span("generate.flashcards") as sp:
+                    flashcards = generate_flashcards(vocab_struct, transcript, limit=8)
+                    sp.set(items=len(flashcards))
+                with span("generate.spelling") as sp:
+                    spelling = generate_spelling_items(vocab_struct, transcript, limit=8)
+                    sp.set(items=len(spelling))
+                with span("generate.fill_blank") as sp:
+                    fill_blank = generate_fill_blank(mistakes_struct, transcript, limit=8)
+                    sp.set(items=len(fill_blank))
+                with span("generate.sentence_builder") as sp:
+                    sentence_builder = generate_sentence_builder(sentences_struct, limit=3)
+                    sp.set(items=len(sentence_builder))
+                with span("generate.grammar_challenge") as sp:
+                    grammar_challenge = generate_grammar_challenge(mistakes_struct, limit=3)
+                    sp.set(items=len(grammar_challenge))
+                with span("generate.advanced_cloze") as sp:
+                    advanced_cloze = generate_advanced_cloze(sentences_struct, limit=2)
+                    sp.set(items=len(advanced_cloze))
 
             # Optional: enhance distractors with Groq for production-quality options
             exercises = {
@@ -171,7 +195,8 @@ class LessonProcessor:
             try:
                 from .enhancers import enhance_pipeline_output
                 logger.info("Enhancing distractors with Groq for lesson %s...", lesson_number)
-                exercises = enhance_pipeline_output(exercises)
+                with stage_timer("enhance"):
+                    exercises = enhance_pipeline_output(exercises)
             except Exception as e:
                 # If Groq is unavailable or enhancement fails, keep original exercises
                 logger.warning("Distractor enhancement skipped/failed: %s", e)
@@ -9,14 +9,16 @@ Fully aligned with:
 from __future__ import annotations
 import logging
 from typing import Dict, Any, Optional, List
+from ..cancellation import check_cancelled
 from ..db.supabase_client import SupabaseClient
+from ..lazy import lazy
 from .transcription import transcribe_recording, TranscriptionError
 from .lesson_processor import LessonProcessor
 from ..time_utils import utc_now_iso
 
 logger = logging.getLogger(__name__)
-supabase = SupabaseClient()
-lesson_processor = LessonProcessor()
+supabase = lazy(SupabaseClient)
+lesson_processor = lazy(LessonProcessor)
 
 
 def _normalize(items: List[Any]) -> List[Dict[str, Any]]:
@@ -114,6 +116,7 @@ def process_transcript_to_exercises(
     # -------------------------------
     # 2. LESSON PROCESSING
     # -------------------------------
+    check_cancelled()
     try:
         result = lesson_processor.process_lesson(transcript_text)
 
@@ -146,6 +149,7 @@ def process_transcript_to_exercises(
     # 4. SAVE TO SUPABASE
     # -------------------------------
     if persist:
+        check_cancelled()
         try:
             inserted = supabase.insert_lesson_exercises(payload)
             return {
@@ -4,6 +4,9 @@ from typing import Optional, Dict
 import time
 import requests
 
+from ...cancellation import cancellable_sleep, check_cancelled
+from ...metrics import provider_call
+
 try:
     import assemblyai as aai
     AAI_AVAILABLE = True
@@ -47,19 +50,21 @@ class AssemblyAIHelper:
     # ------------------------------------------------------------
     # Safe retry wrapper
     # ------------------------------------------------------------
-    def _request_with_retry(self, method: str, url: str, **kwargs):
+    def _request_with_retry(self, method: str, url: str, operation: str = "request", **kwargs):
         for attempt in range(self.MAX_RETRIES):
             try:
-                r = requests.request(method, url, timeout=60, **kwargs)
+                with provider_call("assemblyai", operation):
+                    r = requests.request(method, url, timeout=60, **kwargs)
+                    if r.status_code != 429:
+                        r.raise_for_status()
 
                 # rate limited
                 if r.status_code == 429:
                     wait_time = int(r.headers.get("Retry-After", 3))
                     logger.warning(f"429 rate limit, retrying in {wait_time}s")
-                    time.sleep(wait_time)
+                    cancellable_sleep(wait_time)
                     continue
 
-                r.raise_for_status()
                 return r
 
             except Exception as exc:
@@ -70,7 +75,7 @@ class AssemblyAIHelper:
                 logger.warning(
                     f"Attempt {attempt+1}/{self.MAX_RETRIES} failed: {exc}. Retrying in {self.RETRY_BACKOFF[attempt]}s"
                 )
-                time.sleep(self.RETRY_BACKOFF[attempt])
+                cancellable_sleep(self.RETRY_BACKOFF[attempt])
 
         return None
 
@@ -87,10 +92,12 @@ class AssemblyAIHelper:
         try:
             def chunk_generator():
                 for i in range(0, len(audio_bytes), CHUNK_SIZE):
+                    check_cancelled()
                     yield audio_bytes[i:i + CHUNK_SIZE]
 
-            r = requests.post(upload_url, headers=headers, data=chunk_generator(), timeout=180)
-            r.raise_for_status()
+            with provider_call("assemblyai", "upload"):
+                r = requests.post(upload_url, headers=headers, data=chunk_generator(), timeout=180)
+                r.raise_for_status()
 
             uploaded_url = r.json().get("upload_url")
             if not uploaded_url:
@@ -127,7 +134,7 @@ class AssemblyAIHelper:
             "format_text": True,
         }
 
-        r = self._request_with_retry("POST", transcript_url, json=payload, headers=headers)
+        r = self._request_with_retry("POST", transcript_url, "create", json=payload, headers=headers)
         if not r:
             return None
 
@@ -154,7 +161,7 @@ class AssemblyAIHelper:
                 logger.error(f"Polling timeout for AssemblyAI job {job_id}")
                 return None
 
-            r = self._request_with_retry("GET", status_url, headers=headers)
+            r = self._request_with_retry("GET", status_url, "poll", headers=headers)
             if not r:
                 return None
 
@@ -184,7 +191,7 @@ class AssemblyAIHelper:
                 logger.error(f"AssemblyAI transcription failed: {data.get('error')}")
                 return None
 
-            time.sleep(2)
+            cancellable_sleep(2)
 
     # ------------------------------------------------------------
     # SDK-based URL transcription (unchanged, but kept clean)
@@ -201,7 +208,8 @@ class AssemblyAIHelper:
                 format_text=True,
             )
             transcriber = aai.Transcriber(config=config)
-            transcript = transcriber.transcribe(audio_url)
+            with provider_call("assemblyai", "transcribe"):
+                transcript = transcriber.transcribe(audio_url)
 
             max_wait = 300
             start = time.time()
@@ -210,7 +218,7 @@ class AssemblyAIHelper:
                 if time.time() - start > max_wait:
                     logger.error("Transcription timeout")
                     return None
-                time.sleep(5)
+                cancellable_sleep(5)
 
             if transcript.status == "error":
                 logger.error(f"AssemblyAI transcription error: {transcript.error}")
@@ -10,24 +10,33 @@ Primary transcription method with AssemblyAI as fallback.
 import os
 import logging
 import tempfile
+from functools import lru_cache
 from typing import Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 
-try:
-    from google import genai
+from ...metrics import provider_call
 
-    GENAI_NEW_SDK_AVAILABLE = True
-except ImportError:
-    GENAI_NEW_SDK_AVAILABLE = False
+logger = logging.getLogger(__name__)
 
-try:
-    import soundfile as sf
 
-    SOUNDFILE_AVAILABLE = True
-except ImportError:
-    SOUNDFILE_AVAILABLE = False
+# google-genai and soundfile are heavy; import them when a helper first needs
+# them rather than when this module is loaded.
+@lru_cache(maxsize=None)
+def _genai():
+    try:
+        from google import genai
+    except ImportError:
+        return None
+    return genai
 
-logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _soundfile():
+    try:
+        import soundfile
+    except ImportError:
+        return None
+    return soundfile
 
 
 # ============================================================================
@@ -74,10 +83,12 @@ class Summary(BaseModel):
     level: str = Field(description="Student's level")
 
 
+# Schema passed to Gemini: docs.schema's Summary when available, else the one above
+SummarySchema = Summary
 try:
     from docs.schema import Summary as ExternalSummary
 
-    Summary = ExternalSummary
+    SummarySchema = ExternalSummary
 except Exception as exc:
     logger.warning(f"Failed to import Summary from docs.schema: {exc}")
 
@@ -107,7 +118,8 @@ class GeminiTranscriptionHelper:
         )
         self.model_name = os.getenv("GEMINI_TRANSCRIPTION_MODEL", self.DEFAULT_MODEL)
 
-        if self.api_key and GENAI_NEW_SDK_AVAILABLE:
+        genai = _genai() if self.api_key else None
+        if genai is not None:
             try:
                 self.client = genai.Client(api_key=self.api_key)
                 self.enabled = True
@@ -119,13 +131,21 @@ class GeminiTranscriptionHelper:
                 self.client = None
                 self.enabled = False
         else:
-            if not GENAI_NEW_SDK_AVAILABLE:
+            if self.api_key:
                 logger.info("google-genai package not installed for transcription")
             if not self.api_key:
                 logger.info("GOOGLE_API_KEY/GEMINI_API_KEY not found for transcription")
             self.client = None
             self.enabled = False
 
+    def _upload(self, file: str):
+        with provider_call("gemini", "upload"):
+            return self.client.files.upload(file=file)
+
+    def _generate(self, operation: str, **kwargs):
+        with provider_call("gemini", operation):
+            return self.client.models.generate_content(model=self.model_name, **kwargs)
+
     def _save_temp_wav(
         self, audio_tuple: Tuple[int, Any], filename: str = None
     ) -> Optional[str]:
@@ -142,7 +162,8 @@ class GeminiTranscriptionHelper:
         if audio_tuple is None:
             return None
 
-        if not SOUNDFILE_AVAILABLE:
+        sf = _soundfile()
+        if sf is None:
             logger.error("soundfile package not available for audio conversion")
             return None
 
@@ -208,12 +229,12 @@ class GeminiTranscriptionHelper:
         try:
             # Upload file to Gemini
             logger.info(f"Uploading audio file to Gemini: {file_path}")
-            uploaded_file = self.client.files.upload(file=file_path)
+            uploaded_file = self._upload(file=file_path)
 
             # Generate transcription
             logger.info("Generating transcription with Gemini...")
-            response = self.client.models.generate_content(
-                model=self.model_name,
+            response = self._generate(
+                "transcribe",
                 contents=[TRANSCRIPTION_PROMPT, uploaded_file],
                 config={"temperature": 0.1},
             )
@@ -338,16 +359,16 @@ class GeminiTranscriptionHelper:
 
             # Upload file to Gemini
             logger.info(f"Uploading audio for summary generation: {tmp_path}")
-            uploaded_file = self.client.files.upload(file=tmp_path)
+            uploaded_file = self._upload(file=tmp_path)
 
             # Generate summary with structured output
             logger.info("Generating summary with Gemini...")
-            response = self.client.models.generate_content(
-                model=self.model_name,
+            response = self._generate(
+                "summarize_audio",
                 contents=[SUMMARY_PROMPT, uploaded_file],
                 config={
                     "response_mime_type": "application/json",
-                    "response_schema": Summary,
+                    "response_schema": SummarySchema,
                     "temperature": 0.1,
                 },
             )
@@ -397,15 +418,15 @@ class GeminiTranscriptionHelper:
             )
 
             logger.info("Generating summary from transcript with Gemini...")
-            response = self.client.models.generate_content(
-                model=self.model_name,
+            response = self._generate(
+                "summarize_transcript",
                 contents=[
                     text_summary_prompt,
                     transcript[:10000],
                 ],  # Limit transcript length
                 config={
                     "response_mime_type": "application/json",
-                    "response_schema": Summary,
+                    "response_schema": SummarySchema,
                     "temperature": 0.1,
                 },
             )
@@ -18,22 +18,26 @@ import json
 import logging
 import os
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 
+from ...metrics import provider_call
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------
 # Groq Client Wrapper
 # ---------------------------
-try:
-    from groq import Groq
-
-    GROQ_AVAILABLE = True
-except Exception as e:  # pragma: no cover - diagnostic logging
-    # Log the actual import failure so we can debug configuration issues
-    logger.exception("Failed to import groq Python client: %s", e)
-    Groq = None  # type: ignore
-    GROQ_AVAILABLE = False
+@lru_cache(maxsize=None)
+def _load_groq():
+    """Import the groq client on first use (it is slow to import)."""
+    try:
+        from groq import Groq
+    except Exception as e:  # pragma: no cover - diagnostic logging
+        # Log the actual import failure so we can debug configuration issues
+        logger.exception("Failed to import groq Python client: %s", e)
+        return None
+    return Groq
 
 
 class GroqClient:
@@ -42,7 +46,8 @@ class GroqClient:
     def __init__(self, model: Optional[str] = None):
         self.api_key = os.getenv("GROQ_API_KEY")
         self.model = model or os.getenv("GROQ_MODEL", "llama3-70b-8192")
-        self.enabled = bool(self.api_key and GROQ_AVAILABLE)
+        Groq = _load_groq() if self.api_key else None
+        self.enabled = Groq is not None
         self.client = None
 
         if not self.enabled:
@@ -67,15 +72,16 @@ class GroqClient:
             return None
 
         try:
-            resp = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+            with provider_call("groq", "chat"):
+                resp = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
             if not resp or not getattr(resp, "choices", None):
                 return None
 
@@ -162,7 +168,8 @@ def _translate_word(word: str, translator) -> str:
     if not word or not translator:
         return ""
     try:
-        return translator.translate(word)
+        with provider_call("translator", "translate"):
+            return translator.translate(word)
     except Exception:
         return ""
 
@@ -15,14 +15,16 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from .errors import APIError, api_error_handler, unhandled_handler
-from .middlewares import JWTAuthMiddleware, RequestLogMiddleware, IdempotencyMiddleware
+from .middlewares import APIRequestMiddleware
 from .router_root import router as root_router
+from .routes.admin_routes import router as admin_router
 from .routes.lessons_routes import router as lessons_router
 from ..games.routes.flashcards_routes import router as flashcards_router
 from ..games.routes.spelling_routes import router as spelling_router
 from ..games.routes.cloze_routes import router as cloze_router
 from ..games.routes.grammar_routes import router as grammar_router
 from ..games.routes.sentence_routes import router as sentence_router
+from ..json_utils import FastJSONResponse
 from ..logging_config import configure_logging
 from ..config import settings
 # Rate limiter instance
@@ -39,7 +41,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     yield
     
-    # Shutdown
+    # Shutdown: write queued idempotency keys before the pool goes away
+    from ..games.utils.idempotency import idempotency_store
+    await idempotency_store.flush()
     await AsyncMySQLPool.close_pool()
     logging.info("Application shutdown complete")
 
@@ -58,6 +62,7 @@ def create_app() -> FastAPI:
         docs_url=docs_url,
         redoc_url=redoc_url,
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
         description="AI-powered language learning exercise generation API",
     )
     
@@ -74,14 +79,13 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Middlewares
-    app.add_middleware(RequestLogMiddleware)
-    app.add_middleware(IdempotencyMiddleware)
-    app.add_middleware(JWTAuthMiddleware)
+    # Auth, Idempotency-Key and request logging (one pure-ASGI layer)
+    app.add_middleware(APIRequestMiddleware)
 
     # Routers
     app.include_router(root_router, prefix="/v1")
     app.include_router(lessons_router)
+    app.include_router(admin_router)
     app.include_router(flashcards_router)
     app.include_router(spelling_router)
     app.include_router(cloze_router)
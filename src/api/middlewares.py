@@ -1,87 +1,144 @@
+"""
+Request middleware for the API.
+
+A single pure-ASGI middleware handles JWT auth, the Idempotency-Key header,
+access logging and the per-route latency histogram (src.metrics). BaseHTTPMiddleware wraps every request in extra tasks and
+response streams per layer; here the request goes straight to the app and only
+``send`` is wrapped (to capture the status code for the access log).
+"""
+
 from __future__ import annotations
-import time
 import logging
-from fastapi import Request
-from fastapi.responses import Response
-from fastapi.routing import APIRoute
-from starlette.middleware.base import BaseHTTPMiddleware
+import re
+import time
+from typing import Callable, Iterable, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from ..security import verify_jwt, JWTValidationError
 from ..config import settings
-from .errors import APIError
+from ..metrics import observe_request
+from .responses import error
 
 logger = logging.getLogger(__name__)
 
 
-class JWTAuthMiddleware(BaseHTTPMiddleware):
-    """JWT auth with public route support and dev-mode bypass."""
-
-    PUBLIC_PATHS = {
-        "/",
-        "/v1/health",
-        "/docs",
-        "/redoc",
-        "/openapi.json",
-        "/v1/process",
-        "/v1/trigger-lesson-processing",
-        "/v1/exercises",
-    }
-
-    # All games endpoints are intentionally public (no JWT required in this service)
-    # Updated to match TULKKA Games APIs spec route prefixes
-    GAMES_PUBLIC_PREFIXES = (
-        "/v1/flashcards",
-        "/v1/word-lists",
-        "/v1/spelling",
-        "/v1/grammar-challenge",
-        "/v1/advanced-cloze",
-        "/v1/sentence-builder",
-    )
-
-    def _is_public(self, path: str) -> bool:
-        if path.startswith("/v1/"):
-            return True
-        if path in self.PUBLIC_PATHS:
-            return True
-        for prefix in self.GAMES_PUBLIC_PREFIXES:
-            if path.startswith(prefix):
-                return True
-        return path.startswith("/docs") or path.startswith("/redoc")
-
-    async def dispatch(self, request: Request, call_next):
-        # Allow everything in development mode to unblock local testing
-        if settings.ENVIRONMENT != "production":
-            return await call_next(request)
+PUBLIC_PATHS = (
+    "/",
+    "/v1/health",
+    "/openapi.json",
+    "/v1/process",
+    "/v1/trigger-lesson-processing",
+    "/v1/exercises",
+)
 
-        if self._is_public(request.url.path):
-            return await call_next(request)
+# All /v1 endpoints (games included) are intentionally public in this service;
+# the games prefixes match the TULKKA Games APIs spec route prefixes.
+PUBLIC_PREFIXES = (
+    "/v1/",
+    "/v1/flashcards",
+    "/v1/word-lists",
+    "/v1/spelling",
+    "/v1/grammar-challenge",
+    "/v1/advanced-cloze",
+    "/v1/sentence-builder",
+    "/docs",
+    "/redoc",
+)
 
-        auth = request.headers.get("Authorization", "")
-        if not auth.startswith("Bearer "):
-            raise APIError("UNAUTHORIZED", "missing bearer token", 401)
+# Route label for requests that matched no route (404s, rejected auth)
+UNMATCHED_ROUTE = "<unmatched>"
 
-        token = auth.split(" ", 1)[1].strip()
-        try:
-            payload = verify_jwt(token)
-            request.state.user = payload
-        except JWTValidationError as exc:
-            raise APIError("UNAUTHORIZED", str(exc), 401)
 
-        return await call_next(request)
+def compile_path_matcher(
+    exact: Iterable[str], prefixes: Iterable[str]
+) -> Callable[[str], bool]:
+    """Build one precompiled regex matching ``exact`` paths or any of ``prefixes``."""
+    alternatives = [re.escape(p) + r"\Z" for p in sorted(set(exact))]
+    # Longest prefixes first so the alternation reads like the specific rules
+    alternatives += [re.escape(p) for p in sorted(set(prefixes), key=len, reverse=True)]
+    pattern = re.compile("|".join(alternatives) or r"(?!)")
+
+    def is_public(path: str) -> bool:
+        return pattern.match(path) is not None
+
+    return is_public
+
 
+class APIRequestMiddleware:
+    """
+    JWT auth with public route support and dev-mode bypass, Idempotency-Key
+    capture (``request.state.idempotency_key``) and request logging.
+    """
 
-class RequestLogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start = time.time()
-        response: Response = await call_next(request)
-        dur = int((time.time() - start) * 1000)
-        logger.info("%s %s %d %dms", request.method, request.url.path, response.status_code, dur)
-        return response
+    def __init__(
+        self,
+        app: ASGIApp,
+        public_paths: Iterable[str] = PUBLIC_PATHS,
+        public_prefixes: Iterable[str] = PUBLIC_PREFIXES,
+    ) -> None:
+        self.app = app
+        self.is_public = compile_path_matcher(public_paths, public_prefixes)
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        path = scope["path"]
+        state = scope.setdefault("state", {})
+
+        authorization = idempotency_key = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+            elif name == b"idempotency-key":
+                idempotency_key = value.decode("latin-1")
+        if idempotency_key:
+            state["idempotency_key"] = idempotency_key
+
+        # Allow everything in development mode to unblock local testing
+        if settings.ENVIRONMENT == "production" and not self.is_public(path):
+            message = self._authenticate(authorization, state)
+            if message is not None:
+                logger.warning("API error: code=UNAUTHORIZED, status=401, message=%s, path=%s", message, path)
+                response = JSONResponse(error("UNAUTHORIZED", message), status_code=401)
+                await response(scope, receive, send)
+                self._log(scope, 401, start)
+                return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._log(scope, status_code, start)
+
+    @staticmethod
+    def _authenticate(authorization: Optional[str], state: dict) -> Optional[str]:
+        """Validate the bearer token into ``state["user"]``; return an error message on failure."""
+        if not authorization or not authorization.startswith("Bearer "):
+            return "missing bearer token"
+        token = authorization.split(" ", 1)[1].strip()
+        try:
+            state["user"] = verify_jwt(token)
+        except JWTValidationError as exc:
+            return str(exc)
+        return None
 
-class IdempotencyMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        key = request.headers.get("Idempotency-Key")
-        if not key:
-            return await call_next(request)
-        request.state.idempotency_key = key
-        return await call_next(request)
+    @staticmethod
+    def _log(scope: Scope, status_code: int, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        # Label by route template (set on the scope by the router), never the raw
+        # path, so ids in URLs do not create a time series each
+        route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+        observe_request(scope["method"], route, status_code, elapsed)
+        logger.info("%s %s %d %dms", scope["method"], scope["path"], status_code, int(elapsed * 1000))
@@ -4,8 +4,8 @@ from __future__ import annotations
 import logging
 from typing import Dict, Any
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
 
 from ..config import settings
 from ..db.supabase_client import SupabaseClient
@@ -127,6 +127,35 @@ async def health_detailed() -> JSONResponse:
     )
 
 
+def _wants_prometheus(request: Request) -> bool:
+    if request.query_params.get("format") == "prometheus":
+        return True
+    accept = request.headers.get("accept", "")
+    return "openmetrics" in accept or "text/plain" in accept
+
+
+@router.get("/metrics")
+async def metrics(request: Request) -> Any:
+    """
+    In-process metrics for this API instance.
+
+    Prometheus scrapers (Accept: text/plain / openmetrics, or ?format=prometheus)
+    get the text exposition of src.metrics: request latency per route, pool
+    usage, acquire wait and query latency. Otherwise JSON:
+    mysql.pool shows starvation (inUse == maxSize, high acquireWait);
+    mysql.queries shows per-statement latency by SQL fingerprint.
+    """
+    from ..db.mysql_pool import metrics_snapshot
+    from ..metrics import CONTENT_TYPE, registry
+
+    if _wants_prometheus(request):
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+    return {
+        "timestamp": utc_now_iso(),
+        "mysql": metrics_snapshot(),
+    }
+
+
 @router.get("/ready")
 async def readiness() -> JSONResponse:
     """
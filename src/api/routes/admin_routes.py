@@ -0,0 +1,64 @@
+"""Operational admin routes.
+
+Provides endpoints for:
+- Starting an on-demand sampling profile of this API process (src/profiler.py)
+- Checking the running / last profile and where its output was written
+
+Disabled (404) unless PROFILER_ENABLED is set; every call needs the
+X-Admin-Token header to match PROFILER_ADMIN_TOKEN.
+"""
+
+from __future__ import annotations
+import asyncio
+import hmac
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import JSONResponse
+
+from ... import profiler
+from ...config import settings
+from ..errors import APIError
+
+router = APIRouter(prefix="/v1/admin", tags=["Admin"])
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None, alias="X-Admin-Token")) -> None:
+    token = getattr(settings, "PROFILER_ADMIN_TOKEN", None)
+    if not profiler.enabled() or not token:
+        raise APIError("NOT_FOUND", "Not found", 404)
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, token):
+        raise APIError("FORBIDDEN", "Invalid admin token", 403)
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def start_profile(
+    seconds: float = Query(30, gt=0, le=profiler.MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    idle: bool = Query(False, description="Keep samples of parked threads"),
+) -> JSONResponse:
+    """
+    Sample this process for ``seconds``, then write collapsed-stack and
+    speedscope files to TEMP_DIR/profiles. Returns immediately (202); poll
+    GET /v1/admin/profile for completion.
+    """
+    try:
+        prof = profiler.start_profile(
+            seconds=seconds,
+            interval_ms=interval_ms,
+            loop=asyncio.get_running_loop(),
+            idle=idle,
+            label="api",
+        )
+    except profiler.ProfilerBusy as exc:
+        raise APIError("PROFILER_BUSY", str(exc), 409)
+    return JSONResponse(status_code=202, content=prof.status())
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+async def profile_status() -> Dict[str, Any]:
+    """State of the running profile, or the last one taken by this process."""
+    prof = profiler.current()
+    if prof is None:
+        return {"status": "idle"}
+    return prof.status()
@@ -16,14 +16,16 @@ from pydantic import BaseModel, Field, field_validator
 
 from ...ai.lesson_processor import LessonProcessor
 from ...db.supabase_client import SupabaseClient, SupabaseClientError
+from ...lazy import lazy
 from ...time_utils import utc_now_iso
+from ...workers.wakeup import notify_new_job
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1", tags=["Lesson Processing"])
 
-# Initialize services (lazy initialization would be better for testing)
-lesson_processor = LessonProcessor()
-supabase = SupabaseClient()
+# Built on first request, not at import (keeps API cold start and tests cheap)
+lesson_processor = lazy(LessonProcessor)
+supabase = lazy(SupabaseClient)
 
 class TranscriptInput(BaseModel):
     """Input model for transcript processing."""
@@ -174,6 +176,7 @@ def trigger_lesson_processing(payload: ZoomLessonInput):
         zoom_summary_id = result.get('id')
         
         logger.info(f"✅ Created pending zoom summary {zoom_summary_id} for class {payload.class_id} on {payload.date} at {payload.startTime}")
+        notify_new_job(zoom_summary_id)
         
         return {
             'success': True,
@@ -0,0 +1,79 @@
+# src/cancellation.py
+"""
+Cooperative cancellation for long-running worker jobs.
+
+The worker binds a CancellationToken to the thread running a job; code on the
+job's path (downloads, AssemblyAI polling, orchestrator stages) calls
+``check_cancelled()`` at safe points and ``cancellable_sleep()`` instead of
+``time.sleep`` so a timed-out job stops at the next chunk/poll and releases
+its executor slot. Outside a bound job these are no-ops (plain sleep).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job whose token was cancelled.
+
+    Derives from BaseException (like asyncio.CancelledError) so the pipeline's
+    many ``except Exception`` fallbacks do not swallow it.
+    """
+
+
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled(self.reason or "cancelled")
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to ``seconds``; raise JobCancelled as soon as cancelled."""
+        if self._event.wait(max(0.0, seconds)):
+            raise JobCancelled(self.reason or "cancelled")
+
+
+_local = threading.local()
+
+
+def current_token() -> Optional[CancellationToken]:
+    return getattr(_local, "token", None)
+
+
+@contextmanager
+def bind_token(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Make ``token`` the current thread's token for the duration of the block."""
+    previous = current_token()
+    _local.token = token
+    try:
+        yield token
+    finally:
+        _local.token = previous
+
+
+def check_cancelled() -> None:
+    token = current_token()
+    if token is not None:
+        token.check()
+
+
+def cancellable_sleep(seconds: float) -> None:
+    token = current_token()
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.sleep(seconds)
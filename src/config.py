@@ -30,6 +30,13 @@ class Settings:
     MYSQL_DATABASE: str = os.getenv("MYSQL_DATABASE", "tulkka9")
     MYSQL_POOL_NAME: str = os.getenv("MYSQL_POOL_NAME", "tulkka_pool")
     MYSQL_POOL_SIZE: int = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+    MYSQL_POOL_MIN_SIZE: int = int(os.getenv("MYSQL_POOL_MIN_SIZE", "1"))
+    MYSQL_POOL_WARMUP: bool = os.getenv("MYSQL_POOL_WARMUP", "true").lower() == "true"
+    MYSQL_SLOW_QUERY_MS: int = int(os.getenv("MYSQL_SLOW_QUERY_MS", "500"))
+    # Optional read replica for games GET endpoints (unset = everything on the primary)
+    MYSQL_REPLICA_HOST: Optional[str] = os.getenv("MYSQL_REPLICA_HOST") or None
+    MYSQL_REPLICA_PORT: int = int(os.getenv("MYSQL_REPLICA_PORT", os.getenv("MYSQL_PORT", "3306")))
+    MYSQL_REPLICA_POOL_SIZE: int = int(os.getenv("MYSQL_REPLICA_POOL_SIZE", os.getenv("MYSQL_POOL_SIZE", "10")))
 
     # Zoom
     ZOOM_CLIENT_ID: Optional[str] = os.getenv("ZOOM_CLIENT_ID")
@@ -39,6 +46,22 @@ class Settings:
     ZOOM_TOKEN_EXPIRES_AT: Optional[str] = os.getenv(
         "ZOOM_TOKEN_EXPIRES_AT"
     )  # optional
+    # Refresh the Zoom access token this long before it expires (background)
+    ZOOM_TOKEN_REFRESH_LEAD_SECONDS: int = int(
+        os.getenv("ZOOM_TOKEN_REFRESH_LEAD_SECONDS", "300")
+    )
+    # Zoom HTTP client: keep-alive pool size, longest Retry-After honored
+    # inline, and per-endpoint circuit breaker (src/zoom/zoom_client.py)
+    ZOOM_HTTP_POOL_SIZE: int = int(os.getenv("ZOOM_HTTP_POOL_SIZE", "10"))
+    ZOOM_MAX_RETRY_AFTER_SECONDS: int = int(
+        os.getenv("ZOOM_MAX_RETRY_AFTER_SECONDS", "60")
+    )
+    ZOOM_CIRCUIT_FAILURE_THRESHOLD: int = int(
+        os.getenv("ZOOM_CIRCUIT_FAILURE_THRESHOLD", "5")
+    )
+    ZOOM_CIRCUIT_COOLDOWN_SECONDS: int = int(
+        os.getenv("ZOOM_CIRCUIT_COOLDOWN_SECONDS", "30")
+    )
 
     # AssemblyAI (optional)
     ASSEMBLYAI_API_KEY: Optional[str] = os.getenv("ASSEMBLYAI_API_KEY")
@@ -61,9 +84,33 @@ class Settings:
     # Security
     JWT_SECRET: Optional[str] = os.getenv("JWT_SECRET")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+    # Public key (PEM or JWKS JSON, inline or from a file) for RS*/PS*/ES*
+    JWT_PUBLIC_KEY: Optional[str] = os.getenv("JWT_PUBLIC_KEY")
+    JWT_PUBLIC_KEY_FILE: Optional[str] = os.getenv("JWT_PUBLIC_KEY_FILE")
+    # Verified-token LRU (see security.verify_jwt); tokens without exp are
+    # re-verified after JWT_CACHE_MAX_TTL_SECONDS
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+    JWT_CACHE_MAX_TTL_SECONDS: int = int(
+        os.getenv("JWT_CACHE_MAX_TTL_SECONDS", "3600")
+    )
+
+    # Games idempotency store (src/games/utils/idempotency.py): in-memory LRU,
+    # optional shared Redis tier, batched write-behind to idempotency_keys
+    IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    IDEMPOTENCY_REDIS_URL: str = os.getenv("IDEMPOTENCY_REDIS_URL", "")
+    IDEMPOTENCY_FLUSH_INTERVAL_MS: int = int(
+        os.getenv("IDEMPOTENCY_FLUSH_INTERVAL_MS", "200")
+    )
+    IDEMPOTENCY_FLUSH_BATCH: int = int(os.getenv("IDEMPOTENCY_FLUSH_BATCH", "200"))
+    IDEMPOTENCY_MAX_PENDING: int = int(os.getenv("IDEMPOTENCY_MAX_PENDING", "10000"))
+    IDEMPOTENCY_PURGE_BATCH: int = int(os.getenv("IDEMPOTENCY_PURGE_BATCH", "1000"))
 
     # Misc
     TEMP_DIR: str = os.getenv("TEMP_DIR", "/tmp")
+    # Zoom recording listing cache per teacher-day (src/zoom/recording_index.py)
+    ZOOM_RECORDING_CACHE_TTL_SECONDS: int = int(
+        os.getenv("ZOOM_RECORDING_CACHE_TTL_SECONDS", "300")
+    )
 
     # Worker settings
     WORKER_POLL_INTERVAL_SECONDS: int = int(
@@ -71,6 +118,50 @@ class Settings:
     )
     WORKER_BATCH_SIZE: int = int(os.getenv("WORKER_BATCH_SIZE", "10"))
     WORKER_MAX_RETRIES: int = int(os.getenv("WORKER_MAX_RETRIES", "3"))
+    # Push wakeup (see src/workers/wakeup.py); polling stays as the fallback
+    WORKER_WAKEUP_BIND: str = os.getenv("WORKER_WAKEUP_BIND", "")
+    WORKER_WAKEUP_TARGETS: str = os.getenv("WORKER_WAKEUP_TARGETS", "")
+    # Scheduling (see src/workers/scheduler.py)
+    WORKER_SCHEDULER_WINDOW: int = int(os.getenv("WORKER_SCHEDULER_WINDOW", "5"))
+    WORKER_FRESH_LESSON_DAYS: int = int(os.getenv("WORKER_FRESH_LESSON_DAYS", "1"))
+    WORKER_TENANT_MAX_CONCURRENCY: int = int(
+        os.getenv("WORKER_TENANT_MAX_CONCURRENCY", "2")
+    )
+    WORKER_TENANT_WEIGHTS: str = os.getenv("WORKER_TENANT_WEIGHTS", "")
+    # Stage checkpoint artifacts (see src/workers/checkpoints.py)
+    WORKER_ARTIFACT_DIR: str = os.getenv(
+        "WORKER_ARTIFACT_DIR", os.path.join(os.getenv("TEMP_DIR", "/tmp"), "zoom_artifacts")
+    )
+    WORKER_ARTIFACT_TTL_SECONDS: int = int(
+        os.getenv("WORKER_ARTIFACT_TTL_SECONDS", str(3 * 24 * 3600))
+    )
+    # Job isolation on timeout: "thread" (cooperative cancel) or "process" (kill)
+    WORKER_JOB_ISOLATION: str = os.getenv("WORKER_JOB_ISOLATION", "thread").lower()
+    WORKER_CANCEL_GRACE_SECONDS: int = int(os.getenv("WORKER_CANCEL_GRACE_SECONDS", "30"))
+    # Supervisor mode (run_worker.py): number of job processes, drain timeout
+    WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", "1"))
+    WORKER_DRAIN_TIMEOUT_SECONDS: int = int(
+        os.getenv("WORKER_DRAIN_TIMEOUT_SECONDS", str(20 * 60 + 30))
+    )
+    # Prometheus listener in run_worker.py (0 disables)
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "0"))
+    WORKER_METRICS_HOST: str = os.getenv("WORKER_METRICS_HOST", "0.0.0.0")
+    WORKER_QUEUE_DEPTH_INTERVAL_SECONDS: int = int(
+        os.getenv("WORKER_QUEUE_DEPTH_INTERVAL_SECONDS", "60")
+    )
+    # Per-job pipeline traces (see src/tracing.py, src/tools/trace_view.py)
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_DIR: str = os.getenv(
+        "TRACE_DIR", os.path.join(os.getenv("TEMP_DIR", "/tmp"), "traces")
+    )
+    TRACE_OTLP_ENDPOINT: Optional[str] = os.getenv("TRACE_OTLP_ENDPOINT") or None
+    TRACE_TTL_SECONDS: int = int(os.getenv("TRACE_TTL_SECONDS", str(7 * 24 * 3600)))
+    # On-demand sampling profiler (src/profiler.py): POST /v1/admin/profile on
+    # the API, SIGUSR2 to run_worker.py; output in TEMP_DIR/profiles
+    PROFILER_ENABLED: bool = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+    PROFILER_ADMIN_TOKEN: Optional[str] = os.getenv("PROFILER_ADMIN_TOKEN") or None
+    PROFILER_SECONDS: int = int(os.getenv("PROFILER_SECONDS", "30"))
+    PROFILER_INTERVAL_MS: int = int(os.getenv("PROFILER_INTERVAL_MS", "10"))
 
     # CORS settings (production-safe defaults)
     CORS_ORIGINS: List[str] = [
@@ -1,14 +1,123 @@
 # src/db/mysql_pool.py
+import asyncio
 import logging
-from typing import Optional, Any, List, Tuple
+from contextvars import ContextVar
+from typing import Optional, Any, Dict, List, Tuple
 import aiomysql
 from aiomysql import OperationalError
 from ..config import settings
+from .query_metrics import query_metrics
+from ..metrics import registry
 import time
 
 logger = logging.getLogger(__name__)
 
 
+# -------------------------------------------------------------
+# Read/write routing (sticky primary after writes)
+# -------------------------------------------------------------
+# Each request runs in its own task/context, so this flag is request-scoped:
+# once a request writes, its later reads go to the primary (read-your-writes).
+_sticky_primary: ContextVar[bool] = ContextVar("mysql_sticky_primary", default=False)
+
+_WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def mark_primary_sticky() -> None:
+    """Route every remaining read of the current request to the primary."""
+    _sticky_primary.set(True)
+
+
+def is_primary_sticky() -> bool:
+    return _sticky_primary.get()
+
+
+def _is_write(query) -> bool:
+    return isinstance(query, str) and query.lstrip()[:7].upper().startswith(_WRITE_VERBS)
+
+
+# -------------------------------------------------------------
+# Instrumentation (per-statement latency + acquire wait)
+# -------------------------------------------------------------
+class _TimedCursorMixin:
+    """Records every execute() into query_metrics (fingerprint -> latency)."""
+
+    async def execute(self, query, args=None):
+        if _is_write(query):
+            mark_primary_sticky()
+        start = time.perf_counter()
+        try:
+            result = await super().execute(query, args)
+        except Exception as e:
+            query_metrics.record_query(query, (time.perf_counter() - start) * 1000, error=e)
+            raise
+        query_metrics.record_query(query, (time.perf_counter() - start) * 1000)
+        return result
+
+
+class InstrumentedCursor(_TimedCursorMixin, aiomysql.Cursor):
+    pass
+
+
+class InstrumentedDictCursor(_TimedCursorMixin, aiomysql.DictCursor):
+    pass
+
+
+class _TimedAcquire:
+    """
+    Drop-in for aiomysql's acquire() context manager that records how long
+    callers waited for a free connection. Supports both ``await pool.acquire()``
+    and ``async with pool.acquire() as conn``.
+    """
+
+    def __init__(self, pool: aiomysql.Pool):
+        self._pool = pool
+        self._conn = None
+
+    async def _acquire(self):
+        start = time.perf_counter()
+        conn = await self._pool.acquire()
+        query_metrics.record_acquire_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+    def __await__(self):
+        return self._acquire().__await__()
+
+    async def __aenter__(self):
+        self._conn = await self._acquire()
+        return self._conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+        return False
+
+
+class InstrumentedPool:
+    """Thin wrapper over aiomysql.Pool; everything except acquire() is delegated."""
+
+    def __init__(self, pool: aiomysql.Pool):
+        self._pool = pool
+
+    def acquire(self) -> _TimedAcquire:
+        return _TimedAcquire(self._pool)
+
+    def stats(self) -> Dict[str, int]:
+        size = self._pool.size
+        free = self._pool.freesize
+        return {
+            "size": size,
+            "free": free,
+            "inUse": size - free,
+            "minSize": self._pool.minsize,
+            "maxSize": self._pool.maxsize,
+        }
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+
 class AsyncMySQLPool:
     """
     Production-grade async MySQL pool:
@@ -16,9 +125,13 @@ class AsyncMySQLPool:
     - Connection health checks
     - Idle connection recycling
     - Connection + read timeouts
+    - Warm-up to MYSQL_POOL_MIN_SIZE at startup
+    - Acquire-wait and per-statement latency metrics (see query_metrics)
+    - Optional read-replica pool (MYSQL_REPLICA_HOST) for get_read_pool()
     """
 
-    _pool: Optional[aiomysql.Pool] = None
+    _pool: Optional[InstrumentedPool] = None
+    _replica: Optional[InstrumentedPool] = None
     _last_init = 0
     _reinit_interval = 10  # seconds between forced reinit attempts
 
@@ -40,31 +153,94 @@ class AsyncMySQLPool:
             logger.warning("MySQL credentials missing. Skipping pool creation.")
             return
 
+        minsize = max(0, min(settings.MYSQL_POOL_MIN_SIZE, settings.MYSQL_POOL_SIZE))
+
         try:
-            cls._pool = await aiomysql.create_pool(
-                host=settings.MYSQL_HOST,
-                port=settings.MYSQL_PORT,
-                user=settings.MYSQL_USER,
-                password=settings.MYSQL_PASSWORD,
-                db=settings.MYSQL_DATABASE,
-                minsize=1,
-                maxsize=settings.MYSQL_POOL_SIZE,
-                autocommit=True,
-                charset="utf8mb4",
-
-                # IMPORTANT:
-                connect_timeout=10,
-
-                # Recycle idle connections before MySQL kills them
-                pool_recycle=180,     # always < wait_timeout (default 300)
+            cls._pool = await cls._create_pool(
+                settings.MYSQL_HOST, settings.MYSQL_PORT, minsize, settings.MYSQL_POOL_SIZE
+            )
+            logger.info(
+                "Async MySQL connection pool initialized (min=%d, max=%d).",
+                minsize, settings.MYSQL_POOL_SIZE,
             )
-            logger.info("Async MySQL connection pool initialized.")
         except Exception as e:
             logger.exception("Failed to initialize MySQL pool: %s", e)
             cls._pool = None
+            return
+
+        if settings.MYSQL_POOL_WARMUP and minsize > 0:
+            await cls._warm_up(cls._pool, minsize)
+
+        if settings.MYSQL_REPLICA_HOST:
+            await cls._init_replica(minsize)
 
     @classmethod
-    async def get_pool(cls) -> aiomysql.Pool:
+    async def _init_replica(cls, minsize: int) -> None:
+        """Create the read-replica pool; on failure reads fall back to the primary."""
+        if cls._replica is not None:
+            cls._replica.close()
+            cls._replica = None
+
+        replica_min = min(minsize, settings.MYSQL_REPLICA_POOL_SIZE)
+        try:
+            cls._replica = await cls._create_pool(
+                settings.MYSQL_REPLICA_HOST, settings.MYSQL_REPLICA_PORT,
+                replica_min, settings.MYSQL_REPLICA_POOL_SIZE,
+            )
+            logger.info(
+                "MySQL read-replica pool initialized (%s:%d, min=%d, max=%d).",
+                settings.MYSQL_REPLICA_HOST, settings.MYSQL_REPLICA_PORT,
+                replica_min, settings.MYSQL_REPLICA_POOL_SIZE,
+            )
+        except Exception as e:
+            logger.exception("Failed to initialize MySQL read replica, reads stay on primary: %s", e)
+            cls._replica = None
+            return
+
+        if settings.MYSQL_POOL_WARMUP and replica_min > 0:
+            await cls._warm_up(cls._replica, replica_min)
+
+    @staticmethod
+    async def _create_pool(host: str, port: int, minsize: int, maxsize: int) -> InstrumentedPool:
+        raw_pool = await aiomysql.create_pool(
+            host=host,
+            port=port,
+            user=settings.MYSQL_USER,
+            password=settings.MYSQL_PASSWORD,
+            db=settings.MYSQL_DATABASE,
+            minsize=minsize,
+            maxsize=maxsize,
+            autocommit=True,
+            charset="utf8mb4",
+            cursorclass=InstrumentedCursor,
+
+            # IMPORTANT:
+            connect_timeout=10,
+
+            # Recycle idle connections before MySQL kills them
+            pool_recycle=180,     # always < wait_timeout (default 300)
+        )
+        return InstrumentedPool(raw_pool)
+
+    @staticmethod
+    async def _warm_up(pool: InstrumentedPool, count: int) -> None:
+        """Ping `count` connections concurrently so the first requests don't pay for connects."""
+
+        async def _ping():
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT 1")
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(_ping() for _ in range(count)), return_exceptions=True)
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            logger.warning("MySQL pool warm-up: %d/%d pings failed (%s)", len(failed), count, failed[0])
+        else:
+            logger.info("MySQL pool warmed up: %d connections in %dms", count, int((time.perf_counter() - start) * 1000))
+
+    @classmethod
+    async def get_pool(cls) -> InstrumentedPool:
         """Get the pool with automatic reconnect on failure."""
         if cls._pool is None:
             await cls.init_pool()
@@ -74,8 +250,26 @@ class AsyncMySQLPool:
 
         return cls._pool
 
+    @classmethod
+    async def get_read_pool(cls) -> InstrumentedPool:
+        """
+        Pool for read-only work: the replica when configured, unless the current
+        request already wrote (sticky primary), in which case the primary.
+        """
+        primary = await cls.get_pool()
+        if cls._replica is None or is_primary_sticky():
+            return primary
+        return cls._replica
+
     @classmethod
     async def close_pool(cls):
+        if cls._replica:
+            try:
+                cls._replica.close()
+                await cls._replica.wait_closed()
+                logger.info("MySQL read-replica pool closed.")
+            finally:
+                cls._replica = None
         if cls._pool:
             try:
                 cls._pool.close()
@@ -84,6 +278,40 @@ class AsyncMySQLPool:
             finally:
                 cls._pool = None
 
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Pool usage counters (size/free/in-use/min/max)."""
+        if cls._pool is None:
+            return {"initialized": False}
+        stats: Dict[str, Any] = {"initialized": True, **cls._pool.stats()}
+        if cls._replica is not None:
+            stats["replica"] = cls._replica.stats()
+        return stats
+
+
+@registry.collector
+def _pool_gauges():
+    """Pool usage gauges for the Prometheus view of /v1/metrics."""
+    pools = [("primary", AsyncMySQLPool._pool), ("replica", AsyncMySQLPool._replica)]
+    samples = {"size": [], "in_use": [], "max_size": []}
+    for role, pool in pools:
+        if pool is None:
+            continue
+        stats = pool.stats()
+        samples["size"].append(("mysql_pool_size", {"pool": role}, stats["size"]))
+        samples["in_use"].append(("mysql_pool_in_use", {"pool": role}, stats["inUse"]))
+        samples["max_size"].append(("mysql_pool_max_size", {"pool": role}, stats["maxSize"]))
+    return [
+        ("mysql_pool_size", "Open MySQL connections.", samples["size"]),
+        ("mysql_pool_in_use", "MySQL connections checked out.", samples["in_use"]),
+        ("mysql_pool_max_size", "MySQL pool capacity.", samples["max_size"]),
+    ]
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """Pool usage + acquire wait + per-statement latency, for /v1/metrics."""
+    return {"pool": AsyncMySQLPool.stats(), **query_metrics.snapshot()}
+
 
 async def _retry_mysql(op, *args, retries=2, **kwargs):
     """
@@ -128,7 +356,7 @@ async def execute_query(
     async def _execute():
         pool = await AsyncMySQLPool.get_pool()
         async with pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cursor:
+            async with conn.cursor(InstrumentedDictCursor) as cursor:
                 start = time.time()
                 await cursor.execute(query, params or ())
                 duration = int((time.time() - start) * 1000)
@@ -146,6 +374,109 @@ async def execute_query(
     return await _retry_mysql(_execute)
 
 
-async def get_pool() -> aiomysql.Pool:
+async def get_pool() -> InstrumentedPool:
     """Return pool for advanced usage."""
     return await AsyncMySQLPool.get_pool()
+
+
+async def get_read_pool() -> InstrumentedPool:
+    """Return the pool for read-only endpoints (replica when configured)."""
+    return await AsyncMySQLPool.get_read_pool()
+
+
+# -------------------------------------------------------------
+# Unit of work (one connection + one transaction per request)
+# -------------------------------------------------------------
+class _SharedConnection:
+    """
+    Connection proxy handed out by UnitOfWork.acquire().
+
+    commit()/rollback() are no-ops so existing DAO code can keep calling them;
+    the owning UnitOfWork decides the outcome of the transaction on exit.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def commit(self):
+        return None
+
+    async def rollback(self):
+        return None
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _SharedAcquire:
+    """Async context manager mimicking pool.acquire() for a pinned connection."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def __aenter__(self):
+        return self._conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class UnitOfWork:
+    """
+    Request-scoped unit of work:
+    - Acquires ONE pool connection for the whole handler
+    - Wraps every statement in a single transaction
+    - Commits on clean exit, rolls back on any exception
+
+    It exposes the same ``acquire()`` interface as an aiomysql pool, so it can be
+    passed anywhere a pool is expected (GamesDAO, idempotency helpers).
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = None
+        self._after_commit: List[Any] = []
+
+    def after_commit(self, callback) -> None:
+        """Run ``callback()`` once the transaction has committed (never on rollback)."""
+        self._after_commit.append(callback)
+
+    async def __aenter__(self) -> "UnitOfWork":
+        mark_primary_sticky()
+        self._conn = await self._pool.acquire()
+        try:
+            await self._conn.begin()
+        except Exception:
+            self._pool.release(self._conn)
+            self._conn = None
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        conn, self._conn = self._conn, None
+        try:
+            if exc_type is None:
+                await conn.commit()
+            else:
+                await conn.rollback()
+        except Exception:
+            # Connection state is unknown; drop it instead of returning it to the pool
+            logger.exception("Unit of work failed to finish transaction")
+            conn.close()
+            if exc_type is None:
+                raise
+        finally:
+            self._pool.release(conn)
+        callbacks, self._after_commit = self._after_commit, []
+        if exc_type is None:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("Unit of work after-commit callback failed")
+        return False
+
+    def acquire(self) -> _SharedAcquire:
+        if self._conn is None:
+            raise RuntimeError("UnitOfWork used outside of 'async with'")
+        return _SharedAcquire(_SharedConnection(self._conn))
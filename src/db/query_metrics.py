@@ -0,0 +1,158 @@
+# src/db/query_metrics.py
+"""
+In-process MySQL metrics:
+- Pool acquire-wait latency
+- Per-statement latency histograms keyed by normalized SQL fingerprint
+- Slow-query logging above MYSQL_SLOW_QUERY_MS
+
+Everything is kept in memory (bounded) and exposed via snapshot() for the JSON
+/v1/metrics view; acquire wait and statement latency (without the fingerprint,
+to keep label cardinality low) also feed the Prometheus registry in src.metrics.
+"""
+
+from __future__ import annotations
+import logging
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional
+
+from ..config import settings
+from ..metrics import registry
+
+acquire_wait_seconds = registry.histogram(
+    "mysql_pool_acquire_wait_seconds", "Time spent waiting for a free MySQL connection."
+)
+query_duration_seconds = registry.histogram(
+    "mysql_query_duration_seconds", "MySQL statement latency.", ("outcome",)
+)
+slow_queries_total = registry.counter(
+    "mysql_slow_queries", "Statements slower than MYSQL_SLOW_QUERY_MS."
+)
+
+logger = logging.getLogger(__name__)
+
+# Max distinct fingerprints tracked; anything beyond is folded into OTHER_FINGERPRINT
+MAX_FINGERPRINTS = 500
+OTHER_FINGERPRINT = "<other>"
+
+# Samples kept per histogram (most recent wins)
+SAMPLE_WINDOW = 1024
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """
+    Normalize a SQL statement so that queries differing only in literals,
+    placeholders, IN-list arity or whitespace share one fingerprint.
+    """
+    if not sql:
+        return ""
+    fp = _STRING_LITERAL.sub("?", sql)
+    fp = _PLACEHOLDER.sub("?", fp)
+    fp = _NUMBER_LITERAL.sub("?", fp)
+    fp = _WHITESPACE.sub(" ", fp).strip()
+    fp = _IN_LIST.sub("IN (?+)", fp)
+    return fp
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not ordered:
+        return 0.0
+    n = len(ordered)
+    idx = min(n - 1, max(0, int(round(pct / 100.0 * n)) - 1))
+    return round(ordered[idx], 2)
+
+
+class LatencyHistogram:
+    """Rolling latency window with count/total/max and on-demand percentiles."""
+
+    __slots__ = ("count", "total_ms", "max_ms", "_samples")
+
+    def __init__(self, window: int = SAMPLE_WINDOW):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self._samples.append(ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "avgMs": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50Ms": _percentile(ordered, 50),
+            "p95Ms": _percentile(ordered, 95),
+            "p99Ms": _percentile(ordered, 99),
+            "maxMs": round(self.max_ms, 2),
+        }
+
+
+class QueryMetrics:
+    """Process-wide registry for MySQL pool and statement metrics."""
+
+    def __init__(self):
+        self.acquire_wait = LatencyHistogram()
+        self.queries: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.slow_queries = 0
+
+    def record_acquire_wait(self, ms: float) -> None:
+        self.acquire_wait.observe(ms)
+        acquire_wait_seconds.observe(ms / 1000.0)
+
+    def _bucket(self, fp: str) -> LatencyHistogram:
+        hist = self.queries.get(fp)
+        if hist is None:
+            if len(self.queries) >= MAX_FINGERPRINTS:
+                fp = OTHER_FINGERPRINT
+                hist = self.queries.get(fp)
+            if hist is None:
+                hist = LatencyHistogram()
+                self.queries[fp] = hist
+        return hist
+
+    def record_query(self, sql: str, ms: float, error: Optional[BaseException] = None) -> None:
+        fp = fingerprint(sql)
+        self._bucket(fp).observe(ms)
+        query_duration_seconds.observe(ms / 1000.0, outcome="ok" if error is None else "error")
+
+        if error is not None:
+            self.errors[fp] = self.errors.get(fp, 0) + 1
+
+        threshold = settings.MYSQL_SLOW_QUERY_MS
+        if threshold and ms >= threshold:
+            self.slow_queries += 1
+            slow_queries_total.inc()
+            logger.warning("Slow MySQL query (%.0fms >= %dms): %s", ms, threshold, fp)
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def snapshot(self) -> Dict[str, Any]:
+        queries = {fp: hist.snapshot() for fp, hist in self.queries.items()}
+        for fp, count in self.errors.items():
+            if fp in queries:
+                queries[fp]["errors"] = count
+        return {
+            "acquireWait": self.acquire_wait.snapshot(),
+            "slowQueries": self.slow_queries,
+            "slowQueryThresholdMs": settings.MYSQL_SLOW_QUERY_MS,
+            "queries": queries,
+        }
+
+
+query_metrics = QueryMetrics()
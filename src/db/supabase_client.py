@@ -1,17 +1,27 @@
 """Supabase client wrapper with production-ready error handling."""
 
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import logging
-
-from supabase import create_client, Client
-from supabase.lib.client_options import ClientOptions
+import time
 
 from ..config import settings
 
+if TYPE_CHECKING:  # supabase costs ~150-250 ms to import; load it on first client
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
 
+# Columns the worker needs to schedule and claim a job. Heavy columns
+# (transcript, recording_files, processing_metadata) are loaded per claimed job.
+QUEUE_COLUMNS = (
+    "id, status, processing_attempts, next_retry_at, created_at, "
+    "processing_started_at, user_id, teacher_id, class_id, teacher_email, "
+    "meeting_id, meeting_date, start_time, lesson_number"
+)
+
+
 class SupabaseClientError(Exception):
     """Custom exception for Supabase operations."""
     pass
@@ -39,6 +49,9 @@ class SupabaseClient:
             return
         
         try:
+            from supabase import create_client
+            from supabase.lib.client_options import ClientOptions
+
             # Configure client with reasonable timeouts when supported.
             # Some supabase-py versions expect different ClientOptions fields
             # (e.g. 'storage'), so we fall back to default options if this fails.
@@ -138,14 +151,32 @@ class SupabaseClient:
     # ------------------------------------------------------------------
     # Task Fetching – PENDING
     # ------------------------------------------------------------------
-    def find_pending_summaries(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Return pending summaries eligible for processing."""
+    def find_pending_summaries(
+        self,
+        limit: int = 10,
+        now: Optional[int] = None,
+        fresh_since: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return pending summaries eligible for processing.
+
+        Rows whose ``next_retry_at`` (unix seconds, set by the worker's backoff)
+        is still in the future are skipped. Only QUEUE_COLUMNS are selected.
+        ``fresh_since`` (ISO date) restricts to lessons held on/after that day.
+        """
         client = self._ensure_client()
+        now = int(time.time()) if now is None else int(now)
         try:
-            resp = (
+            query = (
                 client.table("zoom_summaries")
-                .select("*")
+                .select(QUEUE_COLUMNS)
                 .eq("status", "pending")
+                .or_(f"next_retry_at.is.null,next_retry_at.lte.{now}")
+            )
+            if fresh_since:
+                query = query.gte("meeting_date", fresh_since)
+            resp = (
+                query
                 .order("created_at", desc=False)
                 .limit(limit)
                 .execute()
@@ -155,13 +186,35 @@ class SupabaseClient:
             logger.error("Failed to find pending summaries: %s", e)
             return []
 
-    def get_zoom_summary_by_id(self, zoom_summary_id: int) -> Optional[Dict[str, Any]]:
-        """Get a specific zoom summary by ID."""
+    def count_pending_summaries(self, now: Optional[int] = None) -> Optional[int]:
+        """
+        Exact number of rows ``find_pending_summaries`` could return (no row
+        data is transferred). None when the count query fails.
+        """
+        client = self._ensure_client()
+        now = int(time.time()) if now is None else int(now)
+        try:
+            resp = (
+                client.table("zoom_summaries")
+                .select("id", count="exact", head=True)
+                .eq("status", "pending")
+                .or_(f"next_retry_at.is.null,next_retry_at.lte.{now}")
+                .execute()
+            )
+            return getattr(resp, "count", None)
+        except Exception as e:
+            logger.error("Failed to count pending summaries: %s", e)
+            return None
+
+    def get_zoom_summary_by_id(
+        self, zoom_summary_id: int, columns: str = "*"
+    ) -> Optional[Dict[str, Any]]:
+        """Get a specific zoom summary by ID (optionally only ``columns``)."""
         client = self._ensure_client()
         try:
             resp = (
                 client.table("zoom_summaries")
-                .select("*")
+                .select(columns)
                 .eq("id", zoom_summary_id)
                 .limit(1)
                 .execute()
@@ -199,7 +252,7 @@ class SupabaseClient:
 
             resp = (
                 client.table("zoom_summaries")
-                .select("*")
+                .select(QUEUE_COLUMNS)
                 .eq("status", "processing")
                 .lt("processing_started_at", cutoff_iso)
                 .order("processing_started_at", desc=False)
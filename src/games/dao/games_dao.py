@@ -3,13 +3,23 @@ Unified Games DAO for TULKKA Games APIs.
 Handles game_sessions, game_results and user_mistakes tables for all game types.
 """
 
-import json
 import uuid
 import random
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-# Note: 'pool' is expected to be an aiomysql pool or similar async DB pool
+from src.db.mysql_pool import UnitOfWork
+from src.games.dao.queries import after_params, mistakes_page, sql
+from src.games.dao.rows import decode_mistake, decode_result, decode_session
+from src.games.utils.responses import decode_cursor, encode_cursor, keyset_page
+from src import json_utils
+
+# Cursor kind for mistakes pages ordered by (last_answered_at, id)
+MISTAKES_CURSOR = "mistakes:last_answered_at"
+
+
+# Note: 'pool' is expected to be an aiomysql pool or a UnitOfWork (same acquire() interface)
 class GamesDAO:
     """Data Access Object for unified game sessions and results."""
 
@@ -19,6 +29,16 @@ class GamesDAO:
     def __init__(self, pool):
         self.pool = pool
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["GamesDAO"]:
+        """Yield a DAO bound to a single connection/transaction (see UnitOfWork).
+
+        Pass ``tx.pool`` to the idempotency helpers so the whole request handler
+        shares the same connection. Commits on exit, rolls back on exception.
+        """
+        async with UnitOfWork(self.pool) as uow:
+            yield GamesDAO(uow)
+
     # =========================================================================
     # Session Operations
     # =========================================================================
@@ -53,27 +73,13 @@ class GamesDAO:
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    """
-                    INSERT INTO game_sessions (
-                        id, user_id, game_type, mode,
-                        word_list_id, topic_id, category_id, lesson_id, class_id,
-                        difficulty, item_order,
-                        progress_current, progress_total, correct_count, incorrect_count,
-                        mastered_ids, needs_practice_ids, status
-                    ) VALUES (
-                        %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s,
-                        %s, %s,
-                        0, %s, 0, 0,
-                        %s, %s, 'active'
-                    )
-                    """,
+                    sql("session.insert"),
                     (
                         session_id, user_id, game_type, mode,
                         word_list_id, topic_id, category_id, lesson_id, class_id,
-                        difficulty, json.dumps(ordered_ids),
+                        difficulty, json_utils.dumps(ordered_ids),
                         progress_total,
-                        json.dumps([]), json.dumps([])
+                        json_utils.dumps([]), json_utils.dumps([])
                     )
                 )
                 await conn.commit()
@@ -108,16 +114,7 @@ class GamesDAO:
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    """
-                    SELECT 
-                        id, user_id, game_type, mode,
-                        word_list_id, topic_id, category_id, lesson_id, class_id,
-                        difficulty, item_order,
-                        progress_current, progress_total, correct_count, incorrect_count,
-                        mastered_ids, needs_practice_ids,
-                        started_at, completed_at, status
-                    FROM game_sessions WHERE id = %s
-                    """,
+                    sql("session.by_id"),
                     (session_id,)
                 )
                 row = await cur.fetchone()
@@ -140,12 +137,7 @@ class GamesDAO:
                 async with conn.cursor() as cur:
                     # Lock the session row to avoid race conditions
                     await cur.execute(
-                        """
-                        SELECT 
-                            progress_current, progress_total, correct_count, incorrect_count,
-                            mastered_ids, needs_practice_ids
-                        FROM game_sessions WHERE id = %s FOR UPDATE
-                        """,
+                        sql("session.progress_for_update"),
                         (session_id,)
                     )
                     row = await cur.fetchone()
@@ -157,8 +149,8 @@ class GamesDAO:
                     current, total, correct, incorrect, mastered_json, needs_json = row
 
                     # Parse JSON arrays safely
-                    mastered = json.loads(mastered_json) if mastered_json else []
-                    needs_practice = json.loads(needs_json) if needs_json else []
+                    mastered = json_utils.loads(mastered_json) if mastered_json else []
+                    needs_practice = json_utils.loads(needs_json) if needs_json else []
 
                     # Update counters
                     new_current = min(current + 1, total)
@@ -179,19 +171,10 @@ class GamesDAO:
 
                     # Persist changes
                     await cur.execute(
-                        """
-                        UPDATE game_sessions SET
-                            progress_current = %s,
-                            correct_count = %s,
-                            incorrect_count = %s,
-                            mastered_ids = %s,
-                            needs_practice_ids = %s,
-                            updated_at = NOW()
-                        WHERE id = %s
-                        """,
+                        sql("session.update_progress"),
                         (
                             new_current, new_correct, new_incorrect,
-                            json.dumps(mastered), json.dumps(needs_practice),
+                            json_utils.dumps(mastered), json_utils.dumps(needs_practice),
                             session_id
                         )
                     )
@@ -216,13 +199,7 @@ class GamesDAO:
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    """
-                    UPDATE game_sessions SET
-                        status = 'completed',
-                        completed_at = NOW(),
-                        updated_at = NOW()
-                    WHERE id = %s AND status = 'active'
-                    """,
+                    sql("session.complete"),
                     (session_id,)
                 )
                 await conn.commit()
@@ -253,25 +230,13 @@ class GamesDAO:
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    """
-                    INSERT INTO game_results (
-                        session_id, item_id, client_result_id,
-                        is_correct, attempts, time_spent_ms, skipped,
-                        user_answer, selected_answer, selected_answers,
-                        user_tokens, error_type
-                    ) VALUES (
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s
-                    )
-                    """,
+                    sql("result.insert"),
                     (
                         session_id, item_id, client_result_id,
                         1 if is_correct else 0, attempts, time_spent_ms, 1 if skipped else 0,
                         user_answer, selected_answer,
-                        json.dumps(selected_answers) if selected_answers is not None else None,
-                        json.dumps(user_tokens) if user_tokens is not None else None,
+                        json_utils.dumps(selected_answers) if selected_answers is not None else None,
+                        json_utils.dumps(user_tokens) if user_tokens is not None else None,
                         error_type
                     )
                 )
@@ -283,15 +248,7 @@ class GamesDAO:
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    """
-                    SELECT 
-                        id, item_id, client_result_id,
-                        is_correct, attempts, time_spent_ms, skipped,
-                        user_answer, selected_answer, selected_answers,
-                        user_tokens, error_type, created_at
-                    FROM game_results WHERE session_id = %s
-                    ORDER BY created_at ASC
-                    """,
+                    sql("result.by_session"),
                     (session_id,)
                 )
                 rows = await cur.fetchall()
@@ -319,29 +276,11 @@ class GamesDAO:
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    """
-                    INSERT INTO user_mistakes (
-                        user_id, game_type, item_id,
-                        user_answer, correct_answer, selected_answers, error_type,
-                        mistake_count, last_answered_at
-                    ) VALUES (
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        1, NOW()
-                    )
-                    ON DUPLICATE KEY UPDATE
-                        user_answer = VALUES(user_answer),
-                        correct_answer = VALUES(correct_answer),
-                        selected_answers = VALUES(selected_answers),
-                        error_type = VALUES(error_type),
-                        mistake_count = mistake_count + 1,
-                        last_answered_at = NOW(),
-                        updated_at = NOW()
-                    """,
+                    sql("mistake.upsert"),
                     (
                         user_id, game_type, item_id,
                         user_answer, correct_answer,
-                        json.dumps(selected_answers) if selected_answers is not None else None,
+                        json_utils.dumps(selected_answers) if selected_answers is not None else None,
                         error_type
                     )
                 )
@@ -366,20 +305,12 @@ class GamesDAO:
             async with conn.cursor() as cur:
                 # Decrement
                 await cur.execute(
-                    """
-                    UPDATE user_mistakes
-                    SET mistake_count = GREATEST(mistake_count - 1, 0),
-                        updated_at = NOW()
-                    WHERE user_id = %s AND game_type = %s AND item_id = %s
-                    """,
+                    sql("mistake.decrement"),
                     (user_id, game_type, item_id)
                 )
                 # Remove rows where count <= 0
                 await cur.execute(
-                    """
-                    DELETE FROM user_mistakes
-                    WHERE user_id = %s AND game_type = %s AND item_id = %s AND mistake_count <= 0
-                    """,
+                    sql("mistake.delete_exhausted"),
                     (user_id, game_type, item_id)
                 )
                 await conn.commit()
@@ -389,51 +320,46 @@ class GamesDAO:
         user_id: str,
         game_type: str,
         page: int = 1,
-        limit: int = 20
-    ) -> Tuple[List[Dict[str, Any]], int]:
-        """Get paginated user mistakes for a game type."""
-        offset = (page - 1) * limit
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+        """Get paginated user mistakes for a game type.
+
+        Pages are ordered by (last_answered_at, id) DESC. With ``cursor`` (the
+        ``nextCursor`` of the previous page) the page is fetched by keyset and
+        ``page`` is ignored. Returns (mistakes, total, next_cursor); total is
+        None when ``include_total`` is False.
+        """
+        params: List[Any] = [user_id, game_type]
+        if cursor:
+            params.extend(after_params(decode_cursor(cursor, MISTAKES_CURSOR)))
+            offset = 0
+        else:
+            offset = (page - 1) * limit
 
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(
-                    """
-                    SELECT COUNT(*) FROM user_mistakes
-                    WHERE user_id = %s AND game_type = %s
-                    """,
-                    (user_id, game_type)
-                )
-                total_row = await cur.fetchone()
-                total = total_row[0] if total_row else 0
+                total = None
+                if include_total:
+                    await cur.execute(
+                        sql("mistake.count"),
+                        (user_id, game_type)
+                    )
+                    total_row = await cur.fetchone()
+                    total = total_row[0] if total_row else 0
 
                 await cur.execute(
-                    """
-                    SELECT 
-                        item_id, user_answer, correct_answer,
-                        selected_answers, error_type,
-                        mistake_count, last_answered_at
-                    FROM user_mistakes
-                    WHERE user_id = %s AND game_type = %s
-                    ORDER BY last_answered_at DESC
-                    LIMIT %s OFFSET %s
-                    """,
-                    (user_id, game_type, limit, offset)
+                    mistakes_page(bool(cursor)),
+                    params + [limit + 1, offset]
                 )
                 rows = await cur.fetchall()
 
-                mistakes = []
-                for row in rows:
-                    mistakes.append({
-                        "itemId": row[0],
-                        "userAnswer": row[1],
-                        "correctAnswer": row[2],
-                        "selectedAnswers": json.loads(row[3]) if row[3] else None,
-                        "errorType": row[4],
-                        "mistakeCount": row[5],
-                        "lastAnsweredAt": row[6].isoformat() + "Z" if row[6] else None
-                    })
-
-                return mistakes, total
+        rows, next_cursor = keyset_page(
+            rows, limit,
+            lambda r: encode_cursor(MISTAKES_CURSOR, r[6], r[7])
+        )
+        return [decode_mistake(row) for row in rows], total, next_cursor
 
     async def get_mistake_item_ids(
         self,
@@ -445,12 +371,7 @@ class GamesDAO:
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    """
-                    SELECT item_id FROM user_mistakes
-                    WHERE user_id = %s AND game_type = %s
-                    ORDER BY mistake_count DESC, last_answered_at DESC
-                    LIMIT %s
-                    """,
+                    sql("mistake.item_ids"),
                     (user_id, game_type, limit)
                 )
                 rows = await cur.fetchall()
@@ -461,75 +382,9 @@ class GamesDAO:
     # =========================================================================
 
     def _row_to_session(self, row: tuple) -> Dict[str, Any]:
-        """Convert a database row to a session dict."""
-        # handle nulls and JSON safely
-        item_order = []
-        try:
-            item_order = json.loads(row[10]) if row[10] else []
-        except Exception:
-            item_order = []
-
-        mastered = []
-        needs = []
-        try:
-            mastered = json.loads(row[15]) if row[15] else []
-        except Exception:
-            mastered = []
-        try:
-            needs = json.loads(row[16]) if row[16] else []
-        except Exception:
-            needs = []
-
-        return {
-            "id": row[0],
-            "userId": row[1],
-            "gameType": row[2],
-            "mode": row[3],
-            "wordListId": row[4],
-            "topicId": row[5],
-            "categoryId": row[6],
-            "lessonId": row[7],
-            "classId": row[8],
-            "difficulty": row[9],
-            "itemOrder": item_order,
-            "progress": {
-                "current": row[11],
-                "total": row[12],
-                "correct": row[13],
-                "incorrect": row[14]
-            },
-            "masteredIds": mastered,
-            "needsPracticeIds": needs,
-            "startedAt": row[17].isoformat() + "Z" if row[17] else None,
-            "completedAt": row[18].isoformat() + "Z" if row[18] else None,
-            "status": row[19]
-        }
+        """Convert a database row to a session dict (see rows.SessionRow)."""
+        return decode_session(row)
 
     def _row_to_result(self, row: tuple) -> Dict[str, Any]:
-        """Convert a database row to a result dict."""
-        selected_answers = None
-        user_tokens = None
-        try:
-            selected_answers = json.loads(row[9]) if row[9] else None
-        except Exception:
-            selected_answers = None
-        try:
-            user_tokens = json.loads(row[10]) if row[10] else None
-        except Exception:
-            user_tokens = None
-
-        return {
-            "id": row[0],
-            "itemId": row[1],
-            "clientResultId": row[2],
-            "isCorrect": bool(row[3]),
-            "attempts": row[4],
-            "timeSpentMs": row[5],
-            "skipped": bool(row[6]),
-            "userAnswer": row[7],
-            "selectedAnswer": row[8],
-            "selectedAnswers": selected_answers,
-            "userTokens": user_tokens,
-            "errorType": row[11],
-            "createdAt": row[12].isoformat() + "Z" if row[12] else None
-        }
+        """Convert a database row to a result dict (see rows.ResultRow)."""
+        return decode_result(row)
@@ -0,0 +1,327 @@
+"""
+Named SQL statements for the hottest TULKKA Games queries.
+
+All statements are built once at import time; IN-list variants are built once
+per (template, arity) and cached. Routes and GamesDAO look statements up by
+name instead of assembling SQL strings per request, which also gives a single
+place to tune/benchmark a query (see /v1/metrics for per-fingerprint latency).
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+# =============================================================================
+# Column lists (order MUST match the row types in rows.py)
+# =============================================================================
+
+WORD_COLUMNS = (
+    "id, word, translation, notes, is_favorite, "
+    "practice_count, correct_count, accuracy, last_practiced, "
+    "created_at, updated_at"
+)
+
+WORD_LIST_COLUMNS = "id, name, description, word_count, is_favorite, created_at, updated_at"
+
+SESSION_COLUMNS = (
+    "id, user_id, game_type, mode, "
+    "word_list_id, topic_id, category_id, lesson_id, class_id, "
+    "difficulty, item_order, "
+    "progress_current, progress_total, correct_count, incorrect_count, "
+    "mastered_ids, needs_practice_ids, "
+    "started_at, completed_at, status"
+)
+
+RESULT_COLUMNS = (
+    "id, item_id, client_result_id, "
+    "is_correct, attempts, time_spent_ms, skipped, "
+    "user_answer, selected_answer, selected_answers, "
+    "user_tokens, error_type, created_at"
+)
+
+MISTAKE_COLUMNS = (
+    "item_id, user_answer, correct_answer, "
+    "selected_answers, error_type, "
+    "mistake_count, last_answered_at, id"
+)
+
+EXERCISE_COLUMNS = "id, lesson_id, exercise_data, topic_id, difficulty, hint"
+
+FLASHCARD_EXERCISE_COLUMNS = "id, exercise_data, difficulty, hint, explanation"
+
+
+# =============================================================================
+# Fixed statements
+# =============================================================================
+
+STATEMENTS: Dict[str, str] = {
+    # --- words / word lists -------------------------------------------------
+    "word.by_id": f"SELECT {WORD_COLUMNS} FROM words WHERE id = %s",
+    "word.by_list": (
+        f"SELECT {WORD_COLUMNS} FROM words WHERE list_id = %s "
+        "ORDER BY created_at DESC LIMIT %s"
+    ),
+    "word.record_practice": (
+        "UPDATE words SET "
+        "practice_count = practice_count + 1, "
+        "correct_count = correct_count + %s, "
+        "accuracy = ROUND(100 * (correct_count + %s) / (practice_count + 1)), "
+        "last_practiced = NOW() "
+        "WHERE id = %s"
+    ),
+    "word_list.by_id": f"SELECT {WORD_LIST_COLUMNS} FROM word_lists WHERE id = %s",
+    "word_list.owned_by_id": (
+        f"SELECT {WORD_LIST_COLUMNS} FROM word_lists WHERE id = %s AND user_id = %s"
+    ),
+    "word_list.exists_for_user": "SELECT id FROM word_lists WHERE id = %s AND user_id = %s",
+
+    # --- sessions -----------------------------------------------------------
+    "session.insert": (
+        "INSERT INTO game_sessions ("
+        "id, user_id, game_type, mode, "
+        "word_list_id, topic_id, category_id, lesson_id, class_id, "
+        "difficulty, item_order, "
+        "progress_current, progress_total, correct_count, incorrect_count, "
+        "mastered_ids, needs_practice_ids, status"
+        ") VALUES ("
+        "%s, %s, %s, %s, "
+        "%s, %s, %s, %s, %s, "
+        "%s, %s, "
+        "0, %s, 0, 0, "
+        "%s, %s, 'active')"
+    ),
+    "session.by_id": f"SELECT {SESSION_COLUMNS} FROM game_sessions WHERE id = %s",
+    "session.progress_for_update": (
+        "SELECT progress_current, progress_total, correct_count, incorrect_count, "
+        "mastered_ids, needs_practice_ids "
+        "FROM game_sessions WHERE id = %s FOR UPDATE"
+    ),
+    "session.update_progress": (
+        "UPDATE game_sessions SET "
+        "progress_current = %s, "
+        "correct_count = %s, "
+        "incorrect_count = %s, "
+        "mastered_ids = %s, "
+        "needs_practice_ids = %s, "
+        "updated_at = NOW() "
+        "WHERE id = %s"
+    ),
+    "session.complete": (
+        "UPDATE game_sessions SET "
+        "status = 'completed', completed_at = NOW(), updated_at = NOW() "
+        "WHERE id = %s AND status = 'active'"
+    ),
+
+    # --- results ------------------------------------------------------------
+    "result.insert": (
+        "INSERT INTO game_results ("
+        "session_id, item_id, client_result_id, "
+        "is_correct, attempts, time_spent_ms, skipped, "
+        "user_answer, selected_answer, selected_answers, "
+        "user_tokens, error_type"
+        ") VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+    ),
+    "result.by_session": (
+        f"SELECT {RESULT_COLUMNS} FROM game_results WHERE session_id = %s "
+        "ORDER BY created_at ASC"
+    ),
+    "result.by_client_id": (
+        "SELECT id, is_correct, attempts, time_spent_ms, created_at "
+        "FROM game_results WHERE session_id = %s AND client_result_id = %s"
+    ),
+
+    # --- mistakes -----------------------------------------------------------
+    "mistake.upsert": (
+        "INSERT INTO user_mistakes ("
+        "user_id, game_type, item_id, "
+        "user_answer, correct_answer, selected_answers, error_type, "
+        "mistake_count, last_answered_at"
+        ") VALUES (%s, %s, %s, %s, %s, %s, %s, 1, NOW()) "
+        "ON DUPLICATE KEY UPDATE "
+        "user_answer = VALUES(user_answer), "
+        "correct_answer = VALUES(correct_answer), "
+        "selected_answers = VALUES(selected_answers), "
+        "error_type = VALUES(error_type), "
+        "mistake_count = mistake_count + 1, "
+        "last_answered_at = NOW(), "
+        "updated_at = NOW()"
+    ),
+    "mistake.decrement": (
+        "UPDATE user_mistakes "
+        "SET mistake_count = GREATEST(mistake_count - 1, 0), updated_at = NOW() "
+        "WHERE user_id = %s AND game_type = %s AND item_id = %s"
+    ),
+    "mistake.delete_exhausted": (
+        "DELETE FROM user_mistakes "
+        "WHERE user_id = %s AND game_type = %s AND item_id = %s AND mistake_count <= 0"
+    ),
+    "mistake.count": "SELECT COUNT(*) FROM user_mistakes WHERE user_id = %s AND game_type = %s",
+    "mistake.item_ids": (
+        "SELECT item_id FROM user_mistakes "
+        "WHERE user_id = %s AND game_type = %s "
+        "ORDER BY mistake_count DESC, last_answered_at DESC "
+        "LIMIT %s"
+    ),
+
+    # --- idempotency --------------------------------------------------------
+    "idempotency.get": (
+        "SELECT response_data, expires_at FROM idempotency_keys "
+        "WHERE user_id = %s AND endpoint = %s AND idempotency_key = %s "
+        "AND (expires_at IS NULL OR expires_at > NOW())"
+    ),
+    "idempotency.put": (
+        "INSERT INTO idempotency_keys "
+        "(id, user_id, endpoint, idempotency_key, response_data, expires_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE "
+        "response_data = VALUES(response_data), expires_at = VALUES(expires_at)"
+    ),
+    "idempotency.purge_expired": (
+        "DELETE FROM idempotency_keys WHERE expires_at < NOW() LIMIT %s"
+    ),
+}
+
+
+# =============================================================================
+# IN-list templates ({ids} is replaced by "%s,%s,..." for the given arity)
+# =============================================================================
+
+IN_TEMPLATES: Dict[str, str] = {
+    "words.by_ids": f"SELECT {WORD_COLUMNS} FROM words WHERE id IN ({{ids}})",
+    "words.by_ids_in_list": (
+        f"SELECT {WORD_COLUMNS} FROM words WHERE id IN ({{ids}}) AND list_id = %s"
+    ),
+    "words.names_by_ids": "SELECT id, word, translation FROM words WHERE id IN ({ids})",
+    "exercises.by_ids": f"SELECT {EXERCISE_COLUMNS} FROM lesson_exercises WHERE id IN ({{ids}})",
+    "exercises.summary_by_ids": (
+        "SELECT id, exercise_data, topic_id FROM lesson_exercises WHERE id IN ({ids})"
+    ),
+    "exercises.flashcards_by_ids": (
+        f"SELECT {FLASHCARD_EXERCISE_COLUMNS} FROM lesson_exercises WHERE id IN ({{ids}})"
+    ),
+    # params: ids..., exercise_type
+    "exercises.approved_by_ids": (
+        "SELECT le.id, le.lesson_id, le.exercise_data, le.topic_id, le.difficulty, le.hint "
+        "FROM lesson_exercises le "
+        "JOIN lessons l ON l.id = le.lesson_id "
+        "WHERE le.id IN ({ids}) AND le.exercise_type = %s AND l.status = 'approved'"
+    ),
+}
+
+
+def sql(name: str) -> str:
+    """Return a registered statement by name (KeyError on typos, caught in tests)."""
+    return STATEMENTS[name]
+
+
+@lru_cache(maxsize=1024)
+def sql_in(name: str, arity: int) -> str:
+    """Return the IN-list statement `name` expanded for `arity` ids (cached)."""
+    if arity < 1:
+        raise ValueError("IN-list arity must be >= 1")
+    return IN_TEMPLATES[name].format(ids=",".join(["%s"] * arity))
+
+
+# =============================================================================
+# Filtered listing statements (cached per filter combination)
+#
+# Page statements are keyset-capable: rows are ordered by (sort column, id)
+# DESC, and when `has_cursor` is set a "strictly after the cursor row"
+# predicate is added (params: value, value, id) so deep pages seek through the
+# index instead of scanning and discarding OFFSET rows. Callers fetch
+# limit + 1 rows to detect whether another page exists (see keyset_page).
+# =============================================================================
+
+_WORD_LIST_SORT_COLUMNS = {"name": "name", "createdAt": "created_at", "updatedAt": "updated_at"}
+
+
+def word_list_sort_column(sort: str) -> str:
+    """Whitelisted word_lists column for an API sort key (also a WordListRow field)."""
+    return _WORD_LIST_SORT_COLUMNS.get(sort, "created_at")
+
+
+def _after(column: str, id_column: str = "id") -> str:
+    """Keyset predicate for DESC ordering on (column, id)."""
+    return f"({column} < %s OR ({column} = %s AND {id_column} < %s))"
+
+
+def after_params(cursor_values: List[Any]) -> List[Any]:
+    """Expand a decoded (value, id) cursor into the params of the keyset predicate."""
+    value, row_id = cursor_values
+    return [value, value, row_id]
+
+
+@lru_cache(maxsize=64)
+def word_lists_page(
+    has_search: bool, has_favorite: bool, sort: str, has_cursor: bool = False
+) -> Tuple[str, str]:
+    """(count_sql, page_sql) for GET /v1/word-lists.
+
+    Params: user_id[, search][, favorite] (count); then [value, value, id] when
+    has_cursor, then limit, offset (page).
+    """
+    where = ["user_id = %s"]
+    if has_search:
+        where.append("name LIKE %s")
+    if has_favorite:
+        where.append("is_favorite = %s")
+    sort_col = word_list_sort_column(sort)
+    count_where = " AND ".join(where)
+    if has_cursor:
+        where.append(_after(sort_col))
+    return (
+        f"SELECT COUNT(*) FROM word_lists WHERE {count_where}",
+        f"SELECT {WORD_LIST_COLUMNS} FROM word_lists WHERE {' AND '.join(where)} "
+        f"ORDER BY {sort_col} DESC, id DESC LIMIT %s OFFSET %s",
+    )
+
+
+@lru_cache(maxsize=16)
+def words_page(has_search: bool, has_favorite: bool, has_cursor: bool = False) -> Tuple[str, str]:
+    """(count_sql, page_sql) for words in a list, ordered by (created_at, id) DESC.
+
+    Params: list_id[, search, search][, favorite] (count); then
+    [created_at, created_at, id] when has_cursor, then limit, offset (page).
+    """
+    where = ["list_id = %s"]
+    if has_search:
+        where.append("(word LIKE %s OR translation LIKE %s)")
+    if has_favorite:
+        where.append("is_favorite = %s")
+    count_where = " AND ".join(where)
+    if has_cursor:
+        where.append(_after("created_at"))
+    return (
+        f"SELECT COUNT(*) FROM words WHERE {count_where}",
+        f"SELECT {WORD_COLUMNS} FROM words WHERE {' AND '.join(where)} "
+        "ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s",
+    )
+
+
+@lru_cache(maxsize=2)
+def mistakes_page(has_cursor: bool = False) -> str:
+    """Mistakes page for (user_id, game_type), ordered by (last_answered_at, id) DESC.
+
+    Params: user_id, game_type[, last_answered_at, last_answered_at, id], limit, offset.
+    """
+    where = "user_id = %s AND game_type = %s"
+    if has_cursor:
+        where += " AND " + _after("last_answered_at")
+    return (
+        f"SELECT {MISTAKE_COLUMNS} FROM user_mistakes WHERE {where} "
+        "ORDER BY last_answered_at DESC, id DESC LIMIT %s OFFSET %s"
+    )
+
+
+@lru_cache(maxsize=2)
+def flashcard_mistakes_page(has_cursor: bool = False) -> str:
+    """Flashcard mistakes joined with their words; same ordering/params as mistakes_page."""
+    where = "um.user_id = %s AND um.game_type = %s"
+    if has_cursor:
+        where += " AND " + _after("um.last_answered_at", "um.id")
+    return (
+        "SELECT um.item_id, um.user_answer, um.correct_answer, um.last_answered_at, "
+        "w.word, w.translation, um.id "
+        "FROM user_mistakes um LEFT JOIN words w ON w.id = um.item_id "
+        f"WHERE {where} "
+        "ORDER BY um.last_answered_at DESC, um.id DESC LIMIT %s OFFSET %s"
+    )
@@ -0,0 +1,174 @@
+"""
+Typed row decoding for TULKKA Games tables.
+
+Each namedtuple mirrors a column list in queries.py, so positional tuples from
+the cursor are decoded by name in exactly one place instead of ad-hoc
+``row[7]`` indexing scattered across routes.
+"""
+
+from collections import namedtuple
+from typing import Any, Dict, Optional
+from src import json_utils
+
+WordRow = namedtuple(
+    "WordRow",
+    "id word translation notes is_favorite "
+    "practice_count correct_count accuracy last_practiced "
+    "created_at updated_at",
+)
+
+WordListRow = namedtuple(
+    "WordListRow",
+    "id name description word_count is_favorite created_at updated_at",
+)
+
+SessionRow = namedtuple(
+    "SessionRow",
+    "id user_id game_type mode "
+    "word_list_id topic_id category_id lesson_id class_id "
+    "difficulty item_order "
+    "progress_current progress_total correct_count incorrect_count "
+    "mastered_ids needs_practice_ids "
+    "started_at completed_at status",
+)
+
+ResultRow = namedtuple(
+    "ResultRow",
+    "id item_id client_result_id "
+    "is_correct attempts time_spent_ms skipped "
+    "user_answer selected_answer selected_answers "
+    "user_tokens error_type created_at",
+)
+
+MistakeRow = namedtuple(
+    "MistakeRow",
+    "item_id user_answer correct_answer selected_answers error_type "
+    "mistake_count last_answered_at id",
+)
+
+
+# =============================================================================
+# Field helpers
+# =============================================================================
+
+def iso_z(value) -> Optional[str]:
+    """Format a naive UTC datetime as ISO-8601 with a trailing Z."""
+    return value.isoformat() + "Z" if value else None
+
+
+def json_field(value, default=None):
+    """Decode a JSON column (str, already-decoded value or NULL) safely."""
+    if not value:
+        return default
+    if not isinstance(value, (str, bytes)):
+        return value
+    try:
+        return json_utils.loads(value)
+    except Exception:
+        return default
+
+
+# =============================================================================
+# Decoders (DB tuple -> API dict)
+# =============================================================================
+
+def decode_word(row: tuple) -> Dict[str, Any]:
+    w = WordRow._make(row)
+    return {
+        "id": w.id,
+        "word": w.word,
+        "translation": w.translation,
+        "notes": w.notes,
+        "isFavorite": bool(w.is_favorite),
+        "practiceCount": w.practice_count or 0,
+        "correctCount": w.correct_count or 0,
+        "accuracy": w.accuracy or 0,
+        "lastPracticed": iso_z(w.last_practiced),
+        "createdAt": iso_z(w.created_at),
+        "updatedAt": iso_z(w.updated_at),
+    }
+
+
+def decode_word_stats(row: tuple) -> Dict[str, Any]:
+    """Partial word payload returned after recording a practice result."""
+    w = WordRow._make(row)
+    return {
+        "id": w.id,
+        "practiceCount": w.practice_count,
+        "correctCount": w.correct_count,
+        "accuracy": w.accuracy,
+        "lastPracticed": iso_z(w.last_practiced),
+    }
+
+
+def decode_word_list(row: tuple) -> Dict[str, Any]:
+    wl = WordListRow._make(row)
+    return {
+        "id": wl.id,
+        "name": wl.name,
+        "description": wl.description,
+        "wordCount": wl.word_count or 0,
+        "isFavorite": bool(wl.is_favorite),
+        "createdAt": iso_z(wl.created_at),
+        "updatedAt": iso_z(wl.updated_at),
+    }
+
+
+def decode_session(row: tuple) -> Dict[str, Any]:
+    s = SessionRow._make(row)
+    return {
+        "id": s.id,
+        "userId": s.user_id,
+        "gameType": s.game_type,
+        "mode": s.mode,
+        "wordListId": s.word_list_id,
+        "topicId": s.topic_id,
+        "categoryId": s.category_id,
+        "lessonId": s.lesson_id,
+        "classId": s.class_id,
+        "difficulty": s.difficulty,
+        "itemOrder": json_field(s.item_order, []),
+        "progress": {
+            "current": s.progress_current,
+            "total": s.progress_total,
+            "correct": s.correct_count,
+            "incorrect": s.incorrect_count,
+        },
+        "masteredIds": json_field(s.mastered_ids, []),
+        "needsPracticeIds": json_field(s.needs_practice_ids, []),
+        "startedAt": iso_z(s.started_at),
+        "completedAt": iso_z(s.completed_at),
+        "status": s.status,
+    }
+
+
+def decode_result(row: tuple) -> Dict[str, Any]:
+    r = ResultRow._make(row)
+    return {
+        "id": r.id,
+        "itemId": r.item_id,
+        "clientResultId": r.client_result_id,
+        "isCorrect": bool(r.is_correct),
+        "attempts": r.attempts,
+        "timeSpentMs": r.time_spent_ms,
+        "skipped": bool(r.skipped),
+        "userAnswer": r.user_answer,
+        "selectedAnswer": r.selected_answer,
+        "selectedAnswers": json_field(r.selected_answers),
+        "userTokens": json_field(r.user_tokens),
+        "errorType": r.error_type,
+        "createdAt": iso_z(r.created_at),
+    }
+
+
+def decode_mistake(row: tuple) -> Dict[str, Any]:
+    m = MistakeRow._make(row)
+    return {
+        "itemId": m.item_id,
+        "userAnswer": m.user_answer,
+        "correctAnswer": m.correct_answer,
+        "selectedAnswers": json_field(m.selected_answers),
+        "errorType": m.error_type,
+        "mistakeCount": m.mistake_count,
+        "lastAnsweredAt": iso_z(m.last_answered_at),
+    }
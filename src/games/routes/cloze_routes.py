@@ -3,19 +3,20 @@ Advanced Cloze API Routes - TULKKA Games APIs Spec
 Implements: Topics, Lessons, Items, Sessions, Hints, Mistakes
 """
 
-import json
 from fastapi import APIRouter, Depends, Request, Query, Header, Response
-from fastapi.responses import JSONResponse
+from src.json_utils import FastJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Literal
 
 from src.games.middlewares.auth import get_current_user
 from src.games.dao.games_dao import GamesDAO
+from src.games.dao.queries import sql_in
 from src.games.utils import (
     ErrorCodes, raise_error, paginate, ok_response,
     check_idempotency, store_idempotency, check_client_result_id
 )
-from src.db.mysql_pool import get_pool
+from src.db.mysql_pool import get_pool, get_read_pool
+from src import json_utils
 
 router = APIRouter(prefix="/v1/advanced-cloze", tags=["Games - Advanced Cloze"])
 
@@ -56,9 +57,14 @@ async def get_pool_instance():
     return await get_pool()
 
 
+async def get_read_pool_instance():
+    """Get the pool for read-only endpoints (read replica when configured)."""
+    return await get_read_pool()
+
+
 def item_to_response(row: tuple, include_answer: bool = False) -> dict:
     """Convert a lesson_exercises row to Cloze Item format."""
-    exercise_data = row[2] if isinstance(row[2], dict) else json.loads(row[2]) if row[2] else {}
+    exercise_data = row[2] if isinstance(row[2], dict) else json_utils.loads(row[2]) if row[2] else {}
     
     response = {
         "id": row[0],
@@ -84,7 +90,7 @@ async def get_cloze_topics(
     user=Depends(get_current_user)
 ):
     """GET /v1/advanced-cloze/topics - Get available cloze topics."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -119,7 +125,7 @@ async def get_cloze_lessons(
     user=Depends(get_current_user)
 ):
     """GET /v1/advanced-cloze/lessons - Get cloze lessons."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -186,7 +192,7 @@ async def get_cloze_items(
     user=Depends(get_current_user)
 ):
     """GET /v1/advanced-cloze/items - Get cloze items catalog."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     include_answer = include and ("options" in include or "explanation" in include)
     
     async with pool.acquire() as conn:
@@ -256,9 +262,9 @@ async def start_cloze_session(
     
     # Check idempotency
     if idempotency_key:
-        cached = await check_idempotency(pool, user_id, "/v1/advanced-cloze/sessions", idempotency_key)
+        cached = await check_idempotency(pool, user_id, "/v1/advanced-cloze/sessions", idempotency_key, raw=True)
         if cached:
-            return JSONResponse(status_code=201, content=cached)
+            return FastJSONResponse(status_code=201, content=cached)
     
     items = []
     item_ids = []
@@ -267,15 +273,9 @@ async def start_cloze_session(
         async with conn.cursor() as cur:
             if payload.mode == "custom" and payload.selectedItemIds:
                 # Custom mode
-                placeholders = ",".join(["%s"] * len(payload.selectedItemIds))
                 await cur.execute(
-                    f"""
-                    SELECT le.id, le.lesson_id, le.exercise_data, le.topic_id, le.difficulty, le.hint
-                    FROM lesson_exercises le
-                    JOIN lessons l ON l.id = le.lesson_id
-                    WHERE le.id IN ({placeholders}) AND le.exercise_type = 'advanced_cloze' AND l.status = 'approved'
-                    """,
-                    payload.selectedItemIds
+                    sql_in("exercises.approved_by_ids", len(payload.selectedItemIds)),
+                    [*payload.selectedItemIds, "advanced_cloze"]
                 )
                 rows = await cur.fetchall()
                 
@@ -289,15 +289,9 @@ async def start_cloze_session(
                 if not mistake_ids:
                     raise_error(400, ErrorCodes.VALIDATION_ERROR, "No mistakes to review")
                 
-                placeholders = ",".join(["%s"] * len(mistake_ids))
                 await cur.execute(
-                    f"""
-                    SELECT le.id, le.lesson_id, le.exercise_data, le.topic_id, le.difficulty, le.hint
-                    FROM lesson_exercises le
-                    JOIN lessons l ON l.id = le.lesson_id
-                    WHERE le.id IN ({placeholders}) AND le.exercise_type = 'advanced_cloze' AND l.status = 'approved'
-                    """,
-                    mistake_ids
+                    sql_in("exercises.approved_by_ids", len(mistake_ids)),
+                    [*mistake_ids, "advanced_cloze"]
                 )
                 rows = await cur.fetchall()
                 
@@ -381,7 +375,7 @@ async def start_cloze_session(
     if idempotency_key:
         await store_idempotency(pool, user_id, "/v1/advanced-cloze/sessions", idempotency_key, response)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=201,
         content=response,
         headers={"Location": f"/v1/advanced-cloze/sessions/{session['id']}"}
@@ -394,7 +388,7 @@ async def get_cloze_session(
     user=Depends(get_current_user)
 ):
     """GET /v1/advanced-cloze/sessions/{sessionId} - Get session state for resume."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     dao = GamesDAO(pool)
     
@@ -409,12 +403,8 @@ async def get_cloze_session(
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             if session["itemOrder"]:
-                placeholders = ",".join(["%s"] * len(session["itemOrder"]))
                 await cur.execute(
-                    f"""
-                    SELECT id, lesson_id, exercise_data, topic_id, difficulty, hint
-                    FROM lesson_exercises WHERE id IN ({placeholders})
-                    """,
+                    sql_in("exercises.by_ids", len(session["itemOrder"])),
                     session["itemOrder"]
                 )
                 rows = await cur.fetchall()
@@ -447,87 +437,89 @@ async def record_cloze_result(
     """POST /v1/advanced-cloze/sessions/{sessionId}/results - Record a result."""
     pool = await get_pool_instance()
     user_id = user["userId"]
-    dao = GamesDAO(pool)
-    
-    # Check idempotency
-    endpoint = f"/v1/advanced-cloze/sessions/{session_id}/results"
-    if idempotency_key:
-        cached = await check_idempotency(pool, user_id, endpoint, idempotency_key)
-        if cached:
-            return cached
-    
-    # Check clientResultId deduplication
-    if payload.clientResultId:
-        existing = await check_client_result_id(pool, session_id, payload.clientResultId)
-        if existing:
-            session = await dao.get_session(session_id)
-            return {"ok": True, "progress": session["progress"], "item": existing}
-    
-    # Get session
-    session = await dao.get_session(session_id)
-    if not session or session["userId"] != user_id:
-        raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
-    
-    if session["status"] == "completed":
-        raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
     
-    # Validate item ID is in session
-    if payload.itemId not in session["itemOrder"]:
-        raise_error(400, ErrorCodes.UNKNOWN_ITEM, "Item not in session", {"invalidIds": [payload.itemId]})
-    
-    # Get correct answers for validation
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "SELECT exercise_data FROM lesson_exercises WHERE id = %s",
-                (payload.itemId,)
-            )
-            row = await cur.fetchone()
-            if not row:
-                raise_error(400, ErrorCodes.UNKNOWN_ITEM, "Item not found")
-            
-            exercise_data = row[0] if isinstance(row[0], dict) else json.loads(row[0]) if row[0] else {}
-            correct_answers = exercise_data.get("correct", [])
-    
-    # Server-side validation
-    is_correct = payload.selectedAnswers == correct_answers
-    
-    # Insert result
-    await dao.insert_result(
-        session_id=session_id,
-        item_id=payload.itemId,
-        is_correct=is_correct,
-        attempts=payload.attempts,
-        time_spent_ms=payload.timeSpentMs,
-        selected_answers=payload.selectedAnswers,
-        client_result_id=payload.clientResultId
-    )
-    
-    # Update session progress
-    progress = await dao.update_session_progress(session_id, is_correct, payload.itemId)
-    
-    # Track mistake if incorrect
-    if not is_correct:
-        await dao.record_mistake(
-            user_id, "advanced_cloze", payload.itemId,
+    # One connection + transaction for the whole handler (see UnitOfWork)
+    async with GamesDAO(pool).transaction() as dao:
+        uow = dao.pool
+        # Check idempotency
+        endpoint = f"/v1/advanced-cloze/sessions/{session_id}/results"
+        if idempotency_key:
+            cached = await check_idempotency(uow, user_id, endpoint, idempotency_key)
+            if cached:
+                return cached
+        
+        # Check clientResultId deduplication
+        if payload.clientResultId:
+            existing = await check_client_result_id(uow, session_id, payload.clientResultId)
+            if existing:
+                session = await dao.get_session(session_id)
+                return {"ok": True, "progress": session["progress"], "item": existing}
+        
+        # Get session
+        session = await dao.get_session(session_id)
+        if not session or session["userId"] != user_id:
+            raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
+        
+        if session["status"] == "completed":
+            raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
+        
+        # Validate item ID is in session
+        if payload.itemId not in session["itemOrder"]:
+            raise_error(400, ErrorCodes.UNKNOWN_ITEM, "Item not in session", {"invalidIds": [payload.itemId]})
+        
+        # Get correct answers for validation
+        async with uow.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT exercise_data FROM lesson_exercises WHERE id = %s",
+                    (payload.itemId,)
+                )
+                row = await cur.fetchone()
+                if not row:
+                    raise_error(400, ErrorCodes.UNKNOWN_ITEM, "Item not found")
+                
+                exercise_data = row[0] if isinstance(row[0], dict) else json_utils.loads(row[0]) if row[0] else {}
+                correct_answers = exercise_data.get("correct", [])
+        
+        # Server-side validation
+        is_correct = payload.selectedAnswers == correct_answers
+        
+        # Insert result
+        await dao.insert_result(
+            session_id=session_id,
+            item_id=payload.itemId,
+            is_correct=is_correct,
+            attempts=payload.attempts,
+            time_spent_ms=payload.timeSpentMs,
             selected_answers=payload.selectedAnswers,
-            correct_answer=json.dumps(correct_answers)
+            client_result_id=payload.clientResultId
         )
-    else:
-        await dao.remove_mistake(user_id, "advanced_cloze", payload.itemId)
-    
-    item_partial = {
-        "id": payload.itemId,
-        "lastSelected": payload.selectedAnswers,
-        "attempts": payload.attempts
-    }
-    
-    response = {"ok": True, "progress": progress, "item": item_partial}
-    
-    if idempotency_key:
-        await store_idempotency(pool, user_id, endpoint, idempotency_key, response)
-    
-    return response
+        
+        # Update session progress
+        progress = await dao.update_session_progress(session_id, is_correct, payload.itemId)
+        
+        # Track mistake if incorrect
+        if not is_correct:
+            await dao.record_mistake(
+                user_id, "advanced_cloze", payload.itemId,
+                selected_answers=payload.selectedAnswers,
+                correct_answer=json_utils.dumps(correct_answers)
+            )
+        else:
+            await dao.remove_mistake(user_id, "advanced_cloze", payload.itemId)
+        
+        item_partial = {
+            "id": payload.itemId,
+            "lastSelected": payload.selectedAnswers,
+            "attempts": payload.attempts
+        }
+        
+        response = {"ok": True, "progress": progress, "item": item_partial}
+        
+        if idempotency_key:
+            await store_idempotency(uow, user_id, endpoint, idempotency_key, response)
+        
+        return response
 
 
 @router.post("/sessions/{session_id}/complete")
@@ -574,7 +566,7 @@ async def get_cloze_hint(
     user=Depends(get_current_user)
 ):
     """GET /v1/advanced-cloze/items/{itemId}/hint - Get hint for an item."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -589,7 +581,7 @@ async def get_cloze_hint(
             
             hint = row[0]
             if not hint:
-                exercise_data = row[1] if isinstance(row[1], dict) else json.loads(row[1]) if row[1] else {}
+                exercise_data = row[1] if isinstance(row[1], dict) else json_utils.loads(row[1]) if row[1] else {}
                 hint = exercise_data.get("hint", "No hint available for this item.")
     
     return {"itemId": item_id, "hint": hint}
@@ -603,32 +595,32 @@ async def get_cloze_hint(
 async def get_cloze_mistakes(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page (keyset pagination)"),
+    includeTotal: bool = Query(True, description="Set false to skip the total count"),
     user=Depends(get_current_user)
 ):
     """GET /v1/advanced-cloze/mistakes - Get user's cloze mistakes for review."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     dao = GamesDAO(pool)
     
-    mistakes, total = await dao.get_user_mistakes(user_id, "advanced_cloze", page, limit)
+    mistakes, total, next_cursor = await dao.get_user_mistakes(
+        user_id, "advanced_cloze", page, limit, cursor=cursor, include_total=includeTotal
+    )
     
     # Enrich with item data
     if mistakes:
         async with pool.acquire() as conn:
             async with conn.cursor() as cur:
                 item_ids = [m["itemId"] for m in mistakes]
-                placeholders = ",".join(["%s"] * len(item_ids))
                 await cur.execute(
-                    f"""
-                    SELECT id, exercise_data, topic_id
-                    FROM lesson_exercises WHERE id IN ({placeholders})
-                    """,
+                    sql_in("exercises.summary_by_ids", len(item_ids)),
                     item_ids
                 )
                 rows = await cur.fetchall()
                 item_map = {}
                 for row in rows:
-                    exercise_data = row[1] if isinstance(row[1], dict) else json.loads(row[1]) if row[1] else {}
+                    exercise_data = row[1] if isinstance(row[1], dict) else json_utils.loads(row[1]) if row[1] else {}
                     item_map[row[0]] = {
                         "textParts": exercise_data.get("textParts"),
                         "topic": row[2]
@@ -639,7 +631,10 @@ async def get_cloze_mistakes(
                     m["textParts"] = i_data.get("textParts")
                     m["topic"] = i_data.get("topic")
     
-    return paginate(mistakes, page, limit, total)
+    return paginate(
+        mistakes, page, limit, total,
+        include_total=includeTotal, keyset=True, next_cursor=next_cursor
+    )
 
 
 # =============================================================================
@@ -649,7 +644,7 @@ async def get_cloze_mistakes(
 @router.get("/stats/me")
 async def get_cloze_stats(user=Depends(get_current_user)):
     """GET /v1/advanced-cloze/stats/me - Get user's cloze statistics."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     
     async with pool.acquire() as conn:
@@ -4,21 +4,31 @@ Implements: Word Lists, Words, Flashcard Sessions
 """
 
 from fastapi import APIRouter, Depends, Request, Query, Header, Response
-from fastapi.responses import JSONResponse
+from src.json_utils import FastJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
 from src.games.middlewares.auth import get_current_user
-from src.games.dao.games_dao import GamesDAO
+from src.games.dao.games_dao import GamesDAO, MISTAKES_CURSOR
+from src.games.dao.queries import (
+    after_params, flashcard_mistakes_page, sql, sql_in,
+    word_list_sort_column, word_lists_page, words_page,
+)
+from src.games.dao.rows import WordListRow, WordRow, decode_word, decode_word_list, decode_word_stats
 from src.games.utils import (
     ErrorCodes, raise_error, paginate, ok_response, 
-    check_idempotency, store_idempotency, check_client_result_id
+    check_idempotency, store_idempotency, check_client_result_id,
+    encode_cursor, decode_cursor, keyset_page
 )
-from src.db.mysql_pool import get_pool
+from src.db.mysql_pool import get_pool, get_read_pool
+from src import json_utils
 
 router = APIRouter(prefix="/v1", tags=["Games - Flashcards"])
 
+# Cursor kind for words-in-list pages ordered by (created_at, id)
+WORDS_CURSOR = "words:created_at"
+
 
 # =============================================================================
 # Pydantic Schemas
@@ -91,21 +101,14 @@ async def get_pool_instance():
     return await get_pool()
 
 
+async def get_read_pool_instance():
+    """Get the pool for read-only endpoints (read replica when configured)."""
+    return await get_read_pool()
+
+
 def word_to_response(row: tuple) -> dict:
     """Convert a word DB row to API response format."""
-    return {
-        "id": row[0],
-        "word": row[1],
-        "translation": row[2],
-        "notes": row[3],
-        "isFavorite": bool(row[4]),
-        "practiceCount": row[5] or 0,
-        "correctCount": row[6] or 0,
-        "accuracy": row[7] or 0,
-        "lastPracticed": row[8].isoformat() + "Z" if row[8] else None,
-        "createdAt": row[9].isoformat() + "Z" if row[9] else None,
-        "updatedAt": row[10].isoformat() + "Z" if row[10] else None
-    }
+    return decode_word(row)
 
 
 def _exercise_to_flashcard(row: tuple) -> dict:
@@ -114,7 +117,6 @@ def _exercise_to_flashcard(row: tuple) -> dict:
     Row format: (id, exercise_data, difficulty, hint, explanation)
     exercise_data JSON contains: word, translation, example_sentence, notes, etc.
     """
-    import json
     exercise_id = row[0]
     exercise_data = row[1]
     difficulty = row[2]
@@ -123,7 +125,7 @@ def _exercise_to_flashcard(row: tuple) -> dict:
     
     # Parse exercise_data if it's a string
     if isinstance(exercise_data, str):
-        exercise_data = json.loads(exercise_data)
+        exercise_data = json_utils.loads(exercise_data)
     
     return {
         "id": exercise_id,
@@ -144,15 +146,7 @@ def _exercise_to_flashcard(row: tuple) -> dict:
 
 def wordlist_to_response(row: tuple) -> dict:
     """Convert a word list DB row to API response format."""
-    return {
-        "id": row[0],
-        "name": row[1],
-        "description": row[2],
-        "wordCount": row[3] or 0,
-        "isFavorite": bool(row[4]),
-        "createdAt": row[5].isoformat() + "Z" if row[5] else None,
-        "updatedAt": row[6].isoformat() + "Z" if row[6] else None
-    }
+    return decode_word_list(row)
 
 
 # =============================================================================
@@ -166,51 +160,56 @@ async def list_word_lists(
     search: Optional[str] = None,
     favorite: Optional[bool] = None,
     sort: Optional[str] = Query("createdAt", pattern="^(name|createdAt|updatedAt)$"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page (keyset pagination)"),
+    includeTotal: bool = Query(True, description="Set false to skip the total count"),
     user=Depends(get_current_user)
 ):
-    """GET /v1/word-lists - List user's word lists with pagination."""
-    pool = await get_pool_instance()
+    """GET /v1/word-lists - List user's word lists with pagination.
+
+    Pages are ordered by (sort column, id) DESC. Passing the previous page's
+    ``nextCursor`` seeks directly to the next page instead of using OFFSET.
+    """
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
+    sort_col = word_list_sort_column(sort)
+    cursor_kind = f"word_lists:{sort_col}"
+    # Reject a bad cursor before any query runs on a pooled connection
+    after = after_params(decode_cursor(cursor, cursor_kind)) if cursor else []
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
-            # Build query
-            where_clauses = ["user_id = %s"]
+            # Build query (statement text is cached per filter/sort combination)
             params = [user_id]
-            
             if search:
-                where_clauses.append("name LIKE %s")
                 params.append(f"%{search}%")
-            
             if favorite is not None:
-                where_clauses.append("is_favorite = %s")
                 params.append(1 if favorite else 0)
-            
-            where_sql = " AND ".join(where_clauses)
-            
-            # Map sort field
-            sort_map = {"name": "name", "createdAt": "created_at", "updatedAt": "updated_at"}
-            sort_col = sort_map.get(sort, "created_at")
+            count_sql, page_sql = word_lists_page(bool(search), favorite is not None, sort, bool(cursor))
             
             # Get total count
-            await cur.execute(f"SELECT COUNT(*) FROM word_lists WHERE {where_sql}", params)
-            total = (await cur.fetchone())[0]
+            total = None
+            if includeTotal:
+                await cur.execute(count_sql, params)
+                total = (await cur.fetchone())[0]
             
-            # Get paginated data
-            offset = (page - 1) * limit
-            await cur.execute(
-                f"""
-                SELECT id, name, description, word_count, is_favorite, created_at, updated_at
-                FROM word_lists WHERE {where_sql}
-                ORDER BY {sort_col} DESC
-                LIMIT %s OFFSET %s
-                """,
-                params + [limit, offset]
-            )
+            # Get paginated data (one extra row tells us whether there is a next page)
+            offset = 0
+            if cursor:
+                params += after
+            else:
+                offset = (page - 1) * limit
+            await cur.execute(page_sql, params + [limit + 1, offset])
             rows = await cur.fetchall()
     
+    rows, next_cursor = keyset_page(
+        rows, limit,
+        lambda r: encode_cursor(cursor_kind, getattr(WordListRow._make(r), sort_col), r[0])
+    )
     data = [wordlist_to_response(row) for row in rows]
-    return paginate(data, page, limit, total)
+    return paginate(
+        data, page, limit, total,
+        include_total=includeTotal, keyset=True, next_cursor=next_cursor
+    )
 
 
 @router.post(
@@ -257,10 +256,7 @@ async def create_word_list(
             )
             await conn.commit()
             
-            await cur.execute(
-                "SELECT id, name, description, word_count, is_favorite, created_at, updated_at FROM word_lists WHERE id = %s",
-                (list_id,)
-            )
+            await cur.execute(sql("word_list.by_id"), (list_id,))
             row = await cur.fetchone()
     
     return wordlist_to_response(row)
@@ -274,22 +270,21 @@ async def get_word_list(
     limit: int = Query(100, ge=1, le=200),
     search: Optional[str] = None,
     favorite: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous words page (keyset pagination)"),
+    includeTotal: bool = Query(True, description="Set false to skip the total word count"),
     user=Depends(get_current_user)
 ):
     """GET /v1/word-lists/{listId} - Get a word list, optionally with words."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
+    with_words = bool(include and "words" in include)
+    # Reject a bad cursor before any query runs on a pooled connection
+    after = after_params(decode_cursor(cursor, WORDS_CURSOR)) if with_words and cursor else []
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             # Get word list
-            await cur.execute(
-                """
-                SELECT id, name, description, word_count, is_favorite, created_at, updated_at
-                FROM word_lists WHERE id = %s AND user_id = %s
-                """,
-                (list_id, user_id)
-            )
+            await cur.execute(sql("word_list.owned_by_id"), (list_id, user_id))
             row = await cur.fetchone()
             
             if not row:
@@ -298,43 +293,37 @@ async def get_word_list(
             result = wordlist_to_response(row)
             
             # Include words if requested
-            if include and "words" in include:
-                where_clauses = ["list_id = %s"]
+            if with_words:
                 params = [list_id]
-                
                 if search:
-                    where_clauses.append("(word LIKE %s OR translation LIKE %s)")
                     params.extend([f"%{search}%", f"%{search}%"])
-                
                 if favorite is not None:
-                    where_clauses.append("is_favorite = %s")
                     params.append(1 if favorite else 0)
-                
-                where_sql = " AND ".join(where_clauses)
+                count_sql, page_sql = words_page(bool(search), favorite is not None, bool(cursor))
                 
                 # Get total
-                await cur.execute(f"SELECT COUNT(*) FROM words WHERE {where_sql}", params)
-                total_words = (await cur.fetchone())[0]
+                total_words = None
+                if includeTotal:
+                    await cur.execute(count_sql, params)
+                    total_words = (await cur.fetchone())[0]
                 
-                # Get paginated words
-                offset = (page - 1) * limit
-                await cur.execute(
-                    f"""
-                    SELECT id, word, translation, notes, is_favorite,
-                           practice_count, correct_count, accuracy, last_practiced,
-                           created_at, updated_at
-                    FROM words WHERE {where_sql}
-                    ORDER BY created_at DESC
-                    LIMIT %s OFFSET %s
-                    """,
-                    params + [limit, offset]
-                )
+                # Get paginated words (keyset on (created_at, id) when a cursor is given)
+                offset = 0
+                if cursor:
+                    params += after
+                else:
+                    offset = (page - 1) * limit
+                await cur.execute(page_sql, params + [limit + 1, offset])
                 word_rows = await cur.fetchall()
                 
-                result["words"] = {
-                    "data": [word_to_response(w) for w in word_rows],
-                    "pagination": {"page": page, "limit": limit, "total": total_words}
-                }
+                word_rows, next_cursor = keyset_page(
+                    word_rows, limit,
+                    lambda r: encode_cursor(WORDS_CURSOR, WordRow._make(r).created_at, r[0])
+                )
+                result["words"] = paginate(
+                    [word_to_response(w) for w in word_rows], page, limit, total_words,
+                    include_total=includeTotal, keyset=True, next_cursor=next_cursor
+                )
     
     return result
 
@@ -379,10 +368,7 @@ async def update_word_list(
             if cur.rowcount == 0:
                 raise_error(404, ErrorCodes.WORD_LIST_NOT_FOUND, "Word list not found")
             
-            await cur.execute(
-                "SELECT id, name, description, word_count, is_favorite, created_at, updated_at FROM word_lists WHERE id = %s",
-                (list_id,)
-            )
+            await cur.execute(sql("word_list.by_id"), (list_id,))
             row = await cur.fetchone()
     
     return wordlist_to_response(row)
@@ -455,7 +441,7 @@ async def create_word(
         async with conn.cursor() as cur:
             # Verify list ownership
             await cur.execute(
-                "SELECT id FROM word_lists WHERE id = %s AND user_id = %s",
+                sql("word_list.exists_for_user"),
                 (list_id, user_id)
             )
             if not await cur.fetchone():
@@ -479,12 +465,7 @@ async def create_word(
             
             # Fetch created word
             await cur.execute(
-                """
-                SELECT id, word, translation, notes, is_favorite,
-                       practice_count, correct_count, accuracy, last_practiced,
-                       created_at, updated_at
-                FROM words WHERE id = %s
-                """,
+                sql("word.by_id"),
                 (word_id,)
             )
             row = await cur.fetchone()
@@ -527,7 +508,7 @@ async def update_word(
         async with conn.cursor() as cur:
             # Verify list ownership
             await cur.execute(
-                "SELECT id FROM word_lists WHERE id = %s AND user_id = %s",
+                sql("word_list.exists_for_user"),
                 (list_id, user_id)
             )
             if not await cur.fetchone():
@@ -546,12 +527,7 @@ async def update_word(
             
             # Fetch updated word
             await cur.execute(
-                """
-                SELECT id, word, translation, notes, is_favorite,
-                       practice_count, correct_count, accuracy, last_practiced,
-                       created_at, updated_at
-                FROM words WHERE id = %s
-                """,
+                sql("word.by_id"),
                 (word_id,)
             )
             row = await cur.fetchone()
@@ -573,7 +549,7 @@ async def delete_word(
         async with conn.cursor() as cur:
             # Verify list ownership
             await cur.execute(
-                "SELECT id FROM word_lists WHERE id = %s AND user_id = %s",
+                sql("word_list.exists_for_user"),
                 (list_id, user_id)
             )
             if not await cur.fetchone():
@@ -613,7 +589,7 @@ async def toggle_word_favorite(
         async with conn.cursor() as cur:
             # Verify list ownership
             await cur.execute(
-                "SELECT id FROM word_lists WHERE id = %s AND user_id = %s",
+                sql("word_list.exists_for_user"),
                 (list_id, user_id)
             )
             if not await cur.fetchone():
@@ -638,7 +614,7 @@ async def toggle_word_favorite(
 @router.get("/flashcards/topics")
 async def list_flashcard_topics(user=Depends(get_current_user)):
     """GET /v1/flashcards/topics - List available topics with flashcards."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -667,7 +643,7 @@ async def list_flashcard_lessons(
     user=Depends(get_current_user)
 ):
     """GET /v1/flashcards/lessons - List lessons with flashcards."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -713,37 +689,36 @@ async def list_flashcard_lessons(
 async def list_flashcard_mistakes(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page (keyset pagination)"),
+    includeTotal: bool = Query(True, description="Set false to skip the total count"),
     user=Depends(get_current_user)
 ):
     """GET /v1/flashcards/mistakes - List user's flashcard mistakes."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
+    params = [user_id, "flashcards"]
+    offset = 0
+    if cursor:
+        params += after_params(decode_cursor(cursor, MISTAKES_CURSOR))
+    else:
+        offset = (page - 1) * limit
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             # Get total count
-            await cur.execute(
-                "SELECT COUNT(*) FROM user_mistakes WHERE user_id = %s AND game_type = 'flashcards'",
-                (user_id,)
-            )
-            total = (await cur.fetchone())[0]
+            total = None
+            if includeTotal:
+                await cur.execute(sql("mistake.count"), (user_id, "flashcards"))
+                total = (await cur.fetchone())[0]
             
-            # Get paginated mistakes
-            offset = (page - 1) * limit
-            await cur.execute(
-                """
-                SELECT um.item_id, um.user_answer, um.correct_answer, um.last_answered_at,
-                       w.word, w.translation
-                FROM user_mistakes um
-                LEFT JOIN words w ON w.id = um.item_id
-                WHERE um.user_id = %s AND um.game_type = 'flashcards'
-                ORDER BY um.last_answered_at DESC
-                LIMIT %s OFFSET %s
-                """,
-                (user_id, limit, offset)
-            )
+            # Get paginated mistakes (ordered by (last_answered_at, id) DESC)
+            await cur.execute(flashcard_mistakes_page(bool(cursor)), params + [limit + 1, offset])
             rows = await cur.fetchall()
     
+    rows, next_cursor = keyset_page(
+        rows, limit,
+        lambda r: encode_cursor(MISTAKES_CURSOR, r[3], r[6])
+    )
     data = [
         {
             "itemId": row[0],
@@ -756,7 +731,10 @@ async def list_flashcard_mistakes(
         for row in rows
     ]
     
-    return paginate(data, page, limit, total)
+    return paginate(
+        data, page, limit, total,
+        include_total=includeTotal, keyset=True, next_cursor=next_cursor
+    )
 
 
 # =============================================================================
@@ -784,9 +762,9 @@ async def start_flashcard_session(
     
     # Check idempotency
     if idempotency_key:
-        cached = await check_idempotency(pool, user_id, "/v1/flashcards/sessions", idempotency_key)
+        cached = await check_idempotency(pool, user_id, "/v1/flashcards/sessions", idempotency_key, raw=True)
         if cached:
-            return JSONResponse(status_code=201, content=cached)
+            return FastJSONResponse(status_code=201, content=cached)
     
     items = []
     item_ids = []
@@ -807,7 +785,7 @@ async def start_flashcard_session(
                 
                 # Verify word list exists and belongs to user
                 await cur.execute(
-                    "SELECT id FROM word_lists WHERE id = %s AND user_id = %s",
+                    sql("word_list.exists_for_user"),
                     (payload.wordListId, user_id)
                 )
                 if not await cur.fetchone():
@@ -817,14 +795,8 @@ async def start_flashcard_session(
                 
                 # Get words
                 if payload.selectedWordIds:
-                    placeholders = ",".join(["%s"] * len(payload.selectedWordIds))
                     await cur.execute(
-                        f"""
-                        SELECT id, word, translation, notes, is_favorite,
-                               practice_count, correct_count, accuracy, last_practiced,
-                               created_at, updated_at
-                        FROM words WHERE id IN ({placeholders}) AND list_id = %s
-                        """,
+                        sql_in("words.by_ids_in_list", len(payload.selectedWordIds)),
                         payload.selectedWordIds + [payload.wordListId]
                     )
                     word_rows = await cur.fetchall()
@@ -835,14 +807,7 @@ async def start_flashcard_session(
                         raise_error(400, ErrorCodes.UNKNOWN_WORD, "Unknown word IDs", {"invalidIds": invalid_ids})
                 else:
                     await cur.execute(
-                        """
-                        SELECT id, word, translation, notes, is_favorite,
-                               practice_count, correct_count, accuracy, last_practiced,
-                               created_at, updated_at
-                        FROM words WHERE list_id = %s
-                        ORDER BY created_at DESC
-                        LIMIT %s
-                        """,
+                        sql("word.by_list"),
                         (payload.wordListId, limit)
                     )
                     word_rows = await cur.fetchall()
@@ -951,14 +916,8 @@ async def start_flashcard_session(
                 mistake_ids = [row[0] for row in mistake_rows]
                 
                 # Try to fetch from words table first (user-created)
-                placeholders = ",".join(["%s"] * len(mistake_ids))
                 await cur.execute(
-                    f"""
-                    SELECT id, word, translation, notes, is_favorite,
-                           practice_count, correct_count, accuracy, last_practiced,
-                           created_at, updated_at
-                    FROM words WHERE id IN ({placeholders})
-                    """,
+                    sql_in("words.by_ids", len(mistake_ids)),
                     mistake_ids
                 )
                 word_rows = await cur.fetchall()
@@ -969,10 +928,7 @@ async def start_flashcard_session(
                 else:
                     # Try lesson_exercises
                     await cur.execute(
-                        f"""
-                        SELECT id, exercise_data, difficulty, hint, explanation
-                        FROM lesson_exercises WHERE id IN ({placeholders})
-                        """,
+                        sql_in("exercises.flashcards_by_ids", len(mistake_ids)),
                         mistake_ids
                     )
                     exercise_rows = await cur.fetchall()
@@ -1017,7 +973,7 @@ async def start_flashcard_session(
     if idempotency_key:
         await store_idempotency(pool, user_id, "/v1/flashcards/sessions", idempotency_key, response)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=201,
         content=response,
         headers={"Location": f"/v1/flashcards/sessions/{session['id']}"}
@@ -1030,7 +986,7 @@ async def get_flashcard_session(
     user=Depends(get_current_user)
 ):
     """GET /v1/flashcards/sessions/{sessionId} - Get session state for resume."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     dao = GamesDAO(pool)
     
@@ -1045,14 +1001,8 @@ async def get_flashcard_session(
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             if session["itemOrder"]:
-                placeholders = ",".join(["%s"] * len(session["itemOrder"]))
                 await cur.execute(
-                    f"""
-                    SELECT id, word, translation, notes, is_favorite,
-                           practice_count, correct_count, accuracy, last_practiced,
-                           created_at, updated_at
-                    FROM words WHERE id IN ({placeholders})
-                    """,
+                    sql_in("words.by_ids", len(session["itemOrder"])),
                     session["itemOrder"]
                 )
                 word_rows = await cur.fetchall()
@@ -1082,97 +1032,81 @@ async def record_flashcard_result(
     """POST /v1/flashcards/sessions/{sessionId}/results - Record a practice result."""
     pool = await get_pool_instance()
     user_id = user["userId"]
-    dao = GamesDAO(pool)
-    
-    # Check idempotency
-    endpoint = f"/v1/flashcards/sessions/{session_id}/results"
-    if idempotency_key:
-        cached = await check_idempotency(pool, user_id, endpoint, idempotency_key)
-        if cached:
-            return cached
-    
-    # Check clientResultId deduplication
-    if payload.clientResultId:
-        existing = await check_client_result_id(pool, session_id, payload.clientResultId)
-        if existing:
-            # Return the existing result
-            session = await dao.get_session(session_id)
-            return {"ok": True, "progress": session["progress"], "word": existing}
-    
-    # Get session
-    session = await dao.get_session(session_id)
-    if not session or session["userId"] != user_id:
-        raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
-    
-    if session["status"] == "completed":
-        raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
-    
-    # Validate word ID is in session
-    if payload.wordId not in session["itemOrder"]:
-        raise_error(400, ErrorCodes.UNKNOWN_WORD, "Word not in session", {"invalidIds": [payload.wordId]})
-    
-    # Insert result
-    await dao.insert_result(
-        session_id=session_id,
-        item_id=payload.wordId,
-        is_correct=payload.isCorrect,
-        attempts=payload.attempts,
-        time_spent_ms=payload.timeSpentMs,
-        client_result_id=payload.clientResultId
-    )
-    
-    # Update session progress
-    progress = await dao.update_session_progress(session_id, payload.isCorrect, payload.wordId)
     
-    # Update word statistics
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                UPDATE words SET
-                    practice_count = practice_count + 1,
-                    correct_count = correct_count + %s,
-                    accuracy = ROUND(100 * (correct_count + %s) / (practice_count + 1)),
-                    last_practiced = NOW()
-                WHERE id = %s
-                """,
-                (1 if payload.isCorrect else 0, 1 if payload.isCorrect else 0, payload.wordId)
-            )
-            await conn.commit()
-            
-            # Fetch updated word
-            await cur.execute(
-                """
-                SELECT id, word, translation, notes, is_favorite,
-                       practice_count, correct_count, accuracy, last_practiced,
-                       created_at, updated_at
-                FROM words WHERE id = %s
-                """,
-                (payload.wordId,)
-            )
-            word_row = await cur.fetchone()
-    
-    # Track mistake if incorrect
-    if not payload.isCorrect:
-        await dao.record_mistake(user_id, "flashcards", payload.wordId)
-    else:
-        await dao.remove_mistake(user_id, "flashcards", payload.wordId)
-    
-    word_partial = {
-        "id": word_row[0],
-        "practiceCount": word_row[5],
-        "correctCount": word_row[6],
-        "accuracy": word_row[7],
-        "lastPracticed": word_row[8].isoformat() + "Z" if word_row[8] else None
-    }
-    
-    response = {"ok": True, "progress": progress, "word": word_partial}
-    
-    # Store idempotency
-    if idempotency_key:
-        await store_idempotency(pool, user_id, endpoint, idempotency_key, response)
-    
-    return response
+    # One connection + transaction for the whole handler (see UnitOfWork)
+    async with GamesDAO(pool).transaction() as dao:
+        uow = dao.pool
+        # Check idempotency
+        endpoint = f"/v1/flashcards/sessions/{session_id}/results"
+        if idempotency_key:
+            cached = await check_idempotency(uow, user_id, endpoint, idempotency_key)
+            if cached:
+                return cached
+        
+        # Check clientResultId deduplication
+        if payload.clientResultId:
+            existing = await check_client_result_id(uow, session_id, payload.clientResultId)
+            if existing:
+                # Return the existing result
+                session = await dao.get_session(session_id)
+                return {"ok": True, "progress": session["progress"], "word": existing}
+        
+        # Get session
+        session = await dao.get_session(session_id)
+        if not session or session["userId"] != user_id:
+            raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
+        
+        if session["status"] == "completed":
+            raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
+        
+        # Validate word ID is in session
+        if payload.wordId not in session["itemOrder"]:
+            raise_error(400, ErrorCodes.UNKNOWN_WORD, "Word not in session", {"invalidIds": [payload.wordId]})
+        
+        # Insert result
+        await dao.insert_result(
+            session_id=session_id,
+            item_id=payload.wordId,
+            is_correct=payload.isCorrect,
+            attempts=payload.attempts,
+            time_spent_ms=payload.timeSpentMs,
+            client_result_id=payload.clientResultId
+        )
+        
+        # Update session progress
+        progress = await dao.update_session_progress(session_id, payload.isCorrect, payload.wordId)
+        
+        # Update word statistics
+        async with uow.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    sql("word.record_practice"),
+                    (1 if payload.isCorrect else 0, 1 if payload.isCorrect else 0, payload.wordId)
+                )
+                await conn.commit()
+                
+                # Fetch updated word
+                await cur.execute(
+                    sql("word.by_id"),
+                    (payload.wordId,)
+                )
+                word_row = await cur.fetchone()
+        
+        # Track mistake if incorrect
+        if not payload.isCorrect:
+            await dao.record_mistake(user_id, "flashcards", payload.wordId)
+        else:
+            await dao.remove_mistake(user_id, "flashcards", payload.wordId)
+        
+        word_partial = decode_word_stats(word_row)
+        
+        response = {"ok": True, "progress": progress, "word": word_partial}
+        
+        # Store idempotency
+        if idempotency_key:
+            await store_idempotency(uow, user_id, endpoint, idempotency_key, response)
+        
+        return response
 
 
 @router.post("/flashcards/sessions/{session_id}/complete")
@@ -1216,7 +1150,7 @@ async def complete_flashcard_session(
 @router.get("/flashcards/stats/me")
 async def get_flashcard_stats(user=Depends(get_current_user)):
     """GET /v1/flashcards/stats/me - Get user's flashcard statistics."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     
     async with pool.acquire() as conn:
@@ -3,19 +3,20 @@ Grammar Challenge API Routes - TULKKA Games APIs Spec
 Implements: Categories, Lessons, Questions, Sessions, Hints, Mistakes
 """
 
-import json
 from fastapi import APIRouter, Depends, Request, Query, Header, Response
-from fastapi.responses import JSONResponse
+from src.json_utils import FastJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Literal
 
 from src.games.middlewares.auth import get_current_user
 from src.games.dao.games_dao import GamesDAO
+from src.games.dao.queries import sql_in
 from src.games.utils import (
     ErrorCodes, raise_error, paginate, ok_response,
     check_idempotency, store_idempotency, check_client_result_id
 )
-from src.db.mysql_pool import get_pool
+from src.db.mysql_pool import get_pool, get_read_pool
+from src import json_utils
 
 router = APIRouter(prefix="/v1/grammar-challenge", tags=["Games - Grammar Challenge"])
 
@@ -60,9 +61,14 @@ async def get_pool_instance():
     return await get_pool()
 
 
+async def get_read_pool_instance():
+    """Get the pool for read-only endpoints (read replica when configured)."""
+    return await get_read_pool()
+
+
 def question_to_response(row: tuple, include_answer: bool = False) -> dict:
     """Convert a lesson_exercises row to Grammar Question format."""
-    exercise_data = row[2] if isinstance(row[2], dict) else json.loads(row[2]) if row[2] else {}
+    exercise_data = row[2] if isinstance(row[2], dict) else json_utils.loads(row[2]) if row[2] else {}
     
     response = {
         "id": row[0],
@@ -88,7 +94,7 @@ async def get_grammar_categories(
     user=Depends(get_current_user)
 ):
     """GET /v1/grammar-challenge/categories - Get available grammar categories."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -123,7 +129,7 @@ async def get_grammar_lessons(
     user=Depends(get_current_user)
 ):
     """GET /v1/grammar-challenge/lessons - Get grammar lessons."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -190,7 +196,7 @@ async def get_grammar_questions(
     user=Depends(get_current_user)
 ):
     """GET /v1/grammar-challenge/questions - Get grammar questions catalog."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     include_answer = include and ("options" in include or "explanation" in include)
     
     async with pool.acquire() as conn:
@@ -259,9 +265,9 @@ async def start_grammar_session(
     
     # Check idempotency
     if idempotency_key:
-        cached = await check_idempotency(pool, user_id, "/v1/grammar-challenge/sessions", idempotency_key)
+        cached = await check_idempotency(pool, user_id, "/v1/grammar-challenge/sessions", idempotency_key, raw=True)
         if cached:
-            return JSONResponse(status_code=201, content=cached)
+            return FastJSONResponse(status_code=201, content=cached)
     
     questions = []
     question_ids = []
@@ -270,17 +276,9 @@ async def start_grammar_session(
         async with conn.cursor() as cur:
             if payload.mode == "custom" and payload.selectedQuestionIds:
                 # Custom mode: use selected question IDs
-                placeholders = ",".join(["%s"] * len(payload.selectedQuestionIds))
                 await cur.execute(
-                    f"""
-                    SELECT le.id, le.lesson_id, le.exercise_data, le.topic_id, le.difficulty, le.hint
-                    FROM lesson_exercises le
-                    JOIN lessons l ON l.id = le.lesson_id
-                    WHERE le.id IN ({placeholders})
-                      AND le.exercise_type = 'grammar_challenge'
-                      AND l.status = 'approved'
-                    """,
-                    payload.selectedQuestionIds
+                    sql_in("exercises.approved_by_ids", len(payload.selectedQuestionIds)),
+                    [*payload.selectedQuestionIds, "grammar_challenge"]
                 )
                 rows = await cur.fetchall()
                 
@@ -296,17 +294,9 @@ async def start_grammar_session(
                 if not mistake_ids:
                     raise_error(400, ErrorCodes.VALIDATION_ERROR, "No mistakes to review")
                 
-                placeholders = ",".join(["%s"] * len(mistake_ids))
                 await cur.execute(
-                    f"""
-                    SELECT le.id, le.lesson_id, le.exercise_data, le.topic_id, le.difficulty, le.hint
-                    FROM lesson_exercises le
-                    JOIN lessons l ON l.id = le.lesson_id
-                    WHERE le.id IN ({placeholders})
-                      AND le.exercise_type = 'grammar_challenge'
-                      AND l.status = 'approved'
-                    """,
-                    mistake_ids
+                    sql_in("exercises.approved_by_ids", len(mistake_ids)),
+                    [*mistake_ids, "grammar_challenge"]
                 )
                 rows = await cur.fetchall()
                 
@@ -393,7 +383,7 @@ async def start_grammar_session(
     if idempotency_key:
         await store_idempotency(pool, user_id, "/v1/grammar-challenge/sessions", idempotency_key, response)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=201,
         content=response,
         headers={"Location": f"/v1/grammar-challenge/sessions/{session['id']}"}
@@ -406,7 +396,7 @@ async def get_grammar_session(
     user=Depends(get_current_user)
 ):
     """GET /v1/grammar-challenge/sessions/{sessionId} - Get session state for resume."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     dao = GamesDAO(pool)
     
@@ -421,12 +411,8 @@ async def get_grammar_session(
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             if session["itemOrder"]:
-                placeholders = ",".join(["%s"] * len(session["itemOrder"]))
                 await cur.execute(
-                    f"""
-                    SELECT id, lesson_id, exercise_data, topic_id, difficulty, hint
-                    FROM lesson_exercises WHERE id IN ({placeholders})
-                    """,
+                    sql_in("exercises.by_ids", len(session["itemOrder"])),
                     session["itemOrder"]
                 )
                 rows = await cur.fetchall()
@@ -459,83 +445,85 @@ async def record_grammar_result(
     """POST /v1/grammar-challenge/sessions/{sessionId}/results - Record a result."""
     pool = await get_pool_instance()
     user_id = user["userId"]
-    dao = GamesDAO(pool)
-    
-    # Check idempotency
-    endpoint = f"/v1/grammar-challenge/sessions/{session_id}/results"
-    if idempotency_key:
-        cached = await check_idempotency(pool, user_id, endpoint, idempotency_key)
-        if cached:
-            return cached
     
-    # Check clientResultId deduplication
-    if payload.clientResultId:
-        existing = await check_client_result_id(pool, session_id, payload.clientResultId)
-        if existing:
-            session = await dao.get_session(session_id)
-            return {"ok": True, "progress": session["progress"], "question": existing}
-    
-    # Get session
-    session = await dao.get_session(session_id)
-    if not session or session["userId"] != user_id:
-        raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
-    
-    if session["status"] == "completed":
-        raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
-    
-    # Validate question ID is in session
-    if payload.questionId not in session["itemOrder"]:
-        raise_error(400, ErrorCodes.UNKNOWN_QUESTION, "Question not in session", {"invalidIds": [payload.questionId]})
-    
-    # Get correct answer for validation
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "SELECT exercise_data FROM lesson_exercises WHERE id = %s",
-                (payload.questionId,)
-            )
-            row = await cur.fetchone()
-            if not row:
-                raise_error(400, ErrorCodes.UNKNOWN_QUESTION, "Question not found")
-            
-            exercise_data = row[0] if isinstance(row[0], dict) else json.loads(row[0]) if row[0] else {}
-            correct_index = exercise_data.get("correctIndex", 0)
-    
-    # Server-side validation
-    is_correct = payload.selectedAnswer == correct_index
-    
-    # Insert result
-    await dao.insert_result(
-        session_id=session_id,
-        item_id=payload.questionId,
-        is_correct=is_correct,
-        attempts=payload.attempts,
-        time_spent_ms=payload.timeSpentMs,
-        selected_answer=payload.selectedAnswer,
-        client_result_id=payload.clientResultId
-    )
-    
-    # Update session progress
-    progress = await dao.update_session_progress(session_id, is_correct, payload.questionId)
-    
-    # Track mistake if incorrect
-    if not is_correct:
-        await dao.record_mistake(user_id, "grammar_challenge", payload.questionId)
-    else:
-        await dao.remove_mistake(user_id, "grammar_challenge", payload.questionId)
-    
-    question_partial = {
-        "id": payload.questionId,
-        "lastSelected": payload.selectedAnswer,
-        "attempts": payload.attempts
-    }
-    
-    response = {"ok": True, "progress": progress, "question": question_partial}
-    
-    if idempotency_key:
-        await store_idempotency(pool, user_id, endpoint, idempotency_key, response)
-    
-    return response
+    # One connection + transaction for the whole handler (see UnitOfWork)
+    async with GamesDAO(pool).transaction() as dao:
+        uow = dao.pool
+        # Check idempotency
+        endpoint = f"/v1/grammar-challenge/sessions/{session_id}/results"
+        if idempotency_key:
+            cached = await check_idempotency(uow, user_id, endpoint, idempotency_key)
+            if cached:
+                return cached
+        
+        # Check clientResultId deduplication
+        if payload.clientResultId:
+            existing = await check_client_result_id(uow, session_id, payload.clientResultId)
+            if existing:
+                session = await dao.get_session(session_id)
+                return {"ok": True, "progress": session["progress"], "question": existing}
+        
+        # Get session
+        session = await dao.get_session(session_id)
+        if not session or session["userId"] != user_id:
+            raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
+        
+        if session["status"] == "completed":
+            raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
+        
+        # Validate question ID is in session
+        if payload.questionId not in session["itemOrder"]:
+            raise_error(400, ErrorCodes.UNKNOWN_QUESTION, "Question not in session", {"invalidIds": [payload.questionId]})
+        
+        # Get correct answer for validation
+        async with uow.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT exercise_data FROM lesson_exercises WHERE id = %s",
+                    (payload.questionId,)
+                )
+                row = await cur.fetchone()
+                if not row:
+                    raise_error(400, ErrorCodes.UNKNOWN_QUESTION, "Question not found")
+                
+                exercise_data = row[0] if isinstance(row[0], dict) else json_utils.loads(row[0]) if row[0] else {}
+                correct_index = exercise_data.get("correctIndex", 0)
+        
+        # Server-side validation
+        is_correct = payload.selectedAnswer == correct_index
+        
+        # Insert result
+        await dao.insert_result(
+            session_id=session_id,
+            item_id=payload.questionId,
+            is_correct=is_correct,
+            attempts=payload.attempts,
+            time_spent_ms=payload.timeSpentMs,
+            selected_answer=payload.selectedAnswer,
+            client_result_id=payload.clientResultId
+        )
+        
+        # Update session progress
+        progress = await dao.update_session_progress(session_id, is_correct, payload.questionId)
+        
+        # Track mistake if incorrect
+        if not is_correct:
+            await dao.record_mistake(user_id, "grammar_challenge", payload.questionId)
+        else:
+            await dao.remove_mistake(user_id, "grammar_challenge", payload.questionId)
+        
+        question_partial = {
+            "id": payload.questionId,
+            "lastSelected": payload.selectedAnswer,
+            "attempts": payload.attempts
+        }
+        
+        response = {"ok": True, "progress": progress, "question": question_partial}
+        
+        if idempotency_key:
+            await store_idempotency(uow, user_id, endpoint, idempotency_key, response)
+        
+        return response
 
 
 @router.post("/sessions/{session_id}/skip")
@@ -547,32 +535,33 @@ async def skip_grammar_question(
     """POST /v1/grammar-challenge/sessions/{sessionId}/skip - Skip a question."""
     pool = await get_pool_instance()
     user_id = user["userId"]
-    dao = GamesDAO(pool)
-    
-    session = await dao.get_session(session_id)
-    if not session or session["userId"] != user_id:
-        raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
-    
-    if session["status"] == "completed":
-        raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
-    
-    if payload.questionId not in session["itemOrder"]:
-        raise_error(400, ErrorCodes.UNKNOWN_QUESTION, "Question not in session")
-    
-    # Insert skip result (attempts=0)
-    await dao.insert_result(
-        session_id=session_id,
-        item_id=payload.questionId,
-        is_correct=False,
-        attempts=0,
-        time_spent_ms=0,
-        skipped=True
-    )
-    
-    # Update progress (skipped counts as incorrect)
-    progress = await dao.update_session_progress(session_id, False, payload.questionId)
     
-    return {"ok": True, "progress": progress}
+    # One connection + transaction for the whole handler (see UnitOfWork)
+    async with GamesDAO(pool).transaction() as dao:
+        session = await dao.get_session(session_id)
+        if not session or session["userId"] != user_id:
+            raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
+        
+        if session["status"] == "completed":
+            raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
+        
+        if payload.questionId not in session["itemOrder"]:
+            raise_error(400, ErrorCodes.UNKNOWN_QUESTION, "Question not in session")
+        
+        # Insert skip result (attempts=0)
+        await dao.insert_result(
+            session_id=session_id,
+            item_id=payload.questionId,
+            is_correct=False,
+            attempts=0,
+            time_spent_ms=0,
+            skipped=True
+        )
+        
+        # Update progress (skipped counts as incorrect)
+        progress = await dao.update_session_progress(session_id, False, payload.questionId)
+        
+        return {"ok": True, "progress": progress}
 
 
 @router.post("/sessions/{session_id}/complete")
@@ -619,7 +608,7 @@ async def get_grammar_hint(
     user=Depends(get_current_user)
 ):
     """GET /v1/grammar-challenge/questions/{questionId}/hint - Get hint for a question."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -635,7 +624,7 @@ async def get_grammar_hint(
             hint = row[0]
             if not hint:
                 # Try to get hint from exercise_data
-                exercise_data = row[1] if isinstance(row[1], dict) else json.loads(row[1]) if row[1] else {}
+                exercise_data = row[1] if isinstance(row[1], dict) else json_utils.loads(row[1]) if row[1] else {}
                 hint = exercise_data.get("hint", "No hint available for this question.")
     
     return {"questionId": question_id, "hint": hint}
@@ -649,32 +638,32 @@ async def get_grammar_hint(
 async def get_grammar_mistakes(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page (keyset pagination)"),
+    includeTotal: bool = Query(True, description="Set false to skip the total count"),
     user=Depends(get_current_user)
 ):
     """GET /v1/grammar-challenge/mistakes - Get user's grammar mistakes for review."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     dao = GamesDAO(pool)
     
-    mistakes, total = await dao.get_user_mistakes(user_id, "grammar_challenge", page, limit)
+    mistakes, total, next_cursor = await dao.get_user_mistakes(
+        user_id, "grammar_challenge", page, limit, cursor=cursor, include_total=includeTotal
+    )
     
     # Enrich with question data
     if mistakes:
         async with pool.acquire() as conn:
             async with conn.cursor() as cur:
                 item_ids = [m["itemId"] for m in mistakes]
-                placeholders = ",".join(["%s"] * len(item_ids))
                 await cur.execute(
-                    f"""
-                    SELECT id, exercise_data, topic_id
-                    FROM lesson_exercises WHERE id IN ({placeholders})
-                    """,
+                    sql_in("exercises.summary_by_ids", len(item_ids)),
                     item_ids
                 )
                 rows = await cur.fetchall()
                 question_map = {}
                 for row in rows:
-                    exercise_data = row[1] if isinstance(row[1], dict) else json.loads(row[1]) if row[1] else {}
+                    exercise_data = row[1] if isinstance(row[1], dict) else json_utils.loads(row[1]) if row[1] else {}
                     question_map[row[0]] = {
                         "prompt": exercise_data.get("prompt"),
                         "category": row[2]
@@ -685,7 +674,10 @@ async def get_grammar_mistakes(
                     m["prompt"] = q_data.get("prompt")
                     m["category"] = q_data.get("category")
     
-    return paginate(mistakes, page, limit, total)
+    return paginate(
+        mistakes, page, limit, total,
+        include_total=includeTotal, keyset=True, next_cursor=next_cursor
+    )
 
 
 # =============================================================================
@@ -695,7 +687,7 @@ async def get_grammar_mistakes(
 @router.get("/stats/me")
 async def get_grammar_stats(user=Depends(get_current_user)):
     """GET /v1/grammar-challenge/stats/me - Get user's grammar statistics."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     
     async with pool.acquire() as conn:
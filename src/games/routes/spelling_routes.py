@@ -4,18 +4,20 @@ Implements: Spelling Sessions, Pronunciations, Mistakes
 """
 
 from fastapi import APIRouter, Depends, Request, Query, Header, Response
-from fastapi.responses import JSONResponse
+from src.json_utils import FastJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List
 import unicodedata
 
 from src.games.middlewares.auth import get_current_user
 from src.games.dao.games_dao import GamesDAO
+from src.games.dao.queries import sql, sql_in
+from src.games.dao.rows import decode_word, decode_word_stats
 from src.games.utils import (
     ErrorCodes, raise_error, paginate, ok_response,
     check_idempotency, store_idempotency, check_client_result_id
 )
-from src.db.mysql_pool import get_pool
+from src.db.mysql_pool import get_pool, get_read_pool
 
 router = APIRouter(prefix="/v1/spelling", tags=["Games - Spelling Bee"])
 
@@ -54,6 +56,11 @@ async def get_pool_instance():
     return await get_pool()
 
 
+async def get_read_pool_instance():
+    """Get the pool for read-only endpoints (read replica when configured)."""
+    return await get_read_pool()
+
+
 def normalize_answer(text: str) -> str:
     """
     Normalize text for spelling comparison per spec:
@@ -79,19 +86,7 @@ def check_spelling(user_answer: str, correct_word: str) -> bool:
 
 def word_to_response(row: tuple) -> dict:
     """Convert a word DB row to API response format."""
-    return {
-        "id": row[0],
-        "word": row[1],
-        "translation": row[2],
-        "notes": row[3],
-        "isFavorite": bool(row[4]),
-        "practiceCount": row[5] or 0,
-        "correctCount": row[6] or 0,
-        "accuracy": row[7] or 0,
-        "lastPracticed": row[8].isoformat() + "Z" if row[8] else None,
-        "createdAt": row[9].isoformat() + "Z" if row[9] else None,
-        "updatedAt": row[10].isoformat() + "Z" if row[10] else None
-    }
+    return decode_word(row)
 
 
 # =============================================================================
@@ -111,15 +106,15 @@ async def start_spelling_session(
     
     # Check idempotency
     if idempotency_key:
-        cached = await check_idempotency(pool, user_id, "/v1/spelling/sessions", idempotency_key)
+        cached = await check_idempotency(pool, user_id, "/v1/spelling/sessions", idempotency_key, raw=True)
         if cached:
-            return JSONResponse(status_code=201, content=cached)
+            return FastJSONResponse(status_code=201, content=cached)
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             # Verify word list exists and belongs to user
             await cur.execute(
-                "SELECT id FROM word_lists WHERE id = %s AND user_id = %s",
+                sql("word_list.exists_for_user"),
                 (payload.wordListId, user_id)
             )
             if not await cur.fetchone():
@@ -127,14 +122,8 @@ async def start_spelling_session(
             
             # Get words
             if payload.selectedWordIds:
-                placeholders = ",".join(["%s"] * len(payload.selectedWordIds))
                 await cur.execute(
-                    f"""
-                    SELECT id, word, translation, notes, is_favorite,
-                           practice_count, correct_count, accuracy, last_practiced,
-                           created_at, updated_at
-                    FROM words WHERE id IN ({placeholders}) AND list_id = %s
-                    """,
+                    sql_in("words.by_ids_in_list", len(payload.selectedWordIds)),
                     payload.selectedWordIds + [payload.wordListId]
                 )
                 word_rows = await cur.fetchall()
@@ -146,15 +135,8 @@ async def start_spelling_session(
                     raise_error(400, ErrorCodes.UNKNOWN_WORD, "Unknown word IDs", {"invalidIds": invalid_ids})
             else:
                 await cur.execute(
-                    """
-                    SELECT id, word, translation, notes, is_favorite,
-                           practice_count, correct_count, accuracy, last_practiced,
-                           created_at, updated_at
-                    FROM words WHERE list_id = %s
-                    ORDER BY created_at DESC
-                    LIMIT 8
-                    """,
-                    (payload.wordListId,)
+                    sql("word.by_list"),
+                    (payload.wordListId, 8)
                 )
                 word_rows = await cur.fetchall()
             
@@ -191,7 +173,7 @@ async def start_spelling_session(
     if idempotency_key:
         await store_idempotency(pool, user_id, "/v1/spelling/sessions", idempotency_key, response)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=201,
         content=response,
         headers={"Location": f"/v1/spelling/sessions/{session['id']}"}
@@ -204,7 +186,7 @@ async def get_spelling_session(
     user=Depends(get_current_user)
 ):
     """GET /v1/spelling/sessions/{sessionId} - Get session state for resume."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     dao = GamesDAO(pool)
     
@@ -219,14 +201,8 @@ async def get_spelling_session(
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             if session["itemOrder"]:
-                placeholders = ",".join(["%s"] * len(session["itemOrder"]))
                 await cur.execute(
-                    f"""
-                    SELECT id, word, translation, notes, is_favorite,
-                           practice_count, correct_count, accuracy, last_practiced,
-                           created_at, updated_at
-                    FROM words WHERE id IN ({placeholders})
-                    """,
+                    sql_in("words.by_ids", len(session["itemOrder"])),
                     session["itemOrder"]
                 )
                 word_rows = await cur.fetchall()
@@ -256,121 +232,101 @@ async def record_spelling_result(
     """POST /v1/spelling/sessions/{sessionId}/results - Record a spelling result."""
     pool = await get_pool_instance()
     user_id = user["userId"]
-    dao = GamesDAO(pool)
-    
-    # Check idempotency
-    endpoint = f"/v1/spelling/sessions/{session_id}/results"
-    if idempotency_key:
-        cached = await check_idempotency(pool, user_id, endpoint, idempotency_key)
-        if cached:
-            return cached
-    
-    # Check clientResultId deduplication
-    if payload.clientResultId:
-        existing = await check_client_result_id(pool, session_id, payload.clientResultId)
-        if existing:
-            session = await dao.get_session(session_id)
-            return {"ok": True, "progress": session["progress"], "word": existing}
-    
-    # Get session
-    session = await dao.get_session(session_id)
-    if not session or session["userId"] != user_id:
-        raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
     
-    if session["status"] == "completed":
-        raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
-    
-    # Validate word ID is in session
-    if payload.wordId not in session["itemOrder"]:
-        raise_error(400, ErrorCodes.UNKNOWN_WORD, "Word not in session", {"invalidIds": [payload.wordId]})
-    
-    # Get the correct word for validation
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("SELECT word FROM words WHERE id = %s", (payload.wordId,))
-            word_row = await cur.fetchone()
-            if not word_row:
-                raise_error(400, ErrorCodes.UNKNOWN_WORD, "Word not found")
-            correct_word = word_row[0]
-    
-    # Server-side validation of correctness (ALWAYS compute server-side, ignore payload.isCorrect)
-    is_correct = False
-    if payload.userAnswer and not payload.skipped:
-        is_correct = check_spelling(payload.userAnswer, correct_word)
-    elif payload.skipped:
+    # One connection + transaction for the whole handler (see UnitOfWork)
+    async with GamesDAO(pool).transaction() as dao:
+        uow = dao.pool
+        # Check idempotency
+        endpoint = f"/v1/spelling/sessions/{session_id}/results"
+        if idempotency_key:
+            cached = await check_idempotency(uow, user_id, endpoint, idempotency_key)
+            if cached:
+                return cached
+        
+        # Check clientResultId deduplication
+        if payload.clientResultId:
+            existing = await check_client_result_id(uow, session_id, payload.clientResultId)
+            if existing:
+                session = await dao.get_session(session_id)
+                return {"ok": True, "progress": session["progress"], "word": existing}
+        
+        # Get session
+        session = await dao.get_session(session_id)
+        if not session or session["userId"] != user_id:
+            raise_error(404, ErrorCodes.SESSION_NOT_FOUND, "Session not found")
+        
+        if session["status"] == "completed":
+            raise_error(409, ErrorCodes.SESSION_COMPLETED, "Session already completed")
+        
+        # Validate word ID is in session
+        if payload.wordId not in session["itemOrder"]:
+            raise_error(400, ErrorCodes.UNKNOWN_WORD, "Word not in session", {"invalidIds": [payload.wordId]})
+        
+        # Get the correct word for validation
+        async with uow.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT word FROM words WHERE id = %s", (payload.wordId,))
+                word_row = await cur.fetchone()
+                if not word_row:
+                    raise_error(400, ErrorCodes.UNKNOWN_WORD, "Word not found")
+                correct_word = word_row[0]
+        
+        # Server-side validation of correctness (ALWAYS compute server-side, ignore payload.isCorrect)
         is_correct = False
-    
-    # Insert result
-    await dao.insert_result(
-        session_id=session_id,
-        item_id=payload.wordId,
-        is_correct=is_correct,
-        attempts=payload.attempts,
-        time_spent_ms=payload.timeSpentMs,
-        skipped=payload.skipped or False,
-        user_answer=payload.userAnswer,
-        client_result_id=payload.clientResultId
-    )
-    
-    # Update session progress
-    progress = await dao.update_session_progress(session_id, is_correct, payload.wordId)
-    
-    # Update word statistics
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                UPDATE words SET
-                    practice_count = practice_count + 1,
-                    correct_count = correct_count + %s,
-                    accuracy = CASE 
-                        WHEN practice_count + 1 > 0 
-                        THEN ROUND(100 * (correct_count + %s) / (practice_count + 1))
-                        ELSE 0 
-                    END,
-                    last_practiced = NOW()
-                WHERE id = %s
-                """,
-                (1 if is_correct else 0, 1 if is_correct else 0, payload.wordId)
-            )
-            await conn.commit()
-            
-            # Fetch updated word
-            await cur.execute(
-                """
-                SELECT id, word, translation, notes, is_favorite,
-                       practice_count, correct_count, accuracy, last_practiced,
-                       created_at, updated_at
-                FROM words WHERE id = %s
-                """,
-                (payload.wordId,)
-            )
-            word_row = await cur.fetchone()
-    
-    # Track mistake if incorrect
-    if not is_correct:
-        await dao.record_mistake(
-            user_id, "spelling_bee", payload.wordId,
+        if payload.userAnswer and not payload.skipped:
+            is_correct = check_spelling(payload.userAnswer, correct_word)
+        elif payload.skipped:
+            is_correct = False
+        
+        # Insert result
+        await dao.insert_result(
+            session_id=session_id,
+            item_id=payload.wordId,
+            is_correct=is_correct,
+            attempts=payload.attempts,
+            time_spent_ms=payload.timeSpentMs,
+            skipped=payload.skipped or False,
             user_answer=payload.userAnswer,
-            correct_answer=correct_word
+            client_result_id=payload.clientResultId
         )
-    else:
-        await dao.remove_mistake(user_id, "spelling_bee", payload.wordId)
-    
-    word_partial = {
-        "id": word_row[0],
-        "practiceCount": word_row[5],
-        "correctCount": word_row[6],
-        "accuracy": word_row[7],
-        "lastPracticed": word_row[8].isoformat() + "Z" if word_row[8] else None
-    }
-    
-    response = {"ok": True, "progress": progress, "word": word_partial}
-    
-    if idempotency_key:
-        await store_idempotency(pool, user_id, endpoint, idempotency_key, response)
-    
-    return response
+        
+        # Update session progress
+        progress = await dao.update_session_progress(session_id, is_correct, payload.wordId)
+        
+        # Update word statistics
+        async with uow.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    sql("word.record_practice"),
+                    (1 if is_correct else 0, 1 if is_correct else 0, payload.wordId)
+                )
+                await conn.commit()
+                
+                # Fetch updated word
+                await cur.execute(
+                    sql("word.by_id"),
+                    (payload.wordId,)
+                )
+                word_row = await cur.fetchone()
+        
+        # Track mistake if incorrect
+        if not is_correct:
+            await dao.record_mistake(
+                user_id, "spelling_bee", payload.wordId,
+                user_answer=payload.userAnswer,
+                correct_answer=correct_word
+            )
+        else:
+            await dao.remove_mistake(user_id, "spelling_bee", payload.wordId)
+        
+        word_partial = decode_word_stats(word_row)
+        
+        response = {"ok": True, "progress": progress, "word": word_partial}
+        
+        if idempotency_key:
+            await store_idempotency(uow, user_id, endpoint, idempotency_key, response)
+        
+        return response
 
 
 @router.post("/sessions/{session_id}/complete")
@@ -415,7 +371,7 @@ async def get_pronunciation(
     user=Depends(get_current_user)
 ):
     """GET /v1/spelling/pronunciations/{wordId} - Get pronunciation audio URL."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -445,23 +401,26 @@ async def get_pronunciation(
 async def get_spelling_mistakes(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page (keyset pagination)"),
+    includeTotal: bool = Query(True, description="Set false to skip the total count"),
     user=Depends(get_current_user)
 ):
     """GET /v1/spelling/mistakes - Get user's spelling mistakes for review."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     dao = GamesDAO(pool)
     
-    mistakes, total = await dao.get_user_mistakes(user_id, "spelling_bee", page, limit)
+    mistakes, total, next_cursor = await dao.get_user_mistakes(
+        user_id, "spelling_bee", page, limit, cursor=cursor, include_total=includeTotal
+    )
     
     # Enrich with word data
     if mistakes:
         async with pool.acquire() as conn:
             async with conn.cursor() as cur:
                 item_ids = [m["itemId"] for m in mistakes]
-                placeholders = ",".join(["%s"] * len(item_ids))
                 await cur.execute(
-                    f"SELECT id, word, translation FROM words WHERE id IN ({placeholders})",
+                    sql_in("words.names_by_ids", len(item_ids)),
                     item_ids
                 )
                 word_rows = await cur.fetchall()
@@ -472,7 +431,10 @@ async def get_spelling_mistakes(
                     m["word"] = word_data.get("word")
                     m["translation"] = word_data.get("translation")
     
-    return paginate(mistakes, page, limit, total)
+    return paginate(
+        mistakes, page, limit, total,
+        include_total=includeTotal, keyset=True, next_cursor=next_cursor
+    )
 
 
 # =============================================================================
@@ -482,7 +444,7 @@ async def get_spelling_mistakes(
 @router.get("/stats/me")
 async def get_spelling_stats(user=Depends(get_current_user)):
     """GET /v1/spelling/stats/me - Get user's spelling statistics."""
-    pool = await get_pool_instance()
+    pool = await get_read_pool_instance()
     user_id = user["userId"]
     
     async with pool.acquire() as conn:
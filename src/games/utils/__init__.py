@@ -11,6 +11,9 @@ from .responses import (
     raise_error,
     paginate,
     apply_pagination,
+    encode_cursor,
+    decode_cursor,
+    keyset_page,
     make_progress,
     ok_response,
     created_response,
@@ -24,6 +27,8 @@ from .idempotency import (
     store_idempotency,
     check_client_result_id,
     cleanup_expired_keys,
+    IdempotencyStore,
+    idempotency_store,
 )
 
 __all__ = [
@@ -36,6 +41,9 @@ __all__ = [
     "raise_error",
     "paginate",
     "apply_pagination",
+    "encode_cursor",
+    "decode_cursor",
+    "keyset_page",
     "make_progress",
     "ok_response",
     "created_response",
@@ -47,4 +55,6 @@ __all__ = [
     "store_idempotency",
     "check_client_result_id",
     "cleanup_expired_keys",
+    "IdempotencyStore",
+    "idempotency_store",
 ]
@@ -1,14 +1,227 @@
 """
 Idempotency support for TULKKA Games APIs.
 Handles Idempotency-Key header and clientResultId deduplication.
+
+Every helper takes a ``pool`` argument: either the aiomysql pool or a
+request-scoped UnitOfWork (``GamesDAO.transaction()``), in which case the
+lookups/writes run on the handler's shared connection and transaction.
+
+Stored responses live in two tiers (``IdempotencyStore``):
+
+- an in-process LRU with the same expiry as the row (optionally shared by all
+  API processes through a Redis-compatible server, IDEMPOTENCY_REDIS_URL);
+- the ``idempotency_keys`` table. Writes made on the plain pool are queued
+  and flushed in batches in the background, on the pool current at flush
+  time; a failed batch is re-queued (up to IDEMPOTENCY_MAX_PENDING keys) and
+  retried. Writes inside a UnitOfWork stay in its transaction and reach the
+  memory tier only after it commits.
+
+A replay therefore normally costs no MySQL round trip, and a first request
+costs none for the key (one batched INSERT later).
 """
 
-import json
+import asyncio
+import calendar
+import hashlib
+import logging
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 from fastapi import Request
 
+from src.config import settings
+from src.db.mysql_pool import AsyncMySQLPool, UnitOfWork
+from src.games.dao.queries import sql
+from src.games.dao.rows import iso_z
+from src import json_utils
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str, str]
+
+# How long a response found in the shared tier is also kept in memory
+SHARED_HIT_MEMORY_SECONDS = 60
+
+# Minimum wait before retrying a flush that failed
+FLUSH_RETRY_SECONDS = 1.0
+
+
+class IdempotencyStore:
+    """Memory (+ optional Redis) tier and write-behind queue for idempotency_keys."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        flush_batch: Optional[int] = None,
+        redis_url: Optional[str] = None,
+        max_pending: Optional[int] = None,
+        pool_provider=None,
+        clock=time.time,
+    ):
+        self.max_entries = int(
+            max_entries if max_entries is not None
+            else getattr(settings, "IDEMPOTENCY_CACHE_SIZE", 10000)
+        )
+        self.flush_interval = float(
+            flush_interval if flush_interval is not None
+            else getattr(settings, "IDEMPOTENCY_FLUSH_INTERVAL_MS", 200) / 1000.0
+        )
+        self.flush_batch = int(
+            flush_batch if flush_batch is not None
+            else getattr(settings, "IDEMPOTENCY_FLUSH_BATCH", 200)
+        )
+        self.redis_url = redis_url if redis_url is not None else getattr(settings, "IDEMPOTENCY_REDIS_URL", "")
+        self.max_pending = int(
+            max_pending if max_pending is not None
+            else getattr(settings, "IDEMPOTENCY_MAX_PENDING", 10000)
+        )
+        # Resolved at flush time, so queued keys survive a pool re-init
+        self.pool_provider = pool_provider or AsyncMySQLPool.get_pool
+        self._clock = clock
+        self._memory: "OrderedDict[Key, Tuple[bytes, float]]" = OrderedDict()
+        self._pending: List[tuple] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._redis = None
+        self._redis_failed = False
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+    def peek(self, key: Key) -> Optional[bytes]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        data, expires_at = entry
+        if expires_at <= self._clock():
+            self._memory.pop(key, None)
+            return None
+        self._memory.move_to_end(key)
+        return data
+
+    def remember(self, key: Key, data: bytes, expires_at: float) -> None:
+        if self.max_entries <= 0 or expires_at <= self._clock():
+            return
+        self._memory[key] = (data, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def purge_memory(self) -> int:
+        now = self._clock()
+        expired = [k for k, (_, exp) in self._memory.items() if exp <= now]
+        for k in expired:
+            del self._memory[k]
+        return len(expired)
+
+    # ------------------------------------------------------------------
+    # Shared tier (optional)
+    # ------------------------------------------------------------------
+    def _redis_client(self):
+        if self._redis is None and self.redis_url and not self._redis_failed:
+            if aioredis is None:
+                logger.warning("IDEMPOTENCY_REDIS_URL set but the redis package is not installed")
+                self._redis_failed = True
+                return None
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def _redis_key(key: Key) -> str:
+        return "idem:" + hashlib.sha256("\x1f".join(key).encode("utf-8")).hexdigest()
+
+    async def shared_get(self, key: Key) -> Optional[bytes]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            return await client.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning("Idempotency shared-cache read failed: %s", e)
+            return None
+
+    async def shared_put(self, key: Key, data: bytes, expires_at: float) -> None:
+        client = self._redis_client()
+        ttl = int(expires_at - self._clock())
+        if client is None or ttl <= 0:
+            return
+        try:
+            await client.set(self._redis_key(key), data, ex=ttl)
+        except Exception as e:
+            logger.warning("Idempotency shared-cache write failed: %s", e)
+
+    # ------------------------------------------------------------------
+    # Write-behind to MySQL
+    # ------------------------------------------------------------------
+    def enqueue(self, params: tuple) -> None:
+        self._pending.append(params)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        delay = self.flush_interval
+        while True:
+            await asyncio.sleep(delay)
+            await self.flush()
+            if not self._pending:
+                return
+            # Keys queued meanwhile, or a failed batch waiting for MySQL
+            delay = max(self.flush_interval, FLUSH_RETRY_SECONDS)
+
+    def _requeue(self, rows: List[tuple]) -> None:
+        """Put a failed batch back in front, dropping expired and overflowing keys."""
+        now = datetime.utcnow()
+        pending = [p for p in rows if p[5] > now] + self._pending
+        overflow = len(pending) - self.max_pending
+        if overflow > 0:
+            # Oldest first; the memory tier still answers replays on this process
+            logger.error("Idempotency write queue full; dropping %d keys", overflow)
+            pending = pending[overflow:]
+        self._pending = pending
+
+    async def flush(self) -> int:
+        """
+        Write queued keys to idempotency_keys in batches; returns rows written.
+        Stops at the first failed batch, which is re-queued for the next flush.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                rows, self._pending = self._pending[:self.flush_batch], self._pending[self.flush_batch:]
+                try:
+                    pool = await self.pool_provider()
+                    async with pool.acquire() as conn:
+                        async with conn.cursor() as cur:
+                            await cur.executemany(sql("idempotency.put"), rows)
+                            await conn.commit()
+                    written += len(rows)
+                except Exception as e:
+                    logger.warning("Failed to flush %d idempotency keys; will retry: %s", len(rows), e)
+                    self._requeue(rows)
+                    break
+        return written
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _stored_bytes(value: Any) -> bytes:
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return json_utils.dumpb(value)
+
 
 async def get_idempotency_key(request: Request) -> Optional[str]:
     """Extract Idempotency-Key header from request."""
@@ -19,26 +232,37 @@ async def check_idempotency(
     pool,
     user_id: str,
     endpoint: str,
-    idempotency_key: str
-) -> Optional[Dict[str, Any]]:
+    idempotency_key: str,
+    raw: bool = False,
+) -> Optional[Union[Dict[str, Any], bytes]]:
     """
     Check if an idempotency key has been used before.
     Returns the cached response if found, None otherwise.
+
+    With ``raw=True`` the stored JSON is returned as bytes, ready to be sent
+    as-is with FastJSONResponse instead of being decoded and re-encoded.
     """
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                SELECT response_data FROM idempotency_keys
-                WHERE user_id = %s AND endpoint = %s AND idempotency_key = %s
-                AND (expires_at IS NULL OR expires_at > NOW())
-                """,
-                (user_id, endpoint, idempotency_key)
-            )
-            row = await cur.fetchone()
-            if row and row[0]:
-                return json.loads(row[0]) if isinstance(row[0], str) else row[0]
-    return None
+    key = (user_id, endpoint, idempotency_key)
+    data = idempotency_store.peek(key)
+    if data is None:
+        data = await idempotency_store.shared_get(key)
+        if data is not None:
+            idempotency_store.remember(key, data, time.time() + SHARED_HIT_MEMORY_SECONDS)
+    if data is None:
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql("idempotency.get"), key)
+                row = await cur.fetchone()
+        if not row or not row[0]:
+            return None
+        data = _stored_bytes(row[0])
+        expires_at = row[1] if len(row) > 1 else None
+        if isinstance(expires_at, datetime):
+            expires_ts = calendar.timegm(expires_at.utctimetuple())
+        else:
+            expires_ts = time.time() + SHARED_HIT_MEMORY_SECONDS
+        idempotency_store.remember(key, data, expires_ts)
+    return data if raw else json_utils.loads(data)
 
 
 async def store_idempotency(
@@ -50,20 +274,24 @@ async def store_idempotency(
     ttl_hours: int = 24
 ) -> None:
     """Store an idempotency key with its response for future deduplication."""
+    key = (user_id, endpoint, idempotency_key)
     key_id = str(uuid.uuid4())
     expires_at = datetime.utcnow() + timedelta(hours=ttl_hours)
-    
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO idempotency_keys (id, user_id, endpoint, idempotency_key, response_data, expires_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE response_data = VALUES(response_data), expires_at = VALUES(expires_at)
-                """,
-                (key_id, user_id, endpoint, idempotency_key, json.dumps(response_data), expires_at)
-            )
-            await conn.commit()
+    expires_ts = time.time() + ttl_hours * 3600
+    data = json_utils.dumpb(response_data)
+    params = (key_id, user_id, endpoint, idempotency_key, data.decode("utf-8"), expires_at)
+
+    if isinstance(pool, UnitOfWork):
+        # Part of the handler's transaction: only visible once it commits
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql("idempotency.put"), params)
+        pool.after_commit(lambda: idempotency_store.remember(key, data, expires_ts))
+        return
+
+    idempotency_store.remember(key, data, expires_ts)
+    await idempotency_store.shared_put(key, data, expires_ts)
+    idempotency_store.enqueue(params)
 
 
 async def check_client_result_id(
@@ -78,11 +306,7 @@ async def check_client_result_id(
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             await cur.execute(
-                """
-                SELECT id, is_correct, attempts, time_spent_ms, created_at
-                FROM game_results
-                WHERE session_id = %s AND client_result_id = %s
-                """,
+                sql("result.by_client_id"),
                 (session_id, client_result_id)
             )
             row = await cur.fetchone()
@@ -92,17 +316,27 @@ async def check_client_result_id(
                     "isCorrect": bool(row[1]),
                     "attempts": row[2],
                     "timeSpentMs": row[3],
-                    "createdAt": row[4].isoformat() + "Z" if row[4] else None
+                    "createdAt": iso_z(row[4])
                 }
     return None
 
 
-async def cleanup_expired_keys(pool) -> int:
-    """Remove expired idempotency keys. Returns count of deleted rows."""
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "DELETE FROM idempotency_keys WHERE expires_at < NOW()"
-            )
-            await conn.commit()
-            return cur.rowcount
+async def cleanup_expired_keys(pool, batch_size: Optional[int] = None, max_batches: int = 100) -> int:
+    """
+    Remove expired idempotency keys in chunks of ``batch_size`` rows (one
+    short transaction each, so the purge never holds long locks). Returns
+    the number of deleted rows.
+    """
+    batch_size = int(batch_size or getattr(settings, "IDEMPOTENCY_PURGE_BATCH", 1000))
+    idempotency_store.purge_memory()
+    deleted = 0
+    for _ in range(max_batches):
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql("idempotency.purge_expired"), (batch_size,))
+                await conn.commit()
+                count = cur.rowcount
+        deleted += count
+        if count < batch_size:
+            break
+    return deleted
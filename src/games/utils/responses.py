@@ -3,10 +3,14 @@ Shared response utilities for TULKKA Games APIs.
 Provides standardized error shapes, pagination, and response helpers.
 """
 
-from typing import Any, Dict, List, Optional, TypeVar, Generic
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Generic
 from pydantic import BaseModel
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
+
+from src.json_utils import FastJSONResponse
 
 
 # =============================================================================
@@ -37,9 +41,9 @@ def error_response(
     code: str,
     message: str,
     details: Optional[Dict[str, Any]] = None
-) -> JSONResponse:
+) -> FastJSONResponse:
     """Create a standardized error response."""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status_code,
         content={
             "error": {
@@ -90,10 +94,11 @@ class ErrorCodes:
 # =============================================================================
 
 class Pagination(BaseModel):
-    """Pagination metadata."""
+    """Pagination metadata (total is null when the client opted out of counting)."""
     page: int
     limit: int
-    total: int
+    total: Optional[int] = None
+    nextCursor: Optional[str] = None
 
 
 T = TypeVar('T')
@@ -109,17 +114,26 @@ def paginate(
     items: List[Any],
     page: int = 1,
     limit: int = 20,
-    total: Optional[int] = None
+    total: Optional[int] = None,
+    include_total: bool = True,
+    keyset: bool = False,
+    next_cursor: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Create a paginated response."""
-    actual_total = total if total is not None else len(items)
+    """Create a paginated response.
+
+    Keyset endpoints pass ``keyset=True`` so ``nextCursor`` is always present
+    (null on the last page). With ``include_total=False`` the total is null.
+    """
+    pagination: Dict[str, Any] = {
+        "page": page,
+        "limit": limit,
+        "total": (total if total is not None else len(items)) if include_total else None
+    }
+    if keyset:
+        pagination["nextCursor"] = next_cursor
     return {
         "data": items,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": actual_total
-        }
+        "pagination": pagination
     }
 
 
@@ -135,6 +149,52 @@ def apply_pagination(
     return items[start:end], total
 
 
+# =============================================================================
+# Keyset (cursor) pagination
+# =============================================================================
+
+def _cursor_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_cursor(kind: str, *values: Any) -> str:
+    """Build an opaque cursor for the last row of a page.
+
+    ``kind`` names the ordering (e.g. ``"word_lists:updated_at"``) so a cursor
+    from one listing/sort order is rejected by another.
+    """
+    raw = json.dumps([kind, *(_cursor_value(v) for v in values)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, arity: int = 2) -> List[Any]:
+    """Decode a cursor produced by encode_cursor; 400 VALIDATION_ERROR if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        decoded = None
+    if not isinstance(decoded, list) or len(decoded) != arity + 1 or decoded[0] != kind:
+        raise_error(400, ErrorCodes.VALIDATION_ERROR, "Invalid cursor", {"field": "cursor"})
+    return decoded[1:]
+
+
+def keyset_page(
+    rows: Sequence[Any],
+    limit: int,
+    cursor_for: Callable[[Any], str]
+) -> Tuple[List[Any], Optional[str]]:
+    """Trim a ``LIMIT limit + 1`` fetch to ``limit`` rows.
+
+    Returns (rows, next_cursor); next_cursor is built from the last kept row
+    only when the extra row proves there is another page.
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    kept = list(rows[:limit])
+    return kept, cursor_for(kept[-1])
+
+
 # =============================================================================
 # Progress Object (shared across all games)
 # =============================================================================
@@ -169,12 +229,12 @@ def ok_response(data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     return response
 
 
-def created_response(data: Dict[str, Any], location: Optional[str] = None) -> JSONResponse:
+def created_response(data: Dict[str, Any], location: Optional[str] = None) -> FastJSONResponse:
     """201 Created response with optional Location header."""
     headers = {}
     if location:
         headers["Location"] = location
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=201,
         content=data,
         headers=headers if headers else None
@@ -0,0 +1,80 @@
+# src/json_utils.py
+"""
+Fast JSON encoding for API responses and JSON columns.
+
+Uses orjson when it is installed and falls back to the stdlib ``json`` module.
+Both backends produce compact output with UTF-8 (not \\u-escaped) text and
+accept the same extra types (datetime/date, UUID, Decimal, set), so callers
+never depend on which one is active.
+"""
+
+from __future__ import annotations
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, Union
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # orjson handles these natively; the stdlib fallback needs them spelled out
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumpb(obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        return orjson.loads(data)
+
+else:  # pragma: no cover
+    def dumpb(obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes."""
+        return json.dumps(
+            obj, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a JSON string (for JSON/TEXT column parameters)."""
+    return dumpb(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the fast backend.
+
+    ``content`` may also be already-serialized JSON (bytes), e.g. a stored
+    idempotent response, which is sent as-is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumpb(content)
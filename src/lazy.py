@@ -0,0 +1,68 @@
+# src/lazy.py
+"""
+On-first-use service providers.
+
+Modules that used to build clients at import time (``SupabaseClient()``,
+``LessonProcessor()``, ``ZoomAPI()``) bind a ``LazyService`` instead. The
+proxy forwards attribute access to the real object, which is constructed on
+the first access and then reused, so call sites (``supabase.client``,
+``lesson_processor.process_lesson(...)``) and ``monkeypatch.setattr`` on the
+module global keep working while importing the module stays cheap.
+"""
+
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+_UNSET = object()
+
+
+class LazyService(Generic[T]):
+    """Thread-safe proxy that builds ``factory()`` on first attribute access."""
+
+    __slots__ = ("_factory", "_instance", "_lock", "_name")
+
+    def __init__(self, factory: Callable[[], T], name: str = ""):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", _UNSET)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_name", name or getattr(factory, "__name__", "service"))
+
+    def resolve(self) -> T:
+        """Return the underlying object, constructing it if needed."""
+        instance = self._instance
+        if instance is _UNSET:
+            with self._lock:
+                instance = self._instance
+                if instance is _UNSET:
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not _UNSET
+
+    def reset(self) -> None:
+        """Drop the instance; the next access builds a fresh one."""
+        with self._lock:
+            object.__setattr__(self, "_instance", _UNSET)
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.resolve(), item)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        setattr(self.resolve(), key, value)
+
+    def __bool__(self) -> bool:
+        return bool(self.resolve())
+
+    def __repr__(self) -> str:
+        state = repr(self._instance) if self.initialized else "not initialized"
+        return f"<LazyService {self._name}: {state}>"
+
+
+def lazy(factory: Callable[[], T], name: str = "") -> T:
+    """Return a ``LazyService`` for ``factory`` typed as the service itself."""
+    return LazyService(factory, name)  # type: ignore[return-value]
@@ -0,0 +1,371 @@
+# src/metrics.py
+"""
+Prometheus-style metrics for the API and the Zoom worker.
+
+A small dependency-free registry of counters, gauges and histograms rendered
+in the Prometheus text exposition format (0.0.4):
+
+- API request latency per route template   (http_request_duration_seconds)
+- MySQL pool usage, acquire wait and query latency (registered by mysql_pool)
+- Worker stage durations and job outcomes   (pipeline_stage_duration_seconds)
+- Provider calls: Gemini, AssemblyAI, Groq, translator (provider_request_duration_seconds)
+- Worker queue depth and running jobs
+
+The API serves it at /v1/metrics (Prometheus text when the scraper asks for
+it, JSON otherwise); the worker serves it from ``start_metrics_server`` (see
+run_worker.py). Worker child processes ship their counters and histograms to
+the parent with ``registry.drain()`` / ``registry.merge()``, so one endpoint
+covers every job process.
+"""
+
+from __future__ import annotations
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds. Requests and queries are sub-second; stages and provider calls run
+# from seconds (Groq) to many minutes (transcribing a long recording).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0)
+PROVIDER_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 180.0, 600.0)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name + "_total", self._labels(k), v) for k, v in items]
+
+    def _merge(self, key: LabelValues, value: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, self._labels(k), v) for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts..., sum, count]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        out: List[Sample] = []
+        for key, state in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, n in zip(self.buckets, state):
+                cumulative += n
+                out.append((self.name + "_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            out.append((self.name + "_bucket", {**labels, "le": "+Inf"}, state[-1]))
+            out.append((self.name + "_sum", labels, state[-2]))
+            out.append((self.name + "_count", labels, state[-1]))
+        return out
+
+    def _merge(self, key: LabelValues, state: List[float]) -> None:
+        with self._lock:
+            current = self._values.get(key)
+            if current is None:
+                self._values[key] = list(state)
+            else:
+                self._values[key] = [a + b for a, b in zip(current, state)]
+
+
+class Registry:
+    """Named metrics plus collectors that produce gauges at scrape time."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, List[Sample]]]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, fn: Callable[[], Iterable[Tuple[str, str, List[Sample]]]]) -> Callable:
+        """
+        Register ``fn`` returning ``(name, help, samples)`` gauge families,
+        evaluated on every render (pool usage, queue state, ...).
+        """
+        self._collectors.append(fn)
+        return fn
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{n}{_format_labels(l)} {_format_value(v)}" for n, l, v in samples)
+        for collect in list(self._collectors):
+            try:
+                families = list(collect())
+            except Exception:
+                logger.exception("Metrics collector %r failed", collect)
+                continue
+            for name, documentation, samples in families:
+                if not samples:
+                    continue
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{n}{_format_labels(l)} {_format_value(v)}" for n, l, v in samples)
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, List[Tuple[LabelValues, Any]]]:
+        """
+        Take and reset counter/histogram values (picklable), for a child
+        process to hand to its parent's ``merge``. Gauges are per-process.
+        """
+        out: Dict[str, List[Tuple[LabelValues, Any]]] = {}
+        for name, metric in list(self._metrics.items()):
+            if isinstance(metric, (Counter, Histogram)):
+                with metric._lock:
+                    items = list(metric._values.items())
+                    metric._values.clear()
+                if items:
+                    out[name] = items
+        return out
+
+    def merge(self, drained: Dict[str, List[Tuple[LabelValues, Any]]]) -> None:
+        for name, items in (drained or {}).items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                for key, value in items:
+                    metric._merge(tuple(key), value)
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template.",
+    ("method", "route", "status"),
+)
+pipeline_stage_duration = registry.histogram(
+    "pipeline_stage_duration_seconds",
+    "Worker pipeline stage duration (download, transcribe, extract, generate, enhance, persist).",
+    ("stage", "outcome"),
+    buckets=STAGE_BUCKETS,
+)
+worker_jobs = registry.counter(
+    "worker_jobs",
+    "Worker jobs by outcome.",
+    ("outcome",),
+)
+worker_queue_depth = registry.gauge(
+    "worker_queue_depth",
+    "Pending rows eligible for processing (exact count, refreshed every WORKER_QUEUE_DEPTH_INTERVAL_SECONDS).",
+)
+provider_request_duration = registry.histogram(
+    "provider_request_duration_seconds",
+    "External provider call latency (gemini, assemblyai, groq, translator).",
+    ("provider", "operation", "outcome"),
+    buckets=PROVIDER_BUCKETS,
+)
+
+
+@contextmanager
+def _timed(histogram: Histogram, span_name: str, **labels: Any) -> Iterator[Any]:
+    # Each timed section is also a span of the active job trace (if any)
+    with tracing.span(span_name, **labels) as span:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            yield span
+            outcome = "ok"
+        finally:
+            histogram.observe(time.perf_counter() - start, outcome=outcome, **labels)
+
+
+def stage_timer(stage: str):
+    """Time a worker pipeline stage; exceptions are recorded as outcome="error"."""
+    return _timed(pipeline_stage_duration, f"stage.{stage}", stage=stage)
+
+
+def provider_call(provider: str, operation: str):
+    """Time one external provider call; exceptions are recorded as outcome="error"."""
+    return _timed(
+        provider_request_duration, f"{provider}.{operation}", provider=provider, operation=operation
+    )
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    http_request_duration.observe(seconds, method=method, route=route, status=str(status))
+
+
+# -------------------------
+# Worker listener
+# -------------------------
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802 (http.server API)
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # keep scrapes out of the worker log
+        logger.debug("metrics %s - %s", self.address_string(), format % args)
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``registry`` at http://host:port/metrics from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info("Metrics listener on %s:%s/metrics", host, server.server_address[1])
+    return server
@@ -0,0 +1,365 @@
+# src/profiler.py
+"""
+On-demand sampling profiler for live API and worker processes.
+
+Off unless PROFILER_ENABLED is set. A profile is started at runtime with
+``POST /v1/admin/profile`` on the API or SIGUSR2 to run_worker.py. A daemon
+thread then wakes every ``interval`` seconds for a fixed window and records the
+Python stack of every other thread (``sys._current_frames()``). Nothing is
+hooked into the profiled code, so the cost is one stack walk per thread per
+tick, and none at all when no profile is running.
+
+With an event loop attached (the API), each tick also records where every
+pending asyncio task is suspended, by walking its coroutine ``cr_await``
+chain on the loop. Time spent awaiting MySQL or a lock, such as
+``update_session_progress`` waiting on the row lock, shows up there. It is
+invisible to thread sampling, where the loop just sits in ``select``.
+
+When the window ends, two files are written to ``TEMP_DIR/profiles/``:
+``<label>-<pid>-<time>.collapsed`` (flamegraph.pl / speedscope input, one
+``frame;frame;frame count`` line per stack) and ``.speedscope.json``, which
+opens directly at https://www.speedscope.app.
+"""
+
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_SECONDS = 600
+
+# Leaf frames of threads that are parked, not working; dropped unless idle=True
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("connection.py", "_poll"),
+    ("socketserver.py", "serve_forever"),
+    ("thread.py", "_worker"),
+}
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def profile_dir() -> str:
+    return os.path.join(settings.TEMP_DIR, "profiles")
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_ROOT + os.sep):
+        return os.path.relpath(filename, _ROOT)
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+
+class SamplingProfiler:
+    """Samples all thread stacks (and asyncio tasks of ``loop``) for a time window."""
+
+    def __init__(
+        self,
+        seconds: float = 30.0,
+        interval: float = 0.01,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        idle: bool = False,
+        label: str = "profile",
+        directory: Optional[str] = None,
+    ):
+        self.seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+        self.interval = max(0.001, float(interval))
+        self.loop = loop
+        self.idle = idle
+        self.label = label
+        self.directory = directory or profile_dir()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.elapsed = 0.0
+        self.files: Dict[str, str] = {}
+        self.error: Optional[str] = None
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._stacks_lock = threading.Lock()  # task samples are added from the loop thread
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------
+    # Control
+    # -------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._done.is_set()
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        base = os.path.join(self.directory, f"{self.label}-{os.getpid()}-{stamp}")
+        self.files = {"collapsed": base + ".collapsed", "speedscope": base + ".speedscope.json"}
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """End the window early; the output is still written."""
+        self._stop.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "running" if self.running else ("failed" if self.error else "finished"),
+            "label": self.label,
+            "pid": os.getpid(),
+            "startedAt": self.started_at,
+            "seconds": self.seconds,
+            "intervalMs": self.interval * 1000,
+            "elapsed": round(self.elapsed, 3),
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            "files": self.files,
+            "error": self.error,
+        }
+
+    # -------------------------
+    # Sampling
+    # -------------------------
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names: Dict[int, str] = {}
+        started = time.perf_counter()
+        try:
+            while not self._stop.wait(self.interval):
+                self.elapsed = time.perf_counter() - started
+                if self.elapsed >= self.seconds:
+                    break
+                if len(names) != threading.active_count():
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                self._sample_threads(own, names)
+                if self.loop is not None and not self.loop.is_closed():
+                    try:
+                        self.loop.call_soon_threadsafe(self._sample_tasks)
+                    except RuntimeError:
+                        self.loop = None
+                self.samples += 1
+            self.elapsed = time.perf_counter() - started
+            self._stop.set()
+            self.write()
+            logger.info("Profile written to %s (%d samples)", self.files["speedscope"], self.samples)
+        except Exception as exc:
+            self.error = f"{type(exc).__name__}: {exc}"
+            logger.exception("Sampling profiler failed")
+        finally:
+            self._done.set()
+
+    def _frame_label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _sample_threads(self, own: int, names: Dict[int, str]) -> None:
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if not self.idle:
+                leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+                if leaf in _IDLE_LEAVES:
+                    continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(self._frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(f"thread:{names.get(ident, ident)}")
+            with self._stacks_lock:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def _sample_tasks(self) -> None:
+        """Runs on the event loop: where each pending task is suspended."""
+        if self._stop.is_set():
+            return
+        for task in asyncio.all_tasks(self.loop):
+            stack = ["asyncio-tasks"]
+            coro: Any = task.get_coro()
+            while coro is not None:
+                frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+                if frame is None:
+                    break
+                stack.append(self._frame_label(frame.f_code))
+                coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+            if len(stack) > 1:
+                with self._stacks_lock:
+                    self.stacks[";".join(stack)] += 1
+
+    # -------------------------
+    # Output
+    # -------------------------
+    def _counts(self) -> List[Tuple[str, int]]:
+        with self._stacks_lock:
+            return self.stacks.most_common()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._counts())
+
+    def speedscope(self) -> Dict[str, Any]:
+        """speedscope file: one sampled profile per thread plus one for asyncio tasks."""
+        frames: List[Dict[str, Any]] = []
+        index: Dict[str, int] = {}
+        profiles: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        for stack, count in self._counts():
+            root, *rest = stack.split(";")
+            ids = []
+            for name in rest:
+                if name not in index:
+                    index[name] = len(frames)
+                    func, _, where = name.rpartition(" (")
+                    file, _, line = where.rstrip(")").rpartition(":")
+                    frames.append({"name": func or name, "file": file, "line": int(line) if line.isdigit() else None})
+                ids.append(index[name])
+            samples, weights = profiles.setdefault(root, ([], []))
+            samples.append(ids)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.label} pid {os.getpid()}",
+            "exporter": "src.profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": root,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for root, (samples, weights) in sorted(profiles.items())
+            ],
+        }
+
+    def write(self) -> Dict[str, str]:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.files["collapsed"], "w", encoding="utf-8") as fh:
+            fh.write(self.collapsed())
+        with open(self.files["speedscope"], "w", encoding="utf-8") as fh:
+            json.dump(self.speedscope(), fh)
+        return self.files
+
+
+# -------------------------
+# Process-wide control
+# -------------------------
+_lock = threading.Lock()
+_current: Optional[SamplingProfiler] = None
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "PROFILER_ENABLED", False))
+
+
+def current() -> Optional[SamplingProfiler]:
+    """The running profile, or the last one taken in this process."""
+    return _current
+
+
+def start_profile(
+    seconds: Optional[float] = None,
+    interval_ms: Optional[float] = None,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    idle: bool = False,
+    label: str = "profile",
+) -> SamplingProfiler:
+    """Start a profile in this process; raises ProfilerBusy if one is running."""
+    global _current
+    with _lock:
+        if _current is not None and _current.running:
+            raise ProfilerBusy(f"A profile is already running until {_current.started_at + _current.seconds:.0f}")
+        _current = SamplingProfiler(
+            seconds=seconds or getattr(settings, "PROFILER_SECONDS", 30),
+            interval=(interval_ms or getattr(settings, "PROFILER_INTERVAL_MS", 10)) / 1000,
+            loop=loop,
+            idle=idle,
+            label=label,
+        ).start()
+        logger.info("Sampling profiler started for %.0fs (label=%s)", _current.seconds, label)
+        return _current
+
+
+# Self-pipe between the signal handler and the thread that acts on it
+_signal_pipe: Optional[Tuple[int, int]] = None
+_signal_target: Dict[str, Any] = {}
+
+
+def _serve_signal_requests(read_fd: int) -> None:
+    """Start (and forward) one profile per signal byte written by the handler."""
+    while True:
+        try:
+            data = os.read(read_fd, 64)
+        except OSError:
+            return
+        if not data:
+            return
+        for received in data:
+            try:
+                start_profile(label=_signal_target["label"])
+            except ProfilerBusy as exc:
+                logger.warning("Profile request ignored: %s", exc)
+            except Exception:
+                logger.exception("Could not start profile on signal")
+            forward = _signal_target.get("forward")
+            if forward is not None:
+                try:
+                    forward(received)
+                except Exception:
+                    logger.exception("Could not forward profile signal")
+
+
+def install_signal_handler(label: str, forward=None, signum: int = getattr(signal, "SIGUSR2", 0)) -> bool:
+    """
+    Start a profile when this process receives SIGUSR2 (when PROFILER_ENABLED).
+    ``forward`` is called with the signal number too, e.g. to signal child processes.
+
+    The handler only writes a byte to a pipe: it may interrupt code holding
+    ``_lock`` or the logging locks, so the profile is started (and the signal
+    forwarded) by a daemon thread reading the other end.
+    """
+    global _signal_pipe
+    if not enabled() or not signum:
+        return False
+
+    _signal_target.update(label=label, forward=forward)
+    if _signal_pipe is None:
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(write_fd, False)
+        _signal_pipe = (read_fd, write_fd)
+        threading.Thread(
+            target=_serve_signal_requests, args=(read_fd,), name="profiler-signal", daemon=True
+        ).start()
+    write_fd = _signal_pipe[1]
+
+    def handler(received, frame):
+        try:
+            os.write(write_fd, bytes([received]))
+        except OSError:
+            pass  # pipe full: a profile request is already pending
+
+    signal.signal(signum, handler)
+    return True
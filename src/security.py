@@ -2,30 +2,175 @@
 """Security utilities for JWT authentication and authorization."""
 
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 import hashlib
+import json
 import secrets
+import threading
+import time
 
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
+from jose.exceptions import JWKError
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+ASYMMETRIC_PREFIXES = ("RS", "PS", "ES")
+
 
 class JWTValidationError(Exception):
     """Raised when JWT validation fails."""
     pass
 
+
+# ---------------------------------------------------------------------------
+# Key material (constructed once per configuration)
+# ---------------------------------------------------------------------------
+def _public_key_text() -> Optional[str]:
+    if settings.JWT_PUBLIC_KEY:
+        return settings.JWT_PUBLIC_KEY
+    path = getattr(settings, "JWT_PUBLIC_KEY_FILE", None)
+    if path:
+        return _read_key_file(path)
+    return None
+
+
+@lru_cache(maxsize=4)
+def _read_key_file(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as fh:
+        return fh.read()
+
+
+@lru_cache(maxsize=8)
+def _construct_keys(algorithm: str, material: str) -> Tuple[Any, ...]:
+    """Parse the secret / PEM / JWKS once into jose Key objects."""
+    try:
+        document = json.loads(material)
+    except ValueError:
+        document = None
+    if isinstance(document, dict) and "keys" in document:
+        jwks = [k for k in document["keys"] if k.get("alg") in (None, algorithm)]
+        return tuple(jwk.construct(k, algorithm) for k in jwks)
+    if isinstance(document, dict) and "kty" in document:
+        return (jwk.construct(document, algorithm),)
+    return (jwk.construct(material, algorithm),)
+
+
+def _verification_keys() -> Tuple[str, Tuple[Any, ...]]:
+    """Return (algorithm, keys) for the configured algorithm; raise if unconfigured."""
+    algorithm = settings.JWT_ALGORITHM
+    if algorithm.upper().startswith(ASYMMETRIC_PREFIXES):
+        material = _public_key_text()
+        if not material:
+            logger.error("JWT_PUBLIC_KEY not configured for %s - rejecting all tokens", algorithm)
+            raise JWTValidationError(f"Server misconfigured: no public key for {algorithm}")
+    else:
+        material = settings.JWT_SECRET
+        if not material:
+            logger.error("JWT_SECRET not configured - rejecting all tokens in production")
+            raise JWTValidationError("Server misconfigured: JWT_SECRET not set")
+    try:
+        return algorithm, _construct_keys(algorithm, material)
+    except (JWKError, ValueError, TypeError) as e:
+        logger.error("Invalid JWT key material for %s: %s", algorithm, e)
+        raise JWTValidationError(f"Server misconfigured: invalid key for {algorithm}")
+
+
+# ---------------------------------------------------------------------------
+# Verified-token cache
+# ---------------------------------------------------------------------------
+class VerifiedTokenCache:
+    """
+    Bounded LRU of sha256(token) -> (payload, expires_at).
+
+    A token is verified once and then honored until its ``exp`` (or for at
+    most ``max_ttl`` seconds), turning repeat verifications into a hash lookup.
+    Entries are bound to the key material that verified them.
+    """
+
+    def __init__(self, maxsize: int = 4096, max_ttl: float = 3600, clock=time.time):
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, digest: bytes, keys: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at, owner = entry
+            if owner is not keys or self._clock() >= expires_at:
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return payload
+
+    def put(self, digest: bytes, payload: Dict[str, Any], keys: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        now = self._clock()
+        expires_at = now + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[digest] = (payload, expires_at, keys)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = VerifiedTokenCache(
+    maxsize=getattr(settings, "JWT_CACHE_SIZE", 4096),
+    max_ttl=getattr(settings, "JWT_CACHE_MAX_TTL_SECONDS", 3600),
+)
+
+
+def _verify(token: str) -> Dict[str, Any]:
+    algorithm, keys = _verification_keys()
+    digest = token_cache.digest(token)
+    payload = token_cache.get(digest, keys)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, keys, algorithms=[algorithm])
+        except JWTError as e:
+            raise JWTValidationError(f"Invalid token: {e}")
+        token_cache.put(digest, payload, keys)
+    # Callers may annotate the payload; keep the cached copy pristine
+    return dict(payload)
+
+
 def decode_jwt(token: str) -> Optional[Dict[str, Any]]:
     """Decode and validate a JWT token. Returns payload or None."""
     if not token:
         return None
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET or "", algorithms=[settings.JWT_ALGORITHM])
-        return payload
-    except JWTError as e:
+        return _verify(token)
+    except JWTValidationError as e:
         logger.debug("JWT decode failed: %s", e)
         return None
 
@@ -33,14 +178,7 @@ def verify_jwt(token: str) -> Dict[str, Any]:
     """Verify JWT and return payload, raise JWTValidationError if invalid"""
     if not token:
         raise JWTValidationError("Missing token")
-    if not settings.JWT_SECRET:
-        logger.error("JWT_SECRET not configured - rejecting all tokens in production")
-        raise JWTValidationError("Server misconfigured: JWT_SECRET not set")
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        return payload
-    except JWTError as e:
-        raise JWTValidationError(f"Invalid token: {e}")
+    return _verify(token)
 
 def require_scope(payload: Dict[str, Any], required_scope: str) -> bool:
     """Check scope presence in token payload."""
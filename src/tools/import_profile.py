@@ -0,0 +1,116 @@
+"""
+Startup import profile for the API and worker entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+summarizes the output: total import time, the slowest modules by cumulative
+time, and whether any modules that are supposed to load lazily (Supabase,
+Groq, Gemini, soundfile) were imported at startup.
+
+Usage:
+    python -m src.tools.import_profile [src.api.app src.workers.zoom_processor] [--top 15]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_TARGETS = ("src.api.app", "src.workers.zoom_processor")
+
+# Heavy third-party packages that must only load on first use.
+LAZY_MODULES = ("supabase", "groq", "google.genai", "soundfile", "deep_translator")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    target: str
+    records: List[ImportRecord] = field(default_factory=list)
+
+    @property
+    def by_module(self) -> Dict[str, ImportRecord]:
+        return {r.module: r for r in self.records}
+
+    @property
+    def total_us(self) -> int:
+        return sum(r.self_us for r in self.records)
+
+    def loaded(self, module: str) -> bool:
+        return any(r.module == module or r.module.startswith(module + ".") for r in self.records)
+
+    def eager(self, modules: Sequence[str] = LAZY_MODULES) -> List[str]:
+        """Modules from ``modules`` that were imported at startup."""
+        return [m for m in modules if self.loaded(m)]
+
+    def top(self, n: int = 15, depth: Optional[int] = None) -> List[ImportRecord]:
+        rows = self.records if depth is None else [r for r in self.records if r.depth <= depth]
+        return sorted(rows, key=lambda r: r.cumulative_us, reverse=True)[:n]
+
+    def report(self, n: int = 15) -> str:
+        lines = [f"{self.target}: {self.total_us / 1000:.1f} ms total import time"]
+        for r in self.top(n):
+            lines.append(f"  {r.cumulative_us / 1000:8.1f} ms  {'  ' * r.depth}{r.module}")
+        eager = self.eager()
+        lines.append(f"  lazy modules loaded at startup: {', '.join(eager) if eager else 'none'}")
+        return "\n".join(lines)
+
+
+def parse_importtime(stderr: str, target: str = "") -> ImportProfile:
+    """Parse ``-X importtime`` output into an ImportProfile."""
+    profile = ImportProfile(target=target)
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, module = m.groups()
+            profile.records.append(
+                ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return profile
+
+
+def profile_import(target: str, python: str = sys.executable, cwd: Optional[str] = None) -> ImportProfile:
+    """Import ``target`` in a fresh interpreter and profile it."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env=env,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.splitlines()[-20:])
+        raise RuntimeError(f"import {target} failed:\n{tail}")
+    return parse_importtime(proc.stderr, target)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile startup imports of the API and worker.")
+    parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS))
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    args = parser.parse_args()
+
+    failed = False
+    for target in args.targets:
+        profile = profile_import(target)
+        print(profile.report(args.top))
+        failed = failed or bool(profile.eager())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
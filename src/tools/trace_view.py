@@ -0,0 +1,136 @@
+"""
+Waterfall view of one worker job trace.
+
+Reads TRACE_DIR/<zoom_summary_id>.jsonl (written by src/tracing.py) and prints
+the latest attempt, or the one given with --trace, as an indented waterfall:
+one row per span with its offset, duration and a bar on the job's timeline,
+followed by the spans with the most self time (time not covered by children).
+
+Usage:
+    python -m src.tools.trace_view <zoom_summary_id | path.jsonl> [--trace ID] [--list]
+    python -m src.tools.trace_view <id> --otlp trace.json   # OTLP/JSON for other viewers
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from ..tracing import JsonlExporter, load_spans, to_otlp
+
+
+def _resolve_path(target: str) -> str:
+    if os.path.exists(target):
+        return target
+    return JsonlExporter().path_for(target)
+
+
+def _tree(spans: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Spans in depth-first order (children by start time) with their depth."""
+    ids = {s["span_id"] for s in spans}
+    children: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    for s in spans:
+        parent = s.get("parent_id") if s.get("parent_id") in ids else None
+        children[parent].append(s)
+    for items in children.values():
+        items.sort(key=lambda s: s["start"])
+
+    out: List[Tuple[int, Dict[str, Any]]] = []
+    stack = [(0, s) for s in reversed(children[None])]
+    while stack:
+        depth, s = stack.pop()
+        out.append((depth, s))
+        stack.extend((depth + 1, c) for c in reversed(children[s["span_id"]]))
+    return out
+
+
+def _duration(s: Dict[str, Any]) -> float:
+    return max(0.0, (s.get("end") or s["start"]) - s["start"])
+
+
+def self_times(spans: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Span duration minus the time covered by its direct children."""
+    child_total: Dict[str, float] = defaultdict(float)
+    for s in spans:
+        if s.get("parent_id"):
+            child_total[s["parent_id"]] += _duration(s)
+    return {s["span_id"]: max(0.0, _duration(s) - child_total[s["span_id"]]) for s in spans}
+
+
+def render_waterfall(spans: List[Dict[str, Any]], width: int = 40, top: int = 8) -> str:
+    if not spans:
+        return "(no spans)"
+    t0 = min(s["start"] for s in spans)
+    t1 = max((s.get("end") or s["start"]) for s in spans)
+    total = max(t1 - t0, 1e-9)
+    rows = _tree(spans)
+    name_width = min(60, max(len("  " * d + s["name"]) for d, s in rows))
+
+    root = rows[0][1]
+    attrs = " ".join(f"{k}={v}" for k, v in (root.get("attributes") or {}).items())
+    lines = [f"trace {root['trace_id'][:16]}  {root['name']}  {attrs}  total {total:.2f}s"]
+    for depth, s in rows:
+        offset, dur = s["start"] - t0, _duration(s)
+        begin = int(offset / total * width)
+        length = max(1, int(round(dur / total * width)))
+        bar = " " * begin + ("█" if s.get("status") != "error" else "▒") * min(length, width - begin)
+        label = ("  " * depth + s["name"])[:name_width]
+        extra = ""
+        if s.get("status") == "error":
+            extra = f"  ERROR {s.get('error') or ''}"
+        lines.append(f"{label:<{name_width}} {offset:9.2f}s {dur:9.2f}s |{bar:<{width}}|{extra}")
+
+    selfs = self_times(spans)
+    hot = sorted(spans, key=lambda s: selfs[s["span_id"]], reverse=True)[:top]
+    lines.append("")
+    lines.append("self time:")
+    for s in hot:
+        share = selfs[s["span_id"]] / total * 100
+        lines.append(f"  {selfs[s['span_id']]:9.2f}s {share:5.1f}%  {s['name']}")
+    return "\n".join(lines)
+
+
+def list_traces(path: str) -> str:
+    with open(path, encoding="utf-8") as fh:
+        spans = [json.loads(line) for line in fh if line.strip()]
+    roots = sorted((s for s in spans if s.get("parent_id") is None), key=lambda s: s["start"])
+    return "\n".join(
+        f"{r['trace_id']}  {r['name']}  {_duration(r):9.2f}s  {r.get('status')}  "
+        + " ".join(f"{k}={v}" for k, v in (r.get("attributes") or {}).items())
+        for r in roots
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show a worker job trace as a waterfall.")
+    parser.add_argument("target", help="zoom_summary id (looked up in TRACE_DIR) or a .jsonl path")
+    parser.add_argument("--trace", help="Trace id (prefix) to show; default is the latest attempt")
+    parser.add_argument("--list", action="store_true", help="List the traces (attempts) in the file")
+    parser.add_argument("--width", type=int, default=40, help="Width of the timeline bars")
+    parser.add_argument("--top", type=int, default=8, help="Spans to list by self time")
+    parser.add_argument("--otlp", metavar="FILE", help="Write the trace as OTLP/JSON instead")
+    args = parser.parse_args()
+
+    path = _resolve_path(args.target)
+    if not os.path.exists(path):
+        print(f"No trace file at {path}", file=sys.stderr)
+        return 1
+    if args.list:
+        print(list_traces(path))
+        return 0
+
+    spans = load_spans(path, args.trace)
+    if args.otlp:
+        with open(args.otlp, "w", encoding="utf-8") as fh:
+            json.dump(to_otlp(spans), fh)
+        print(f"Wrote {len(spans)} spans to {args.otlp}")
+        return 0
+    print(render_waterfall(spans, width=args.width, top=args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,335 @@
+# src/tracing.py
+"""
+Lightweight per-job tracing for the lesson pipeline.
+
+The worker opens one trace per job attempt (``trace("job", key=zoom_summary_id)``);
+code on the job's path wraps its work in ``span(name, **attributes)``. Pipeline
+stages and provider calls get spans automatically through
+``metrics.stage_timer`` / ``metrics.provider_call``; the extractors, generators
+and enhancer add their own. Outside a trace ``span()`` is a no-op, so the API
+calling the same code pays nothing.
+
+When the trace ends its spans are appended as JSON lines to
+``TRACE_DIR/<key>.jsonl`` (one file per zoom_summary, one trace per attempt)
+and, if TRACE_OTLP_ENDPOINT is set, posted as OTLP/JSON to
+``<endpoint>/v1/traces`` by a background thread (``flush()`` before a
+short-lived process exits). ``python -m src.tools.trace_view <zoom_summary_id>``
+renders a waterfall of the latest attempt. The worker removes trace files
+untouched for TRACE_TTL_SECONDS (``prune_traces``).
+"""
+
+from __future__ import annotations
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _trace_dir() -> str:
+    return getattr(settings, "TRACE_DIR", None) or os.path.join(settings.TEMP_DIR, "traces")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float  # epoch seconds
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+    _perf_start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.time()) - self.start
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self) -> None:
+        # Monotonic duration on top of the wall-clock start
+        self.end = self.start + (time.perf_counter() - self._perf_start)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "end": round(self.end, 6) if self.end is not None else None,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Returned by ``span()`` outside a trace."""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    def __init__(self, key: str, trace_id: Optional[str] = None):
+        self.key = key
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def new_span(self, name: str, parent: Optional[Span], attributes: Dict[str, Any]) -> Span:
+        s = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start=time.time(),
+            attributes=dict(attributes),
+        )
+        with self._lock:
+            self.spans.append(s)
+        return s
+
+
+_active: ContextVar[Optional[tuple]] = ContextVar("active_trace", default=None)
+
+
+def current_span():
+    """The innermost open span, or a no-op span outside a trace."""
+    active = _active.get()
+    return active[1] if active else NOOP_SPAN
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    active = _active.get()
+    if active is None:
+        yield NOOP_SPAN
+        return
+    tr, parent = active
+    s = tr.new_span(name, parent, attributes)
+    token = _active.set((tr, s))
+    try:
+        yield s
+    except BaseException as exc:
+        s.status = "error"
+        s.error = f"{type(exc).__name__}: {exc}"[:500]
+        raise
+    finally:
+        _active.reset(token)
+        s.finish()
+
+
+def record_span(name: str, started: float, **attributes: Any) -> None:
+    """
+    Add a finished span that began at ``started`` (a ``time.perf_counter()``
+    value) and ends now, for stages that are not one ``with`` block.
+    """
+    active = _active.get()
+    if active is None:
+        return
+    tr, parent = active
+    elapsed = time.perf_counter() - started
+    s = tr.new_span(name, parent, attributes)
+    s.start -= elapsed
+    s.end = s.start + elapsed
+
+
+@contextmanager
+def trace(name: str, key: Any, exporter: Optional["JsonlExporter"] = None, **attributes: Any) -> Iterator[Any]:
+    """
+    Run the block as the root span of a new trace stored under ``key``
+    (the zoom_summary id for worker jobs) and export it when the block ends.
+    """
+    if not getattr(settings, "TRACING_ENABLED", True):
+        yield NOOP_SPAN
+        return
+    tr = Trace(str(key))
+    root = tr.new_span(name, None, attributes)
+    token = _active.set((tr, root))
+    try:
+        yield root
+    except BaseException as exc:
+        root.status = "error"
+        root.error = f"{type(exc).__name__}: {exc}"[:500]
+        raise
+    finally:
+        _active.reset(token)
+        root.finish()
+        try:
+            (exporter or default_exporter()).export(tr)
+        except Exception:
+            logger.exception("Failed to export trace %s for %s", tr.trace_id, tr.key)
+
+
+# -------------------------
+# Export
+# -------------------------
+# Traces waiting for the OTLP sender; more are dropped (the JSONL copy stays)
+OTLP_QUEUE_SIZE = 256
+
+
+class JsonlExporter:
+    """Appends each finished trace to ``<directory>/<key>.jsonl``."""
+
+    def __init__(self, directory: Optional[str] = None, otlp_endpoint: Optional[str] = None):
+        self.directory = directory or _trace_dir()
+        self.otlp_endpoint = otlp_endpoint
+        self._otlp_queue: Optional[queue.Queue] = None
+        self._otlp_lock = threading.Lock()
+
+    def path_for(self, key: Any) -> str:
+        safe = str(key).replace(os.sep, "_").replace("..", "_")
+        return os.path.join(self.directory, f"{safe}.jsonl")
+
+    def export(self, tr: Trace) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(tr.key)
+        spans = sorted(tr.spans, key=lambda s: s.start)
+        with open(path, "a", encoding="utf-8") as fh:
+            for s in spans:
+                fh.write(json.dumps(s.to_dict(), default=str) + "\n")
+        if self.otlp_endpoint:
+            # Posted off the job thread: a slow collector must not stall jobs
+            try:
+                self._otlp_sender().put_nowait([s.to_dict() for s in spans])
+            except queue.Full:
+                logger.warning("OTLP export queue full; dropping trace %s", tr.trace_id)
+        return path
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait up to ``timeout`` for queued OTLP posts; True when none are left."""
+        q = self._otlp_queue
+        if q is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while q.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return not q.unfinished_tasks
+
+    def _otlp_sender(self) -> queue.Queue:
+        with self._otlp_lock:
+            if self._otlp_queue is None:
+                self._otlp_queue = queue.Queue(maxsize=OTLP_QUEUE_SIZE)
+                threading.Thread(target=self._send_otlp, name="otlp-exporter", daemon=True).start()
+            return self._otlp_queue
+
+    def _send_otlp(self) -> None:
+        while True:
+            spans = self._otlp_queue.get()
+            try:
+                self._post_otlp(spans)
+            finally:
+                self._otlp_queue.task_done()
+
+    def _post_otlp(self, spans: List[Dict[str, Any]]) -> None:
+        import requests
+
+        url = self.otlp_endpoint.rstrip("/") + "/v1/traces"
+        try:
+            requests.post(url, json=to_otlp(spans), timeout=5).raise_for_status()
+        except Exception as exc:
+            logger.warning("OTLP export to %s failed: %s", url, exc)
+
+
+_exporter: Optional[JsonlExporter] = None
+
+
+def default_exporter() -> JsonlExporter:
+    global _exporter
+    if _exporter is None:
+        _exporter = JsonlExporter(otlp_endpoint=getattr(settings, "TRACE_OTLP_ENDPOINT", None))
+    return _exporter
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """Wait for the default exporter's pending OTLP posts (see JsonlExporter.flush)."""
+    return _exporter.flush(timeout) if _exporter is not None else True
+
+
+def prune_traces(max_age_seconds: int, directory: Optional[str] = None) -> int:
+    """Remove trace files not appended to for ``max_age_seconds``; returns files removed."""
+    directory = directory or _trace_dir()
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in os.scandir(directory):
+        try:
+            if entry.name.endswith(".jsonl") and entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def load_spans(path: str, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Read spans from a trace file. Without ``trace_id`` returns the most
+    recent trace (the last attempt) in the file.
+    """
+    with open(path, encoding="utf-8") as fh:
+        spans = [json.loads(line) for line in fh if line.strip()]
+    if not spans:
+        return []
+    if trace_id is None:
+        roots = [s for s in spans if s.get("parent_id") is None]
+        latest = max(roots or spans, key=lambda s: s["start"])
+        trace_id = latest["trace_id"]
+    return [s for s in spans if s["trace_id"].startswith(trace_id)]
+
+
+def to_otlp(spans: List[Dict[str, Any]], service_name: str = "tulkka-worker") -> Dict[str, Any]:
+    """Convert span dicts to an OTLP/JSON ExportTraceServiceRequest."""
+
+    def attr(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    otlp_spans = []
+    for s in spans:
+        item = {
+            "traceId": s["trace_id"],
+            "spanId": s["span_id"],
+            "name": s["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(int(s["start"] * 1e9)),
+            "endTimeUnixNano": str(int((s["end"] or s["start"]) * 1e9)),
+            "attributes": [attr(k, v) for k, v in (s.get("attributes") or {}).items()],
+            "status": {"code": 2, "message": s.get("error") or ""} if s.get("status") == "error" else {"code": 1},
+        }
+        if s.get("parent_id"):
+            item["parentSpanId"] = s["parent_id"]
+        otlp_spans.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [attr("service.name", service_name)]},
+                "scopeSpans": [{"scope": {"name": "src.tracing"}, "spans": otlp_spans}],
+            }
+        ]
+    }
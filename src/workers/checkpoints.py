@@ -0,0 +1,198 @@
+"""
+Pipeline-stage checkpoints and a local artifact store for the Zoom worker.
+
+A job runs through STAGES in order. Completing a stage records it in
+``zoom_summaries.pipeline_checkpoints`` (jsonb: stage -> {"at": iso, ...}) and
+in a local manifest next to the stage's artifacts, so a retry resumes from the
+first incomplete stage instead of re-downloading and re-transcribing:
+
+- recordings_listed   -> recordings.json (Zoom recording_files)
+- audio_downloaded    -> audio (the streamed recording)
+- transcribed         -> transcript.txt (also persisted on the row)
+- exercises_generated -> exercises.json (lesson_exercises payload)
+- persisted           -> lesson_exercises row inserted
+
+The column is added by migrations/001_zoom_summaries_pipeline_checkpoints.sql.
+Checkpoints are written in their own row update, never bundled with stage
+data, and a failed write is logged and skipped: the local manifest is written
+first, so a finished stage is not lost on this host. Artifacts are host-local:
+a job reclaimed on another host only reuses what is stored on the row.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+from ..time_utils import utc_now_iso
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_LISTED = "recordings_listed"
+AUDIO_DOWNLOADED = "audio_downloaded"
+TRANSCRIBED = "transcribed"
+EXERCISES_GENERATED = "exercises_generated"
+PERSISTED = "persisted"
+
+STAGES = (RECORDINGS_LISTED, AUDIO_DOWNLOADED, TRANSCRIBED, EXERCISES_GENERATED, PERSISTED)
+
+MANIFEST = "checkpoints.json"
+
+
+class ArtifactStore:
+    """Per-row directories under WORKER_ARTIFACT_DIR holding stage outputs."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or getattr(settings, "WORKER_ARTIFACT_DIR", None) or os.path.join(
+            tempfile.gettempdir(), "zoom_artifacts"
+        )
+
+    def _dir(self, row_id: Any) -> str:
+        safe = str(row_id).replace(os.sep, "_").replace("..", "_")
+        return os.path.join(self.root, safe)
+
+    def directory(self, row_id: Any) -> str:
+        """Create (if needed) and return the row's artifact directory."""
+        directory = self._dir(row_id)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def path(self, row_id: Any, name: str) -> str:
+        return os.path.join(self._dir(row_id), name)
+
+    def exists(self, row_id: Any, name: str) -> bool:
+        return os.path.isfile(self.path(row_id, name))
+
+    def write_bytes(self, row_id: Any, name: str, data: bytes) -> str:
+        """Atomically write an artifact (temp file + rename)."""
+        directory = self._dir(row_id)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            final = self.path(row_id, name)
+            os.replace(tmp_path, final)
+            return final
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def write_json(self, row_id: Any, name: str, data: Any) -> str:
+        return self.write_bytes(row_id, name, json.dumps(data, default=str).encode("utf-8"))
+
+    def read_json(self, row_id: Any, name: str) -> Optional[Any]:
+        try:
+            with open(self.path(row_id, name), "rb") as fh:
+                return json.loads(fh.read().decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def write_text(self, row_id: Any, name: str, text: str) -> str:
+        return self.write_bytes(row_id, name, (text or "").encode("utf-8"))
+
+    def read_text(self, row_id: Any, name: str) -> Optional[str]:
+        try:
+            with open(self.path(row_id, name), "rb") as fh:
+                return fh.read().decode("utf-8")
+        except OSError:
+            return None
+
+    def adopt(self, row_id: Any, name: str, src_path: str) -> str:
+        """Move an existing file (e.g. a finished download) into the store."""
+        os.makedirs(self._dir(row_id), exist_ok=True)
+        final = self.path(row_id, name)
+        shutil.move(src_path, final)
+        return final
+
+    def remove(self, row_id: Any, name: str) -> None:
+        try:
+            os.unlink(self.path(row_id, name))
+        except OSError:
+            pass
+
+    def discard(self, row_id: Any) -> None:
+        shutil.rmtree(self._dir(row_id), ignore_errors=True)
+
+    def prune(self, max_age_seconds: int) -> int:
+        """Remove row directories untouched for ``max_age_seconds``."""
+        if not os.path.isdir(self.root):
+            return 0
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for entry in os.scandir(self.root):
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def _decode_stored(stored: Any) -> Dict[str, Dict[str, Any]]:
+    if isinstance(stored, str):
+        try:
+            stored = json.loads(stored)
+        except ValueError:
+            return {}
+    if not isinstance(stored, dict):
+        return {}
+    return {k: (v if isinstance(v, dict) else {}) for k, v in stored.items() if k in STAGES}
+
+
+class PipelineCheckpoints:
+    """Checkpoint state of one job (row checkpoints merged with the local manifest)."""
+
+    def __init__(
+        self,
+        row_id: Any,
+        stored: Any,
+        store: ArtifactStore,
+        update: Callable[[Any, Dict[str, Any]], Any],
+    ):
+        self.row_id = row_id
+        self.store = store
+        self._update = update
+        self.state = _decode_stored(store.read_json(row_id, MANIFEST))
+        self.state.update(_decode_stored(stored))
+
+    def done(self, stage: str) -> bool:
+        return stage in self.state
+
+    def meta(self, stage: str) -> Dict[str, Any]:
+        return self.state.get(stage, {})
+
+    def resume_stage(self) -> Optional[str]:
+        """First stage not yet completed (None when the job is fully done)."""
+        for stage in STAGES:
+            if stage not in self.state:
+                return stage
+        return None
+
+    def complete(self, stage: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record ``stage`` locally, then on the row. Never raises: a checkpoint
+        that cannot be saved only costs redoing the stage on a retry.
+        """
+        self.state[stage] = {"at": utc_now_iso(), **(meta or {})}
+        try:
+            self.store.write_json(self.row_id, MANIFEST, self.state)
+        except OSError as e:
+            logger.warning("Row %s: could not write local checkpoint %s: %s", self.row_id, stage, e)
+        try:
+            self._update(self.row_id, {"pipeline_checkpoints": self.state})
+        except Exception as e:
+            logger.warning("Row %s: could not save checkpoint %s on the row: %s", self.row_id, stage, e)
+        logger.info("Row %s checkpoint: %s", self.row_id, stage)
+
+    def invalidate(self, stage: str) -> None:
+        """Forget a stage whose artifact turned out to be missing on this host."""
+        self.state.pop(stage, None)
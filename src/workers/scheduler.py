@@ -0,0 +1,167 @@
+"""
+Priority + fair-share scheduling for the Zoom worker queue.
+
+The worker fetches a window of eligible rows and asks ``FairScheduler.plan``
+which of them to run next:
+
+- Priority classes: fresh lessons (meeting_date within WORKER_FRESH_LESSON_DAYS)
+  first, then backfill (older lessons), then retries (processing_attempts > 0
+  or reclaimed stale rows).
+- Within a class, tenants (teacher_id, falling back to class_id) are served by
+  start-time weighted fair queuing: each tenant carries a virtual finish tag
+  that grows by 1/weight per job, and the tenant whose next job starts earliest
+  goes next. Tags persist across batches, so a teacher who bulk-triggers a week
+  of lessons is interleaved with everyone else instead of draining first.
+- At most WORKER_TENANT_MAX_CONCURRENCY jobs per tenant are planned or running
+  at any time (``started``/``finished`` track in-flight jobs).
+"""
+
+import threading
+from collections import Counter, deque
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+
+PRIORITY_FRESH = 0
+PRIORITY_BACKFILL = 1
+PRIORITY_RETRY = 2
+
+
+def tenant_of(row: Dict[str, Any]) -> str:
+    """Fair-share key for a zoom_summaries row."""
+    if row.get("teacher_id"):
+        return f"teacher:{row['teacher_id']}"
+    if row.get("class_id"):
+        return f"class:{row['class_id']}"
+    if row.get("teacher_email"):
+        return f"teacher_email:{row['teacher_email']}"
+    return "default"
+
+
+def parse_weights(raw: str) -> Dict[str, float]:
+    """Parse "teacher:t1=2,class:c9=0.5" into a tenant -> weight mapping."""
+    weights: Dict[str, float] = {}
+    for item in (raw or "").split(","):
+        key, sep, value = item.strip().rpartition("=")
+        if not sep or not key:
+            continue
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        if weight > 0:
+            weights[key.strip()] = weight
+    return weights
+
+
+class FairScheduler:
+    """Orders candidate rows by priority class and weighted fair share."""
+
+    def __init__(
+        self,
+        max_per_tenant: Optional[int] = None,
+        fresh_days: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        today: Callable[[], date] = date.today,
+    ):
+        self.max_per_tenant = max(1, int(
+            max_per_tenant if max_per_tenant is not None
+            else getattr(settings, "WORKER_TENANT_MAX_CONCURRENCY", 2)
+        ))
+        self.fresh_days = int(
+            fresh_days if fresh_days is not None
+            else getattr(settings, "WORKER_FRESH_LESSON_DAYS", 1)
+        )
+        self.weights = weights if weights is not None else parse_weights(
+            getattr(settings, "WORKER_TENANT_WEIGHTS", "")
+        )
+        self._today = today
+        self._lock = threading.Lock()
+        self._finish: Dict[str, float] = {}
+        self._vtime = 0.0
+        self._running: Counter = Counter()
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+    def fresh_since(self) -> str:
+        """Earliest meeting_date (ISO) that still counts as a fresh lesson."""
+        return (self._today() - timedelta(days=self.fresh_days)).isoformat()
+
+    def priority(self, row: Dict[str, Any]) -> int:
+        if int(row.get("processing_attempts") or 0) > 0 or row.get("status") == "processing":
+            return PRIORITY_RETRY
+        meeting_date = str(row.get("meeting_date") or "")[:10]
+        if meeting_date and meeting_date >= self.fresh_since():
+            return PRIORITY_FRESH
+        return PRIORITY_BACKFILL
+
+    def weight(self, tenant: str) -> float:
+        return self.weights.get(tenant, 1.0)
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+    def plan(self, rows: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Pick up to ``limit`` rows to run next, in dispatch order."""
+        by_class: Dict[int, Dict[str, deque]] = {}
+        seen = set()
+        for row in sorted(rows, key=lambda r: str(r.get("created_at") or "")):
+            if row.get("id") in seen:
+                continue
+            seen.add(row.get("id"))
+            queues = by_class.setdefault(self.priority(row), {})
+            queues.setdefault(tenant_of(row), deque()).append(row)
+
+        selected: List[Dict[str, Any]] = []
+        planned: Counter = Counter()
+        with self._lock:
+            for prio in sorted(by_class):
+                queues = by_class[prio]
+                while queues and len(selected) < limit:
+                    tenant = min(
+                        queues,
+                        key=lambda t: (self._start_tag(t), str(queues[t][0].get("created_at") or "")),
+                    )
+                    if self._running[tenant] + planned[tenant] >= self.max_per_tenant:
+                        del queues[tenant]
+                        continue
+                    selected.append(queues[tenant].popleft())
+                    planned[tenant] += 1
+                    self._charge(tenant)
+                    if not queues[tenant]:
+                        del queues[tenant]
+            self._prune()
+        return selected
+
+    def _start_tag(self, tenant: str) -> float:
+        return max(self._finish.get(tenant, 0.0), self._vtime)
+
+    def _charge(self, tenant: str) -> None:
+        start = self._start_tag(tenant)
+        self._finish[tenant] = start + 1.0 / self.weight(tenant)
+        self._vtime = start
+
+    def _prune(self) -> None:
+        # Tenants whose tag fell behind virtual time have no backlog credit left
+        for tenant in [t for t, tag in self._finish.items() if tag <= self._vtime]:
+            del self._finish[tenant]
+
+    # ------------------------------------------------------------------
+    # In-flight tracking (per-tenant concurrency cap)
+    # ------------------------------------------------------------------
+    def started(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._running[tenant_of(row)] += 1
+
+    def finished(self, row: Dict[str, Any]) -> None:
+        tenant = tenant_of(row)
+        with self._lock:
+            self._running[tenant] -= 1
+            if self._running[tenant] <= 0:
+                del self._running[tenant]
+
+    def running(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._running)
@@ -0,0 +1,121 @@
+"""
+Push wakeup for the Zoom worker.
+
+The API publishes a tiny UDP datagram when a lesson is queued
+(``notify_new_job``); idle workers block on a ``WakeupListener`` instead of
+sleeping a fixed poll interval, so new jobs are picked up immediately.
+Datagrams are best-effort: a lost signal only means the job is picked up by
+the (slow) fallback poll, which is why polling is kept.
+
+Config:
+- WORKER_WAKEUP_BIND: "host:port" the worker listens on (empty disables)
+- WORKER_WAKEUP_TARGETS: comma separated "host:port" list the API notifies
+"""
+
+import logging
+import select
+import socket
+from typing import List, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+WAKEUP_MESSAGE = b"zoom_summaries:pending"
+
+
+def _parse_address(value: str) -> Optional[Tuple[str, int]]:
+    host, sep, port = (value or "").strip().rpartition(":")
+    if not sep or not port.isdigit():
+        return None
+    return host or "0.0.0.0", int(port)
+
+
+def _targets() -> List[Tuple[str, int]]:
+    raw = getattr(settings, "WORKER_WAKEUP_TARGETS", "") or ""
+    targets = []
+    for item in raw.split(","):
+        address = _parse_address(item)
+        if address:
+            targets.append(address)
+    return targets
+
+
+def notify_new_job(summary_id=None) -> int:
+    """
+    Signal workers that a pending row exists. Never raises; returns the number
+    of targets the datagram was sent to.
+    """
+    targets = _targets()
+    if not targets:
+        return 0
+    payload = WAKEUP_MESSAGE
+    if summary_id is not None:
+        payload += b":" + str(summary_id).encode()
+    sent = 0
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for target in targets:
+                try:
+                    sock.sendto(payload, target)
+                    sent += 1
+                except OSError as exc:
+                    logger.debug("Worker wakeup to %s:%s failed: %s", target[0], target[1], exc)
+    except OSError as exc:
+        logger.debug("Worker wakeup socket error: %s", exc)
+    return sent
+
+
+class WakeupListener:
+    """UDP socket the worker blocks on between empty polls."""
+
+    def __init__(self, address: Tuple[str, int]):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(address)
+        self.sock.setblocking(False)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.sock.getsockname()
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to ``timeout`` seconds; True if woken by a notification."""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], max(0.0, timeout))
+        except (OSError, ValueError):
+            return False
+        if not readable:
+            return False
+        self._drain()
+        return True
+
+    def _drain(self) -> None:
+        # Coalesce a burst of notifications into a single wakeup
+        while True:
+            try:
+                self.sock.recvfrom(256)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def create_listener() -> Optional[WakeupListener]:
+    """Bind the configured wakeup socket, or return None (plain polling)."""
+    address = _parse_address(getattr(settings, "WORKER_WAKEUP_BIND", "") or "")
+    if not address:
+        return None
+    try:
+        listener = WakeupListener(address)
+    except OSError as exc:
+        logger.warning("Could not bind worker wakeup socket %s:%s (%s); polling only", address[0], address[1], exc)
+        return None
+    logger.info("Worker wakeup listener bound on %s:%s", *listener.address[:2])
+    return listener
@@ -11,6 +11,7 @@ Key improvements vs. original:
 - Better logging and safer status transitions.
 """
 import logging
+import multiprocessing
 import time
 import traceback
 import tempfile
@@ -18,16 +19,36 @@ import os
 from typing import Dict, Any, Optional, List
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
+from ..cancellation import CancellationToken, JobCancelled, bind_token, check_cancelled
 from ..db.supabase_client import SupabaseClient
-from ..zoom.zoom_utils import has_transcript_file, has_audio_files, clean_vtt_transcript
+from .checkpoints import (
+    ArtifactStore,
+    PipelineCheckpoints,
+    AUDIO_DOWNLOADED,
+    EXERCISES_GENERATED,
+    PERSISTED,
+    RECORDINGS_LISTED,
+    TRANSCRIBED,
+)
+from .scheduler import FairScheduler
+from .wakeup import create_listener
+from ..zoom.zoom_utils import has_transcript_file, has_audio_files, iter_vtt_cues, vtt_cues_to_text
 from ..zoom.zoom_client import ZoomAPI
+from ..zoom.recording_index import RecordingIndex
 from ..config import settings
+from ..lazy import lazy
+from ..metrics import pipeline_stage_duration, registry, stage_timer, worker_jobs, worker_queue_depth
+from .. import profiler, tracing
 from ..time_utils import utc_now_iso
 
 logger = logging.getLogger(__name__)
 
-supabase = SupabaseClient()
-zoom_api = ZoomAPI()
+# Clients are built on first use so importing the worker (tests, CLI tools)
+# does not read the Zoom token file or connect to Supabase.
+supabase = lazy(SupabaseClient)
+zoom_api = lazy(ZoomAPI)
+# Teacher-day listings shared by the claimed jobs on this host
+recording_index = RecordingIndex(zoom_api)
 
 POLL_INTERVAL = getattr(settings, "WORKER_POLL_INTERVAL_SECONDS", 10)
 BATCH_SIZE = getattr(settings, "WORKER_BATCH_SIZE", 5)
@@ -49,18 +70,98 @@ LOCAL_EXECUTOR_WORKERS = getattr(settings, "WORKER_LOCAL_EXECUTOR_WORKERS", 2)
 
 executor = ThreadPoolExecutor(max_workers=LOCAL_EXECUTOR_WORKERS)
 
+# "thread": run jobs in `executor` and cancel cooperatively on timeout.
+# "process": run each job in a spawned child process that is killed on timeout.
+JOB_ISOLATION = getattr(settings, "WORKER_JOB_ISOLATION", "thread")
+
+# How long a cancelled job gets to reach its next cancellation point / exit.
+CANCEL_GRACE_SECONDS = getattr(settings, "WORKER_CANCEL_GRACE_SECONDS", 30)
+
+# Candidate rows fetched per poll = BATCH_SIZE * SCHEDULER_WINDOW; the scheduler
+# picks the batch from them by priority class and per-tenant fair share.
+SCHEDULER_WINDOW = max(1, getattr(settings, "WORKER_SCHEDULER_WINDOW", 5))
+
+scheduler = FairScheduler()
+
+
+@registry.collector
+def _running_jobs():
+    running = sum(scheduler.running().values())
+    return [
+        ("worker_jobs_running", "Jobs currently dispatched by this worker.",
+         [("worker_jobs_running", {}, running)]),
+    ]
+
+
+# A full poll window only says "at least N"; count the queue this often
+QUEUE_DEPTH_INTERVAL = getattr(settings, "WORKER_QUEUE_DEPTH_INTERVAL_SECONDS", 60)
+_queue_depth_counted_at = 0.0
+
+
+def _update_queue_depth(window_rows: int, limit: int) -> None:
+    """Set worker_queue_depth: the window size when it was not full, else a COUNT."""
+    global _queue_depth_counted_at
+    if window_rows < limit:
+        worker_queue_depth.set(window_rows)
+        return
+    now = time.monotonic()
+    if _queue_depth_counted_at and now - _queue_depth_counted_at < QUEUE_DEPTH_INTERVAL:
+        return
+    _queue_depth_counted_at = now
+    depth = supabase.count_pending_summaries()
+    if depth is not None:
+        worker_queue_depth.set(depth)
+
+
+# Stage artifacts (recordings, audio, transcript, exercises) kept between retries
+artifacts = ArtifactStore()
+ARTIFACT_TTL_SECONDS = getattr(settings, "WORKER_ARTIFACT_TTL_SECONDS", 3 * 24 * 3600)
+TRACE_TTL_SECONDS = getattr(settings, "TRACE_TTL_SECONDS", 7 * 24 * 3600)
+PRUNE_INTERVAL_SECONDS = 3600
+_pruned_at = 0.0
+
+
+def prune_local_state(force: bool = False) -> None:
+    """Drop stale artifact directories and trace files (at most hourly unless ``force``)."""
+    global _pruned_at
+    now = time.monotonic()
+    if not force and _pruned_at and now - _pruned_at < PRUNE_INTERVAL_SECONDS:
+        return
+    _pruned_at = now
+    pruned = artifacts.prune(ARTIFACT_TTL_SECONDS)
+    if pruned:
+        logger.info("Pruned %d stale artifact directories", pruned)
+    pruned = tracing.prune_traces(TRACE_TTL_SECONDS)
+    if pruned:
+        logger.info("Pruned %d stale trace files", pruned)
+
 
 # -------------------------
 # Supabase helper wrappers
 # -------------------------
 def fetch_pending(limit: int = BATCH_SIZE) -> List[Dict[str, Any]]:
     """
-    Primary fetch of pending rows.
+    Primary fetch of pending rows (the scheduler's candidate window).
     If there are no 'pending' rows, also attempt to fetch stale 'processing' rows
     older than STALE_PROCESSING_SECONDS so crashed workers get reclaimed.
+
+    The window is the ``limit`` oldest pending rows, plus the ``limit`` oldest
+    fresh lessons when the first query came back full. Fair share and
+    priorities are only applied inside this window: tenants whose rows all
+    sit beyond it wait until the rows ahead of them drain.
     """
     try:
         pending = supabase.find_pending_summaries(limit)
+        _update_queue_depth(len(pending), limit)
+        if len(pending) >= limit:
+            # A full window may hide fresh lessons behind a large backfill
+            # (older created_at); fetch those separately. An idle or short
+            # queue is already complete, so the poll stays one query.
+            fresh = supabase.find_pending_summaries(
+                limit, fresh_since=scheduler.fresh_since()
+            )
+            known = {r.get("id") for r in pending}
+            pending.extend(r for r in fresh if r.get("id") not in known)
     except Exception:
         logger.exception("Failed fetching pending summaries (primary)")
         pending = []
@@ -85,6 +186,17 @@ def fetch_pending(limit: int = BATCH_SIZE) -> List[Dict[str, Any]]:
     return pending
 
 
+def load_claimed_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Queue rows only carry the scheduling columns (see QUEUE_COLUMNS). Once a job
+    is claimed, fetch the full row (recording_files, transcript, ...) for it.
+    """
+    full = supabase.get_zoom_summary_by_id(row.get("id"))
+    if not full:
+        return row
+    return {**row, **full}
+
+
 def claim_summary(row_id: Any) -> bool:
     """Optimistic claim: set status to 'processing' only if still 'pending' or stale."""
     try:
@@ -104,8 +216,9 @@ def mark_completed(
     metadata: Optional[Dict[str, Any]] = None,
     exercises_generated: bool = True,
 ):
+    status = "completed" if exercises_generated else "awaiting_exercises"
+    worker_jobs.inc(outcome=status)
     try:
-        status = "completed" if exercises_generated else "awaiting_exercises"
         payload = {
             "status": status,
             "processed_at": utc_now_iso(),
@@ -120,6 +233,7 @@ def mark_completed(
 
 
 def mark_failed(row_id: Any, error: str, attempts: int):
+    worker_jobs.inc(outcome="retry" if attempts < MAX_RETRIES else "failed")
     try:
         # compute new status
         next_status = "pending" if attempts < MAX_RETRIES else "failed"
@@ -133,6 +247,7 @@ def mark_failed(row_id: Any, error: str, attempts: int):
             payload["next_retry_at"] = int(time.time()) + (60 * (2 ** (attempts - 1)))
         else:
             payload["processed_at"] = utc_now_iso()
+            artifacts.discard(row_id)
         supabase.update_zoom_summary(row_id, payload)
         logger.warning(
             "Marked row %s as failed/pending (attempts=%s) error=%s",
@@ -156,18 +271,21 @@ def _is_video_file_type(file_type: Optional[str]) -> bool:
 
 
 def _stream_download_to_tempfile(
-    download_url: str, desc: str = "zoom_download", chunk_size: int = 8 * 1024 * 1024
+    download_url: str,
+    desc: str = "zoom_download",
+    chunk_size: int = 8 * 1024 * 1024,
+    dir: Optional[str] = None,
 ) -> str:
     """
-    Stream a remote URL to a temporary file and return the path.
-    This avoids loading whole file in memory.
+    Stream a remote URL to a temporary file (in ``dir`` if given) and return the path.
+    This avoids loading whole file in memory. Checks for cancellation per chunk.
     """
     token = zoom_api.get_token()
     headers = {"Authorization": f"Bearer {token}"} if token else {}
     logger.info("Streaming download %s -> temp (desc=%s)", download_url, desc)
 
     # create named temp file that persists until we remove it
-    tmp = tempfile.NamedTemporaryFile(delete=False, prefix="zoom_", suffix=".tmp")
+    tmp = tempfile.NamedTemporaryFile(delete=False, prefix="zoom_", suffix=".tmp", dir=dir)
     tmp_path = tmp.name
     tmp.close()
 
@@ -175,12 +293,13 @@ def _stream_download_to_tempfile(
         with requests_get_stream_safe(download_url, headers=headers) as r:
             # r is a requests.Response
             for chunk in r.iter_content(chunk_size=chunk_size):
+                check_cancelled()
                 if chunk:
                     with open(tmp_path, "ab") as fw:
                         fw.write(chunk)
         return tmp_path
-    except Exception:
-        # cleanup on failure
+    except BaseException:
+        # cleanup on failure or cancellation
         try:
             os.unlink(tmp_path)
         except Exception:
@@ -191,29 +310,136 @@ def _stream_download_to_tempfile(
 def requests_get_stream_safe(
     url: str, headers: Dict[str, str] = None, timeout: int = 120
 ):
-    """Helper wrapper around requests.get with streaming and simple retry on 401 token refresh."""
-    import requests
-
+    """Streaming GET on the Zoom client's pooled session, retrying once on 401 after a token refresh."""
     headers = headers or {}
-    r = requests.get(url, headers=headers, timeout=timeout, stream=True)
+    r = zoom_api.session.get(url, headers=headers, timeout=timeout, stream=True)
     # If 401, try refreshing token then retry once
     if r.status_code == 401:
         logger.warning("Stream download returned 401; refreshing token and retrying")
-        token = zoom_api.tm.refresh()
+        stale = (headers.get("Authorization") or "").replace("Bearer ", "", 1) or None
+        token = zoom_api.tm.refresh(stale_token=stale)
         if token:
             headers["Authorization"] = f"Bearer {token}"
-            r = requests.get(url, headers=headers, timeout=timeout, stream=True)
+            r.close()
+            r = zoom_api.session.get(url, headers=headers, timeout=timeout, stream=True)
     r.raise_for_status()
     return r
 
 
+def _stream_vtt_transcript(row_id: Any, download_url: str):
+    """
+    Stream a Zoom VTT transcript into text.
+
+    Returns the plain transcript (stored on the row, same format as
+    ``clean_vtt_transcript``), a speaker-labelled version with every cue that
+    has a speaker written as "Name: text", and cue stats. The labelled text is
+    what extraction gets: the mistake extractor assigns teacher/student roles
+    from those labels, which plain text drops for ``<v Name>`` voice tags.
+    It is kept as the ``transcript_speakers.txt`` artifact until the job
+    finishes, so a retry past transcription still extracts from it.
+    """
+    cues = []
+    for cue in iter_vtt_cues(zoom_api.stream_lines(download_url)):
+        check_cancelled()
+        cues.append(cue)
+    speaker_text = vtt_cues_to_text(cues, speakers=True)
+    artifacts.write_text(row_id, "transcript_speakers.txt", speaker_text)
+    stats = {"cues": len(cues), "speakers": len({c.speaker for c in cues if c.speaker})}
+    return vtt_cues_to_text(cues), speaker_text, stats
+
+
 # -------------------------
 # Main processing
 # -------------------------
+def _select_meeting(meetings: List[Dict[str, Any]], row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Pick the row's meeting from a teacher-day listing (id, then start time, then first)."""
+    row_id = row.get("id")
+    meeting_id = row.get("meeting_id")
+    start_time = row.get("start_time")
+    selected_meeting = None
+
+    if meeting_id:
+        meeting_id_str = str(meeting_id)
+        for m in meetings:
+            mid = str(m.get("id") or m.get("uuid") or "")
+            if (
+                mid
+                and (mid == meeting_id_str or meeting_id_str in mid)
+                and m.get("recording_files")
+            ):
+                selected_meeting = m
+                break
+
+    # pick closest start_time if present
+    if not selected_meeting and start_time:
+        try:
+            target_hm = str(start_time)[:5]
+            h, m = target_hm.split(":", 1)
+            target_minutes = int(h) * 60 + int(m)
+        except Exception:
+            target_minutes = None
+
+        if target_minutes is not None:
+            best_diff = None
+            for m in meetings:
+                mst = m.get("start_time") or ""
+                if len(mst) >= 16:
+                    hm = mst[11:16]
+                    try:
+                        hh, mm = hm.split(":", 1)
+                        mins = int(hh) * 60 + int(mm)
+                    except Exception:
+                        continue
+                    diff = abs(mins - target_minutes)
+                    if (best_diff is None or diff < best_diff) and m.get(
+                        "recording_files"
+                    ):
+                        best_diff = diff
+                        selected_meeting = m
+            if best_diff is not None and best_diff > 90:
+                logger.info(
+                    "Closest meeting start time diff=%s min for row %s outside window",
+                    best_diff,
+                    row_id,
+                )
+                # leave selected_meeting as None (fallback to first)
+
+    # fallback: first meeting with recordings
+    if not selected_meeting:
+        for m in meetings:
+            if m.get("recording_files"):
+                selected_meeting = m
+                break
+
+    return selected_meeting
+
+
+def _is_confident_match(meeting: Optional[Dict[str, Any]], row: Dict[str, Any]) -> bool:
+    """True if ``meeting`` matches the row by id, or by start time within 90 minutes."""
+    if not meeting:
+        return False
+    meeting_id = row.get("meeting_id")
+    if meeting_id:
+        mid = str(meeting.get("id") or meeting.get("uuid") or "")
+        return bool(mid) and (mid == str(meeting_id) or str(meeting_id) in mid)
+    start_time = row.get("start_time")
+    if not start_time:
+        return True
+    try:
+        h, m = str(start_time)[:5].split(":", 1)
+        hh, mm = (meeting.get("start_time") or "")[11:16].split(":", 1)
+        return abs((int(hh) * 60 + int(mm)) - (int(h) * 60 + int(m))) <= 90
+    except ValueError:
+        return False
+
+
 def _process_row_internal(row: Dict[str, Any]):
     """
     The heavy work of processing a single row. Designed to be run in a worker future
     and bounded by JOB_TIMEOUT_SECONDS from the outer caller.
+
+    Each claimed attempt is one trace (TRACE_DIR/<row id>.jsonl, see
+    src/tracing.py); losing the claim to another worker records nothing.
     """
     row_id = row.get("id")
     logger.info("Starting work on row %s", row_id)
@@ -223,13 +449,40 @@ def _process_row_internal(row: Dict[str, Any]):
         logger.info("Could not claim row %s; skipping", row_id)
         return
 
+    with tracing.trace(
+        "job",
+        key=row_id,
+        zoom_summary_id=row_id,
+        attempt=int(row.get("processing_attempts") or 0) + 1,
+        pid=os.getpid(),
+    ):
+        _process_row_stages(row)
+
+
+def _process_row_stages(row: Dict[str, Any]):
+    row_id = row.get("id")
+    row = load_claimed_row(row)
+    checkpoints = PipelineCheckpoints(
+        row_id, row.get("pipeline_checkpoints"), artifacts, supabase.update_zoom_summary
+    )
+    if checkpoints.done(PERSISTED):
+        logger.info("Row %s already persisted; marking completed", row_id)
+        mark_completed(
+            row_id,
+            metadata={"transcription_source": checkpoints.meta(TRANSCRIBED).get("source")},
+        )
+        artifacts.discard(row_id)
+        return
+    logger.info("Row %s starting at stage %s", row_id, checkpoints.resume_stage())
+
     files = row.get("recording_files") or row.get("files") or []
+    if not files and checkpoints.done(RECORDINGS_LISTED):
+        files = artifacts.read_json(row_id, "recordings.json") or []
     # If no files in the row, fetch from Zoom API
     if not files:
         logger.info("No recording_files in row %s, fetching from Zoom API", row_id)
         teacher_email = row.get("teacher_email")
         meeting_date = row.get("meeting_date")
-        start_time = row.get("start_time")
 
         if not teacher_email or not meeting_date:
             raise RuntimeError(
@@ -237,9 +490,8 @@ def _process_row_internal(row: Dict[str, Any]):
             )
 
         try:
-            zoom_response = zoom_api.list_user_recordings(
-                user_id=teacher_email, from_date=meeting_date, to_date=meeting_date
-            )
+            from_cache = recording_index.peek(teacher_email, meeting_date) is not None
+            zoom_response = recording_index.list_recordings(teacher_email, meeting_date)
         except Exception as zoom_err:
             err_str = str(zoom_err)
             # Map some common error reasons to friendly messages and mark failed
@@ -267,62 +519,17 @@ def _process_row_internal(row: Dict[str, Any]):
             "Found %d meetings for %s on %s", len(meetings), teacher_email, meeting_date
         )
 
-        # Try to select meeting (same robust logic as before)
-        meeting_id = row.get("meeting_id")
-        selected_meeting = None
-
-        if meeting_id:
-            meeting_id_str = str(meeting_id)
-            for m in meetings:
-                mid = str(m.get("id") or m.get("uuid") or "")
-                if (
-                    mid
-                    and (mid == meeting_id_str or meeting_id_str in mid)
-                    and m.get("recording_files")
-                ):
-                    selected_meeting = m
-                    break
-
-        # pick closest start_time if present
-        if not selected_meeting and start_time:
+        selected_meeting = _select_meeting(meetings, row)
+        if from_cache and not _is_confident_match(selected_meeting, row):
+            # The cached listing may predate this lesson's recording; list once more
+            recording_index.invalidate(teacher_email, meeting_date)
             try:
-                target_hm = str(start_time)[:5]
-                h, m = target_hm.split(":", 1)
-                target_minutes = int(h) * 60 + int(m)
+                fresh = recording_index.list_recordings(teacher_email, meeting_date, fresh=True)
             except Exception:
-                target_minutes = None
-
-            if target_minutes is not None:
-                best_diff = None
-                for m in meetings:
-                    mst = m.get("start_time") or ""
-                    if len(mst) >= 16:
-                        hm = mst[11:16]
-                        try:
-                            hh, mm = hm.split(":", 1)
-                            mins = int(hh) * 60 + int(mm)
-                        except Exception:
-                            continue
-                        diff = abs(mins - target_minutes)
-                        if (best_diff is None or diff < best_diff) and m.get(
-                            "recording_files"
-                        ):
-                            best_diff = diff
-                            selected_meeting = m
-                if best_diff is not None and best_diff > 90:
-                    logger.info(
-                        "Closest meeting start time diff=%s min for row %s outside window",
-                        best_diff,
-                        row_id,
-                    )
-                    # leave selected_meeting as None (fallback to first)
-
-        # fallback: first meeting with recordings
-        if not selected_meeting:
-            for m in meetings:
-                if m.get("recording_files"):
-                    selected_meeting = m
-                    break
+                logger.exception("Fresh Zoom listing failed for row %s", row_id)
+            else:
+                meetings = fresh.get("meetings", [])
+                selected_meeting = _select_meeting(meetings, row) or selected_meeting
 
         if not selected_meeting:
             attempts = int((row.get("processing_attempts") or 0) + 1)
@@ -339,6 +546,11 @@ def _process_row_internal(row: Dict[str, Any]):
             row_id,
         )
 
+    if not checkpoints.done(RECORDINGS_LISTED):
+        artifacts.write_json(row_id, "recordings.json", files)
+        checkpoints.complete(RECORDINGS_LISTED, {"files": len(files)})
+    check_cancelled()
+
     # Identify available files (prefer audio for Gemini transcription)
     audio_file = has_audio_files(files)
     transcript_file = has_transcript_file(files)
@@ -356,23 +568,42 @@ def _process_row_internal(row: Dict[str, Any]):
     transcript_text = ""
     transcription_source = None
     temp_file_path = None
+    transcribe_started = None
+    if checkpoints.done(TRANSCRIBED):
+        transcript_text = (
+            row.get("transcript") or artifacts.read_text(row_id, "transcript.txt") or ""
+        )
+        transcription_source = checkpoints.meta(TRANSCRIBED).get("source")
+        if not transcript_text:
+            checkpoints.invalidate(TRANSCRIBED)
 
     try:
         # =====================================================================
         # PRIORITY 1: Audio file → Gemini (primary) → AssemblyAI (fallback)
         # =====================================================================
-        if audio_file:
-            download_url = audio_file.get("download_url")
-            # Stream to temp file
-            temp_file_path = _stream_download_to_tempfile(
-                download_url, desc=f"row_{row_id}"
-            )
-            logger.info(
-                "Downloaded audio/video to temp file %s for row %s",
-                temp_file_path,
-                row_id,
-            )
+        if audio_file and not transcript_text:
+            if checkpoints.done(AUDIO_DOWNLOADED) and artifacts.exists(row_id, "audio"):
+                audio_path = artifacts.path(row_id, "audio")
+                logger.info("Reusing downloaded audio %s for row %s", audio_path, row_id)
+            else:
+                download_url = audio_file.get("download_url")
+                # Stream to temp file, then keep it in the artifact store
+                with stage_timer("download"):
+                    temp_file_path = _stream_download_to_tempfile(
+                        download_url, desc=f"row_{row_id}", dir=artifacts.directory(row_id)
+                    )
+                audio_path = artifacts.adopt(row_id, "audio", temp_file_path)
+                temp_file_path = None
+                logger.info(
+                    "Downloaded audio/video to %s for row %s",
+                    audio_path,
+                    row_id,
+                )
+                checkpoints.complete(
+                    AUDIO_DOWNLOADED, {"bytes": os.path.getsize(audio_path)}
+                )
 
+            transcribe_started = time.perf_counter()
             # -----------------------------------------------------------------
             # Try Gemini first (PRIMARY)
             # -----------------------------------------------------------------
@@ -386,7 +617,7 @@ def _process_row_internal(row: Dict[str, Any]):
                     logger.info(
                         "Using Gemini transcription (primary) for row %s", row_id
                     )
-                    gemini_result = gemini.transcribe_audio_file(temp_file_path)
+                    gemini_result = gemini.transcribe_audio_file(audio_path)
                     if gemini_result and len(gemini_result.strip()) > 50:
                         transcript_text = gemini_result
                         transcription_source = "gemini"
@@ -433,7 +664,7 @@ def _process_row_internal(row: Dict[str, Any]):
                     # Try SDK local file transcription first
                     try:
                         transcript_result = aai.transcribe_local_file(
-                            temp_file_path, language_code="en"
+                            audio_path, language_code="en"
                         )
                     except Exception:
                         logger.warning(
@@ -444,7 +675,7 @@ def _process_row_internal(row: Dict[str, Any]):
                     # Try HTTP chunked upload fallback
                     if not transcript_result:
                         try:
-                            with open(temp_file_path, "rb") as fh:
+                            with open(audio_path, "rb") as fh:
                                 audio_bytes = fh.read()
                                 transcript_result = aai.transcribe_audio_bytes(
                                     audio_bytes
@@ -468,22 +699,40 @@ def _process_row_internal(row: Dict[str, Any]):
         # PRIORITY 2: Zoom native transcript (fallback if audio transcription failed)
         # =====================================================================
         if not transcript_text and transcript_file:
+            if transcribe_started is None:
+                transcribe_started = time.perf_counter()
             download_url = transcript_file.get("download_url")
             try:
-                content_bytes = zoom_api.download_file(download_url)
-                content = content_bytes.decode("utf-8", errors="ignore")
-                transcript_text = clean_vtt_transcript(content)
+                with tracing.span("zoom.vtt_transcript") as sp:
+                    transcript_text, _, cue_stats = _stream_vtt_transcript(row_id, download_url)
+                    sp.set(**cue_stats)
                 transcription_source = "zoom_native_transcript"
                 logger.info(
-                    "Using Zoom native transcript for row %s, length=%d",
+                    "Using Zoom native transcript for row %s, length=%d, cues=%d, speakers=%d",
                     row_id,
                     len(transcript_text or ""),
+                    cue_stats["cues"],
+                    cue_stats["speakers"],
                 )
             except Exception:
                 logger.exception(
                     "Failed downloading Zoom transcript file for row %s", row_id
                 )
 
+        if transcribe_started is not None:
+            outcome = "ok" if transcript_text else "error"
+            pipeline_stage_duration.observe(
+                time.perf_counter() - transcribe_started, stage="transcribe", outcome=outcome
+            )
+            tracing.record_span(
+                "stage.transcribe",
+                transcribe_started,
+                stage="transcribe",
+                outcome=outcome,
+                source=transcription_source or "none",
+                transcript_chars=len(transcript_text or ""),
+            )
+
         # =====================================================================
         # No transcription available
         # =====================================================================
@@ -506,57 +755,87 @@ def _process_row_internal(row: Dict[str, Any]):
             return
 
         # Persist transcript into zoom_summaries (overwrite or update)
-        update_payload = {
-            "transcript": transcript_text,
-            "transcript_length": len(transcript_text or ""),
-            "transcript_source": transcription_source or "unknown",
-            "transcription_status": "completed",
-            "status": "awaiting_exercises",
-            "processing_completed_at": utc_now_iso(),
-        }
-        supabase.update_zoom_summary(row_id, update_payload)
-        logger.info("Persisted transcript for row %s", row_id)
+        check_cancelled()
+        if not checkpoints.done(TRANSCRIBED):
+            update_payload = {
+                "transcript": transcript_text,
+                "transcript_length": len(transcript_text or ""),
+                "transcript_source": transcription_source or "unknown",
+                "transcription_status": "completed",
+                "status": "awaiting_exercises",
+                "processing_completed_at": utc_now_iso(),
+            }
+            artifacts.write_text(row_id, "transcript.txt", transcript_text)
+            supabase.update_zoom_summary(row_id, update_payload)
+            checkpoints.complete(TRANSCRIBED, {"source": transcription_source or "unknown"})
+            artifacts.remove(row_id, "audio")
+            logger.info("Persisted transcript for row %s", row_id)
 
         # Prepare summary for AI orchestrator
         summary_for_ai = dict(row)
-        summary_for_ai["transcript"] = transcript_text
+        # Zoom VTT transcripts carry speakers; extract from the labelled text
+        summary_for_ai["transcript"] = (
+            artifacts.read_text(row_id, "transcript_speakers.txt") or transcript_text
+        )
         if transcription_source:
             summary_for_ai["transcript_source"] = transcription_source
 
-        # Generate exercises (call existing orchestrator)
-        exercise_generation_failed = False
-        try:
-            from ..ai.orchestrator import process_transcript_to_exercises
+        # Generate exercises (call existing orchestrator), unless a previous
+        # attempt already produced them and only persisting failed
+        exercises_payload = None
+        if checkpoints.done(EXERCISES_GENERATED):
+            exercises_payload = artifacts.read_json(row_id, "exercises.json")
+            if exercises_payload is None:
+                checkpoints.invalidate(EXERCISES_GENERATED)
 
-            result = process_transcript_to_exercises(summary_for_ai, persist=True)
-            if result.get("ok"):
-                logger.info(
-                    "Generated exercises for row %s: %s", row_id, result.get("counts")
-                )
-            else:
-                logger.warning(
-                    "Exercise generation reported failure for row %s: %s",
+        if exercises_payload is None:
+            try:
+                from ..ai.orchestrator import process_transcript_to_exercises
+
+                result = process_transcript_to_exercises(summary_for_ai, persist=False)
+                if result.get("ok"):
+                    exercises_payload = result.get("payload")
+                    logger.info(
+                        "Generated exercises for row %s: %s",
+                        row_id,
+                        exercises_payload["exercises"]["counts"],
+                    )
+                else:
+                    logger.warning(
+                        "Exercise generation reported failure for row %s: %s",
+                        row_id,
+                        result.get("reason"),
+                    )
+            except Exception as e:
+                logger.exception("Exercise generation exception for row %s: %s", row_id, e)
+
+            if not exercises_payload:
+                mark_completed(
                     row_id,
-                    result.get("reason"),
+                    metadata={"transcription_source": transcription_source},
+                    exercises_generated=False,
                 )
-                exercise_generation_failed = True
-        except Exception as e:
-            logger.exception("Exercise generation exception for row %s: %s", row_id, e)
-            exercise_generation_failed = True
+                artifacts.discard(row_id)
+                return
 
-        if exercise_generation_failed:
-            mark_completed(
-                row_id,
-                metadata={"transcription_source": transcription_source},
-                exercises_generated=False,
-            )
-        else:
-            mark_completed(
-                row_id,
-                metadata={"transcription_source": transcription_source},
-                exercises_generated=True,
+            artifacts.write_json(row_id, "exercises.json", exercises_payload)
+            checkpoints.complete(
+                EXERCISES_GENERATED, {"counts": exercises_payload["exercises"]["counts"]}
             )
 
+        # Persist; failures propagate so the retry resumes from exercises.json.
+        # Nothing after the insert raises, so a retry never inserts twice.
+        check_cancelled()
+        with stage_timer("persist"):
+            supabase.insert_lesson_exercises(exercises_payload)
+        mark_completed(
+            row_id,
+            metadata={"transcription_source": transcription_source},
+            exercises_generated=True,
+        )
+        checkpoints.complete(PERSISTED)
+        artifacts.discard(row_id)
+
     finally:
         # Ensure temp file cleanup
         if temp_file_path and os.path.exists(temp_file_path):
@@ -567,15 +846,124 @@ def _process_row_internal(row: Dict[str, Any]):
                 logger.warning("Could not remove temp file %s", temp_file_path)
 
 
-def process_row(row: Dict[str, Any]):
+def _run_with_token(token: CancellationToken, row: Dict[str, Any]):
+    with bind_token(token):
+        _process_row_internal(row)
+
+
+def _run_in_thread(row: Dict[str, Any]):
     """
-    Run heavy processing in a thread with a timeout to avoid hanging the worker.
+    Run the job in `executor`. On timeout, cancel its token and give it
+    CANCEL_GRACE_SECONDS to unwind (temp files, uploads) and free its slot.
     """
     row_id = row.get("id")
+    token = CancellationToken()
+    future = executor.submit(_run_with_token, token, row)
     try:
-        future = executor.submit(_process_row_internal, row)
-        # Block with timeout
         future.result(timeout=JOB_TIMEOUT_SECONDS)
+        return
+    except FutureTimeout:
+        token.cancel("Job exceeded timeout of {} seconds".format(JOB_TIMEOUT_SECONDS))
+
+    try:
+        future.result(timeout=CANCEL_GRACE_SECONDS)
+    except JobCancelled:
+        logger.info("Row %s stopped after cancellation", row_id)
+    except FutureTimeout:
+        logger.error(
+            "Row %s did not reach a cancellation point within %ss; its executor slot "
+            "stays busy until the blocking call returns",
+            row_id,
+            CANCEL_GRACE_SECONDS,
+        )
+    except Exception:
+        logger.info("Row %s failed while being cancelled", row_id)
+    raise FutureTimeout()
+
+
+# Live isolated job processes (JOB_ISOLATION == "process") of this worker
+_job_processes = set()
+
+
+def forward_to_jobs(signum: int) -> None:
+    """Pass a signal (the profiler's SIGUSR2) on to the running job processes."""
+    for proc in list(_job_processes):
+        if proc.is_alive():
+            try:
+                os.kill(proc.pid, signum)
+            except OSError:
+                pass
+
+
+def _process_child(row: Dict[str, Any], conn):
+    """Entry point of an isolated job process; reports a traceback or None."""
+    from ..logging_config import configure_logging
+
+    configure_logging()
+    profiler.install_signal_handler("job")
+    error = None
+    try:
+        _process_row_internal(row)
+    except BaseException:
+        error = traceback.format_exc()
+    # The process exits next; let the OTLP sender finish this job's trace
+    tracing.flush()
+    try:
+        # Stage/provider metrics live in this process; hand them to the parent
+        conn.send((error, registry.drain()))
+    finally:
+        conn.close()
+
+
+def _run_in_process(row: Dict[str, Any]):
+    """
+    Run the job in a spawned child process; terminate (then kill) it on timeout
+    so hung SDK calls cannot hold on to worker capacity.
+    """
+    row_id = row.get("id")
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(
+        target=_process_child,
+        args=(row, child_conn),
+        name=f"zoom-job-{row_id}",
+        daemon=True,
+    )
+    proc.start()
+    _job_processes.add(proc)
+    child_conn.close()
+    try:
+        if not parent_conn.poll(JOB_TIMEOUT_SECONDS):
+            proc.terminate()
+            proc.join(min(CANCEL_GRACE_SECONDS, 10))
+            if proc.is_alive():
+                proc.kill()
+            raise FutureTimeout()
+        try:
+            error, drained = parent_conn.recv()
+            registry.merge(drained)
+        except EOFError:
+            proc.join()
+            error = "Job process exited with code {}".format(proc.exitcode)
+        if error:
+            raise RuntimeError(error)
+    finally:
+        proc.join(5)
+        _job_processes.discard(proc)
+        parent_conn.close()
+
+
+def process_row(row: Dict[str, Any]):
+    """
+    Run heavy processing isolated (thread or process) with a timeout to avoid
+    hanging the worker. Timed-out jobs are cancelled, not just abandoned.
+    """
+    row_id = row.get("id")
+    try:
+        if JOB_ISOLATION == "process":
+            _run_in_process(row)
+        else:
+            _run_in_thread(row)
     except FutureTimeout:
         # Timeout occurred: mark job for retry
         tb = "Job exceeded timeout of {} seconds".format(JOB_TIMEOUT_SECONDS)
@@ -589,26 +977,52 @@ def process_row(row: Dict[str, Any]):
         mark_failed(row_id, str(exc), attempts)
 
 
+def _idle_wait(listener, seconds: float) -> None:
+    """Sleep until the next poll, returning early if the API pushes a wakeup."""
+    if listener is None:
+        time.sleep(seconds)
+        return
+    if listener.wait(seconds):
+        logger.debug("Woken by new-job notification")
+
+
 def run_forever():
+    listener = create_listener()
+    zoom_api.tm.start_background_refresh()
+    prune_local_state(force=True)
     logger.info(
-        "Zoom processor started. Poll interval %ds; batch=%s; timeout=%ds",
+        "Zoom processor started. Poll interval %ds; batch=%s; timeout=%ds; push wakeup=%s",
         POLL_INTERVAL,
         BATCH_SIZE,
         JOB_TIMEOUT_SECONDS,
+        "on" if listener else "off",
     )
+    try:
+        _loop(listener)
+    finally:
+        if listener:
+            listener.close()
+
+
+def _loop(listener):
     while True:
         try:
-            pending = fetch_pending(BATCH_SIZE)
-            if not pending:
-                time.sleep(POLL_INTERVAL)
+            prune_local_state()
+            candidates = fetch_pending(BATCH_SIZE * SCHEDULER_WINDOW)
+            batch = scheduler.plan(candidates, BATCH_SIZE)
+            if not batch:
+                _idle_wait(listener, POLL_INTERVAL)
                 continue
-            for row in pending:
+            for row in batch:
+                scheduler.started(row)
                 try:
                     process_row(row)
                 except Exception:
                     logger.exception(
                         "Unhandled exception while processing row, continuing to next"
                     )
+                finally:
+                    scheduler.finished(row)
         except KeyboardInterrupt:
             logger.info("Processor interrupted; exiting.")
             break
@@ -619,5 +1033,39 @@ def run_forever():
             time.sleep(min(POLL_INTERVAL, 60))
 
 
+
+def serve_jobs(worker_index: int, jobs, events):
+    """
+    Job-process loop for the multi-process supervisor (run_worker.py).
+
+    Receives rows on ``jobs`` (None means drain and exit) and reports
+    ("done", worker_index, row_id) on ``events`` after each one. SIGINT is
+    ignored so Ctrl-C reaches only the supervisor, which drains the children.
+    """
+    import signal
+
+    from ..logging_config import configure_logging
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure_logging()
+    # The supervisor forwards SIGUSR2 here; pass it on to an isolated job process
+    profiler.install_signal_handler(f"worker-{worker_index}", forward=forward_to_jobs)
+    zoom_api.tm.start_background_refresh()
+    logger.info("Job process %s started (pid %s)", worker_index, os.getpid())
+    while True:
+        row = jobs.get()
+        if row is None:
+            logger.info("Job process %s drained; exiting", worker_index)
+            tracing.flush()
+            return
+        try:
+            process_row(row)
+        except Exception:
+            logger.exception("Unhandled exception while processing row %s", row.get("id"))
+        finally:
+            # The supervisor serves metrics for all job processes
+            events.put(("metrics", worker_index, registry.drain()))
+            events.put(("done", worker_index, row.get("id")))
+
 if __name__ == "__main__":
     run_forever()
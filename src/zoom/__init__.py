@@ -1,5 +1,23 @@
 # src/zoom/__init__.py
 from .zoom_client import ZoomTokenManager, ZoomAPI
-from .zoom_utils import clean_vtt_transcript, has_audio_files, has_transcript_file
+from .recording_index import RecordingIndex
+from .zoom_utils import (
+    VttCue,
+    clean_vtt_transcript,
+    has_audio_files,
+    has_transcript_file,
+    iter_vtt_cues,
+    vtt_cues_to_text,
+)
 
-__all__ = ["ZoomTokenManager", "ZoomAPI", "clean_vtt_transcript", "has_audio_files", "has_transcript_file"]
+__all__ = [
+    "ZoomTokenManager",
+    "ZoomAPI",
+    "RecordingIndex",
+    "VttCue",
+    "clean_vtt_transcript",
+    "has_audio_files",
+    "has_transcript_file",
+    "iter_vtt_cues",
+    "vtt_cues_to_text",
+]
@@ -0,0 +1,188 @@
+# src/zoom/recording_index.py
+"""Per teacher-day cache of Zoom recording listings.
+
+Every lesson row without ``recording_files`` needs the teacher's recordings
+for the meeting date. A teacher with eight lessons that day would otherwise
+trigger eight identical paginated ``list_user_recordings`` calls.
+
+RecordingIndex caches listings keyed by (teacher, date) for a short TTL, in
+memory and in a small on-disk store under TEMP_DIR (shared by the job
+processes of a supervisor on the same host). Listing is single-flight per
+teacher-day across threads and, through an flock, across those processes:
+the first claimed job of a teacher-day lists, the others wait and read its
+entry. Empty listings and errors are not cached: recordings may still be
+processing on Zoom's side.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from ..config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process single-flight only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Cross-process listing locks are striped over this many files
+LOCK_STRIPES = 64
+
+Key = Tuple[str, str]
+
+
+def _key(teacher: str, meeting_date: Any) -> Key:
+    return (str(teacher or "").strip().lower(), str(meeting_date or "")[:10])
+
+
+class RecordingIndex:
+    """TTL cache in front of ``ZoomAPI.list_user_recordings``."""
+
+    def __init__(
+        self,
+        zoom_api,
+        ttl_seconds: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.zoom_api = zoom_api
+        self.ttl = int(
+            ttl_seconds if ttl_seconds is not None
+            else getattr(settings, "ZOOM_RECORDING_CACHE_TTL_SECONDS", 300)
+        )
+        self.cache_dir = cache_dir if cache_dir is not None else getattr(
+            settings, "ZOOM_RECORDING_CACHE_DIR", None
+        ) or os.path.join(settings.TEMP_DIR, "zoom_recording_index")
+        self._clock = clock
+        self._memory: Dict[Key, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Key, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------
+    def list_recordings(self, teacher: str, meeting_date: Any, fresh: bool = False) -> Dict[str, Any]:
+        """Return ``{"meetings": [...]}`` for the teacher-day (cached unless ``fresh``)."""
+        key = _key(teacher, meeting_date)
+        if not fresh:
+            cached = self._get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+        # Single-flight per key: concurrent callers (threads, then job
+        # processes on this host) wait for one listing
+        with self._key_lock(key), self._file_lock(key):
+            if not fresh:
+                cached = self._get(key)
+                if cached is not None:
+                    self.hits += 1
+                    return cached
+            self.misses += 1
+            data = self.zoom_api.list_user_recordings(
+                user_id=teacher, from_date=key[1], to_date=key[1]
+            )
+            if data.get("meetings"):
+                self._put(key, data)
+            return data
+
+    def peek(self, teacher: str, meeting_date: Any) -> Optional[Dict[str, Any]]:
+        """Cached listing for the teacher-day, or None (never calls Zoom)."""
+        return self._get(_key(teacher, meeting_date))
+
+    def invalidate(self, teacher: str, meeting_date: Any) -> None:
+        key = _key(teacher, meeting_date)
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    # -------------------------------------------------------------
+    # Storage (memory first, then disk)
+    # -------------------------------------------------------------
+    def _key_lock(self, key: Key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def _file_lock(self, key: Key) -> Iterator[None]:
+        """Exclusive cross-process lock for ``key`` (no-op without fcntl or a cache dir)."""
+        if fcntl is None:
+            yield
+            return
+        stripe = int(self._digest(key)[:8], 16) % LOCK_STRIPES
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fh = open(os.path.join(self.cache_dir, f"listing-{stripe}.lock"), "a")
+        except OSError as exc:
+            logger.debug("Recording index lock unavailable: %s", exc)
+            yield
+            return
+        with fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _digest(key: Key) -> str:
+        return hashlib.sha1("|".join(key).encode("utf-8")).hexdigest()
+
+    def _path(self, key: Key) -> str:
+        return os.path.join(self.cache_dir, f"{self._digest(key)}.json")
+
+    def _get(self, key: Key) -> Optional[Dict[str, Any]]:
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as fh:
+                stored = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        expires_at = stored.get("expires_at", 0)
+        if expires_at <= now:
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+            return None
+        data = stored.get("data") or {}
+        with self._lock:
+            self._memory[key] = (expires_at, data)
+        return data
+
+    def _put(self, key: Key, data: Dict[str, Any]) -> None:
+        now = self._clock()
+        expires_at = now + self.ttl
+        with self._lock:
+            if len(self._memory) >= 1024:
+                for stale in [k for k, (exp, _) in self._memory.items() if exp <= now]:
+                    self._memory.pop(stale, None)
+                    self._key_locks.pop(stale, None)
+            self._memory[key] = (expires_at, data)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"expires_at": expires_at, "data": data}, fh)
+            os.replace(tmp_path, self._path(key))
+        except OSError as exc:
+            logger.debug("Could not persist recording index entry: %s", exc)
@@ -1,12 +1,21 @@
 # src/zoom/zoom_auth.py
-"""Zoom OAuth token management with secure persistence."""
+"""Zoom OAuth token management with secure persistence.
+
+Refreshes are single-flight: one thread per process (``_lock``) and one
+process per host (an flock on LOCK_FILE) talks to the OAuth endpoint; the
+others pick up the rotated tokens from TOKEN_FILE. A background thread
+refreshes ahead of expiry so callers normally never wait on a refresh.
+"""
 
 from __future__ import annotations
 import base64
 import json
 import logging
 import os
-from typing import Optional
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -14,10 +23,44 @@ import requests
 
 from ..config import settings
 
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 # Token file location - use TEMP_DIR from settings for better portability
 TOKEN_FILE = Path(settings.TEMP_DIR) / "zoom_tokens.json"
+LOCK_FILE = Path(settings.TEMP_DIR) / "zoom_tokens.lock"
+
+# Floor between background refreshes, whatever the token lifetime
+MIN_REFRESH_INTERVAL_SECONDS = 30
+
+
+# Lock files held by the current thread (flock is per open file, so a nested
+# acquire on a second descriptor would block on ourselves)
+_held = threading.local()
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Exclusive cross-process lock on ``path`` (no-op without fcntl); re-entrant per thread."""
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = set()
+    if fcntl is None or path in held:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
 
 
 class ZoomTokenManager:
@@ -32,6 +75,11 @@ class ZoomTokenManager:
         self.refresh_token = None
         self.expires_at = None
 
+        self._lock = threading.RLock()
+        self._file_mtime: Optional[int] = None
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
         self._load_tokens()
 
     # -------------------------------------------------------------
@@ -39,59 +87,101 @@ class ZoomTokenManager:
     # -------------------------------------------------------------
     def _load_tokens(self) -> None:
         """Load tokens from file, fallback to env on first run."""
-        if TOKEN_FILE.exists():
-            try:
-                data = json.loads(TOKEN_FILE.read_text(encoding="utf-8"))
+        with self._lock:
+            if self._read_token_file():
+                return
+            # First start: seed TOKEN_FILE from the environment, unless another
+            # process did (or refreshed) while we were checking
+            with _file_lock(LOCK_FILE):
+                if self._read_token_file():
+                    return
+                logger.info("ℹ️ Loading Zoom tokens from environment")
+                self.access_token = settings.ZOOM_ACCESS_TOKEN
+                self.refresh_token = settings.ZOOM_REFRESH_TOKEN
+                self.expires_at = None
 
-                self.access_token = data.get("access_token")
-                self.refresh_token = data.get("refresh_token")
-                expires = data.get("expires_at")
+                self._save_tokens()  # Save initial state
 
-                if expires:
-                    self.expires_at = datetime.fromisoformat(expires)
+    def _read_token_file(self) -> bool:
+        if not TOKEN_FILE.exists():
+            return False
+        try:
+            data = json.loads(TOKEN_FILE.read_text(encoding="utf-8"))
 
-                logger.info("Loaded Zoom tokens from disk")
-                return
-                
-            except json.JSONDecodeError as e:
-                logger.warning("Token file corrupted, will recreate: %s", e)
-            except Exception as e:
-                logger.warning("Failed to load token file: %s", e)
-
-        # Fallback to environment on first start
-        logger.info("ℹ️ Loading Zoom tokens from environment")
-        self.access_token = settings.ZOOM_ACCESS_TOKEN
-        self.refresh_token = settings.ZOOM_REFRESH_TOKEN
-        self.expires_at = None
+            self.access_token = data.get("access_token")
+            self.refresh_token = data.get("refresh_token")
+            expires = data.get("expires_at")
+
+            self.expires_at = datetime.fromisoformat(expires) if expires else None
+            self._file_mtime = self._stat_mtime()
 
-        self._save_tokens()  # Save initial state
+            logger.info("Loaded Zoom tokens from disk")
+            return True
+
+        except json.JSONDecodeError as e:
+            logger.warning("Token file corrupted, will recreate: %s", e)
+        except Exception as e:
+            logger.warning("Failed to load token file: %s", e)
+        return False
 
     def _save_tokens(self) -> None:
-        """Persist tokens to local JSON file with secure permissions."""
+        """Persist tokens to local JSON file with secure permissions (under LOCK_FILE)."""
+        temp_path = None
         try:
             data = {
                 "access_token": self.access_token,
                 "refresh_token": self.refresh_token,
                 "expires_at": self.expires_at.isoformat() if self.expires_at else None,
             }
-            
+
             # Ensure parent directory exists
             TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write atomically to avoid corruption
-            temp_file = TOKEN_FILE.with_suffix(".tmp")
-            temp_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
-            temp_file.replace(TOKEN_FILE)
-            
+
+            with _file_lock(LOCK_FILE):
+                # Write atomically to avoid corruption; the temp name is unique
+                # per writer (created 0600) so processes never share it
+                with tempfile.NamedTemporaryFile(
+                    "w",
+                    encoding="utf-8",
+                    dir=TOKEN_FILE.parent,
+                    prefix=f".{TOKEN_FILE.name}.",
+                    suffix=".tmp",
+                    delete=False,
+                ) as fh:
+                    temp_path = fh.name
+                    fh.write(json.dumps(data, indent=2))
+                os.replace(temp_path, TOKEN_FILE)
+                temp_path = None
+                self._file_mtime = self._stat_mtime()
+
             # Set restrictive permissions (owner read/write only)
             try:
                 os.chmod(TOKEN_FILE, 0o600)
             except OSError:
                 pass  # Windows may not support chmod
-            
+
             logger.info("Zoom tokens saved to disk")
         except Exception as e:
             logger.error("Failed to save zoom token file: %s", e)
+        finally:
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _stat_mtime() -> Optional[int]:
+        try:
+            return TOKEN_FILE.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload_if_changed(self) -> None:
+        """Adopt tokens another process wrote to TOKEN_FILE (cheap stat otherwise)."""
+        mtime = self._stat_mtime()
+        if mtime is not None and mtime != self._file_mtime:
+            self._load_tokens()
 
     # -------------------------------------------------------------
     # Token Helpers
@@ -99,17 +189,56 @@ class ZoomTokenManager:
     def _encode_credentials(self) -> str:
         return base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
 
-    def is_valid(self) -> bool:
-        """Check if the current access token is valid and not expired."""
+    def is_valid(self, min_validity: int = 0) -> bool:
+        """Check if the access token is valid for at least ``min_validity`` more seconds."""
         if self.access_token and self.expires_at:
-            return datetime.now(timezone.utc) < self.expires_at.replace(tzinfo=timezone.utc)
+            return (
+                datetime.now(timezone.utc) + timedelta(seconds=min_validity)
+                < self.expires_at.replace(tzinfo=timezone.utc)
+            )
         return False
 
+    def seconds_until_expiry(self) -> Optional[float]:
+        if not self.expires_at:
+            return None
+        return (self.expires_at.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)).total_seconds()
+
+    def get_token(self) -> Optional[str]:
+        """Current access token; refreshes (single-flight) only if it has expired."""
+        self._reload_if_changed()
+        if self.is_valid():
+            return self.access_token
+        return self.refresh() or self.access_token
+
     # -------------------------------------------------------------
     # Main Refresh Logic
     # -------------------------------------------------------------
-    def refresh(self) -> Optional[str]:
-        """Refresh token using Zoom OAuth (persistent)."""
+    def refresh(self, stale_token: Optional[str] = None, min_validity: int = 0) -> Optional[str]:
+        """
+        Refresh token using Zoom OAuth (persistent, single-flight).
+
+        ``stale_token`` is the token a caller saw rejected (401). If another
+        thread or process has already replaced it with one valid for at least
+        ``min_validity`` seconds, that token is returned without calling Zoom.
+        """
+        with self._lock:
+            if self._already_refreshed(stale_token, min_validity):
+                return self.access_token
+            with _file_lock(LOCK_FILE):
+                self._reload_if_changed()
+                if self._already_refreshed(stale_token, min_validity):
+                    logger.info("Zoom token already refreshed by another worker")
+                    return self.access_token
+                return self._refresh_locked()
+
+    def _already_refreshed(self, stale_token: Optional[str], min_validity: int) -> bool:
+        return (
+            bool(self.access_token)
+            and self.access_token != stale_token
+            and self.is_valid(min_validity)
+        )
+
+    def _refresh_locked(self) -> Optional[str]:
         if not self.refresh_token:
             logger.error("❌ No refresh token available")
             return None
@@ -151,3 +280,42 @@ class ZoomTokenManager:
         except Exception as e:
             logger.error(f"❌ Zoom refresh failed: {e}")
             return None
+
+    # -------------------------------------------------------------
+    # Proactive Background Refresh
+    # -------------------------------------------------------------
+    def start_background_refresh(self, lead_seconds: Optional[int] = None) -> None:
+        """Refresh ``lead_seconds`` before expiry in a daemon thread (idempotent)."""
+        if self._refresher and self._refresher.is_alive():
+            return
+        if not (self.client_id and self.client_secret and self.refresh_token):
+            logger.info("Zoom credentials incomplete; background token refresh disabled")
+            return
+        lead = int(
+            lead_seconds if lead_seconds is not None
+            else getattr(settings, "ZOOM_TOKEN_REFRESH_LEAD_SECONDS", 300)
+        )
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(lead,), name="zoom-token-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+
+    def _refresh_loop(self, lead: int) -> None:
+        while not self._stop.is_set():
+            self._reload_if_changed()
+            remaining = self.seconds_until_expiry()
+            if remaining is not None and remaining - lead > 0:
+                # Re-check at least every 5 minutes: another process may refresh first
+                self._stop.wait(min(remaining - lead, 300))
+                continue
+            if self.refresh(min_validity=lead) is None:
+                self._stop.wait(30)
+                continue
+            # A token living no longer than ``lead`` is due again at once;
+            # never call the token endpoint more often than this
+            remaining = self.seconds_until_expiry() or 0
+            self._stop.wait(max(MIN_REFRESH_INTERVAL_SECONDS, remaining - lead))
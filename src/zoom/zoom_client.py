@@ -1,62 +1,238 @@
 # src/zoom/zoom_client.py
 
 import logging
+import random
+import threading
 import requests
 import time
-from typing import Optional, Dict, Any, List
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Iterator, List
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from .. import tracing
+from ..cancellation import cancellable_sleep
+from ..config import settings
 from .zoom_auth import ZoomTokenManager
+from .zoom_utils import iter_text_lines
 
 logger = logging.getLogger(__name__)
 
+# Statuses worth retrying; other 4xx are raised immediately
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+
+class ZoomCircuitOpenError(RuntimeError):
+    """Raised without calling Zoom while an endpoint's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one Zoom endpoint.
+
+    After ``threshold`` failures (5xx / network errors) the circuit opens for
+    ``cooldown`` seconds; then a single probe request is let through and its
+    outcome closes or re-opens the circuit. A probe that ends without an
+    outcome (429, token error, cancellation) is released for the next caller.
+    """
+
+    def __init__(self, name: str, threshold: int = 5, cooldown: float = 30.0, clock=time.monotonic):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.open_until = 0.0
+        self._probing = False
+        self._probe_id = 0
+
+    @property
+    def state(self) -> str:
+        if self.open_until == 0.0:
+            return "closed"
+        return "half_open" if self._clock() >= self.open_until else "open"
+
+    def before_request(self) -> int:
+        """Raise while open; a non-zero probe id when the caller is the half-open probe."""
+        with self._lock:
+            if self.open_until == 0.0:
+                return 0
+            remaining = self.open_until - self._clock()
+            if remaining > 0:
+                raise ZoomCircuitOpenError(
+                    f"Zoom circuit open for {self.name} ({remaining:.0f}s remaining)"
+                )
+            if self._probing:
+                raise ZoomCircuitOpenError(f"Zoom circuit half-open for {self.name}; probe in flight")
+            self._probing = True
+            self._probe_id += 1
+            return self._probe_id
+
+    def release_probe(self, probe_id: int) -> None:
+        """Let another request probe if ``probe_id`` is still in flight; the state is unchanged."""
+        with self._lock:
+            if self._probing and self._probe_id == probe_id:
+                self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self._trip(self.cooldown)
+
+    def trip(self, seconds: float) -> None:
+        with self._lock:
+            self._trip(seconds)
+
+    def _trip(self, seconds: float) -> None:
+        self.open_until = self._clock() + seconds
+        self._probing = False
+        logger.warning("Zoom circuit for %s opened for %.0fs", self.name, seconds)
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Group URLs per endpoint: ``GET api.zoom.us/v2/users``, ``GET zoom.us/rec/download``."""
+    parts = urlsplit(url)
+    segments = [p for p in parts.path.split("/") if p][:2]
+    return f"{method.upper()} {parts.netloc}/{'/'.join(segments)}"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
 
 class ZoomAPI:
     BASE_URL = "https://api.zoom.us/v2"
 
     def __init__(self):
         self.tm = ZoomTokenManager()
+        self.timeout = 20
+        self.max_retry_after = getattr(settings, "ZOOM_MAX_RETRY_AFTER_SECONDS", 60)
+
+        # Keep-alive connection pool shared by API calls and downloads
+        pool_size = getattr(settings, "ZOOM_HTTP_POOL_SIZE", 10)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
 
     # -------------------------------------------------------------
     # Token Management
     # -------------------------------------------------------------
     def get_token(self) -> Optional[str]:
-        if self.tm.is_valid():
-            return self.tm.access_token
-        return self.tm.refresh() or self.tm.access_token
+        return self.tm.get_token()
+
+    # -------------------------------------------------------------
+    # Circuit breakers + backoff
+    # -------------------------------------------------------------
+    def breaker_for(self, method: str, url: str) -> CircuitBreaker:
+        key = endpoint_key(method, url)
+        with self._breakers_lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    key,
+                    threshold=getattr(settings, "ZOOM_CIRCUIT_FAILURE_THRESHOLD", 5),
+                    cooldown=getattr(settings, "ZOOM_CIRCUIT_COOLDOWN_SECONDS", 30),
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
 
     # -------------------------------------------------------------
     # Generic request helper with retries + error handling
     # -------------------------------------------------------------
     def _request(self, method: str, url: str, retries: int = 3, **kwargs):
-        for attempt in range(1, retries + 1):
-            token = self.get_token()
-            headers = kwargs.pop("headers", {})
-            headers["Authorization"] = f"Bearer {token}"
+        breaker = self.breaker_for(method, url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        kwargs.setdefault("timeout", self.timeout)
 
+        for attempt in range(1, retries + 1):
+            probe = breaker.before_request()
             try:
-                resp = requests.request(method, url, headers=headers, timeout=20, **kwargs)
-
-                # Retry on invalid token
-                if resp.status_code == 401:
-                    logger.warning("Zoom API returned 401, refreshing token...")
-                    new_token = self.tm.refresh()
-                    if new_token:
-                        headers["Authorization"] = f"Bearer {new_token}"
-                        resp = requests.request(method, url, headers=headers, timeout=20, **kwargs)
-
-                # Retry on rate limit or server errors
-                if resp.status_code in (429, 500, 503):
-                    wait = 2 ** attempt
-                    logger.warning(f"Zoom API error {resp.status_code}, retry {attempt}/{retries} after {wait}s")
-                    time.sleep(wait)
-                    continue
-
-                resp.raise_for_status()
-                return resp
-
-            except requests.exceptions.RequestException as e:
-                wait = 2 ** attempt
-                logger.warning(f"Zoom request error {e}, retry {attempt}/{retries} after {wait}s")
-                time.sleep(wait)
+                token = self.get_token()
+                headers["Authorization"] = f"Bearer {token}"
+
+                try:
+                    with tracing.span("zoom.request", endpoint=endpoint_key(method, url), attempt=attempt) as sp:
+                        resp = self.session.request(method, url, headers=headers, **kwargs)
+                        sp.set(status=resp.status_code)
+
+                    # Retry on invalid token
+                    if resp.status_code == 401:
+                        logger.warning("Zoom API returned 401, refreshing token...")
+                        new_token = self.tm.refresh(stale_token=token)
+                        if new_token:
+                            resp.close()
+                            headers["Authorization"] = f"Bearer {new_token}"
+                            resp = self.session.request(method, url, headers=headers, **kwargs)
+
+                    # Retry on rate limit or server errors
+                    if resp.status_code in RETRYABLE_STATUS:
+                        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                        if resp.status_code == 429:
+                            # Throttled, not failing: the breaker is left as is
+                            if retry_after is not None and retry_after > self.max_retry_after:
+                                # e.g. daily quota exhausted: stop calling this endpoint until then
+                                breaker.trip(retry_after)
+                                resp.raise_for_status()
+                        else:
+                            breaker.record_failure()
+                        resp.close()
+                        if attempt == retries:
+                            break
+                        wait = (retry_after + random.uniform(0, 1)) if retry_after is not None else self._backoff(attempt)
+                        logger.warning(
+                            f"Zoom API error {resp.status_code}, retry {attempt}/{retries} after {wait:.1f}s"
+                        )
+                        cancellable_sleep(wait)
+                        continue
+
+                    breaker.record_success()
+                    resp.raise_for_status()
+                    return resp
+
+                except requests.exceptions.HTTPError:
+                    raise
+                except requests.exceptions.RequestException as e:
+                    breaker.record_failure()
+                    if attempt == retries:
+                        break
+                    wait = self._backoff(attempt)
+                    logger.warning(f"Zoom request error {e}, retry {attempt}/{retries} after {wait:.1f}s")
+                    cancellable_sleep(wait)
+            finally:
+                if probe:
+                    breaker.release_probe(probe)
 
         raise RuntimeError(f"Zoom request failed after {retries} retries: {url}")
 
@@ -99,3 +275,11 @@ class ZoomAPI:
                 chunks.append(chunk)
 
         return b"".join(chunks)
+
+    def stream_lines(self, download_url: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """Yield the decoded lines of a text file (e.g. a VTT transcript) as they arrive."""
+        resp = self._request("GET", download_url, stream=True)
+        try:
+            yield from iter_text_lines(resp.iter_content(chunk_size=chunk_size))
+        finally:
+            resp.close()
@@ -1,6 +1,7 @@
 # src/zoom/zoom_utils.py
 import re
-from typing import List, Dict, Optional
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 
 # -------------------------------------------------------------
@@ -55,6 +56,153 @@ def clean_vtt_transcript(content: str) -> str:
     return text.strip()
 
 
+# -------------------------------------------------------------
+# STREAMING VTT PARSER
+# -------------------------------------------------------------
+CUE_TIMING = re.compile(
+    r"^((?:\d+:)?\d{2}:\d{2}[.,]\d{3})\s*-->\s*((?:\d+:)?\d{2}:\d{2}[.,]\d{3})"
+)
+VOICE_TAG = re.compile(r"<v(?:\.[^\s>]*)?\s+([^>]*)>")
+INLINE_SPEAKER = re.compile(r"^([^:<>]{1,64}?):\s+(.*)$")  # Zoom: "Jane Doe: hello"
+CUE_MARKUP = re.compile(r"</?[^>]+>")
+
+
+@dataclass
+class VttCue:
+    """One transcript cue; times in seconds from the start of the recording."""
+
+    start: float
+    end: float
+    text: str
+    speaker: Optional[str] = None
+    # True when the speaker came from a "Name: text" prefix (Zoom's format)
+    speaker_inline: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def parse_vtt_timestamp(value: str) -> float:
+    """Convert a cue timestamp ("01:02:03.456" or "02:03.456") to seconds."""
+    clock, _, millis = value.replace(",", ".").partition(".")
+    seconds = 0
+    for part in clock.split(":"):
+        seconds = seconds * 60 + int(part)
+    return seconds + int(millis or 0) / 1000.0
+
+
+def iter_text_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Split a byte stream (e.g. ``Response.iter_content``) into decoded lines.
+
+    Unlike ``Response.iter_lines`` this never yields a spurious blank line when
+    a CRLF is split across chunks, which would end a VTT cue early.
+    """
+    buffer = b""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode(encoding, errors="ignore")
+    if buffer:
+        yield buffer.rstrip(b"\r").decode(encoding, errors="ignore")
+
+
+def _build_cue(timing: "re.Match", payload: List[str]) -> Optional[VttCue]:
+    speaker = None
+    inline = False
+    parts = []
+    for line in payload:
+        voice = VOICE_TAG.search(line)
+        if voice and not speaker:
+            speaker = voice.group(1).strip() or None
+        parts.append(CUE_MARKUP.sub("", line).strip())
+    text = re.sub(r"\s+", " ", " ".join(p for p in parts if p)).strip()
+    if not speaker:
+        match = INLINE_SPEAKER.match(text)
+        if match:
+            speaker, text, inline = match.group(1).strip(), match.group(2).strip(), True
+    if not text:
+        return None
+    return VttCue(
+        start=parse_vtt_timestamp(timing.group(1)),
+        end=parse_vtt_timestamp(timing.group(2)),
+        text=text,
+        speaker=speaker,
+        speaker_inline=inline,
+    )
+
+
+def iter_vtt_cues(lines: Iterable[Union[str, bytes]]) -> Iterator[VttCue]:
+    """
+    Incrementally parse WebVTT lines into cues.
+
+    Holds at most one cue in memory, so a transcript streamed with
+    ``ZoomAPI.stream_lines`` is parsed in constant memory. Header, NOTE,
+    STYLE and REGION blocks are skipped; cue identifiers are optional.
+    """
+    timing = None
+    payload: List[str] = []
+    skipping = False  # inside the header or a NOTE/STYLE/REGION block
+
+    first = True
+    for raw in lines:
+        line = raw.decode("utf-8", errors="ignore") if isinstance(raw, bytes) else raw
+        line = line.rstrip("\r\n")
+        if first:
+            first = False
+            line = line.lstrip("\ufeff")
+            if line.startswith("WEBVTT"):
+                skipping = True
+                continue
+
+        if not line.strip():
+            if timing is not None:
+                cue = _build_cue(timing, payload)
+                if cue:
+                    yield cue
+            timing, payload, skipping = None, [], False
+            continue
+
+        if skipping:
+            continue
+        if timing is None:
+            match = CUE_TIMING.match(line.strip())
+            if match:
+                timing = match
+            elif line.startswith(("NOTE", "STYLE", "REGION")):
+                skipping = True
+            # anything else before the timing line is a cue identifier
+            continue
+        payload.append(line)
+
+    if timing is not None:
+        cue = _build_cue(timing, payload)
+        if cue:
+            yield cue
+
+
+def vtt_cues_to_text(cues: Iterable[VttCue], speakers: bool = False) -> str:
+    """
+    Join cues into plain text.
+
+    With ``speakers=False`` the output matches ``clean_vtt_transcript`` (voice
+    tags dropped, Zoom's inline "Name: " prefixes kept); ``speakers=True``
+    labels every cue that has a speaker as "Name: text".
+    """
+    parts = []
+    for cue in cues:
+        if cue.text.isdigit() and not cue.speaker:
+            continue
+        if cue.speaker and (speakers or cue.speaker_inline):
+            parts.append(f"{cue.speaker}: {cue.text}")
+        else:
+            parts.append(cue.text)
+    return re.sub(r"\s+", " ", " ".join(parts)).strip()
+
+
 # -------------------------------------------------------------
 # TRANSCRIPT FILE DETECTION
 # -------------------------------------------------------------
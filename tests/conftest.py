@@ -6,24 +6,31 @@ import pytest
 import pytest_asyncio
 
 
+async def _close_pools():
+    from src.db.mysql_pool import AsyncMySQLPool
+    for attr in ("_replica", "_pool"):
+        pool = getattr(AsyncMySQLPool, attr)
+        if pool is not None:
+            try:
+                pool.close()
+                await pool.wait_closed()
+            except Exception:
+                pass
+            setattr(AsyncMySQLPool, attr, None)
+
+
 @pytest_asyncio.fixture(autouse=True)
 async def reset_mysql_pool():
-    """Reset MySQL pool before each test to avoid event loop issues."""
-    from src.db.mysql_pool import AsyncMySQLPool
-    # Close existing pool if any
-    if AsyncMySQLPool._pool is not None:
-        try:
-            AsyncMySQLPool._pool.close()
-            await AsyncMySQLPool._pool.wait_closed()
-        except Exception:
-            pass
-        AsyncMySQLPool._pool = None
+    """Reset MySQL pools (primary + replica) before each test to avoid event loop issues."""
+    # Close existing pools if any
+    await _close_pools()
     yield
     # Cleanup after test
-    if AsyncMySQLPool._pool is not None:
-        try:
-            AsyncMySQLPool._pool.close()
-            await AsyncMySQLPool._pool.wait_closed()
-        except Exception:
-            pass
-        AsyncMySQLPool._pool = None
+    await _close_pools()
+
+
+@pytest.fixture(autouse=True)
+def trace_dir(tmp_path, monkeypatch):
+    """Keep job traces written by worker tests out of the real TRACE_DIR."""
+    from src import tracing
+    monkeypatch.setattr(tracing, "_exporter", tracing.JsonlExporter(str(tmp_path / "traces")))
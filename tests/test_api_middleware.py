@@ -0,0 +1,83 @@
+"""
+Unit tests for the fused pure-ASGI API middleware.
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient, ASGITransport
+
+from src.api import middlewares
+from src.api.middlewares import APIRequestMiddleware, compile_path_matcher
+from src.security import JWTValidationError
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/{path:path}")
+    async def echo(request: Request):
+        return {
+            "user": getattr(request.state, "user", None),
+            "idempotency_key": getattr(request.state, "idempotency_key", None),
+        }
+
+    app.add_middleware(APIRequestMiddleware)
+    return app
+
+
+@pytest.fixture
+def production(monkeypatch):
+    monkeypatch.setattr(middlewares.settings, "ENVIRONMENT", "production")
+
+    def fake_verify(token):
+        if token != "good":
+            raise JWTValidationError("Invalid token: bad signature")
+        return {"sub": "user-1"}
+
+    monkeypatch.setattr(middlewares, "verify_jwt", fake_verify)
+
+
+async def _get(path, headers=None):
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as ac:
+        return await ac.get(path, headers=headers or {})
+
+
+def test_path_matcher_exact_and_prefix():
+    is_public = compile_path_matcher(middlewares.PUBLIC_PATHS, middlewares.PUBLIC_PREFIXES)
+    assert is_public("/")
+    assert is_public("/openapi.json")
+    assert is_public("/v1/flashcards/sessions/abc")
+    assert is_public("/docs/oauth2-redirect")
+    assert not is_public("/openapi.json/x")
+    assert not is_public("/admin")
+    assert not is_public("/v1")
+
+
+async def test_idempotency_key_is_exposed_on_state():
+    resp = await _get("/v1/spelling/sessions", {"Idempotency-Key": "abc-123"})
+    assert resp.json()["idempotency_key"] == "abc-123"
+
+
+async def test_public_paths_skip_auth_in_production(production):
+    resp = await _get("/v1/grammar-challenge/sessions")
+    assert resp.status_code == 200
+
+
+async def test_private_path_requires_bearer_in_production(production):
+    resp = await _get("/internal/stats")
+    assert resp.status_code == 401
+    assert resp.json()["error"] == {"code": "UNAUTHORIZED", "message": "missing bearer token", "details": {}}
+
+    resp = await _get("/internal/stats", {"Authorization": "Bearer nope"})
+    assert resp.status_code == 401
+    assert "bad signature" in resp.json()["error"]["message"]
+
+    resp = await _get("/internal/stats", {"Authorization": "Bearer good"})
+    assert resp.status_code == 200
+    assert resp.json()["user"] == {"sub": "user-1"}
+
+
+async def test_development_bypasses_auth(monkeypatch):
+    monkeypatch.setattr(middlewares.settings, "ENVIRONMENT", "development")
+    resp = await _get("/internal/stats")
+    assert resp.status_code == 200
@@ -0,0 +1,53 @@
+"""
+Unit tests for the games statement registry and row decoders.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.games.dao import queries, rows
+
+
+@pytest.mark.parametrize("columns, row_type", [
+    (queries.WORD_COLUMNS, rows.WordRow),
+    (queries.WORD_LIST_COLUMNS, rows.WordListRow),
+    (queries.SESSION_COLUMNS, rows.SessionRow),
+    (queries.RESULT_COLUMNS, rows.ResultRow),
+    (queries.MISTAKE_COLUMNS, rows.MistakeRow),
+])
+def test_row_types_match_column_lists(columns, row_type):
+    names = tuple(c.strip() for c in columns.split(","))
+    assert names == row_type._fields
+
+
+def test_sql_in_is_cached_per_arity():
+    three = queries.sql_in("words.by_ids", 3)
+    assert three.endswith("IN (%s,%s,%s)")
+    assert queries.sql_in("words.by_ids", 3) is three
+    with pytest.raises(ValueError):
+        queries.sql_in("words.by_ids", 0)
+
+
+def test_word_lists_page_whitelists_sort_column():
+    count_sql, page_sql = queries.word_lists_page(True, False, "name; DROP TABLE x")
+    assert "name LIKE %s" in count_sql
+    assert "ORDER BY created_at DESC" in page_sql
+
+
+def test_decode_session_parses_json_columns():
+    started = datetime(2025, 1, 1, 12, 0, 0)
+    row = (
+        "s1", "u1", "flashcards", "custom",
+        "wl1", None, None, None, None,
+        None, '["a", "b"]',
+        1, 2, 1, 0,
+        '["a"]', None,
+        started, None, "active",
+    )
+    session = rows.decode_session(row)
+    assert session["itemOrder"] == ["a", "b"]
+    assert session["masteredIds"] == ["a"]
+    assert session["needsPracticeIds"] == []
+    assert session["progress"] == {"current": 1, "total": 2, "correct": 1, "incorrect": 0}
+    assert session["startedAt"] == "2025-01-01T12:00:00Z"
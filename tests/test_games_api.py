@@ -744,6 +744,48 @@ class TestIdempotency:
         # Should either return 201 with same data or handle idempotency
         assert response2.status_code in [201, 200]
 
+    @pytest.mark.asyncio
+    async def test_idempotent_flashcard_result(self, client, headers):
+        """Replaying a result with the same Idempotency-Key must not double count."""
+        list_response = await client.post(
+            "/v1/word-lists",
+            headers=headers,
+            json={"name": "Idempotent Result Test"}
+        )
+        list_id = list_response.json()["id"]
+
+        word_response = await client.post(
+            f"/v1/word-lists/{list_id}/words",
+            headers=headers,
+            json={"word": "river", "translation": "نهر"}
+        )
+        word_id = word_response.json()["id"]
+
+        session_response = await client.post(
+            "/v1/flashcards/sessions",
+            headers=headers,
+            json={"wordListId": list_id}
+        )
+        session_id = session_response.json()["id"]
+
+        headers_with_key = {**headers, "Idempotency-Key": str(uuid.uuid4())}
+        result = {"wordId": word_id, "isCorrect": False, "timeSpentMs": 900, "attempts": 1}
+
+        response1 = await client.post(
+            f"/v1/flashcards/sessions/{session_id}/results",
+            headers=headers_with_key,
+            json=result
+        )
+        response2 = await client.post(
+            f"/v1/flashcards/sessions/{session_id}/results",
+            headers=headers_with_key,
+            json=result
+        )
+        assert response1.status_code == 200
+        assert response2.status_code == 200
+        assert response2.json() == response1.json()
+        assert response2.json()["progress"]["incorrect"] == 1
+
 
 # =============================================================================
 # PAGINATION TESTS
@@ -766,7 +808,41 @@ class TestPagination:
         assert "total" in pagination
         assert pagination["page"] == 1
         assert pagination["limit"] == 5
-    
+
+    @pytest.mark.asyncio
+    async def test_word_lists_keyset_pagination(self, client, headers):
+        """Following nextCursor walks every list exactly once."""
+        created = set()
+        for i in range(3):
+            response = await client.post(
+                "/v1/word-lists", headers=headers, json={"name": f"Keyset {i}"}
+            )
+            created.add(response.json()["id"])
+
+        first = (await client.get(
+            "/v1/word-lists?limit=2&sort=updatedAt", headers=headers
+        )).json()
+        assert len(first["data"]) == 2
+        assert first["pagination"]["nextCursor"]
+
+        second = (await client.get(
+            f"/v1/word-lists?limit=2&sort=updatedAt&includeTotal=false"
+            f"&cursor={first['pagination']['nextCursor']}",
+            headers=headers
+        )).json()
+        assert second["pagination"]["total"] is None
+        assert second["pagination"]["nextCursor"] is None
+
+        seen = [wl["id"] for wl in first["data"] + second["data"]]
+        assert len(seen) == len(set(seen)) == 3
+        assert set(seen) == created
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, client, headers):
+        """A cursor from another ordering (or garbage) is a validation error."""
+        response = await client.get("/v1/word-lists?cursor=not-a-cursor", headers=headers)
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_grammar_questions_pagination(self, client, headers):
         """Test grammar questions pagination."""
@@ -0,0 +1,82 @@
+"""
+Unit tests for the games load-test harness (no MySQL needed: the API is faked).
+"""
+
+import json
+
+import httpx
+
+from benchmarks.games_load import (
+    histogram_quantile,
+    parse_prometheus,
+    percentile,
+    render,
+    run_level,
+    schema_statements,
+    summarize,
+)
+
+METRICS = """# TYPE mysql_pool_in_use gauge
+mysql_pool_in_use{pool="primary"} %d
+mysql_pool_max_size{pool="primary"} 4
+mysql_pool_acquire_wait_seconds_bucket{pool="primary",le="0.005"} %d
+mysql_pool_acquire_wait_seconds_bucket{pool="primary",le="0.1"} %d
+mysql_pool_acquire_wait_seconds_bucket{pool="primary",le="+Inf"} %d
+mysql_slow_queries_total %d
+"""
+
+
+def fake_api():
+    state = {"scrapes": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/metrics":
+            n = state["scrapes"]
+            state["scrapes"] += 1
+            return httpx.Response(200, text=METRICS % (4 if n % 2 else 1, 10 * n, 15 * n, 15 * n, n))
+        assert request.headers["X-User-Id"].startswith("load-student-")
+        if path.endswith("/sessions"):
+            body = json.loads(request.content)
+            items = [{"id": f"item-{i}", "word": "cat", "tokens": ["a"]} for i in range(3)]
+            return httpx.Response(201, json={"id": "s1", "words": items, "questions": items, "items": items, "mode": body.get("mode")})
+        if path.endswith("/results"):
+            # Every other result fails so the error rate is visible
+            return httpx.Response(500 if json.loads(request.content)["timeSpentMs"] % 2 else 200, json={"ok": True})
+        return httpx.Response(200, json={"ok": True})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test")
+
+
+async def test_run_level_reports_latency_errors_and_pool():
+    async with fake_api() as client:
+        result = await run_level(client, concurrency=3, duration=0.3, students=10, lessons=2, think_ms=2, sample_interval=0.02)
+    summary = summarize(result)
+
+    assert summary["sessions"] > 0
+    ops = summary["ops"]
+    assert ops["session_start"]["count"] == ops["complete"]["count"]
+    assert ops["result"]["count"] >= 3 * ops["complete"]["count"]
+    assert 0 < ops["result"]["error_rate"] < 1
+    assert ops["stats"]["error_rate"] == 0
+    assert ops["all"]["p99_ms"] >= ops["all"]["p50_ms"]
+
+    pool = summary["pool"]
+    assert pool["max_in_use"] == 4 and pool["max_size"] == 4
+    assert 0 < pool["saturated_share"] < 1
+    assert pool["slow_queries"] > 0
+    assert "concurrency 3" in render(summary)
+
+
+def test_helpers():
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([float(i) for i in range(1, 101)], 99) == 99
+    before = parse_prometheus(METRICS % (0, 0, 0, 0, 0))
+    after = parse_prometheus(METRICS % (2, 90, 98, 100, 3))
+    assert after['mysql_pool_in_use{pool="primary"}'] == 2
+    assert histogram_quantile(before, after, "mysql_pool_acquire_wait_seconds", 0.5) == 0.005
+    assert histogram_quantile(before, after, "mysql_pool_acquire_wait_seconds", 0.99) == float("inf")
+
+    with open("schema.sql", encoding="utf-8") as fh:
+        statements = schema_statements(fh.read())
+    assert len(statements) == 8 and all(s.startswith("CREATE TABLE") for s in statements)
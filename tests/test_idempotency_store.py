@@ -0,0 +1,184 @@
+"""
+Unit tests for the two-tier games idempotency store.
+"""
+
+import pytest
+
+from src.db.mysql_pool import UnitOfWork
+from src.games.utils import idempotency
+from src.games.utils.idempotency import IdempotencyStore
+
+
+class _Cursor:
+    def __init__(self, pool):
+        self.pool = pool
+        self.rowcount = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params=None):
+        self.pool.executed.append((query, params))
+        if query.startswith("DELETE"):
+            self.rowcount = self.pool.purge_counts.pop(0)
+
+    async def executemany(self, query, rows):
+        self.pool.batches.append(list(rows))
+
+    async def fetchone(self):
+        return self.pool.row
+
+
+class _Conn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return _Cursor(self.pool)
+
+    async def begin(self):
+        pass
+
+    async def commit(self):
+        self.pool.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+class _Pool:
+    def __init__(self, row=None):
+        self.row = row
+        self.executed = []
+        self.batches = []
+        self.purge_counts = []
+        self.commits = 0
+
+    def acquire(self):
+        return _Conn(self)
+
+
+class _RawPool(_Pool):
+    """Pool whose acquire() is awaitable (UnitOfWork uses ``await pool.acquire()``)."""
+
+    def acquire(self):
+        pool = self
+
+        class _Awaitable(_Conn):
+            def __await__(self):
+                async def _conn():
+                    return _Conn(pool)
+                return _conn().__await__()
+
+        return _Awaitable(pool)
+
+    def release(self, conn):
+        pass
+
+
+def _provider(holder):
+    async def get_pool():
+        return holder[0]
+    return get_pool
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fresh = IdempotencyStore(
+        max_entries=100, flush_interval=0, flush_batch=2, redis_url="", pool_provider=_provider([_Pool()])
+    )
+    monkeypatch.setattr(idempotency, "idempotency_store", fresh)
+    return fresh
+
+
+async def test_store_then_replay_skips_mysql(store):
+    pool = _Pool()
+    await idempotency.store_idempotency(pool, "u1", "/v1/spelling/sessions", "k1", {"id": "s1"})
+    assert pool.executed == []  # write is queued, not done inline
+
+    cached = await idempotency.check_idempotency(pool, "u1", "/v1/spelling/sessions", "k1", raw=True)
+    assert cached == b'{"id":"s1"}'
+    assert pool.executed == []
+
+    assert await idempotency.check_idempotency(pool, "u1", "/v1/spelling/sessions", "other") is None
+    assert len(pool.executed) == 1  # misses fall through to the table
+
+
+async def test_queued_writes_are_flushed_in_batches(store):
+    pool = _Pool()
+    store.pool_provider = _provider([pool])
+    for i in range(5):
+        await idempotency.store_idempotency(pool, "u1", "/v1/flashcards/sessions", f"k{i}", {"n": i})
+    assert await store.flush() == 5
+    assert [len(b) for b in pool.batches] == [2, 2, 1]
+    assert pool.batches[0][0][1:5] == ("u1", "/v1/flashcards/sessions", "k0", '{"n":0}')
+
+
+async def test_failed_batch_is_requeued_and_flushed_on_the_current_pool(store):
+    class _DownPool(_Pool):
+        def acquire(self):
+            raise ConnectionError("pool is closed")
+
+    current = [_DownPool()]
+    store.pool_provider = _provider(current)
+    store.max_pending = 4
+    for i in range(5):
+        await idempotency.store_idempotency(_Pool(), "u1", "/e", f"k{i}", {"n": i})
+
+    assert await store.flush() == 0
+    # Bounded: the oldest key is dropped, the rest wait in order
+    assert [p[3] for p in store._pending] == ["k1", "k2", "k3", "k4"]
+
+    current[0] = _Pool()  # pool re-initialised
+    assert await store.flush() == 4
+    assert [row[3] for batch in current[0].batches for row in batch] == ["k1", "k2", "k3", "k4"]
+
+
+async def test_table_hit_is_remembered(store):
+    pool = _Pool(row=('{"id":"s9"}', None))
+    assert await idempotency.check_idempotency(pool, "u", "/e", "k") == {"id": "s9"}
+    assert await idempotency.check_idempotency(pool, "u", "/e", "k") == {"id": "s9"}
+    assert len(pool.executed) == 1
+
+
+async def test_unit_of_work_write_is_visible_only_after_commit(store):
+    pool = _RawPool()
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork(pool) as uow:
+            await idempotency.store_idempotency(uow, "u", "/e", "rolled-back", {"ok": 1})
+            raise RuntimeError("handler failed")
+    assert store.peek(("u", "/e", "rolled-back")) is None
+
+    async with UnitOfWork(pool) as uow:
+        await idempotency.store_idempotency(uow, "u", "/e", "committed", {"ok": 1})
+        assert store.peek(("u", "/e", "committed")) is None
+    assert store.peek(("u", "/e", "committed")) == b'{"ok":1}'
+    assert store._pending == []  # written inside the transaction, not queued
+
+
+async def test_cleanup_deletes_in_bounded_chunks(store):
+    pool = _Pool()
+    pool.purge_counts = [3, 3, 1]
+    assert await idempotency.cleanup_expired_keys(pool, batch_size=3) == 7
+    assert [params for _, params in pool.executed] == [(3,), (3,), (3,)]
+    assert pool.commits == 3
+
+
+def test_memory_tier_is_bounded_and_expires():
+    now = [100.0]
+    store = IdempotencyStore(max_entries=2, redis_url="", clock=lambda: now[0])
+    for i in range(3):
+        store.remember(("u", "/e", str(i)), b"{}", 200.0)
+    assert store.peek(("u", "/e", "0")) is None
+    assert store.peek(("u", "/e", "2")) == b"{}"
+    now[0] = 200.0
+    assert store.peek(("u", "/e", "2")) is None
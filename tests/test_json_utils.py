@@ -0,0 +1,80 @@
+"""
+Unit tests for the fast JSON layer.
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+
+from src import json_utils
+from src.games.utils import idempotency
+
+
+def test_round_trip_and_extra_types():
+    payload = {
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "startedAt": datetime.datetime(2026, 1, 2, 3, 4, 5),
+        "score": decimal.Decimal("0.5"),
+        "tags": {"a"},
+        "word": "שלום",
+        1: "int key",
+    }
+    encoded = json_utils.dumpb(payload)
+    assert "שלום".encode("utf-8") in encoded  # not \u-escaped
+    decoded = json_utils.loads(encoded)
+    assert decoded["id"] == "12345678-1234-5678-1234-567812345678"
+    assert decoded["startedAt"].startswith("2026-01-02T03:04:05")
+    assert decoded["score"] == 0.5
+    assert decoded["tags"] == ["a"]
+    assert decoded["1"] == "int key"
+    assert json.loads(json_utils.dumps(payload)) == decoded
+
+
+def test_response_passes_pre_serialized_bytes_through():
+    body = b'{"id":"s1","words":[]}'
+    assert json_utils.FastJSONResponse(content=body).body == body
+    assert json_utils.FastJSONResponse(content={"ok": True}).body == b'{"ok":true}'
+
+
+class _Cursor:
+    def __init__(self, row):
+        self.row = row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, *args):
+        pass
+
+    async def fetchone(self):
+        return self.row
+
+
+class _Pool:
+    def __init__(self, row):
+        self.row = row
+
+    def acquire(self):
+        pool = self
+
+        class _Conn:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def cursor(self):
+                return _Cursor(pool.row)
+
+        return _Conn()
+
+
+async def test_idempotency_raw_returns_stored_bytes():
+    pool = _Pool(('{"id":"s1"}',))
+    assert await idempotency.check_idempotency(pool, "u", "/v1/spelling/sessions", "k", raw=True) == b'{"id":"s1"}'
+    assert await idempotency.check_idempotency(pool, "u", "/v1/spelling/sessions", "k") == {"id": "s1"}
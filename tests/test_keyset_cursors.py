@@ -0,0 +1,68 @@
+"""
+Tests that keyset routes reject a bad cursor before touching the database.
+
+The read pool is replaced with one that fails on acquire, so these run
+without MySQL.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from src.games.dao.games_dao import GamesDAO
+from src.games.routes import flashcards_routes
+
+
+class _NoAcquirePool:
+    def acquire(self):
+        raise AssertionError("pool acquired before the cursor was validated")
+
+
+@pytest.fixture
+def no_pool(monkeypatch):
+    pool = _NoAcquirePool()
+
+    async def get_pool():
+        return pool
+
+    monkeypatch.setattr(flashcards_routes, "get_read_pool_instance", get_pool)
+    return pool
+
+
+USER = {"userId": "user-1"}
+
+
+@pytest.mark.asyncio
+async def test_list_word_lists_rejects_cursor_before_acquire(no_pool):
+    with pytest.raises(HTTPException) as exc:
+        await flashcards_routes.list_word_lists(
+            page=1, limit=20, search=None, favorite=None, sort="createdAt",
+            cursor="not-a-cursor", includeTotal=True, user=USER
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_word_list_rejects_words_cursor_before_acquire(no_pool):
+    with pytest.raises(HTTPException) as exc:
+        await flashcards_routes.get_word_list(
+            list_id="list-1", include="words", page=1, limit=50, search=None,
+            favorite=None, cursor="not-a-cursor", includeTotal=True, user=USER
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_flashcard_mistakes_rejects_cursor_before_acquire(no_pool):
+    with pytest.raises(HTTPException) as exc:
+        await flashcards_routes.list_flashcard_mistakes(
+            page=1, limit=50, cursor="not-a-cursor", includeTotal=True, user=USER
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_dao_user_mistakes_rejects_cursor_before_acquire():
+    dao = GamesDAO(_NoAcquirePool())
+    with pytest.raises(HTTPException) as exc:
+        await dao.get_user_mistakes("user-1", "flashcards", cursor="not-a-cursor")
+    assert exc.value.status_code == 400
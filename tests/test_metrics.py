@@ -0,0 +1,99 @@
+"""
+Unit tests for the Prometheus-style metrics registry and its endpoints.
+"""
+
+import urllib.request
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from src import metrics
+from src.api import router_root
+from src.api.middlewares import APIRequestMiddleware
+from src.metrics import Registry, provider_call, start_metrics_server
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = Registry()
+    hist = reg.histogram("job_seconds", "Job time.", ("stage",), buckets=(1, 5))
+    for value in (0.5, 2, 7):
+        hist.observe(value, stage="extract")
+    text = reg.render()
+    assert "# TYPE job_seconds histogram" in text
+    assert 'job_seconds_bucket{stage="extract",le="1"} 1' in text
+    assert 'job_seconds_bucket{stage="extract",le="5"} 2' in text
+    assert 'job_seconds_bucket{stage="extract",le="+Inf"} 3' in text
+    assert 'job_seconds_sum{stage="extract"} 9.5' in text
+    assert 'job_seconds_count{stage="extract"} 3' in text
+    with pytest.raises(ValueError):
+        hist.observe(1.0)
+
+
+def test_counter_gauge_and_collector():
+    reg = Registry()
+    reg.counter("jobs", "Jobs.", ("outcome",)).inc(outcome='say "hi"')
+    reg.gauge("depth", "Depth.").set(4)
+    reg.collector(lambda: [("pool_in_use", "In use.", [("pool_in_use", {"pool": "primary"}, 2)])])
+    text = reg.render()
+    assert 'jobs_total{outcome="say \\"hi\\""} 1' in text
+    assert "depth 4" in text
+    assert 'pool_in_use{pool="primary"} 2' in text
+
+
+def test_drain_and_merge_across_processes():
+    child, parent = Registry(), Registry()
+    for reg in (child, parent):
+        reg.histogram("stage_seconds", "Stage.", ("stage",), buckets=(1,))
+        reg.counter("jobs", "Jobs.")
+    child.get("stage_seconds").observe(0.5, stage="persist")
+    child.get("jobs").inc()
+    parent.get("jobs").inc()
+
+    parent.merge(child.drain())
+    parent.merge(child.drain())  # nothing left to merge twice
+    assert parent.get("stage_seconds").count(stage="persist") == 1
+    assert parent.get("jobs").value() == 2
+
+
+def test_provider_call_records_errors():
+    hist = metrics.provider_request_duration
+    before = hist.count(provider="groq", operation="chat", outcome="error")
+    with pytest.raises(RuntimeError):
+        with provider_call("groq", "chat"):
+            raise RuntimeError("rate limited")
+    assert hist.count(provider="groq", operation="chat", outcome="error") == before + 1
+
+
+async def test_api_records_route_template_and_serves_prometheus():
+    app = FastAPI()
+    app.include_router(router_root.router, prefix="/v1")
+
+    @app.get("/v1/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    app.add_middleware(APIRequestMiddleware)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/v1/items/abc")
+        await ac.get("/v1/items/def")
+        resp = await ac.get("/v1/metrics", headers={"Accept": "text/plain;version=0.0.4"})
+        json_resp = await ac.get("/v1/metrics")
+
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/v1/items/{item_id}",status="200"}' in resp.text
+    assert "/v1/items/abc" not in resp.text
+    assert "mysql" in json_resp.json()
+
+
+def test_worker_listener_serves_registry():
+    metrics.worker_queue_depth.set(7)
+    server = start_metrics_server(0, host="127.0.0.1")
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+            body = resp.read().decode()
+        assert "worker_queue_depth 7" in body
+    finally:
+        server.shutdown()
+        server.server_close()
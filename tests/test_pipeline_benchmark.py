@@ -0,0 +1,40 @@
+"""
+Smoke test for the offline pipeline benchmark and its provider replay.
+"""
+
+import io
+import socket
+
+import pytest
+
+from benchmarks.pipeline import compare, run_suite, synthetic_transcript
+from benchmarks.replay import NetworkBlocked, replay_providers
+
+
+def test_replay_answers_from_fixtures_without_network():
+    from src.ai.generators import spelling_generator
+    from src.ai.utils.assemblyai_helper import AssemblyAIHelper
+    from src.ai.utils.gemini_transcription_helper import GeminiTranscriptionHelper
+
+    with replay_providers() as stats:
+        assert spelling_generator._translator("he").translate("homework") == "שיעורי בית"
+        assert GeminiTranscriptionHelper().transcribe_audio_bytes(b"RIFF" + bytes(16)).startswith("[0:4:22]")
+        result = AssemblyAIHelper().transcribe_audio_bytes(b"RIFF" + bytes(16), "he")
+        assert result["status"] == "completed" and result["text"]
+        with pytest.raises(NetworkBlocked):
+            socket.create_connection(("127.0.0.1", 9), timeout=1)
+    assert stats.calls["assemblyai"] == 4  # upload, create, processing poll, completed poll
+
+
+def test_suite_runs_offline_and_flags_regressions():
+    assert len(synthetic_transcript(5000)) == 5000
+    out = io.StringIO()
+    current = run_suite(sizes=(5000,), repeat=1, only=r"process_lesson|enhance|assemblyai", out=out)
+    results = current["results"]
+    assert {"synthetic_5k/process_lesson", "google_transcript/enhance", "replay/assemblyai.transcribe_audio_bytes"} <= set(results)
+    assert results["synthetic_5k/process_lesson"]["chars_per_s"] > 0
+    assert current["replay_calls"]["groq"] >= 1
+
+    faster = {"results": {k: dict(v, median_s=v["median_s"] / 3) for k, v in results.items()}}
+    assert compare(current, faster, threshold=0.5)
+    assert not compare(current, current, threshold=0.5)
@@ -0,0 +1,162 @@
+"""
+Unit tests for the on-demand sampling profiler and its admin endpoint.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from src import profiler
+from src.api.errors import APIError, api_error_handler
+from src.api.routes import admin_routes
+from src.config import settings
+from src.profiler import SamplingProfiler
+
+
+@pytest.fixture(autouse=True)
+def profiler_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TEMP_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "PROFILER_ADMIN_TOKEN", "s3cret", raising=False)
+    yield
+    prof = profiler.current()
+    if prof is not None:
+        prof.stop()
+        prof.wait(5)
+    monkeypatch.setattr(profiler, "_current", None)
+
+
+def busy_regex_work(stop):
+    import re
+
+    while not stop.is_set():
+        re.findall(r"\b\w+ing\b", "going running jumping " * 200)
+
+
+def test_thread_samples_written_as_collapsed_and_speedscope(tmp_path):
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_regex_work, args=(stop,), name="busy")
+    worker.start()
+    try:
+        prof = SamplingProfiler(seconds=0.3, interval=0.005, label="test", directory=str(tmp_path)).start()
+        assert prof.wait(5)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert prof.samples > 10 and prof.status()["status"] == "finished"
+    with open(prof.files["collapsed"]) as fh:
+        lines = fh.read().splitlines()
+    busy = [line for line in lines if line.startswith("thread:busy;")]
+    assert busy and any("busy_regex_work (tests/test_profiler.py:" in line for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    with open(prof.files["speedscope"]) as fh:
+        doc = json.load(fh)
+    names = {p["name"] for p in doc["profiles"]}
+    assert "thread:busy" in names
+    frames = doc["shared"]["frames"]
+    assert any(f["name"] == "busy_regex_work" and f["file"] == "tests/test_profiler.py" for f in frames)
+    for p in doc["profiles"]:
+        assert len(p["samples"]) == len(p["weights"])
+        assert all(0 <= i < len(frames) for stack in p["samples"] for i in stack)
+
+
+async def test_asyncio_tasks_sampled_where_suspended(tmp_path):
+    lock = asyncio.Lock()
+
+    async def update_session_progress():
+        async with lock:
+            await asyncio.sleep(0)
+
+    await lock.acquire()
+    waiter = asyncio.create_task(update_session_progress())
+    prof = SamplingProfiler(seconds=0.2, interval=0.01, loop=asyncio.get_running_loop(), directory=str(tmp_path)).start()
+    while prof.running:
+        await asyncio.sleep(0.01)
+    lock.release()
+    await waiter
+
+    task_stacks = [s for s in prof.stacks if s.startswith("asyncio-tasks;")]
+    assert any("update_session_progress" in s and "Lock.acquire" in s for s in task_stacks)
+
+
+async def test_admin_endpoint_is_opt_in_and_token_protected(monkeypatch):
+    app = FastAPI()
+    app.include_router(admin_routes.router)
+    app.add_exception_handler(APIError, api_error_handler)
+    headers = {"X-Admin-Token": "s3cret"}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        assert (await ac.post("/v1/admin/profile", headers={"X-Admin-Token": "nope"})).status_code == 403
+        assert (await ac.get("/v1/admin/profile", headers=headers)).json() == {"status": "idle"}
+
+        started = await ac.post("/v1/admin/profile?seconds=0.2&interval_ms=5", headers=headers)
+        assert started.status_code == 202
+        assert started.json()["status"] == "running" and started.json()["label"] == "api"
+        assert (await ac.post("/v1/admin/profile", headers=headers)).status_code == 409
+
+        for _ in range(100):
+            status = (await ac.get("/v1/admin/profile", headers=headers)).json()
+            if status["status"] != "running":
+                break
+            await asyncio.sleep(0.02)
+        assert status["status"] == "finished"
+        assert os.path.exists(status["files"]["speedscope"])
+        assert os.path.dirname(status["files"]["collapsed"]) == os.path.join(settings.TEMP_DIR, "profiles")
+
+        monkeypatch.setattr(settings, "PROFILER_ENABLED", False)
+        assert (await ac.get("/v1/admin/profile", headers=headers)).status_code == 404
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="POSIX only")
+def test_sigusr2_starts_a_profile_and_forwards(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILER_SECONDS", 0.2, raising=False)
+    forwarded = []
+    previous = signal.getsignal(signal.SIGUSR2)
+    try:
+        assert profiler.install_signal_handler("worker", forward=forwarded.append)
+        # The signal may land while this thread holds the profiler lock; the
+        # handler must not try to take it
+        before = profiler.current()
+        with profiler._lock:
+            os.kill(os.getpid(), signal.SIGUSR2)
+            time.sleep(0.05)
+            assert profiler.current() is before
+        for _ in range(100):
+            if forwarded:
+                break
+            time.sleep(0.01)
+        prof = profiler.current()
+        assert prof is not None and prof.label == "worker"
+        assert forwarded == [signal.SIGUSR2]
+        assert prof.wait(5) and os.path.exists(prof.files["collapsed"])
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", False)
+    assert not profiler.install_signal_handler("worker")
+
+
+def test_worker_forwards_to_isolated_job_processes(monkeypatch):
+    from src.workers import zoom_processor
+
+    class Proc:
+        def __init__(self, pid, alive):
+            self.pid, self.alive = pid, alive
+
+        def is_alive(self):
+            return self.alive
+
+    killed = []
+    monkeypatch.setattr(os, "kill", lambda pid, signum: killed.append((pid, signum)))
+    monkeypatch.setattr(zoom_processor, "_job_processes", {Proc(101, True), Proc(102, False)})
+    zoom_processor.forward_to_jobs(12)
+    assert killed == [(101, 12)]
@@ -0,0 +1,39 @@
+"""
+Unit tests for MySQL query metrics (fingerprinting + latency histograms).
+"""
+
+from src.db.query_metrics import LatencyHistogram, QueryMetrics, fingerprint
+
+
+def test_fingerprint_collapses_literals_and_whitespace():
+    a = fingerprint("SELECT id FROM words\n   WHERE id = %s AND list_id = 'abc'")
+    b = fingerprint("SELECT id FROM words WHERE id = %s AND list_id = 'xyz'")
+    assert a == b == "SELECT id FROM words WHERE id = ? AND list_id = ?"
+
+
+def test_fingerprint_folds_in_list_arity():
+    one = fingerprint("SELECT * FROM words WHERE id IN (%s)")
+    many = fingerprint("SELECT * FROM words WHERE id IN (%s,%s,%s, %s)")
+    assert one == many == "SELECT * FROM words WHERE id IN (?+)"
+
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram()
+    for ms in range(1, 101):
+        hist.observe(float(ms))
+    snap = hist.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50Ms"] == 50.0
+    assert snap["p95Ms"] == 95.0
+    assert snap["p99Ms"] == 99.0
+    assert snap["maxMs"] == 100.0
+
+
+def test_query_metrics_groups_by_fingerprint():
+    metrics = QueryMetrics()
+    metrics.record_query("SELECT 1 FROM t WHERE id = %s", 2.0)
+    metrics.record_query("SELECT 1 FROM t WHERE id = %s", 4.0)
+    metrics.record_acquire_wait(1.5)
+    snap = metrics.snapshot()
+    assert snap["queries"]["SELECT ? FROM t WHERE id = ?"]["count"] == 2
+    assert snap["acquireWait"]["count"] == 1
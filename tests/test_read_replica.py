@@ -0,0 +1,62 @@
+"""
+Tests for read-replica routing and the per-request sticky-primary flag.
+
+Point MYSQL_REPLICA_HOST at a second local MySQL instance to exercise a real
+replica; these tests swap in placeholder pools so they run without one.
+"""
+
+import asyncio
+
+import pytest
+
+from src.db.mysql_pool import AsyncMySQLPool, _is_write, is_primary_sticky, mark_primary_sticky
+
+
+class _FakePool:
+    def __init__(self, name):
+        self.name = name
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+@pytest.fixture
+def pools():
+    primary, replica = _FakePool("primary"), _FakePool("replica")
+    AsyncMySQLPool._pool, AsyncMySQLPool._replica = primary, replica
+    return primary, replica
+
+
+def test_write_detection():
+    assert _is_write("  INSERT INTO words VALUES (%s)")
+    assert _is_write("\nupdate game_sessions SET status = 'completed'")
+    assert _is_write("REPLACE INTO t VALUES (1)")
+    assert not _is_write("SELECT id FROM words WHERE id = %s")
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_until_request_writes(pools):
+    primary, replica = pools
+
+    async def request_without_write():
+        return await AsyncMySQLPool.get_read_pool()
+
+    async def request_with_write():
+        mark_primary_sticky()
+        return await AsyncMySQLPool.get_read_pool()
+
+    # Each request runs in its own task, so stickiness never leaks between them
+    assert await asyncio.create_task(request_without_write()) is replica
+    assert await asyncio.create_task(request_with_write()) is primary
+    assert await asyncio.create_task(request_without_write()) is replica
+    assert not is_primary_sticky()
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_primary_without_replica(pools):
+    primary, _ = pools
+    AsyncMySQLPool._replica = None
+    assert await AsyncMySQLPool.get_read_pool() is primary
@@ -0,0 +1,87 @@
+"""
+Unit tests for the per teacher-day Zoom recording index.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.zoom import recording_index
+from src.zoom.recording_index import RecordingIndex
+
+
+class _FakeZoom:
+    def __init__(self, meetings):
+        self.meetings = meetings
+        self.calls = []
+
+    def list_user_recordings(self, user_id, from_date, to_date):
+        self.calls.append((user_id, from_date, to_date))
+        return {"meetings": list(self.meetings)}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _rows(n, teacher="T@x.com", day="2025-03-10"):
+    return [{"id": i, "teacher_email": teacher, "meeting_date": day} for i in range(n)]
+
+
+def test_listing_is_single_flight_per_teacher_day(tmp_path):
+    zoom = _FakeZoom([{"id": 1, "recording_files": [{}]}])
+    index = RecordingIndex(zoom, ttl_seconds=60, cache_dir=str(tmp_path))
+    rows = _rows(8) + _rows(2, teacher="other@x.com")
+
+    for row in rows:
+        index.list_recordings(row["teacher_email"], row["meeting_date"])
+    assert len(zoom.calls) == 2
+
+
+@pytest.mark.skipif(recording_index.fcntl is None, reason="POSIX only")
+def test_concurrent_processes_share_one_listing(tmp_path):
+    class SlowZoom(_FakeZoom):
+        def list_user_recordings(self, user_id, from_date, to_date):
+            time.sleep(0.05)
+            return super().list_user_recordings(user_id, from_date, to_date)
+
+    zoom = SlowZoom([{"id": 1}])
+    # One index per job process; only the on-disk lock and entry are shared
+    indexes = [RecordingIndex(zoom, ttl_seconds=60, cache_dir=str(tmp_path)) for _ in range(4)]
+    threads = [
+        threading.Thread(target=index.list_recordings, args=("t@x.com", "2025-03-10"))
+        for index in indexes
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(zoom.calls) == 1
+
+
+def test_entries_expire_and_are_shared_on_disk(tmp_path):
+    clock = _Clock()
+    zoom = _FakeZoom([{"id": 1}])
+    first = RecordingIndex(zoom, ttl_seconds=60, cache_dir=str(tmp_path), clock=clock)
+    first.list_recordings("t@x.com", "2025-03-10")
+
+    # Another process on the same host reads the disk entry
+    second = RecordingIndex(zoom, ttl_seconds=60, cache_dir=str(tmp_path), clock=clock)
+    assert second.peek("T@X.com", "2025-03-10T00:00:00") == {"meetings": [{"id": 1}]}
+
+    clock.now += 61
+    second.list_recordings("t@x.com", "2025-03-10")
+    assert len(zoom.calls) == 2
+
+
+def test_empty_listings_are_not_cached(tmp_path):
+    zoom = _FakeZoom([])
+    index = RecordingIndex(zoom, ttl_seconds=60, cache_dir=str(tmp_path))
+    index.list_recordings("t@x.com", "2025-03-10")
+    index.list_recordings("t@x.com", "2025-03-10")
+    assert len(zoom.calls) == 2
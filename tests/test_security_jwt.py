@@ -0,0 +1,104 @@
+"""
+Unit tests for JWT verification with the verified-token cache.
+"""
+
+import time
+
+import pytest
+from jose import jwt
+
+from src import security
+from src.security import JWTValidationError, VerifiedTokenCache
+
+
+@pytest.fixture
+def hs256(monkeypatch):
+    monkeypatch.setattr(security.settings, "JWT_SECRET", "test-secret")
+    monkeypatch.setattr(security.settings, "JWT_ALGORITHM", "HS256")
+    monkeypatch.setattr(security, "token_cache", VerifiedTokenCache(maxsize=2))
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return calls
+
+
+def _token(exp_in=3600, secret="test-secret", **claims):
+    return jwt.encode({"sub": "u1", "exp": int(time.time()) + exp_in, **claims}, secret, algorithm="HS256")
+
+
+def test_token_is_verified_once(hs256):
+    token = _token()
+    for _ in range(5):
+        assert security.verify_jwt(token)["sub"] == "u1"
+    assert len(hs256) == 1
+    assert security.token_cache.hits == 4
+
+
+def test_cached_payload_is_not_shared(hs256):
+    token = _token()
+    security.verify_jwt(token)["sub"] = "mutated"
+    assert security.verify_jwt(token)["sub"] == "u1"
+
+
+def test_bad_tokens_are_never_cached(hs256):
+    token = _token(secret="other")
+    for _ in range(2):
+        with pytest.raises(JWTValidationError):
+            security.verify_jwt(token)
+    assert len(hs256) == 2
+    assert security.decode_jwt(token) is None
+
+
+def test_entry_expires_with_token(monkeypatch):
+    now = [1000.0]
+    cache = VerifiedTokenCache(maxsize=10, max_ttl=3600, clock=lambda: now[0])
+    keys = object()
+    cache.put(b"d", {"exp": 1010}, keys)
+    assert cache.get(b"d", keys) == {"exp": 1010}
+    now[0] = 1010
+    assert cache.get(b"d", keys) is None
+    cache.put(b"x", {"exp": 900}, keys)  # already expired: not stored
+    assert len(cache) == 0
+
+
+def test_lru_bound_and_key_rotation(hs256, monkeypatch):
+    tokens = [_token(n=i) for i in range(3)]
+    for t in tokens:
+        security.verify_jwt(t)
+    assert len(security.token_cache) == 2
+    monkeypatch.setattr(security.settings, "JWT_SECRET", "rotated")
+    with pytest.raises(JWTValidationError):
+        security.verify_jwt(tokens[2])
+
+
+def test_rs256_with_public_key(monkeypatch):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+    monkeypatch.setattr(security.settings, "JWT_ALGORITHM", "RS256")
+    monkeypatch.setattr(security.settings, "JWT_SECRET", None)
+    monkeypatch.setattr(security.settings, "JWT_PUBLIC_KEY", public_pem, raising=False)
+    monkeypatch.setattr(security, "token_cache", VerifiedTokenCache())
+
+    token = jwt.encode({"sub": "u2", "exp": int(time.time()) + 60}, private_pem, algorithm="RS256")
+    assert security.verify_jwt(token)["sub"] == "u2"
+    assert security.verify_jwt(token)["sub"] == "u2"
+    assert security.token_cache.hits == 1
+
+    monkeypatch.setattr(security.settings, "JWT_PUBLIC_KEY", None)
+    monkeypatch.setattr(security.settings, "JWT_PUBLIC_KEY_FILE", None, raising=False)
+    with pytest.raises(JWTValidationError, match="no public key"):
+        security.verify_jwt(token)
@@ -0,0 +1,71 @@
+"""
+Startup cost of the API and worker entry points.
+
+Each target is imported in a fresh interpreter under ``-X importtime``; the
+profile is printed (``pytest -s`` shows it) and the test fails if a service
+client or heavy optional SDK is loaded at import time.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.lazy import LazyService
+from src.tools.import_profile import DEFAULT_TARGETS, parse_importtime, profile_import
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("target", DEFAULT_TARGETS)
+def test_entry_point_imports_are_lazy(target):
+    profile = profile_import(target, cwd=str(ROOT))
+    print("\n" + profile.report(10))
+    assert profile.loaded(target)
+    assert profile.eager() == []
+
+
+def test_services_are_not_constructed_at_import():
+    code = (
+        "import src.api.app, src.ai.orchestrator as o, src.workers.zoom_processor as w\n"
+        "from src.api.routes import lessons_routes as l\n"
+        "print(all(not s.initialized for s in (o.supabase, o.lesson_processor, "
+        "l.supabase, l.lesson_processor, w.supabase, w.zoom_api)))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True
+    )
+    assert out.stdout.strip().splitlines()[-1] == "True"
+
+
+def test_lazy_service_builds_once():
+    built = []
+
+    class Service:
+        value = 1
+
+        def __init__(self):
+            built.append(self)
+
+    svc = LazyService(Service)
+    assert not svc.initialized and built == []
+    assert svc.value == 1
+    svc.value = 2
+    assert svc.value == 2 and len(built) == 1
+    svc.reset()
+    assert svc.value == 1 and len(built) == 2
+
+
+def test_parse_importtime():
+    profile = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |     json.decoder\n"
+        "import time:       200 |        300 |   json\n"
+        "import time:        50 |        350 | pkg\n",
+        "pkg",
+    )
+    assert profile.total_us == 350
+    assert [r.module for r in profile.top(2)] == ["pkg", "json"]
+    assert profile.by_module["json.decoder"].depth == 2
+    assert profile.loaded("json") and not profile.loaded("js")
@@ -0,0 +1,130 @@
+"""
+Unit tests for per-job pipeline traces and the waterfall viewer.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src import metrics, tracing
+from src.tools.trace_view import render_waterfall, self_times
+from src.tracing import JsonlExporter, load_spans, to_otlp
+
+
+def _job(exporter, fail=False):
+    with tracing.trace("job", key="row-1", exporter=exporter, zoom_summary_id="row-1"):
+        with metrics.stage_timer("extract"):
+            with tracing.span("extract.vocabulary") as sp:
+                sp.set(items=3)
+        with metrics.provider_call("groq", "chat"):
+            time.sleep(0.01)
+        if fail:
+            with tracing.span("persist"):
+                raise RuntimeError("supabase down")
+
+
+def test_spans_nest_and_export_per_attempt(tmp_path):
+    exporter = JsonlExporter(str(tmp_path))
+    _job(exporter)
+    with pytest.raises(RuntimeError):
+        _job(exporter, fail=True)
+
+    path = exporter.path_for("row-1")
+    spans = load_spans(path)  # latest attempt only
+    by_name = {s["name"]: s for s in spans}
+    assert set(by_name) == {"job", "stage.extract", "extract.vocabulary", "groq.chat", "persist"}
+    assert by_name["extract.vocabulary"]["parent_id"] == by_name["stage.extract"]["span_id"]
+    assert by_name["extract.vocabulary"]["attributes"] == {"items": 3}
+    assert by_name["groq.chat"]["attributes"]["provider"] == "groq"
+    assert by_name["persist"]["status"] == "error"
+    assert by_name["job"]["status"] == "error"
+    assert by_name["job"]["attributes"]["zoom_summary_id"] == "row-1"
+    assert len({s["trace_id"] for s in load_spans(path, spans[0]["trace_id"])}) == 1
+
+    with open(path) as fh:
+        assert len({line.split('"trace_id": "')[1][:32] for line in fh}) == 2
+
+
+def test_spans_are_noops_outside_a_trace():
+    with tracing.span("extract.vocabulary") as sp:
+        sp.set(items=1)
+    assert tracing.current_span() is tracing.NOOP_SPAN
+
+
+def test_record_span_back_dates_start(tmp_path):
+    exporter = JsonlExporter(str(tmp_path))
+    with tracing.trace("job", key="r2", exporter=exporter):
+        started = time.perf_counter() - 2.0
+        tracing.record_span("stage.transcribe", started, source="gemini")
+    spans = {s["name"]: s for s in load_spans(exporter.path_for("r2"))}
+    transcribe = spans["stage.transcribe"]
+    assert transcribe["end"] - transcribe["start"] == pytest.approx(2.0, abs=0.05)
+    assert transcribe["parent_id"] == spans["job"]["span_id"]
+
+
+def test_waterfall_and_otlp():
+    spans = [
+        {"trace_id": "t" * 32, "span_id": "a", "parent_id": None, "name": "job",
+         "start": 0.0, "end": 10.0, "attributes": {"zoom_summary_id": 7}, "status": "ok"},
+        {"trace_id": "t" * 32, "span_id": "b", "parent_id": "a", "name": "stage.transcribe",
+         "start": 1.0, "end": 7.0, "attributes": {}, "status": "ok"},
+        {"trace_id": "t" * 32, "span_id": "c", "parent_id": "a", "name": "stage.persist",
+         "start": 8.0, "end": 9.0, "attributes": {}, "status": "error", "error": "boom"},
+    ]
+    assert self_times(spans) == {"a": 3.0, "b": 6.0, "c": 1.0}
+    text = render_waterfall(spans, width=10, top=2)
+    lines = text.splitlines()
+    assert "total 10.00s" in lines[0]
+    assert lines[2].startswith("  stage.transcribe") and "|" + " " * 1 + "█" * 6 in lines[2]
+    assert "ERROR boom" in lines[3]
+    assert lines[-2].strip().startswith("6.00s")
+
+    otlp = to_otlp(spans)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert otlp[1]["parentSpanId"] == "a"
+    assert otlp[2]["status"]["code"] == 2
+    assert otlp[0]["attributes"] == [{"key": "zoom_summary_id", "value": {"intValue": "7"}}]
+
+
+def test_lost_claim_exports_no_trace(tmp_path, monkeypatch):
+    from src.workers import zoom_processor
+
+    monkeypatch.setattr(tracing, "_exporter", JsonlExporter(str(tmp_path)))
+    monkeypatch.setattr(zoom_processor, "claim_summary", lambda row_id: False)
+    zoom_processor._process_row_internal({"id": "taken", "processing_attempts": 0})
+    assert not (tmp_path / "taken.jsonl").exists()
+
+
+def test_otlp_post_runs_off_the_job_thread(tmp_path, monkeypatch):
+    exporter = JsonlExporter(str(tmp_path), otlp_endpoint="http://collector:4318")
+    release = threading.Event()
+    posted = []
+
+    def slow_post(spans):
+        release.wait(5)
+        posted.append((threading.current_thread().name, [s["name"] for s in spans]))
+
+    monkeypatch.setattr(exporter, "_post_otlp", slow_post)
+    started = time.perf_counter()
+    _job(exporter)
+    assert time.perf_counter() - started < 1
+    assert not exporter.flush(timeout=0.05)
+
+    release.set()
+    assert exporter.flush(timeout=5)
+    assert posted[0][0] == "otlp-exporter" and "job" in posted[0][1]
+
+
+def test_prune_traces_removes_only_stale_files(tmp_path):
+    import os
+
+    exporter = JsonlExporter(str(tmp_path))
+    _job(exporter)
+    stale = tmp_path / "old.jsonl"
+    stale.write_text("{}\n")
+    old = time.time() - 3600
+    os.utime(stale, (old, old))
+    (tmp_path / "notes.txt").write_text("keep")
+
+    assert tracing.prune_traces(600, directory=str(tmp_path)) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["notes.txt", "row-1.jsonl"]
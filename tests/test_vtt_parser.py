@@ -0,0 +1,70 @@
+"""
+Unit tests for the streaming Zoom VTT parser.
+"""
+
+from src.zoom.zoom_utils import (
+    clean_vtt_transcript,
+    iter_text_lines,
+    iter_vtt_cues,
+    vtt_cues_to_text,
+)
+
+ZOOM_VTT = (
+    "WEBVTT\r\n"
+    "\r\n"
+    "1\r\n"
+    "00:00:01.000 --> 00:00:04.500\r\n"
+    "Jane Teacher: Good morning, how are you?\r\n"
+    "\r\n"
+    "2\r\n"
+    "00:00:05.000 --> 00:00:07.250\r\n"
+    "Sam Student: I am fine,\r\n"
+    "thank you.\r\n"
+    "\r\n"
+    "NOTE recorded in class\r\n"
+    "\r\n"
+    "3\r\n"
+    "01:00:00.000 --> 01:00:02.000\r\n"
+    "<v Jane Teacher>See you tomorrow</v>\r\n"
+)
+
+
+def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_cues_carry_timing_and_speakers():
+    cues = list(iter_vtt_cues(ZOOM_VTT.splitlines()))
+    assert [(c.start, c.end) for c in cues] == [(1.0, 4.5), (5.0, 7.25), (3600.0, 3602.0)]
+    assert [c.speaker for c in cues] == ["Jane Teacher", "Sam Student", "Jane Teacher"]
+    assert cues[1].text == "I am fine, thank you."
+    assert cues[2].speaker_inline is False
+
+
+def test_plain_text_matches_clean_vtt_transcript():
+    # clean_vtt_transcript leaves closing tags in place; the parser drops them
+    content = ZOOM_VTT.replace("</v>", "")
+    cues = iter_vtt_cues(content.splitlines())
+    assert vtt_cues_to_text(cues) == clean_vtt_transcript(content)
+
+
+def test_speaker_labels_on_request():
+    text = vtt_cues_to_text(iter_vtt_cues(ZOOM_VTT.splitlines()), speakers=True)
+    assert text.endswith("Jane Teacher: See you tomorrow")
+
+
+def test_split_crlf_across_chunks_does_not_break_cues():
+    data = ZOOM_VTT.encode("utf-8")
+    for size in (1, 2, 3, 7, 64):
+        cues = list(iter_vtt_cues(iter_text_lines(_chunks(data, size))))
+        assert len(cues) == 3
+        assert cues[1].text == "I am fine, thank you."
+
+
+def test_multibyte_characters_split_across_chunks():
+    data = "WEBVTT\n\n00:01.000 --> 00:02.000\nAna: ¿Qué tal? café\n".encode("utf-8")
+    cues = list(iter_vtt_cues(iter_text_lines(_chunks(data, 1))))
+    assert cues[0].start == 1.0
+    assert cues[0].speaker == "Ana"
+    assert cues[0].text == "¿Qué tal? café"
@@ -0,0 +1,60 @@
+"""
+Unit tests for cooperative cancellation of timed-out worker jobs.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.cancellation import (
+    CancellationToken,
+    JobCancelled,
+    bind_token,
+    cancellable_sleep,
+    check_cancelled,
+)
+from src.workers import zoom_processor
+
+
+def test_token_interrupts_sleep_and_check():
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel, args=("timeout",)).start()
+    started = time.monotonic()
+    with bind_token(token):
+        with pytest.raises(JobCancelled, match="timeout"):
+            cancellable_sleep(5)
+        with pytest.raises(JobCancelled):
+            check_cancelled()
+    assert time.monotonic() - started < 1
+    # Unbound threads are unaffected
+    check_cancelled()
+
+
+def test_timed_out_job_stops_and_frees_its_slot(monkeypatch):
+    stopped = threading.Event()
+    failures = []
+
+    def hung_job(row):
+        try:
+            while True:
+                try:
+                    cancellable_sleep(0.01)
+                except Exception:
+                    # Broad handlers in the pipeline must not swallow cancellation
+                    pass
+        finally:
+            stopped.set()
+
+    monkeypatch.setattr(zoom_processor, "_process_row_internal", hung_job)
+    monkeypatch.setattr(zoom_processor, "JOB_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(zoom_processor, "CANCEL_GRACE_SECONDS", 2)
+    monkeypatch.setattr(zoom_processor, "JOB_ISOLATION", "thread")
+    monkeypatch.setattr(
+        zoom_processor, "mark_failed", lambda row_id, error, attempts: failures.append(error)
+    )
+
+    zoom_processor.process_row({"id": "r1", "processing_attempts": 0})
+
+    assert stopped.is_set()
+    assert failures and "timeout" in failures[0]
@@ -0,0 +1,157 @@
+"""
+Unit tests for worker stage checkpoints and resume-from-stage behaviour.
+"""
+
+import pytest
+
+from src.workers import checkpoints as cp
+from src.workers import zoom_processor
+
+
+class _FakeSupabase:
+    def __init__(self, row, fail_insert=False, migrated=True):
+        self.row = dict(row)
+        self.fail_insert = fail_insert
+        self.migrated = migrated
+        self.updates = []
+        self.inserted = []
+
+    def update_zoom_summary(self, row_id, payload):
+        if not self.migrated and "pipeline_checkpoints" in payload:
+            raise RuntimeError("column zoom_summaries.pipeline_checkpoints does not exist")
+        self.updates.append(payload)
+        self.row.update(payload)
+        return True
+
+    def get_zoom_summary_by_id(self, row_id, columns="*"):
+        return dict(self.row)
+
+    def insert_lesson_exercises(self, payload):
+        if self.fail_insert:
+            raise RuntimeError("supabase blip")
+        self.inserted.append(payload)
+        return {"id": 1}
+
+
+def test_local_manifest_survives_failed_row_update(tmp_path):
+    store = cp.ArtifactStore(str(tmp_path))
+
+    def failing_update(row_id, payload):
+        raise RuntimeError("down")
+
+    job = cp.PipelineCheckpoints("r1", None, store, failing_update)
+    job.complete(cp.RECORDINGS_LISTED, {"files": 2})  # logged, not raised
+
+    resumed = cp.PipelineCheckpoints("r1", None, store, failing_update)
+    assert resumed.done(cp.RECORDINGS_LISTED)
+    assert resumed.resume_stage() == cp.AUDIO_DOWNLOADED
+
+
+def test_retry_resumes_at_persist_without_regenerating(tmp_path, monkeypatch):
+    store = cp.ArtifactStore(str(tmp_path))
+    row = {
+        "id": "r2",
+        "status": "pending",
+        "processing_attempts": 0,
+        "recording_files": [{"file_type": "M4A", "recording_type": "audio_only", "download_url": "u"}],
+        "transcript": "hello " * 20,
+    }
+    fake = _FakeSupabase(row, fail_insert=True)
+    monkeypatch.setattr(zoom_processor, "supabase", fake)
+    monkeypatch.setattr(zoom_processor, "artifacts", store)
+
+    generated = []
+
+    def fake_generate(summary, persist=True):
+        generated.append(summary["id"])
+        return {"ok": True, "payload": {"exercises": {"counts": {"flashcards": 1}}}}
+
+    monkeypatch.setattr("src.ai.orchestrator.process_transcript_to_exercises", fake_generate)
+
+    # Transcription already done on a previous attempt
+    cp.PipelineCheckpoints("r2", None, store, fake.update_zoom_summary).complete(
+        cp.TRANSCRIBED, {"source": "gemini"}
+    )
+    fake.row["pipeline_checkpoints"] = {cp.TRANSCRIBED: {"source": "gemini"}}
+
+    with pytest.raises(RuntimeError):
+        zoom_processor._process_row_internal(dict(fake.row))
+    assert generated == ["r2"]
+    assert cp.EXERCISES_GENERATED in fake.row["pipeline_checkpoints"]
+
+    fake.fail_insert = False
+    zoom_processor._process_row_internal(dict(fake.row))
+    assert generated == ["r2"]
+    assert len(fake.inserted) == 1
+    assert fake.row["status"] == "completed"
+    assert not (tmp_path / "r2").exists()
+
+
+def test_unmigrated_row_still_gets_transcript_and_exercises(tmp_path, monkeypatch):
+    store = cp.ArtifactStore(str(tmp_path))
+    row = {
+        "id": "r3",
+        "status": "pending",
+        "processing_attempts": 0,
+        "recording_files": [{"file_type": "M4A", "recording_type": "audio_only", "download_url": "u"}],
+    }
+    fake = _FakeSupabase(row, migrated=False)
+    monkeypatch.setattr(zoom_processor, "supabase", fake)
+    monkeypatch.setattr(zoom_processor, "artifacts", store)
+
+    class FakeGemini:
+        enabled = True
+
+        def transcribe_audio_file(self, path):
+            return "hello " * 20
+
+    monkeypatch.setattr("src.ai.utils.gemini_transcription_helper.GeminiTranscriptionHelper", FakeGemini)
+    monkeypatch.setattr(
+        "src.ai.orchestrator.process_transcript_to_exercises",
+        lambda summary, persist=True: {"ok": True, "payload": {"exercises": {"counts": {"flashcards": 1}}}},
+    )
+    # Audio already downloaded on this host by an earlier attempt
+    store.write_bytes("r3", "audio", b"m4a")
+    cp.PipelineCheckpoints("r3", None, store, fake.update_zoom_summary).complete(cp.AUDIO_DOWNLOADED)
+
+    zoom_processor._process_row_internal(dict(fake.row))
+
+    assert "pipeline_checkpoints" not in fake.row
+    assert fake.row["transcript"].startswith("hello")
+    assert len(fake.inserted) == 1
+    assert fake.row["status"] == "completed"
+
+
+def test_vtt_speakers_reach_extraction(tmp_path, monkeypatch):
+    store = cp.ArtifactStore(str(tmp_path))
+    row = {
+        "id": "r4",
+        "status": "pending",
+        "processing_attempts": 0,
+        "recording_files": [{"file_type": "VTT", "recording_type": "audio_transcript", "download_url": "u"}],
+    }
+    fake = _FakeSupabase(row)
+    monkeypatch.setattr(zoom_processor, "supabase", fake)
+    monkeypatch.setattr(zoom_processor, "artifacts", store)
+
+    class FakeZoom:
+        def stream_lines(self, url):
+            return iter([
+                "WEBVTT", "",
+                "00:00:01.000 --> 00:00:04.000", "<v Jane Teacher>Say it again please</v>", "",
+                "00:00:05.000 --> 00:00:09.000", "<v Sam Student>I goed to the park yesterday with my family</v>", "",
+            ])
+
+    monkeypatch.setattr(zoom_processor, "zoom_api", FakeZoom())
+    seen = []
+
+    def fake_generate(summary, persist=True):
+        seen.append(summary["transcript"])
+        return {"ok": True, "payload": {"exercises": {"counts": {"flashcards": 1}}}}
+
+    monkeypatch.setattr("src.ai.orchestrator.process_transcript_to_exercises", fake_generate)
+    zoom_processor._process_row_internal(dict(fake.row))
+
+    assert fake.row["transcript"].startswith("Say it again please")
+    assert seen == ["Jane Teacher: Say it again please Sam Student: I goed to the park yesterday with my family"]
+    assert fake.row["status"] == "completed"
@@ -0,0 +1,85 @@
+"""
+Unit tests for the worker's pending-queue query against a recording fake client.
+"""
+
+from src import metrics
+from src.db.supabase_client import QUEUE_COLUMNS, SupabaseClient
+from src.workers import zoom_processor
+
+
+class _Resp:
+    def __init__(self, data):
+        self.data = data
+        self.count = 42
+
+
+class _Query:
+    """Records postgrest builder calls and returns canned data on execute()."""
+
+    def __init__(self, calls, data):
+        self.calls = calls
+        self.data = data
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args))
+            return self
+        return method
+
+    def execute(self):
+        return _Resp(self.data)
+
+
+class _Client:
+    def __init__(self, data):
+        self.calls = []
+        self.data = data
+
+    def table(self, name):
+        self.calls.append(("table", (name,)))
+        return _Query(self.calls, self.data)
+
+
+def _client(data):
+    sb = SupabaseClient.__new__(SupabaseClient)
+    sb.client = _Client(data)
+    sb._initialized = True
+    return sb
+
+
+def test_pending_query_projects_columns_and_honours_next_retry_at():
+    sb = _client([{"id": 1}])
+    assert sb.find_pending_summaries(limit=3, now=1700000000) == [{"id": 1}]
+    calls = dict(sb.client.calls)
+    assert calls["select"] == (QUEUE_COLUMNS,)
+    assert calls["eq"] == ("status", "pending")
+    assert calls["or_"] == ("next_retry_at.is.null,next_retry_at.lte.1700000000",)
+    assert calls["limit"] == (3,)
+
+
+def test_queue_columns_exclude_heavy_payloads():
+    columns = {c.strip() for c in QUEUE_COLUMNS.split(",")}
+    assert {"id", "status", "next_retry_at", "processing_attempts"} <= columns
+    assert not columns & {"transcript", "recording_files", "processing_metadata"}
+
+
+def test_fresh_window_and_count_only_queried_when_pending_window_is_full(monkeypatch):
+    monkeypatch.setattr(zoom_processor, "_queue_depth_counted_at", 0.0)
+    sb = _client([{"id": 1}])
+    monkeypatch.setattr(zoom_processor, "supabase", sb)
+    assert zoom_processor.fetch_pending(limit=3) == [{"id": 1}]
+    assert [c for c in sb.client.calls if c[0] == "table"] == [("table", ("zoom_summaries",))]
+    assert metrics.worker_queue_depth.value() == 1
+
+    sb = _client([{"id": i} for i in range(3)])
+    monkeypatch.setattr(zoom_processor, "supabase", sb)
+    assert len(zoom_processor.fetch_pending(limit=3)) == 3
+    # window + exact count + fresh window
+    assert len([c for c in sb.client.calls if c[0] == "table"]) == 3
+    assert any(c[0] == "gte" and c[1][0] == "meeting_date" for c in sb.client.calls)
+    assert metrics.worker_queue_depth.value() == 42
+
+    # The count is rate limited; the next full poll reuses it
+    sb.client.calls.clear()
+    zoom_processor.fetch_pending(limit=3)
+    assert len([c for c in sb.client.calls if c[0] == "table"]) == 2
@@ -0,0 +1,71 @@
+"""
+Unit tests for the worker's priority / fair-share scheduler.
+"""
+
+from datetime import date
+
+from src.workers.scheduler import (
+    PRIORITY_BACKFILL,
+    PRIORITY_FRESH,
+    PRIORITY_RETRY,
+    FairScheduler,
+)
+
+TODAY = date(2025, 3, 10)
+
+
+def _row(id, teacher, meeting_date="2025-01-01", attempts=0, created=None):
+    return {
+        "id": id,
+        "teacher_id": teacher,
+        "meeting_date": meeting_date,
+        "processing_attempts": attempts,
+        "created_at": created or f"2025-03-10T00:00:{id:02d}",
+    }
+
+
+def _scheduler(**kwargs):
+    kwargs.setdefault("max_per_tenant", 100)
+    kwargs.setdefault("weights", {})
+    return FairScheduler(fresh_days=1, today=lambda: TODAY, **kwargs)
+
+
+def test_priority_classes():
+    s = _scheduler()
+    assert s.priority(_row(1, "t", "2025-03-10")) == PRIORITY_FRESH
+    assert s.priority(_row(2, "t", "2025-03-01")) == PRIORITY_BACKFILL
+    assert s.priority(_row(3, "t", "2025-03-10", attempts=1)) == PRIORITY_RETRY
+
+
+def test_fresh_lesson_jumps_bulk_backfill():
+    s = _scheduler()
+    rows = [_row(i, "bulk") for i in range(1, 11)]
+    rows.append(_row(11, "other", "2025-03-10"))
+    batch = s.plan(rows, 3)
+    assert batch[0]["id"] == 11
+
+
+def test_tenants_interleave_by_weight():
+    s = _scheduler(weights={"teacher:heavy": 2})
+    rows = [_row(i, "heavy") for i in range(1, 7)] + [_row(i, "light") for i in range(7, 10)]
+    order = [r["teacher_id"] for r in s.plan(rows, 6)]
+    assert order == ["heavy", "light", "heavy", "heavy", "light", "heavy"]
+
+
+def test_fair_share_persists_across_batches():
+    s = _scheduler()
+    first = s.plan([_row(1, "a"), _row(2, "a")], 1)
+    assert first[0]["teacher_id"] == "a"
+    second = s.plan([_row(2, "a"), _row(3, "b")], 1)
+    assert second[0]["teacher_id"] == "b"
+
+
+def test_per_tenant_concurrency_cap():
+    s = _scheduler(max_per_tenant=1)
+    running = _row(1, "a")
+    s.started(running)
+    batch = s.plan([_row(2, "a"), _row(3, "b")], 5)
+    assert [r["id"] for r in batch] == [3]
+    s.finished(running)
+    assert s.running() == {}
+    assert [r["id"] for r in s.plan([_row(2, "a")], 5)] == [2]
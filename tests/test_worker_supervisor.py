@@ -0,0 +1,75 @@
+"""
+Unit tests for the multi-process supervisor's shutdown (run_worker.py).
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = textwrap.dedent(
+    """
+    import os, signal, sys, time
+    sys.path.insert(0, {root!r})
+    import run_worker
+    from src.workers import zoom_processor
+
+    def busy_child(index, inbox, events):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        with open({pidfile!r}, "w") as fh:
+            fh.write(str(os.getpid()))
+        time.sleep(600)  # a long job that ignores the drain request
+
+    if __name__ == "__main__":
+        zoom_processor.serve_jobs = busy_child
+        zoom_processor.fetch_pending = lambda limit: []
+        supervisor = run_worker.Supervisor(1)
+        signal.signal(signal.SIGTERM, supervisor.request_drain)
+        supervisor.run()
+    """
+)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="POSIX only")
+def test_second_sigterm_stops_busy_children_promptly(tmp_path):
+    pidfile = tmp_path / "child.pid"
+    script = tmp_path / "supervise.py"
+    script.write_text(SCRIPT.format(root=ROOT, pidfile=str(pidfile)))
+    env = dict(os.environ, WORKER_DRAIN_TIMEOUT_SECONDS="600")
+    proc = subprocess.Popen([sys.executable, str(script)], cwd=ROOT, env=env)
+    try:
+        for _ in range(300):
+            if pidfile.exists() and pidfile.read_text():
+                break
+            time.sleep(0.05)
+        child = int(pidfile.read_text())
+
+        proc.send_signal(signal.SIGTERM)  # drain: waits for the busy child
+        time.sleep(1)
+        assert proc.poll() is None
+        started = time.monotonic()
+        proc.send_signal(signal.SIGTERM)  # forced
+        assert proc.wait(timeout=15) == 1
+        assert time.monotonic() - started < 10
+        for _ in range(50):
+            if not _alive(child):
+                break
+            time.sleep(0.1)
+        assert not _alive(child)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
@@ -0,0 +1,32 @@
+"""
+Unit tests for the worker push-wakeup channel.
+"""
+
+import time
+
+from src.config import settings
+from src.workers import wakeup
+
+
+def test_notify_wakes_listener(monkeypatch):
+    listener = wakeup.WakeupListener(("127.0.0.1", 0))
+    try:
+        host, port = listener.address[:2]
+        monkeypatch.setattr(settings, "WORKER_WAKEUP_TARGETS", f"{host}:{port}", raising=False)
+
+        assert listener.wait(0.01) is False
+        assert wakeup.notify_new_job(42) == 1
+        assert wakeup.notify_new_job(43) == 1
+
+        started = time.monotonic()
+        assert listener.wait(5) is True
+        assert time.monotonic() - started < 1
+        # Both notifications were coalesced into the first wakeup
+        assert listener.wait(0.01) is False
+    finally:
+        listener.close()
+
+
+def test_notify_without_targets_is_noop(monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_WAKEUP_TARGETS", "", raising=False)
+    assert wakeup.notify_new_job(1) == 0
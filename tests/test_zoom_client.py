@@ -0,0 +1,153 @@
+"""
+Unit tests for the Zoom HTTP client: pooled session, Retry-After backoff and
+per-endpoint circuit breakers.
+"""
+
+import pytest
+import requests
+
+from src.zoom import zoom_auth, zoom_client
+
+
+class _Resp:
+    def __init__(self, status, headers=None, body=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.body = body or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Client Error", response=self)
+
+    def json(self):
+        return self.body
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.setattr(zoom_auth, "TOKEN_FILE", tmp_path / "zoom_tokens.json")
+    monkeypatch.setattr(zoom_auth, "LOCK_FILE", tmp_path / "zoom_tokens.lock")
+    monkeypatch.setattr(zoom_auth.settings, "ZOOM_ACCESS_TOKEN", "access-0", raising=False)
+    sleeps = []
+    monkeypatch.setattr(zoom_client, "cancellable_sleep", sleeps.append)
+    client = zoom_client.ZoomAPI()
+    client.sleeps = sleeps
+    return client
+
+
+def _script(api, responses):
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append((method, url, kwargs.get("params", {}).copy() if kwargs.get("params") else None))
+        resp = responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+    api.session.request = fake_request
+    return calls
+
+
+def test_session_pool_is_shared_for_pagination(api):
+    calls = _script(api, [
+        _Resp(200, body={"meetings": [{"id": 1}], "next_page_token": "p2"}),
+        _Resp(200, body={"meetings": [{"id": 2}]}),
+    ])
+    data = api.list_user_recordings("t@x.com", "2026-01-01", "2026-01-01")
+    assert [m["id"] for m in data["meetings"]] == [1, 2]
+    assert calls[1][2]["next_page_token"] == "p2"
+    assert api.session.get_adapter("https://api.zoom.us")._pool_maxsize == zoom_client.settings.ZOOM_HTTP_POOL_SIZE
+
+
+def test_429_honors_retry_after(api):
+    _script(api, [_Resp(429, {"Retry-After": "7"}), _Resp(200, body={"ok": True})])
+    assert api._request("GET", "https://api.zoom.us/v2/users/me").json() == {"ok": True}
+    assert 7 <= api.sleeps[0] <= 8
+
+
+def test_long_retry_after_opens_circuit_without_waiting(api):
+    _script(api, [_Resp(429, {"Retry-After": "3600"})])
+    url = "https://api.zoom.us/v2/users/me/recordings"
+    with pytest.raises(requests.exceptions.HTTPError):
+        api._request("GET", url)
+    assert api.sleeps == []
+    with pytest.raises(zoom_client.ZoomCircuitOpenError):
+        api._request("GET", url)
+
+
+def test_429_leaves_breaker_alone_and_releases_probe(api, monkeypatch):
+    monkeypatch.setattr(zoom_client.settings, "ZOOM_CIRCUIT_FAILURE_THRESHOLD", 5, raising=False)
+    url = "https://api.zoom.us/v2/users/me/recordings"
+    breaker = api.breaker_for("GET", url)
+    breaker.failures = 3
+    _script(api, [_Resp(429, {"Retry-After": "1"})] * 3)
+    with pytest.raises(RuntimeError):
+        api._request("GET", url)
+    assert breaker.failures == 3
+
+    # Half-open: a throttled probe must not close the circuit or stay in flight
+    breaker.trip(0)
+    _script(api, [_Resp(429, {"Retry-After": "1"})] * 3)
+    with pytest.raises(RuntimeError):
+        api._request("GET", url)
+    assert breaker.state == "half_open" and breaker.failures == 3
+    assert breaker.before_request()
+
+
+def test_probe_released_when_token_refresh_raises(api, monkeypatch):
+    url = "https://api.zoom.us/v2/users/me/recordings"
+    breaker = api.breaker_for("GET", url)
+    breaker.trip(0)
+
+    def broken_token():
+        raise RuntimeError("token endpoint down")
+
+    monkeypatch.setattr(api, "get_token", broken_token)
+    with pytest.raises(RuntimeError, match="token endpoint down"):
+        api._request("GET", url)
+    assert breaker.before_request()  # not stuck "probe in flight"
+
+
+def test_client_errors_are_not_retried(api):
+    calls = _script(api, [_Resp(404)])
+    with pytest.raises(requests.exceptions.HTTPError, match="404"):
+        api._request("GET", "https://api.zoom.us/v2/meetings/1")
+    assert len(calls) == 1
+
+
+def test_breaker_opens_per_endpoint_and_probes_after_cooldown():
+    now = [0.0]
+    breaker = zoom_client.CircuitBreaker("GET api.zoom.us/v2/users", threshold=2, cooldown=30, clock=lambda: now[0])
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    with pytest.raises(zoom_client.ZoomCircuitOpenError):
+        breaker.before_request()
+
+    now[0] = 31
+    breaker.before_request()  # the single half-open probe
+    with pytest.raises(zoom_client.ZoomCircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_request()
+
+
+def test_server_errors_trip_only_that_endpoint(api, monkeypatch):
+    monkeypatch.setattr(zoom_client.settings, "ZOOM_CIRCUIT_FAILURE_THRESHOLD", 3, raising=False)
+    _script(api, [_Resp(503)] * 3 + [_Resp(200, body={"ok": True})])
+    with pytest.raises(RuntimeError):
+        api._request("GET", "https://api.zoom.us/v2/users/me/recordings")
+    with pytest.raises(zoom_client.ZoomCircuitOpenError):
+        api._request("GET", "https://api.zoom.us/v2/users/other/recordings")
+    assert api._request("GET", "https://zoom.us/rec/download/abc").json() == {"ok": True}
+
+
+def test_parse_retry_after_http_date():
+    assert zoom_client.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert zoom_client.parse_retry_after("garbage") is None
+    assert zoom_client.parse_retry_after("12") == 12.0
@@ -0,0 +1,126 @@
+"""
+Unit tests for single-flight Zoom token refresh.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.zoom import zoom_auth
+
+
+class _Resp:
+    def __init__(self, n):
+        self.n = n
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"access_token": f"access-{self.n}", "refresh_token": f"refresh-{self.n}", "expires_in": 3600}
+
+
+@pytest.fixture
+def oauth(tmp_path, monkeypatch):
+    monkeypatch.setattr(zoom_auth, "TOKEN_FILE", tmp_path / "zoom_tokens.json")
+    monkeypatch.setattr(zoom_auth, "LOCK_FILE", tmp_path / "zoom_tokens.lock")
+    monkeypatch.setattr(zoom_auth.settings, "ZOOM_ACCESS_TOKEN", "access-0", raising=False)
+    monkeypatch.setattr(zoom_auth.settings, "ZOOM_REFRESH_TOKEN", "refresh-0", raising=False)
+    calls = []
+    lock = threading.Lock()
+
+    def fake_post(url, headers=None, data=None, timeout=None):
+        with lock:
+            calls.append(data["refresh_token"])
+            return _Resp(len(calls))
+
+    monkeypatch.setattr(zoom_auth.requests, "post", fake_post)
+    return calls
+
+
+def test_concurrent_401s_refresh_once(oauth):
+    tm = zoom_auth.ZoomTokenManager()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(tm.refresh(stale_token="access-0")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert oauth == ["refresh-0"]
+    assert set(results) == {"access-1"}
+
+
+def test_second_process_adopts_rotated_tokens_from_disk(oauth):
+    first = zoom_auth.ZoomTokenManager()
+    second = zoom_auth.ZoomTokenManager()
+    assert first.refresh(stale_token="access-0") == "access-1"
+
+    # The other process saw the same 401 but must not reuse the rotated refresh token
+    assert second.refresh(stale_token="access-0") == "access-1"
+    assert second.refresh_token == "refresh-1"
+    assert oauth == ["refresh-0"]
+
+    # A rejected current token still forces a real refresh with the new refresh token
+    assert second.refresh(stale_token="access-1") == "access-2"
+    assert oauth == ["refresh-0", "refresh-1"]
+
+
+@pytest.mark.skipif(zoom_auth.fcntl is None, reason="POSIX only")
+def test_env_seed_waits_for_lock_and_keeps_rotated_tokens(oauth):
+    holding = threading.Event()
+    release = threading.Event()
+
+    def other_process_refreshing():
+        with zoom_auth._file_lock(zoom_auth.LOCK_FILE):
+            holding.set()
+            release.wait(5)
+            zoom_auth.TOKEN_FILE.write_text(
+                '{"access_token": "access-9", "refresh_token": "refresh-9", "expires_at": null}'
+            )
+
+    other = threading.Thread(target=other_process_refreshing)
+    other.start()
+    holding.wait(5)
+    managers = []
+    starter = threading.Thread(target=lambda: managers.append(zoom_auth.ZoomTokenManager()))
+    starter.start()
+    time.sleep(0.1)  # the new manager found no file and waits on the lock
+    release.set()
+    other.join()
+    starter.join()
+
+    assert managers[0].refresh_token == "refresh-9"
+    assert "refresh-9" in zoom_auth.TOKEN_FILE.read_text()
+
+
+def test_concurrent_saves_use_private_temp_files(oauth):
+    managers = [zoom_auth.ZoomTokenManager() for _ in range(4)]
+
+    def save_many(tm):
+        for _ in range(25):
+            tm._save_tokens()
+
+    threads = [threading.Thread(target=save_many, args=(tm,)) for tm in managers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [p.name for p in zoom_auth.TOKEN_FILE.parent.iterdir() if p.suffix == ".tmp"] == []
+    assert zoom_auth.ZoomTokenManager().refresh_token == "refresh-0"
+
+
+def test_background_refresh_waits_after_short_lived_token(oauth, monkeypatch):
+    # Tokens expire in 60s (- 120s padding): always inside the 300s lead
+    monkeypatch.setattr(_Resp, "json", lambda self: {"access_token": f"access-{self.n}", "expires_in": 60})
+    monkeypatch.setattr(zoom_auth.settings, "ZOOM_CLIENT_ID", "id", raising=False)
+    monkeypatch.setattr(zoom_auth.settings, "ZOOM_CLIENT_SECRET", "secret", raising=False)
+    monkeypatch.setattr(zoom_auth, "MIN_REFRESH_INTERVAL_SECONDS", 0.2)
+    tm = zoom_auth.ZoomTokenManager()
+    tm.start_background_refresh(lead_seconds=300)
+    time.sleep(0.5)
+    tm.stop_background_refresh()
+    assert 1 <= len(oauth) <= 4